@@ -0,0 +1,103 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+""" Benchmarks the OCSP status check of the certificates of the sample GPU certificate chain against a stub OCSP
+responder with a fixed latency, with and without the batched OCSP requests, and with a responder which does not
+support them.
+
+Usage: python benchmarks/bench_batched_ocsp.py [--latency SECONDS] [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT_DIR, "src"), os.path.join(ROOT_DIR, "tests")]
+
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import BaseSettings
+from verifier.nvml import NvmlHandlerTest
+from verifier.utils import get_ocsp_single_response
+from verifier.utils.http_client import HttpClient
+
+from ocsp_stub import StubOcspResponder
+
+STUB_OCSP_URL = "https://ocsp.stub.test/"
+
+
+def run(cert_pairs, latency, iterations, batch_enabled, supports_batch, nonce_enabled):
+    responder = StubOcspResponder(STUB_OCSP_URL, latency=latency, supports_batch=supports_batch)
+    responder.add_certificates(cert_pairs)
+    HttpClient.post = responder.post
+    BaseSettings.OCSP_BATCH_REQUEST_ENABLED = batch_enabled
+    BaseSettings.OCSP_NONCE_ENABLED = nonce_enabled
+    CcAdminUtils.ocsp_batch_unsupported_urls = set()
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        for ocsp_request, ocsp_response, _, _ in CcAdminUtils.fetch_ocsp_responses(cert_pairs):
+            assert get_ocsp_single_response(ocsp_response, ocsp_request.issuer_key_hash, ocsp_request.serial_number)
+    duration = (time.perf_counter() - start_time) / iterations
+
+    return duration * 1000, responder.get_request_count() / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="the latency of the stub responder in seconds")
+    parser.add_argument("--iterations", type=int, default=20, help="the number of certificate chains checked")
+    arguments = parser.parse_args()
+
+    BaseSettings.OCSP_URL = STUB_OCSP_URL
+    BaseSettings.OCSP_CACHE_ENABLED = False
+    BaseSettings.OCSP_BUNDLE_PATH = ""
+    cert_chain = NvmlHandlerTest(settings=BaseSettings).get_attestation_cert_chain()
+    cert_pairs = CcAdminUtils.get_ocsp_cert_pairs(
+        cert_chain, BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION
+    )
+
+    print(f"{len(cert_pairs)} certificates, stub responder latency {arguments.latency * 1000:.0f} ms")
+    print(f"{'requests':<28} {'nonce':<6} {'ms/chain':>9} {'POSTs/chain':>12}")
+    for name, batch_enabled, supports_batch in (
+        ("single", False, True),
+        ("batched", True, True),
+        ("batched, unsupported", True, False),
+    ):
+        for nonce_enabled in (False, True):
+            duration, request_count = run(
+                cert_pairs, arguments.latency, arguments.iterations, batch_enabled, supports_batch, nonce_enabled
+            )
+            print(f"{name:<28} {str(nonce_enabled):<6} {duration:>9.1f} {request_count:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
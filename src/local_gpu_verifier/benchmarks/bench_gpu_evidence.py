@@ -0,0 +1,95 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+""" Benchmarks the collection of the evidence of 8 GPUs from a stub NVML with the latencies of a Hopper GPU, with one
+and with MAX_EVIDENCE_COLLECTION_WORKERS workers, and with a hung GPU stopping the collection at the deadline.
+
+Usage: python benchmarks/bench_gpu_evidence.py [--gpus N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT_DIR, "src"), os.path.join(ROOT_DIR, "tests")]
+
+from verifier import cc_admin
+from verifier.config import BaseSettings
+from verifier.nvml import NvmlHandler
+
+from nvml_stub import StubNvml
+
+CALL_LATENCY = 0.005
+CERTIFICATE_LATENCY = 0.05
+REPORT_LATENCY = 0.15
+HUNG_GPU = 3
+
+
+def collect(workers):
+    BaseSettings.MAX_EVIDENCE_COLLECTION_WORKERS = workers
+    NvmlHandler.Initialized = False
+    start_time = time.perf_counter()
+    evidence_list = cc_admin.collect_gpu_evidence(BaseSettings.NONCE)
+    return evidence_list, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--gpus", type=int, default=8, help="the number of GPUs")
+    arguments = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    stub = StubNvml(
+        arguments.gpus,
+        call_latency=CALL_LATENCY,
+        certificate_latency=CERTIFICATE_LATENCY,
+        report_latency=lambda index: REPORT_LATENCY,
+    )
+    stub.install()
+    workers = BaseSettings.MAX_EVIDENCE_COLLECTION_WORKERS
+
+    for number_of_workers in (1, workers):
+        evidence_list, duration = collect(number_of_workers)
+        print(f"workers={number_of_workers}: {len(evidence_list)} GPUs in {duration:.3f} s, "
+              f"order {[gpu_info_obj.get_uuid() for gpu_info_obj in evidence_list]}")
+
+    BaseSettings.MAX_GPU_EVIDENCE_TIME_DELAY = 1
+    stub.hung_gpus.add(HUNG_GPU)
+    evidence_list, duration = collect(workers)
+    stub.release()
+    print(f"workers={workers}, GPU {HUNG_GPU} hung, {BaseSettings.MAX_GPU_EVIDENCE_TIME_DELAY} s per GPU: "
+          f"{[gpu_info_obj.get_uuid() for gpu_info_obj in evidence_list]} in {duration:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+""" Benchmarks the parsing of the bundled sample RIM files: reading the RIM, its manufacturer id, its
+certificates and its golden measurements.
+
+Usage: python benchmarks/bench_rim_parser.py [--iterations N]
+"""
+
+import argparse
+import glob
+import logging
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT_DIR, "src")]
+
+from verifier.config import HopperSettings
+from verifier.rim import RIM
+
+
+def parse_rims(contents):
+    for rim_path, content in contents:
+        rim = RIM("driver" if "Driver" in os.path.basename(rim_path) else "vbios", HopperSettings(), content=content)
+        rim.get_manufacturer_id()
+        rim.extract_certificates()
+        rim.get_measurements()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=15, help="the number of passes over the RIM files")
+    arguments = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rim_paths = sorted(glob.glob(os.path.join(HopperSettings.RIM_DIRECTORY_PATH, "*.swidtag")))
+    contents = list()
+    for rim_path in rim_paths:
+        with open(rim_path, "r") as f:
+            contents.append((rim_path, f.read()))
+
+    parse_rims(contents)
+    durations = list()
+    for _ in range(arguments.iterations):
+        start_time = time.perf_counter()
+        parse_rims(contents)
+        durations.append(time.perf_counter() - start_time)
+    duration = statistics.median(durations)
+    print(f"{len(contents)} RIM files: median {duration * 1000:.2f} ms per pass, {duration / len(contents) * 1e6:.0f} us per RIM")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+""" Benchmarks the schema validation of the bundled sample RIM files, compiling the swidtag schema for every
+validation as before the SchemaCache, and with the SchemaCache.
+
+Usage: python benchmarks/bench_schema_cache.py [--iterations N]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT_DIR, "src")]
+
+from lxml import etree
+
+import verifier.rim
+from verifier.config import HopperSettings
+from verifier.rim import RIM
+from verifier.rim.schema_cache import SchemaCache
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(verifier.rim.__file__)), "swidSchema2015.xsd")
+
+
+def validate_uncached(root):
+    xml_schema = etree.XMLSchema(etree.parse(SCHEMA_PATH, etree.XMLParser(resolve_entities=False)))
+    return xml_schema.validate(root)
+
+
+def validate_cached(root):
+    return SchemaCache.validate(SCHEMA_PATH, root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=5, help="the number of validations of every RIM file")
+    arguments = parser.parse_args()
+
+    rim_paths = sorted(glob.glob(os.path.join(HopperSettings.RIM_DIRECTORY_PATH, "*.swidtag")))
+    roots = [RIM.read(base_RIM_path=rim_path) for rim_path in rim_paths]
+
+    SchemaCache.clear()
+    results = dict()
+    for name, validate in (("uncached", validate_uncached), ("SchemaCache", validate_cached)):
+        start_time = time.perf_counter()
+        valid = [validate(root) for _ in range(arguments.iterations) for root in roots]
+        results[name] = valid
+        duration = (time.perf_counter() - start_time) / len(valid)
+        print(f"{name:<12} {duration * 1000:8.2f} ms/validation, {sum(valid)}/{len(valid)} valid")
+
+    assert results["uncached"] == results["SchemaCache"]
+    print(f"{len(rim_paths)} sample RIM files, {arguments.iterations} validations each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+""" Benchmarks the parsing of the SPDM GET_MEASUREMENT response message and of the whole attestation report of
+samples/hopperAttestationReport.txt.
+
+Usage: python benchmarks/bench_spdm_parser.py [--iterations N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT_DIR, "src")]
+
+from verifier.attestation import AttestationReport
+from verifier.attestation.spdm_msrt_resp_msg import SpdmMeasurementResponseMessage
+from verifier.config import HopperSettings, event_log
+from verifier.utils import convert_string_to_blob
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000, help="the number of times every message is parsed")
+    arguments = parser.parse_args()
+    event_log.setLevel(logging.CRITICAL)
+
+    with open(HopperSettings.ATTESTATION_REPORT_PATH, "r") as f:
+        attestation_report_data = convert_string_to_blob(f.read())
+    response = attestation_report_data[AttestationReport.LENGTH_OF_SPDM_GET_MEASUREMENT_REQUEST_MESSAGE:]
+    settings = HopperSettings()
+
+    for name, parse, data in (
+        ("SpdmMeasurementResponseMessage", SpdmMeasurementResponseMessage, response),
+        ("AttestationReport", AttestationReport, attestation_report_data),
+    ):
+        start_time = time.perf_counter()
+        for _ in range(arguments.iterations):
+            parse(data, settings)
+        duration = (time.perf_counter() - start_time) / arguments.iterations
+        print(f"{name:<31} {duration * 1e6:8.1f} us/parse of {len(data)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,10 +28,17 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import threading
+from collections import OrderedDict
+
 from ecdsa import (
     VerifyingKey,
     BadSignatureError,
 )
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
 
 from verifier.utils import extract_public_key
 from verifier.config import (
@@ -59,6 +66,16 @@ class AttestationReport:
     """
 
     LENGTH_OF_SPDM_GET_MEASUREMENT_REQUEST_MESSAGE = 37
+    HASH_ALGORITHMS = {
+        "sha256": hashes.SHA256,
+        "sha384": hashes.SHA384,
+        "sha512": hashes.SHA512,
+    }
+    # The public keys of the GPU leaf certificates, keyed by the sha256 fingerprint of the certificate, with the
+    # least recently used ones evicted beyond MAX_PUBLIC_KEYS.
+    MAX_PUBLIC_KEYS = 64
+    public_keys = OrderedDict()
+    public_keys_lock = threading.Lock()
 
     def extract_response_message(self, attestation_report_data):
         """ Extracts the SPDM GET_MEASUREMENT response message from the attestation report.
@@ -110,10 +127,76 @@ class AttestationReport:
             raise ParsingError("The the length of the SPDM GET_MEASUREMENT response message is less than \
                                or equal to the length of the signature field, which is not correct.")
 
-        data = request_data + response_data
-        data = data[ : len(data) - signature_length]
+        data = request_data + response_data[ : len(response_data) - signature_length]
         return data
 
+    @classmethod
+    def get_public_key(cls, certificate):
+        """ Fetches the public key of the GPU leaf certificate, parsing it only once per certificate while it is
+        among the MAX_PUBLIC_KEYS most recently used ones.
+
+        Args:
+            certificate (cryptography.x509.Certificate): The GPU attestation leaf certificate.
+
+        Returns:
+            [cryptography.hazmat.primitives.asymmetric.types.PublicKeyTypes]: the public key.
+        """
+        fingerprint = certificate.fingerprint(hashes.SHA256())
+        with cls.public_keys_lock:
+            public_key = cls.public_keys.get(fingerprint)
+            if public_key is None:
+                public_key = certificate.public_key()
+                cls.public_keys[fingerprint] = public_key
+                if len(cls.public_keys) > cls.MAX_PUBLIC_KEYS:
+                    cls.public_keys.popitem(last=False)
+            else:
+                cls.public_keys.move_to_end(fingerprint)
+        return public_key
+
+    @classmethod
+    def verify_signature_with_cryptography(cls, public_key, signature, data, hashfunc):
+        """ Verifies the raw r||s ECDSA signature of the data with the OpenSSL backed cryptography library.
+
+        Args:
+            public_key (cryptography.hazmat.primitives.asymmetric.ec.EllipticCurvePublicKey): the public key.
+            signature (bytes): the signature as the concatenation of r and s.
+            data (bytes): the signed data.
+            hashfunc (_hashlib.HASH): The hashlib hash function.
+
+        Returns:
+            [bool]: True if the signature is valid, otherwise False.
+        """
+        half_length = len(signature) // 2
+        r = int.from_bytes(signature[:half_length], "big")
+        s = int.from_bytes(signature[half_length:], "big")
+        hash_algorithm = cls.HASH_ALGORITHMS[hashfunc().name]
+        try:
+            public_key.verify(encode_dss_signature(r, s), data, ec.ECDSA(hash_algorithm()))
+            return True
+        except InvalidSignature:
+            return False
+
+    def verify_signature_with_ecdsa(self, certificate, signature, data, hashfunc):
+        """ Verifies the raw r||s ECDSA signature of the data with the python-ecdsa library.
+
+        Args:
+            certificate (cryptography.x509.Certificate): The GPU attestation leaf certificate.
+            signature (bytes): the signature as the concatenation of r and s.
+            data (bytes): the signed data.
+            hashfunc (_hashlib.HASH): The hashlib hash function.
+
+        Returns:
+            [bool]: True if the signature is valid, otherwise False.
+        """
+        event_log.debug("Extracting the public key from the certificate for the attestation report.")
+        public_key = extract_public_key(certificate)
+        verifying_key = VerifyingKey.from_pem(public_key)
+        event_log.debug("Extracted the public key from the certificate for the the attestation report.")
+        try:
+            return verifying_key.verify(signature, data, hashfunc = hashfunc)
+        except BadSignatureError:
+            return False
+
     def verify_signature(self, certificate, signature_length, hashfunc):
         """ Performs the signature verification of the attestation report.
 
@@ -127,21 +210,21 @@ class AttestationReport:
             otherwise, return False.
         """
         try:
-            event_log.debug("Extracting the public key from the certificate for the attestation report.")
-            public_key = extract_public_key(certificate)
-            verifying_key = VerifyingKey.from_pem(public_key)
-            event_log.debug("Extracted the public key from the certificate for the the attestation report.")
-
             data_whose_signature_is_to_be_verified = AttestationReport.concatenate(request_data = self.request_data,
                                                                                    response_data = self.response_data,
                                                                                    signature_length = signature_length)
             signature = self.get_response_message().get_signature()
-            
+
             event_log.debug("Verifying the signature of the attestation report.")
-            status = verifying_key.verify(signature, data_whose_signature_is_to_be_verified, hashfunc = hashfunc)
-            return status
-        except BadSignatureError:
-            return False
+            public_key = self.get_public_key(certificate)
+            if isinstance(public_key, ec.EllipticCurvePublicKey) and hashfunc().name in self.HASH_ALGORITHMS:
+                try:
+                    return self.verify_signature_with_cryptography(public_key, signature,
+                                                                   data_whose_signature_is_to_be_verified, hashfunc)
+                except (ValueError, TypeError) as error:
+                    event_log.debug(f"Falling back to python-ecdsa for the attestation report signature : {error}")
+
+            return self.verify_signature_with_ecdsa(certificate, signature, data_whose_signature_is_to_be_verified, hashfunc)
 
         except Exception as error:
             err_msg = "Something went wrong during attestation report signature verification."
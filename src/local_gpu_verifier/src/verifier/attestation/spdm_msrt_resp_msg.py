@@ -28,7 +28,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
-from verifier.utils import read_field_as_little_endian
+import struct
+
 from verifier.exceptions import (
     NoMeasurementBlockError,
     MeasurementSpecificationError,
@@ -49,6 +50,8 @@ class DmtfMeasurement:
         "DMTFSpecMeasurementValueSize": 2,
         "DMTFSpecMeasurementValue": None,
     }
+    HEADER_FORMAT = struct.Struct("<BH")
+    __slots__ = ("DMTFSpecMeasurementValueType", "DMTFSpecMeasurementValueSize", "DMTFSpecMeasurementValue")
 
     def get_measurement_value(self):
         """ Fetches the measurement value.
@@ -102,23 +105,14 @@ class DmtfMeasurement:
         """ Parses the raw DMTF Measurement data and sets the various field values of the Measurement.
 
         Args:
-            measurement_data (bytes): the raw DMTF Measurement data.
+            measurement_data (bytes or memoryview): the raw DMTF Measurement data.
         """
-        byte_index = 0
-
-        x = measurement_data[byte_index: byte_index + self.FieldSize['DMTFSpecMeasurementValueType']]
-        value = int(x.hex(), 16)
-        self.set_measurement_value_type(value)
-        byte_index = byte_index + self.FieldSize['DMTFSpecMeasurementValueType']
+        value_type, value_size = self.HEADER_FORMAT.unpack_from(measurement_data, 0)
+        self.set_measurement_value_type(value_type)
+        self.set_measurement_value_size(value_size)
 
-        x = measurement_data[byte_index: byte_index + self.FieldSize['DMTFSpecMeasurementValueSize']]
-        value = int(read_field_as_little_endian(x), 16)
-        self.set_measurement_value_size(value)
-        byte_index = byte_index + self.FieldSize['DMTFSpecMeasurementValueSize']
-
-        value = measurement_data[byte_index: byte_index + self.get_measurement_value_size()]
-        self.set_measurement_value(value)
-        byte_index = byte_index + self.get_measurement_value_size()
+        byte_index = self.HEADER_FORMAT.size
+        self.set_measurement_value(bytes(measurement_data[byte_index: byte_index + value_size]))
 
     def print_obj(self, logger):
         """ Prints all the fields of the object representing the DMTF Measurement.
@@ -134,9 +128,9 @@ class DmtfMeasurement:
         """ The constructor method for the DmtfMeasurement class representing the DMTF Measurement.
 
         Args:
-            measurement_data (bytes): the raw DMTF Measurement data.
+            measurement_data (bytes or memoryview): the raw DMTF Measurement data.
         """
-        assert type(measurement_data) is bytes
+        assert isinstance(measurement_data, (bytes, memoryview))
 
         self.DMTFSpecMeasurementValueType = None
         self.DMTFSpecMeasurementValueSize = None
@@ -158,6 +152,8 @@ class MeasurementRecord:
         "MeasurementSpecification": 1,
         "MeasurementSize": 2,
     }
+    HEADER_FORMAT = struct.Struct("<BBH")
+    __slots__ = ("MeasurementBlocks", "NumberOfBlocks")
 
     DMTF_MEASUREMENT_SPECIFICATION_VALUE = 1
 
@@ -179,7 +175,7 @@ class MeasurementRecord:
         representing the Measurement Record.
 
         Args:
-            binary_data (bytes): the raw Measurement Record data
+            binary_data (bytes or memoryview): the raw Measurement Record data
             settings (config.HopperSettings): the object containing the various config info.
 
         Raises:
@@ -187,29 +183,24 @@ class MeasurementRecord:
             MeasurementSpecificationError: it is raised if any measurement block does not follow DMTF specification.
             ParsingError: it is raised if there is any issue in the parsing of the data.
         """
-        assert type(binary_data) is bytes
+        assert isinstance(binary_data, (bytes, memoryview))
 
         if self.NumberOfBlocks == 0:
             err_msg = "\tThere are no measurement blocks in the respone message."
             raise NoMeasurementBlockError(err_msg)
 
+        # The measurement blocks are views into the record, only the measurement values are copied.
+        binary_data = memoryview(binary_data)
+        unpack_header = self.HEADER_FORMAT.unpack_from
+        header_size = self.HEADER_FORMAT.size
         byte_index = 0
 
         for _ in range(self.NumberOfBlocks):
-            x = binary_data[byte_index: byte_index + self.FieldSize['Index']]
-            index = int(x.hex(), 16)
-            byte_index = byte_index + self.FieldSize['Index']
-
-            x = binary_data[byte_index: byte_index + self.FieldSize['MeasurementSpecification']]
-            measurement_specification = int(x.hex(), 16)
+            index, measurement_specification, measurement_size = unpack_header(binary_data, byte_index)
             if measurement_specification != self.DMTF_MEASUREMENT_SPECIFICATION_VALUE:
-                raise MeasurementSpecificationError("Measurement block at index ", self.get_index(), \
-                                                    " not following DMTF specification.\n\tQuitting now.")
-            byte_index = byte_index + self.FieldSize['MeasurementSpecification']
-
-            x = binary_data[byte_index: byte_index + self.FieldSize['MeasurementSize']]
-            measurement_size = int(read_field_as_little_endian(x), 16)
-            byte_index = byte_index + self.FieldSize['MeasurementSize']
+                raise MeasurementSpecificationError(f"Measurement block at index {index} not following DMTF "
+                                                    "specification.\n\tQuitting now.")
+            byte_index = byte_index + header_size
 
             measurement_data = binary_data[byte_index: byte_index + measurement_size]
             self.MeasurementBlocks[index] = DmtfMeasurement(measurement_data)
@@ -219,12 +210,9 @@ class MeasurementRecord:
             err_msg = "Something went wrong while parsing the MeasurementRecord.\nQuitting now."
             raise ParsingError(err_msg)
 
-        count = 0
-        for i in range(1, self.NumberOfBlocks + 1):
-
-            if self.MeasurementBlocks[i] is not None \
-               and len(self.MeasurementBlocks[i].get_measurement_value()) == self.MeasurementBlocks[i].get_measurement_value_size():
-               count = count + 1
+        if any(i not in self.MeasurementBlocks for i in range(1, self.NumberOfBlocks + 1)):
+            err_msg = "The measurement block indices in the MeasurementRecord are not contiguous.\nQuitting now."
+            raise ParsingError(err_msg)
 
     def print_obj(self, logger):
         """ Prints all the field value of the class representing the Measurement Records.
@@ -242,11 +230,11 @@ class MeasurementRecord:
         """ The constructor method for the class MeasurementRecord to represent the measurement records.
 
         Args:
-            measurement_record_data (bytes): the raw measurement record data
+            measurement_record_data (bytes or memoryview): the raw measurement record data
             number_of_blocks (int): the number of measurement blocks
             settings (config.HopperSettings): object that contains the config info.
         """
-        assert type(measurement_record_data) is bytes
+        assert isinstance(measurement_record_data, (bytes, memoryview))
         assert type(number_of_blocks) is int
 
         self.MeasurementBlocks = dict()
@@ -300,6 +288,7 @@ class OpaqueData:
         "DataSize"    : 2,
         "PdiDataSize" : 8,
     }
+    HEADER_FORMAT = struct.Struct("<HH")
 
     def get_data(self, field_name):
         """ Fetches the field value of the given field name.
@@ -321,7 +310,7 @@ class OpaqueData:
         """ Parses and creates a list of measurement count values from the OpaqueData field.
 
         Args:
-            data (bytes): the raw measurement count data.
+            data (bytes or memoryview): the raw measurement count data.
 
         Raises:
             ParsingError: it is raised if the length of the data is not a multiple of MSR_COUNT_SIZE.
@@ -330,14 +319,8 @@ class OpaqueData:
         if len(data) % self.MSR_COUNT_SIZE != 0:
             raise ParsingError("Invalid size of measurement count field data.")
 
-        msr_cnt = list()
         number_of_elements = len(data) // self.MSR_COUNT_SIZE
-
-        for i in range(number_of_elements):
-            start = i * self.MSR_COUNT_SIZE
-            end = start + self.MSR_COUNT_SIZE
-            element = data[start: end]
-            msr_cnt.append(int(read_field_as_little_endian(element), 16))
+        msr_cnt = list(struct.unpack_from(f"<{number_of_elements}I", data, 0))
 
         self.OpaqueDataField['OPAQUE_FIELD_ID_MSRSCNT'] = msr_cnt
 
@@ -345,7 +328,7 @@ class OpaqueData:
         """ Parses  the raw NvSwitch PDIs data of all the 18 NvLinks of the GPU.
 
         Args:
-            binary_data (bytes): the raw NvSwitch PDI data.
+            binary_data (bytes or memoryview): the raw NvSwitch PDI data.
 
         Raises:
             ParsingError: it is raised if the length off the data is not a multiple of self.FieldSize["PdiDataSize"]
@@ -357,7 +340,7 @@ class OpaqueData:
         self.OpaqueDataField["OPAQUE_FIELD_ID_SWITCH_PDI"] = []
 
         while byte_index < len(binary_data):
-            pdi = binary_data[byte_index : byte_index + self.FieldSize['PdiDataSize']]
+            pdi = bytes(binary_data[byte_index : byte_index + self.FieldSize['PdiDataSize']])
             self.OpaqueDataField["OPAQUE_FIELD_ID_SWITCH_PDI"].append(pdi)
             byte_index = byte_index + self.FieldSize['PdiDataSize']
     
@@ -366,7 +349,7 @@ class OpaqueData:
         Args:
             binary_data (bytes): the raw feature flag data
         """
-        chip_info = binary_data.decode('utf-8').split('\x00')[0]
+        chip_info = bytes(binary_data).decode('utf-8').split('\x00')[0]
         self.OpaqueDataField["OPAQUE_FIELD_ID_CHIP_INFO"] = chip_info
 
 
@@ -374,8 +357,9 @@ class OpaqueData:
         """ Parses the raw OpaqueData field of the SPDM GET_MEASUREMENT response message.
 
         Args:
-            binary_data (bytes): the data content of the Opaque Data field.
+            binary_data (bytes or memoryview): the data content of the Opaque Data field.
         """
+        binary_data = memoryview(binary_data)
         byte_index = 0
 
         opaque_field_to_function_map = {
@@ -387,21 +371,15 @@ class OpaqueData:
 
         while byte_index < len(binary_data):
 
-            x = binary_data[byte_index: byte_index + self.FieldSize['DataType']]
-            value = int(read_field_as_little_endian(x), 16)
+            value, data_size = self.HEADER_FORMAT.unpack_from(binary_data, byte_index)
             data_type = self.OPAQUE_DATA_TYPES[value]
-            byte_index = byte_index + self.FieldSize['DataType']
-
-            x = binary_data[byte_index: byte_index + self.FieldSize['DataSize']]
-            data_size = int(read_field_as_little_endian(x), 16)
-            byte_index = byte_index + self.FieldSize['DataSize']
+            byte_index = byte_index + self.HEADER_FORMAT.size
 
             value = binary_data[byte_index: byte_index + data_size]
-
             if data_type in opaque_field_to_function_map:
                 opaque_field_to_function_map[data_type](value)
             else:
-                self.OpaqueDataField[data_type] = value
+                self.OpaqueDataField[data_type] = bytes(value)
 
             byte_index = byte_index + data_size
 
@@ -419,9 +397,9 @@ class OpaqueData:
         """ The constructor method for the class representing the OpaqueData.
 
         Args:
-            binary_data (bytes): the Opaque data content.
+            binary_data (bytes or memoryview): the Opaque data content.
         """
-        assert type(binary_data) is bytes
+        assert isinstance(binary_data, (bytes, memoryview))
         self.OpaqueDataField = dict()
         self.parse(binary_data)
 
@@ -453,6 +431,8 @@ class SpdmMeasurementResponseMessage:
         "Nonce": 32,
         "OpaqueLength": 2,
     }
+    HEADER_FORMAT = struct.Struct("<ccccB")
+    OPAQUE_LENGTH_FORMAT = struct.Struct("<H")
 
     def get_spdm_version(self):
         """ Fetches the SPDMVersion of the object representing the SPDM GET_MEASUREMENT response message.
@@ -628,59 +608,48 @@ class SpdmMeasurementResponseMessage:
         Args:
             response (bytes): the raw data content of the SPDM GET_MEASUREMENT response message.
             settings (config.HopperSettings): object that contains the config info.
+
+        Raises:
+            ParsingError: it is raised if the response message is shorter than its fields.
         """
         assert type(response) is bytes
 
-        byte_index = 0
-
-        value = response[byte_index: byte_index + self.FieldSize['SPDMVersion']]
-        self.set_spdm_version(value)
-        byte_index = byte_index + self.FieldSize['SPDMVersion']
-
-        value = response[byte_index: byte_index + self.FieldSize['RequestResponseCode']]
-        self.set_request_response_code(value)
-        byte_index = byte_index + self.FieldSize['RequestResponseCode']
-
-        value = response[byte_index: byte_index + self.FieldSize['Param1']]
-        self.set_param1(value)
-        byte_index = byte_index + self.FieldSize['Param1']
+        # The measurement record and the opaque data are parsed from views into the response message.
+        response = memoryview(response)
 
-        value = response[byte_index: byte_index + self.FieldSize['Param2']]
-        self.set_param2(value)
-        byte_index = byte_index + self.FieldSize['Param2']
+        spdm_version, request_response_code, param1, param2, number_of_blocks = self.HEADER_FORMAT.unpack_from(response, 0)
+        self.set_spdm_version(spdm_version)
+        self.set_request_response_code(request_response_code)
+        self.set_param1(param1)
+        self.set_param2(param2)
+        self.set_number_of_blocks(number_of_blocks)
+        byte_index = self.HEADER_FORMAT.size
 
-        x = response[byte_index: byte_index + self.FieldSize['NumberOfBlocks']]
-        value = int(x.hex(), 16)
-        self.set_number_of_blocks(value)
-        byte_index = byte_index + self.FieldSize['NumberOfBlocks']
-
-        x = response[byte_index: byte_index + self.FieldSize['MeasurementRecordLength']]
-        value = int(read_field_as_little_endian(x), 16)
-        self.set_measurement_record_length(value)
-        byte_index = byte_index + self.FieldSize['MeasurementRecordLength']
+        end_index = byte_index + self.FieldSize['MeasurementRecordLength']
+        self.set_measurement_record_length(int.from_bytes(response[byte_index: end_index], "little"))
+        byte_index = end_index
 
         measurement_record = response[byte_index: byte_index + self.get_measurement_record_length()]
         self.set_measurement_record(MeasurementRecord(measurement_record, self.get_number_of_blocks(), settings))
         byte_index = byte_index + self.get_measurement_record_length()
 
-        value = response[byte_index: byte_index + self.FieldSize['Nonce']]
-        self.set_nonce(value)
+        self.set_nonce(bytes(response[byte_index: byte_index + self.FieldSize['Nonce']]))
         byte_index = byte_index + self.FieldSize['Nonce']
 
-        x = response[byte_index: byte_index + self.FieldSize['OpaqueLength']]
-        x = read_field_as_little_endian(x)
-        value = int(x, 16)
-        self.set_opaque_data_length(value)
+        self.set_opaque_data_length(self.OPAQUE_LENGTH_FORMAT.unpack_from(response, byte_index)[0])
         byte_index = byte_index + self.FieldSize['OpaqueLength']
 
         opaque_data_content = response[byte_index: byte_index + self.get_opaque_data_length()]
         self.OpaqueData = OpaqueData(opaque_data_content)
         byte_index = byte_index + self.get_opaque_data_length()
 
-        value = response[byte_index: byte_index + self.FieldSize['Signature']]
-        self.set_signature(value)
+        self.set_signature(bytes(response[byte_index: byte_index + self.FieldSize['Signature']]))
         byte_index = byte_index + self.FieldSize['Signature']
 
+        # The slices of the memoryview are silently shorter than the declared lengths of a truncated response
+        if byte_index > len(response):
+            raise ParsingError("The SPDM GET_MEASUREMENT response message is truncated.\nQuitting now.")
+
     def print_obj(self, logger):
         """ Prints all the fields of the class SpdmMeasurementResponseMessage representing the SPDM GET_MEASUREMENT response message.
 
@@ -0,0 +1,323 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import sys
+import json
+import time
+import base64
+import shutil
+import logging
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from verifier import cc_admin
+from verifier.attestation import AttestationReport
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+    info_log,
+    event_log,
+)
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.nvml.gpu_cert_chains import GpuCertificateChains
+from verifier.rim.rim_memo import RimMemo
+from verifier.utils import format_vbios_version
+from verifier.utils.cert_store_cache import CertificateStoreCache
+from verifier.utils.tracing import Tracer
+
+
+class ArchivedEvidence:
+    """ A class to represent the archived evidence of one GPU, as returned by collect_gpu_evidence_remote(),
+    with the same getters as the NvmlHandler objects used by the attestation.
+
+    The record is a JSON object with the base64 encoded "certificate" chain and "evidence" attestation report,
+    and optionally the "nonce" used to collect the evidence, the "uuid" and the "arch" of the GPU. The driver
+    and VBIOS versions are read from the attestation report, and the root certificate of the archived chain is
+    replaced with the trusted device root certificate like for the certificate chains fetched from the GPU.
+    """
+
+    def __init__(self, record, index):
+        """ The constructor method for the ArchivedEvidence class.
+
+        Args:
+            record (dict): the archived evidence record.
+            index (int): the index of the record, used as the GPU name if the record has no uuid.
+        """
+        cert_chain_data = base64.b64decode(record["certificate"])
+        self.CertificateChain = GpuCertificateChains.extract_cert_chain(cert_chain_data)[:-1]
+        self.CertificateChain.append(CertificateStoreCache.load_root_certificate(BaseSettings.DEVICE_ROOT_CERT))
+        self.AttestationReport = base64.b64decode(record["evidence"])
+        self.UUID = record.get("uuid") or f"GPU-{index}"
+        self.Architecture = record.get("arch") or "HOPPER"
+
+        attestation_report = AttestationReport(self.AttestationReport, HopperSettings())
+        opaque_data = attestation_report.get_response_message().get_opaque_data()
+        self.DriverVersion = opaque_data.get_data("OPAQUE_FIELD_ID_DRIVER_VERSION").decode().rstrip("\0")
+        self.VbiosVersion = format_vbios_version(opaque_data.get_data("OPAQUE_FIELD_ID_VBIOS_VERSION"))
+        self.ArchivedNonce = record.get("nonce")
+        self.ReportNonce = attestation_report.get_request_message().get_nonce().hex()
+
+    def get_uuid(self):
+        return self.UUID
+
+    def get_gpu_architecture(self):
+        return self.Architecture
+
+    def get_driver_version(self):
+        return self.DriverVersion
+
+    def get_vbios_version(self):
+        return self.VbiosVersion
+
+    def get_attestation_report(self):
+        return self.AttestationReport
+
+    def get_attestation_cert_chain(self):
+        return self.CertificateChain
+
+    def get_archived_nonce(self):
+        """ Returns the nonce archived in the record, used to collect the evidence.
+
+        Returns:
+            [str]: the nonce as a hex string, or None if the record has no nonce.
+        """
+        return self.ArchivedNonce
+
+    def get_report_nonce(self):
+        """ Returns the nonce of the request message in the attestation report.
+
+        Returns:
+            [str]: the nonce as a hex string.
+        """
+        return self.ReportNonce
+
+
+# The state of a worker process, kept across the records it verifies.
+worker_state = dict()
+
+
+def init_worker(arguments_as_dictionary):
+    """Method to initialize a worker process with the Attestation Options.
+
+    The output of the verifier is moved to stderr so that stdout only contains the results, and the
+    RIM memo of the worker is shared by all the records it verifies.
+
+    Args:
+        arguments_as_dictionary (Dictionary): the dictionary object containing the Attestation Options.
+    """
+    for handler in info_log.handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+            handler.setStream(sys.stderr)
+    cc_admin.apply_attestation_arguments(arguments_as_dictionary)
+    if not arguments_as_dictionary["verbose"]:
+        info_log.setLevel(logging.WARNING)
+    worker_state["arguments"] = arguments_as_dictionary
+    worker_state["rim_memo"] = RimMemo()
+
+
+def verify_record(index, line):
+    """Method to verify one archived evidence record in a worker process, in its own trace if the
+    tracing is enabled.
+
+    Args:
+        index (int): the index of the record in the input.
+        line (str): the JSON record.
+
+    Returns:
+        A dictionary containing the index, uuid, nonce, attestation status, claims and warnings of the record,
+        and its trace if --trace is set.
+    """
+    arguments_as_dictionary = worker_state["arguments"]
+    if not cc_admin.is_trace_enabled(arguments_as_dictionary):
+        return verify_archived_evidence(index, line)
+
+    with Tracer.start_trace("verify_record", record=index) as trace:
+        result = verify_archived_evidence(index, line)
+    cc_admin.export_trace(trace, arguments_as_dictionary)
+    if arguments_as_dictionary["trace"]:
+        result["trace"] = trace.to_dict()
+    return result
+
+
+def verify_archived_evidence(index, line):
+    """Method to verify one archived evidence record.
+
+    Args:
+        index (int): the index of the record in the input.
+        line (str): the JSON record.
+
+    Returns:
+        A dictionary containing the index, uuid, nonce, attestation status, claims and warnings of the record.
+        Without an archived nonce or --nonce the nonce of the attestation report is only compared with itself,
+        so the record has "nonce_verified" false and its nonce match claim is false.
+    """
+    arguments_as_dictionary = worker_state["arguments"]
+    result = {"record": index, "uuid": None, "nonce": None, "nonce_verified": False, "status": False, "claims": None}
+
+    try:
+        evidence = ArchivedEvidence(json.loads(line), index)
+        expected_nonce = arguments_as_dictionary.get("nonce") or evidence.get_archived_nonce()
+        nonce = expected_nonce or evidence.get_report_nonce()
+        result["uuid"] = evidence.get_uuid()
+        result["nonce"] = nonce
+        result["nonce_verified"] = expected_nonce is not None
+
+        gpu_result = cc_admin.attest_gpu_with_span((
+            index,
+            evidence,
+            arguments_as_dictionary,
+            CcAdminUtils.validate_and_extract_nonce(nonce),
+            worker_state["rim_memo"],
+        ))
+        result["status"] = gpu_result["status"]
+        result["claims"] = gpu_result["claims"]
+        if not result["nonce_verified"]:
+            event_log.warning(f"The evidence record {index} has no nonce, its attestation report nonce is not verified.")
+            result["claims"]["x-nvidia-gpu-attestation-report-nonce-match"] = False
+        for key in ("hwmodel", "oemid", "ueid", "driver_warning", "vbios_warning"):
+            if gpu_result[key] is not None:
+                result[key] = str(gpu_result[key])
+    except Exception as error:
+        event_log.error(f"Unable to verify the evidence record {index} : {error}")
+        result["error"] = str(error) or type(error).__name__
+    return result
+
+
+def read_records(input_file):
+    """Method to read the non empty lines of the JSONL input.
+
+    Args:
+        input_file (file): the JSONL input.
+
+    Yields:
+        The index and the content of every record.
+    """
+    index = 0
+    for line in input_file:
+        line = line.strip()
+        if line:
+            yield index, line
+            index += 1
+
+
+def verify_records(records, arguments_as_dictionary, workers):
+    """Method to verify the archived evidence records on a process pool.
+
+    At most a few records per worker are in flight, so the input is streamed, and the results are
+    yielded in the order of the records.
+
+    Args:
+        records (iterable): the index and the content of every record.
+        arguments_as_dictionary (Dictionary): the dictionary object containing the Attestation Options.
+        workers (int): the number of worker processes.
+
+    Yields:
+        The result of every record.
+    """
+    max_in_flight = workers * 4
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(arguments_as_dictionary,)
+    ) as executor:
+        in_flight = deque()
+        for index, line in records:
+            in_flight.append(executor.submit(verify_record, index, line))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def build_argument_parser():
+    """Method to build the command line argument parser of the batch verifier.
+
+    Returns:
+        An argparse.ArgumentParser object with the Attestation Options and the batch options.
+    """
+    parser = cc_admin.build_argument_parser()
+    parser.description = "Verifies archived GPU evidence records offline."
+    parser.add_argument(
+        "input",
+        help="The JSONL file with one collect_gpu_evidence_remote() record per line, or - for stdin.",
+    )
+    parser.add_argument(
+        "--output",
+        help="The JSONL file the results are written to. Defaults to stdout.",
+    )
+    parser.add_argument(
+        "--workers",
+        help="The number of worker processes. Defaults to the number of CPUs.",
+        type=int,
+        default=os.cpu_count() or 1,
+    )
+    return parser
+
+
+def main():
+    """The main function of the batch verifier."""
+    arguments_as_dictionary = vars(build_argument_parser().parse_args())
+    workers = max(1, arguments_as_dictionary["workers"])
+
+    # The workers share the RIM cache on disk, and an OCSP cache directory for the run if none is configured.
+    temp_ocsp_cache_dir = None
+    if not arguments_as_dictionary.get("ocsp_cache_dir") and not BaseSettings.OCSP_CACHE_DIR:
+        temp_ocsp_cache_dir = tempfile.mkdtemp(prefix="nv-ocsp-cache-")
+        arguments_as_dictionary["ocsp_cache_dir"] = temp_ocsp_cache_dir
+
+    input_file = sys.stdin if arguments_as_dictionary["input"] == "-" else open(arguments_as_dictionary["input"], "r")
+    output_file = open(arguments_as_dictionary["output"], "w") if arguments_as_dictionary["output"] else sys.stdout
+
+    start_time = time.monotonic()
+    number_of_records = 0
+    number_of_successes = 0
+    try:
+        for result in verify_records(read_records(input_file), arguments_as_dictionary, workers):
+            output_file.write(json.dumps(result) + "\n")
+            number_of_records += 1
+            number_of_successes += 1 if result["status"] else 0
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+        if temp_ocsp_cache_dir:
+            shutil.rmtree(temp_ocsp_cache_dir, ignore_errors=True)
+
+    sys.stderr.write(
+        f"Verified {number_of_records} evidence records with {workers} workers in "
+        f"{time.monotonic() - start_time:.2f} s, {number_of_successes} succeeded.\n"
+    )
+    if number_of_successes != number_of_records:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
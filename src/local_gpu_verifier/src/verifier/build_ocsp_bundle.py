@@ -0,0 +1,206 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import sys
+import json
+import base64
+import argparse
+
+from cryptography.x509 import ocsp
+
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+    info_log,
+)
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.nvml.gpu_cert_chains import GpuCertificateChains
+from verifier.rim import RIM
+from verifier.utils import get_ocsp_single_response
+from verifier.utils.cert_store_cache import CertificateStoreCache
+from verifier.utils.ocsp_bundle import OcspBundle
+from verifier.utils.rim_bundle import RimBundle
+
+
+def get_gpu_cert_pairs(cert_chain_data):
+    """Method to list the certificates of a GPU attestation certificate chain whose ocsp status is checked.
+
+    Args:
+        cert_chain_data (bytes): the GPU attestation certificate chain in PEM format.
+
+    Returns:
+        [list]: the list of (certificate, issuer certificate) tuples.
+    """
+    # The root certificate of the chain is replaced with the trusted device root certificate like in the attestation
+    cert_chain = GpuCertificateChains.extract_cert_chain(cert_chain_data)[:-1]
+    cert_chain.append(CertificateStoreCache.load_root_certificate(BaseSettings.DEVICE_ROOT_CERT))
+    return CcAdminUtils.get_ocsp_cert_pairs(cert_chain, BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION)
+
+
+def get_rim_cert_pairs(rim_name, content):
+    """Method to list the certificates of the certificate chain of a RIM file whose ocsp status is checked.
+
+    Args:
+        rim_name (str): the name of the RIM, can be either "driver" or "vbios".
+        content (str): the content of the RIM file as a string.
+
+    Returns:
+        [list]: the list of (certificate, issuer certificate) tuples.
+    """
+    rim_cert_chain = RIM(rim_name, HopperSettings(), content=content).extract_certificates()
+    rim_cert_chain.append(CertificateStoreCache.load_root_certificate(BaseSettings.RIM_ROOT_CERT))
+    if rim_name == "driver":
+        mode = BaseSettings.Certificate_Chain_Verification_Mode.DRIVER_RIM_CERT
+    else:
+        mode = BaseSettings.Certificate_Chain_Verification_Mode.VBIOS_RIM_CERT
+    return CcAdminUtils.get_ocsp_cert_pairs(rim_cert_chain, mode)
+
+
+def collect_cert_pairs(arguments_as_dictionary):
+    """Method to collect the certificates of the certificate chains given on the command line.
+
+    Args:
+        arguments_as_dictionary (Dictionary): the dictionary object containing the command line options.
+
+    Returns:
+        [list]: the list of (certificate, issuer certificate) tuples, without duplicates.
+    """
+    cert_pairs = list()
+    for path in arguments_as_dictionary["cert_chain"] or []:
+        with open(path, "rb") as f:
+            cert_pairs.extend(get_gpu_cert_pairs(f.read()))
+    for path in arguments_as_dictionary["evidence"] or []:
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    cert_pairs.extend(get_gpu_cert_pairs(base64.b64decode(json.loads(line)["certificate"])))
+    for path in arguments_as_dictionary["rim_file"] or []:
+        with open(path, "r") as f:
+            cert_pairs.extend(get_rim_cert_pairs("driver", f.read()))
+    if arguments_as_dictionary["rim_bundle"]:
+        BaseSettings.set_rim_bundle_path(arguments_as_dictionary["rim_bundle"])
+        for rim_id in RimBundle.list_rim_ids():
+            rim_name = "driver" if rim_id.startswith("NV_GPU_DRIVER_") else "vbios"
+            cert_pairs.extend(get_rim_cert_pairs(rim_name, RimBundle.get(rim_id)))
+
+    unique_cert_pairs = dict()
+    for cert, issuer in cert_pairs:
+        unique_cert_pairs.setdefault(CcAdminUtils.get_ocsp_prefetch_key(cert, issuer), (cert, issuer))
+    return list(unique_cert_pairs.values())
+
+
+def build_argument_parser():
+    """Method to build the command line argument parser of the OCSP bundle builder.
+
+    Returns:
+        An argparse.ArgumentParser object with the OCSP bundle options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Builds an OCSP bundle from the OCSP service, to be used with the --ocsp_bundle option of cc_admin."
+    )
+    parser.add_argument(
+        "output",
+        help="The path of the OCSP bundle to be written.",
+    )
+    parser.add_argument(
+        "--cert_chain",
+        help="A GPU attestation certificate chain in PEM format, can be repeated.",
+        action="append",
+    )
+    parser.add_argument(
+        "--evidence",
+        help="A JSONL file of archived GPU evidence records, as read by verifier.batch_verify, can be repeated.",
+        action="append",
+    )
+    parser.add_argument(
+        "--rim_file",
+        help="A RIM file whose signing certificates are added to the OCSP bundle, can be repeated.",
+        action="append",
+    )
+    parser.add_argument(
+        "--rim_bundle",
+        help="A RIM bundle whose RIM signing certificates are added to the OCSP bundle.",
+    )
+    parser.add_argument(
+        "--ocsp_url",
+        help="The url of the OCSP service the OCSP responses are fetched from. Defaults to the Nvidia OCSP service.",
+        default=BaseSettings.OCSP_URL_NVIDIA,
+    )
+    return parser
+
+
+def main():
+    """The main function of the OCSP bundle builder."""
+    arguments_as_dictionary = vars(build_argument_parser().parse_args())
+
+    # The bundled responses are fetched without a nonce so that they can be reused, and never from a cache
+    BaseSettings.set_ocsp_url(arguments_as_dictionary["ocsp_url"])
+    BaseSettings.OCSP_NONCE_ENABLED = False
+    BaseSettings.OCSP_CACHE_ENABLED = False
+    BaseSettings.OCSP_BUNDLE_PATH = ""
+
+    cert_pairs = collect_cert_pairs(arguments_as_dictionary)
+    if not cert_pairs:
+        info_log.error("No certificates were given, use --cert_chain, --evidence, --rim_file or --rim_bundle.")
+        sys.exit(1)
+
+    ocsp_fetch_results = list()
+    failed_serial_numbers = list()
+    for (cert, issuer), (ocsp_request, ocsp_response, _, _) in zip(
+        cert_pairs, CcAdminUtils.fetch_ocsp_responses(cert_pairs, use_prefetched=False)
+    ):
+        if (
+            ocsp_response is None
+            or ocsp_response.response_status != ocsp.OCSPResponseStatus.SUCCESSFUL
+            or not CcAdminUtils.verify_ocsp_signature(ocsp_response)
+        ):
+            failed_serial_numbers.append(format(cert.serial_number, "x"))
+            continue
+        single_response = get_ocsp_single_response(
+            ocsp_response, ocsp_request.issuer_key_hash, ocsp_request.serial_number
+        )
+        if single_response is None or single_response.next_update_utc is None:
+            failed_serial_numbers.append(format(cert.serial_number, "x"))
+            continue
+        ocsp_fetch_results.append((ocsp_request, ocsp_response))
+
+    if failed_serial_numbers:
+        info_log.error(f"Could not fetch the OCSP responses of the certificates : {', '.join(failed_serial_numbers)}")
+        sys.exit(1)
+
+    not_after = OcspBundle.write(arguments_as_dictionary["output"], ocsp_fetch_results)
+    info_log.info(
+        f"Wrote the OCSP responses of {len(ocsp_fetch_results)} certificates to {arguments_as_dictionary['output']}, "
+        f"fresh until {not_after.isoformat()}."
+    )
+
+
+if __name__ == "__main__":
+    main()
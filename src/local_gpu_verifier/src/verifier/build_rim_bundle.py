@@ -0,0 +1,176 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from verifier.config import (
+    BaseSettings,
+    info_log,
+)
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.utils.http_client import HttpClient
+from verifier.utils.rim_bundle import RimBundle
+
+MAX_FETCH_WORKERS = 8
+
+
+def read_rim_ids(arguments_as_dictionary):
+    """Method to collect the RIM file ids requested on the command line.
+
+    Args:
+        arguments_as_dictionary (Dictionary): the dictionary object containing the command line options.
+
+    Returns:
+        [list]: the sorted RIM file ids, without duplicates.
+    """
+    rim_ids = set(arguments_as_dictionary["rim_id"] or [])
+    if arguments_as_dictionary["rim_ids_file"]:
+        with open(arguments_as_dictionary["rim_ids_file"], "r") as f:
+            rim_ids.update(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if arguments_as_dictionary["all"]:
+        data = HttpClient.get(arguments_as_dictionary["rim_service_url"] + "ids", BaseSettings.MAX_RIM_REQUEST_TIME_DELAY)
+        rim_ids.update(json.loads(data)["ids"])
+    return sorted(rim_ids)
+
+
+def load_signing_key(path):
+    """Method to load the key signing the RIM bundle.
+
+    Args:
+        path (str): the path to the PEM encoded EC private key.
+
+    Raises:
+        ValueError: it is raised if the key is not an EC private key.
+
+    Returns:
+        [cryptography.hazmat.primitives.asymmetric.ec.EllipticCurvePrivateKey]: the private key.
+    """
+    with open(path, "rb") as f:
+        signing_key = serialization.load_pem_private_key(f.read(), password=None)
+    if not isinstance(signing_key, ec.EllipticCurvePrivateKey):
+        raise ValueError(f"The signing key {path} is not an EC private key.")
+    return signing_key
+
+
+def fetch_rims(rim_ids, url):
+    """Method to fetch the RIM files from the RIM service concurrently.
+
+    Args:
+        rim_ids (list): the RIM file ids.
+        url (str): the base url of the RIM service.
+
+    Returns:
+        [tuple]: the content of the fetched RIM files keyed by RIM file id, and the RIM file ids which could not
+                be fetched.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        contents = executor.map(
+            lambda rim_id: CcAdminUtils.fetch_rim_file_from_url(rim_id, url, BaseSettings.RIM_SERVICE_RETRY_COUNT),
+            rim_ids,
+        )
+        rims = dict(zip(rim_ids, contents))
+    missing_rim_ids = [rim_id for rim_id, content in rims.items() if content is None]
+    return {rim_id: content for rim_id, content in rims.items() if content is not None}, missing_rim_ids
+
+
+def build_argument_parser():
+    """Method to build the command line argument parser of the RIM bundle builder.
+
+    Returns:
+        An argparse.ArgumentParser object with the RIM bundle options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Builds a RIM bundle from the RIM service, to be used with the --rim_bundle option of cc_admin."
+    )
+    parser.add_argument(
+        "output",
+        help="The path of the RIM bundle to be written.",
+    )
+    parser.add_argument(
+        "--rim_id",
+        help="A RIM file id to be added to the RIM bundle, can be repeated.",
+        action="append",
+    )
+    parser.add_argument(
+        "--rim_ids_file",
+        help="A file with one RIM file id per line to be added to the RIM bundle.",
+    )
+    parser.add_argument(
+        "--all",
+        help="Add all the RIM files listed by the RIM service to the RIM bundle.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--rim_service_url",
+        help="The base url of the RIM service the RIM files are fetched from. Defaults to the Nvidia RIM service.",
+        default=BaseSettings.RIM_SERVICE_BASE_URL_NVIDIA,
+    )
+    parser.add_argument(
+        "--signing_key",
+        help="The PEM encoded EC private key signing the RIM bundle. Without it the RIM bundle is not signed.",
+    )
+    return parser
+
+
+def main():
+    """The main function of the RIM bundle builder."""
+    arguments_as_dictionary = vars(build_argument_parser().parse_args())
+    if not arguments_as_dictionary["rim_service_url"].endswith("/"):
+        arguments_as_dictionary["rim_service_url"] += "/"
+
+    signing_key = None
+    if arguments_as_dictionary["signing_key"]:
+        signing_key = load_signing_key(arguments_as_dictionary["signing_key"])
+
+    rim_ids = read_rim_ids(arguments_as_dictionary)
+    if not rim_ids:
+        info_log.error("No RIM file ids were given, use --rim_id, --rim_ids_file or --all.")
+        sys.exit(1)
+
+    rims, missing_rim_ids = fetch_rims(rim_ids, arguments_as_dictionary["rim_service_url"])
+    if missing_rim_ids:
+        info_log.error(f"Could not fetch the RIM files : {', '.join(missing_rim_ids)}")
+        sys.exit(1)
+
+    RimBundle.write(arguments_as_dictionary["output"], rims, signing_key)
+    info_log.info(
+        f"Wrote {len(rims)} RIM files to {arguments_as_dictionary['output']}"
+        + (" signed." if signing_key is not None else " without a signature.")
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -35,11 +35,16 @@ import jwt
 import json
 import sys
 import base64
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives.serialization import Encoding
 
 from verifier.attestation import AttestationReport
 from verifier.rim import RIM
+from verifier.rim.rim_memo import RimMemo
+from verifier.prefetch import AttestationPrefetcher
 from verifier.nvml import (
     NvmlHandler,
     NvmlHandlerTest,
@@ -61,30 +66,30 @@ from verifier.exceptions import (
     CertChainVerificationFailureError,
     AttestationReportVerificationError,
     RIMVerificationFailureError,
+    RIMFetchError,
     UnknownGpuArchitectureError,
     InvalidClaimsVersionError,
+    TimeoutError,
 )
 from verifier.exceptions.utils import is_non_fatal_issue
 from verifier.cc_admin_utils import CcAdminUtils
 from verifier.utils.claims_utils import ClaimsUtils
 from verifier.nvml.gpu_cert_chains import GpuCertificateChains
-from verifier.utils import (
-    function_wrapper_with_timeout,
-    format_vbios_version,
-)
+from verifier.utils import function_wrapper_with_timeout
+from verifier.utils.rim_cache import RimCache
+from verifier.utils.verdict_cache import VerdictCache
+from verifier.utils.tracing import Tracer
 
 arguments_as_dictionary = None
 previous_try_status = None
-hwmodel = {}
-oemid = {}
-ueid = {}
-gpu_driver_attestation_warning_list = {}
-gpu_vbios_attestation_warning_list = {}
 
 
-def main():
-    """The main function for the CC admin tool."""
-    global arguments_as_dictionary
+def build_argument_parser():
+    """Method to build the command line argument parser of the CC admin tool.
+
+    Returns:
+        An argparse.ArgumentParser object with all the Attestation Options.
+    """
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "-v",
@@ -166,22 +171,124 @@ def main():
                 The default settings are to allow hold cert, validity extension and cert revocation extension of 7 days.
                 The strict settings are to not allow hold cert, validity extension and cert revocation extension of 0 days.""",
     )
+    parser.add_argument(
+        "--rim_cache_dir",
+        help="The directory used to cache the verified RIM files fetched from the RIM service.",
+    )
+    parser.add_argument(
+        "--disable_rim_cache",
+        help="Always fetch the RIM files from the RIM service instead of using the local RIM cache.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--rim_bundle",
+        help="The RIM bundle used before the RIM service to fetch the RIM files, built with verifier.build_rim_bundle.",
+    )
+    parser.add_argument(
+        "--rim_bundle_public_key",
+        help="The PEM encoded EC public key verifying the signature of the RIM bundle.",
+    )
+    parser.add_argument(
+        "--ocsp_cache_dir",
+        help="The directory used to persist the OCSP responses of the certificates until their next update time.",
+    )
+    parser.add_argument(
+        "--disable_ocsp_cache",
+        help="Always fetch the OCSP responses from the OCSP service instead of reusing the cached OCSP responses.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--ocsp_bundle",
+        help="The OCSP bundle used before the OCSP service to check the revocation status of the certificates, "
+        "built with verifier.build_ocsp_bundle.",
+    )
+    parser.add_argument(
+        "--ocsp_bundle_allow_expired",
+        help="Use the expired responses of the OCSP bundle when both OCSP services can not be reached.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--parallelism",
+        help="The number of GPUs to be attested concurrently.",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--disable_prefetch",
+        help="Do not fetch the RIM files and OCSP responses in the background while the evidence is being verified.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--incremental",
+        help="Reuse the certificate chain and RIM verifications of the previous attestations of the process while "
+        "their OCSP responses are valid, only the attestation report and the measurements are verified again.",
+        action="store_true",
+    )
     parser.add_argument(
         "--claims_version",
         help="The version of the claims(Can be 2.0 or 3.0)",
         type=str,
         default="2.0",
     )
+    parser.add_argument(
+        "--trace",
+        help="Print the duration of every phase of the attestation along with the retry and cache counters.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--trace_file",
+        help="Append the trace of every attestation to the given file in the OpenTelemetry OTLP JSON format.",
+    )
+    return parser
+
+
+def is_trace_enabled(arguments_as_dictionary):
+    """Method to check if the attestations should be traced.
+
+    Args:
+        arguments_as_dictionary (Dictionary): the dictionary object containing Attestation Options.
+
+    Returns:
+        True if the trace is printed or written to a trace file, otherwise False.
+    """
+    return bool(arguments_as_dictionary.get("trace") or arguments_as_dictionary.get("trace_file"))
+
+
+def export_trace(trace, arguments_as_dictionary):
+    """Method to write the trace of an attestation to the trace file, if one is configured.
+
+    Args:
+        trace (Trace): the trace of the attestation.
+        arguments_as_dictionary (Dictionary): the dictionary object containing Attestation Options.
+    """
+    if arguments_as_dictionary.get("trace_file"):
+        Tracer.export(trace, arguments_as_dictionary["trace_file"])
 
+
+def main():
+    """The main function for the CC admin tool."""
+    global arguments_as_dictionary
+    parser = build_argument_parser()
     args = parser.parse_args()
     arguments_as_dictionary = vars(args)
 
     nonce = get_user_nonce(arguments_as_dictionary)
-    evidence_list = collect_gpu_evidence(nonce, arguments_as_dictionary["test_no_gpu"])
-    result, jwt_token = attest(arguments_as_dictionary, nonce, evidence_list)
+    if is_trace_enabled(arguments_as_dictionary):
+        with Tracer.start_trace("gpu_attestation") as trace:
+            evidence_list = collect_gpu_evidence(nonce, arguments_as_dictionary["test_no_gpu"])
+            result, jwt_token = attest(arguments_as_dictionary, nonce, evidence_list)
+        export_trace(trace, arguments_as_dictionary)
+    else:
+        trace = None
+        evidence_list = collect_gpu_evidence(nonce, arguments_as_dictionary["test_no_gpu"])
+        result, jwt_token = attest(arguments_as_dictionary, nonce, evidence_list)
     info_log.info("\nEntity Attestation Token:")
     info_log.info(json.dumps(jwt_token, indent=2))
 
+    if trace is not None and arguments_as_dictionary["trace"]:
+        info_log.info("\nAttestation Trace:")
+        info_log.info(json.dumps(trace.to_dict(), indent=2))
+
     if not result:
         sys.exit(1)
 
@@ -226,7 +333,8 @@ def collect_gpu_evidence(nonce: str, no_gpu_mode=False, standalone_mode=True):
             evidence_nonce = BaseSettings.NONCE
             number_of_available_gpus = NvmlHandlerTest.get_number_of_gpus()
         else:
-            init_nvml(standalone_mode=standalone_mode)
+            with Tracer.span("init_nvml"):
+                init_nvml(standalone_mode=standalone_mode)
             evidence_nonce = CcAdminUtils.validate_and_extract_nonce(nonce)
 
             number_of_available_gpus = NvmlHandler.get_number_of_gpus()
@@ -236,12 +344,7 @@ def collect_gpu_evidence(nonce: str, no_gpu_mode=False, standalone_mode=True):
                 raise NoGpuFoundError(err_msg)
             info_log.info(f"Number of GPUs available : {number_of_available_gpus}")
 
-        for i in range(number_of_available_gpus):
-            info_log.info(f"Fetching GPU {i} information from GPU driver.")
-            if no_gpu_mode:
-                gpu_info_obj = NvmlHandlerTest(settings=BaseSettings)
-            else:
-                gpu_info_obj = NvmlHandler(index=i, nonce=evidence_nonce, settings=BaseSettings)
+        for gpu_info_obj in fetch_all_gpu_evidence(number_of_available_gpus, evidence_nonce, no_gpu_mode):
             evidence_list.append(gpu_info_obj)
         info_log.info("All GPU Evidences fetched successfully")
 
@@ -251,6 +354,65 @@ def collect_gpu_evidence(nonce: str, no_gpu_mode=False, standalone_mode=True):
         return evidence_list
 
 
+def fetch_gpu_evidence(i, evidence_nonce, no_gpu_mode):
+    """Method to fetch the evidence of a single GPU from the GPU driver.
+
+    Args:
+        i (int): the index of the GPU.
+        evidence_nonce (bytes): the nonce of the attestation report.
+        no_gpu_mode (Boolean): Represents if the function should run in No GPU (test) mode
+
+    Returns:
+        the NvmlHandler object containing the evidence of the GPU.
+    """
+    info_log.info(f"Fetching GPU {i} information from GPU driver.")
+    with Tracer.span("fetch_gpu_evidence", gpu_index=i):
+        if no_gpu_mode:
+            return NvmlHandlerTest(settings=BaseSettings)
+        return NvmlHandler(index=i, nonce=evidence_nonce, settings=BaseSettings)
+
+
+def fetch_all_gpu_evidence(number_of_gpus, evidence_nonce, no_gpu_mode):
+    """Method to fetch the evidence of all the GPUs, concurrently for up to
+    BaseSettings.MAX_EVIDENCE_COLLECTION_WORKERS GPUs. The evidence is yielded in the order of the GPUs.
+
+    Args:
+        number_of_gpus (int): the number of GPUs.
+        evidence_nonce (bytes): the nonce of the attestation reports.
+        no_gpu_mode (Boolean): Represents if the function should run in No GPU (test) mode
+
+    Raises:
+        TimeoutError: it is raised if the evidence of a GPU is not fetched within
+                      BaseSettings.MAX_GPU_EVIDENCE_TIME_DELAY seconds.
+
+    Yields:
+        the NvmlHandler objects containing the evidence of the GPUs.
+    """
+    workers = min(number_of_gpus, BaseSettings.MAX_EVIDENCE_COLLECTION_WORKERS)
+    if workers <= 1:
+        for i in range(number_of_gpus):
+            yield fetch_gpu_evidence(i, evidence_nonce, no_gpu_mode)
+        return
+
+    bound_fetch_gpu_evidence = Tracer.bind(fetch_gpu_evidence)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="verifier-evidence")
+    try:
+        futures = [
+            executor.submit(bound_fetch_gpu_evidence, i, evidence_nonce, no_gpu_mode) for i in range(number_of_gpus)
+        ]
+        # The GPUs are fetched in rounds of at most workers GPUs, each of them being given the timeout
+        number_of_rounds = -(-number_of_gpus // workers)
+        deadline = time.monotonic() + BaseSettings.MAX_GPU_EVIDENCE_TIME_DELAY * number_of_rounds
+        for i, future in enumerate(futures):
+            try:
+                yield future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                raise TimeoutError(f"Fetching the evidence of GPU {i} timed out.")
+    finally:
+        # A GPU whose NVML call hangs keeps its thread until the call times out, so it is not waited for
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def collect_gpu_evidence_local(nonce: str, no_gpu_mode=False, standalone_mode=True):
     """Method to Collect GPU Evidence for Local GPU Attestation workflow
     Args:
@@ -326,178 +488,119 @@ def init_nvml(standalone_mode: bool):
         sys.exit()
 
 
-def attest(arguments_as_dictionary, nonce, gpu_evidence_list):
-    """Method to perform GPU Attestation and return an Attestation Response.
+def attest_gpu(i, gpu_info_obj, arguments_as_dictionary, att_report_nonce_hex, rim_memo):
+    """Method to perform the attestation of a single GPU. It only uses its own HopperSettings object
+    and returns its results, so that several GPUs can be attested concurrently.
 
     Args:
+        i (int): the index of the GPU.
+        gpu_info_obj (NvmlHandler): the object containing the evidence of the GPU.
         arguments_as_dictionary (Dictionary): the dictionary object containing Attestation Options.
-
-    Raises:
-        Different Errors regarding GPU Attestation
+        att_report_nonce_hex (bytes): the nonce expected in the attestation report.
+        rim_memo (RimMemo): the memo sharing the RIM files across the GPUs of the attestation.
 
     Returns:
-        A tuple containing Attestation result (boolean) and Attestation JWT claims(JWT Object)
+        A dictionary containing the attestation status, the claims, the hwmodel, oemid and ueid and the
+        driver and VBIOS attestation warnings of the GPU.
     """
-    overall_status = False
-    gpu_claims_list = []  # (index, gpu_uuid, gpu_claims)
-    att_report_nonce_hex = CcAdminUtils.validate_and_extract_nonce(nonce)
+    settings = None
+    gpu_result = {
+        "index": i,
+        "uuid": gpu_info_obj.get_uuid(),
+        "status": False,
+        "claims": None,
+        "hwmodel": None,
+        "oemid": None,
+        "ueid": None,
+        "driver_warning": None,
+        "vbios_warning": None,
+    }
 
     try:
-        # Set claims version and validate
-        BaseSettings.CLAIMS_VERSION = arguments_as_dictionary.get("claims_version") or "2.0"
-
-        if BaseSettings.CLAIMS_VERSION != "2.0" and BaseSettings.CLAIMS_VERSION != "3.0":
-            raise InvalidClaimsVersionError(f'Claims version is not supported: {BaseSettings.CLAIMS_VERSION}')
-
-        # Set log level to DEBUG if verbose flag is set
-        if arguments_as_dictionary["verbose"]:
-            info_log.setLevel(logging.DEBUG)
-
-        # Get Azure VM Region
-        BaseSettings.get_vm_region()
-        info_log.debug(f"VM Region : {BaseSettings.AZURE_VM_REGION}")
-
-        # Set RIM service url
-        if not arguments_as_dictionary["rim_service_url"] is None:
-            BaseSettings.set_rim_service_base_url(arguments_as_dictionary["rim_service_url"])
-        else:
-            BaseSettings.set_thim_rim_service_base_url()
-        info_log.debug(f"RIM service url: {BaseSettings.RIM_SERVICE_BASE_URL}")
+        info_log.info("-----------------------------------")
 
-        # Set OCSP service url
-        if not arguments_as_dictionary["ocsp_url"] is None:
-            BaseSettings.set_ocsp_url(arguments_as_dictionary["ocsp_url"])
-            BaseSettings.OCSP_NONCE_ENABLED = arguments_as_dictionary.get("ocsp_nonce_enabled", False)
+        if gpu_info_obj.get_gpu_architecture() == "HOPPER":
+            event_log.debug(f"The architecture of the GPU with index {i} is HOPPER")
+            settings = HopperSettings()
         else:
-            BaseSettings.set_thim_ocsp_service_url()
-        info_log.debug(
-            f"OCSP service url: {BaseSettings.OCSP_URL}\nOCSP Nonce: {'ENABLED' if BaseSettings.OCSP_NONCE_ENABLED else 'DISABLED'}"
-        )
-
-        # Set OCSP attestation settings
-        if arguments_as_dictionary["ocsp_attestation_settings"] == "strict":
-            BaseSettings.allow_hold_cert = False
-            BaseSettings.OCSP_VALIDITY_EXTENSION_HRS = 0
-            BaseSettings.OCSP_CERT_REVOCATION_DEVICE_EXTENSION_HRS = 0
-            BaseSettings.OCSP_CERT_REVOCATION_DRIVER_RIM_EXTENSION_HRS = 0
-            BaseSettings.OCSP_CERT_REVOCATION_VBIOS_RIM_EXTENSION_HRS = 0
-        elif arguments_as_dictionary["ocsp_attestation_settings"] == "default":
-            BaseSettings.allow_hold_cert = True
-            BaseSettings.OCSP_VALIDITY_EXTENSION_HRS = 14 * 24
-            BaseSettings.OCSP_CERT_REVOCATION_DEVICE_EXTENSION_HRS = 14 * 24
-            BaseSettings.OCSP_CERT_REVOCATION_DRIVER_RIM_EXTENSION_HRS = 14 * 24
-            BaseSettings.OCSP_CERT_REVOCATION_VBIOS_RIM_EXTENSION_HRS = 90 * 24
-
-        # Set allow OCSP cert hold flag
-        if arguments_as_dictionary["allow_hold_cert"] is not None:
-            BaseSettings.allow_hold_cert = BaseSettings.allow_hold_cert or arguments_as_dictionary["allow_hold_cert"]
-
-        # Set OCSP validity extension
-        if arguments_as_dictionary["ocsp_validity_extension"] is not None:
-            BaseSettings.OCSP_VALIDITY_EXTENSION_HRS = max(0, arguments_as_dictionary["ocsp_validity_extension"])
-
-        # Set OCSP cert revoked extension
-        if arguments_as_dictionary["ocsp_cert_revocation_extension_device"] is not None:
-            BaseSettings.OCSP_CERT_REVOCATION_DEVICE_EXTENSION_HRS = max(
-                0, arguments_as_dictionary["ocsp_cert_revocation_extension_device"]
-            )
-        if arguments_as_dictionary["ocsp_cert_revocation_extension_driver_rim"] is not None:
-            BaseSettings.OCSP_CERT_REVOCATION_DRIVER_RIM_EXTENSION_HRS = max(
-                0, arguments_as_dictionary["ocsp_cert_revocation_extension_driver_rim"]
-            )
-        if arguments_as_dictionary["ocsp_cert_revocation_extension_vbios_rim"] is not None:
-            BaseSettings.OCSP_CERT_REVOCATION_VBIOS_RIM_EXTENSION_HRS = max(
-                0, arguments_as_dictionary["ocsp_cert_revocation_extension_vbios_rim"]
-            )
-
-        # Set the RIM root certificate path
-        if not arguments_as_dictionary["rim_root_cert"] is None:
-            BaseSettings.set_rim_root_certificate(arguments_as_dictionary["rim_root_cert"])
-
-        # Log the arguments and BaseSettings
-        base_settings_dict = dict(
-            (k, v)
-            for k, v in vars(BaseSettings).items()
-            if not (k.startswith("_") or callable(v) or k in dir(BaseSettings.__class__) or isinstance(v, classmethod))
-        )
-        event_log.debug(f"Arguments: {arguments_as_dictionary}")
-        event_log.debug(f"BaseSettings: {base_settings_dict}")
-
-        # Run attestation for each GPU
-        for i, gpu_info_obj in enumerate(gpu_evidence_list):
-            info_log.info("-----------------------------------")
-
-            if gpu_info_obj.get_gpu_architecture() == "HOPPER":
-                event_log.debug(f"The architecture of the GPU with index {i} is HOPPER")
-                settings = HopperSettings()
-
-                HopperSettings.set_driver_rim_path(arguments_as_dictionary["driver_rim"])
-                HopperSettings.set_vbios_rim_path(arguments_as_dictionary["vbios_rim"])
-
-                if arguments_as_dictionary["test_no_gpu"]:
-                    HopperSettings.set_driver_rim_path(HopperSettings.TEST_NO_GPU_DRIVER_RIM_PATH)
-                    HopperSettings.set_vbios_rim_path(HopperSettings.TEST_NO_GPU_VBIOS_RIM_PATH)
-            else:
-                err_msg = "Unknown GPU architecture."
-                event_log.error(err_msg)
-                raise UnknownGpuArchitectureError(err_msg)
+            err_msg = "Unknown GPU architecture."
+            event_log.error(err_msg)
+            raise UnknownGpuArchitectureError(err_msg)
 
-            event_log.debug("GPU info fetched successfully.")
-            info_log.info(f"Verifying GPU: {str(gpu_info_obj.get_uuid())}")
+        event_log.debug("GPU info fetched successfully.")
+        info_log.info(f"Verifying GPU: {str(gpu_info_obj.get_uuid())}")
 
-            if gpu_info_obj.get_gpu_architecture() != settings.GpuArch:
-                err_msg = "\tGPU architecture is not supported."
-                event_log.error(err_msg)
-                raise UnsupportedGpuArchitectureError(err_msg)
+        if gpu_info_obj.get_gpu_architecture() != settings.GpuArch:
+            err_msg = "\tGPU architecture is not supported."
+            event_log.error(err_msg)
+            raise UnsupportedGpuArchitectureError(err_msg)
 
-            event_log.debug("\tGPU architecture is correct.")
-            settings.mark_gpu_arch_is_correct()
+        event_log.debug("\tGPU architecture is correct.")
+        settings.mark_gpu_arch_is_correct()
 
-            driver_version = gpu_info_obj.get_driver_version()
-            vbios_version = gpu_info_obj.get_vbios_version()
-            vbios_version = vbios_version.lower()
+        driver_version = gpu_info_obj.get_driver_version()
+        vbios_version = gpu_info_obj.get_vbios_version()
+        vbios_version = vbios_version.lower()
 
-            info_log.info(f"\tDriver version fetched : {driver_version}")
-            info_log.info(f"\tVBIOS version fetched : {vbios_version}")
-            settings.mark_gpu_driver_version(driver_version)
-            settings.mark_gpu_vbios_version(vbios_version)
+        info_log.info(f"\tDriver version fetched : {driver_version}")
+        info_log.info(f"\tVBIOS version fetched : {vbios_version}")
+        Tracer.set_attribute("driver_version", driver_version)
+        Tracer.set_attribute("vbios_version", vbios_version)
+        settings.mark_gpu_driver_version(driver_version)
+        settings.mark_gpu_vbios_version(vbios_version)
 
-            event_log.debug(f"GPU info fetched : \n\t\t{vars(gpu_info_obj)}")
+        event_log.debug(f"GPU info fetched : \n\t\t{vars(gpu_info_obj)}")
 
-            # Parsing the attestation report.
-            attestation_report_data = gpu_info_obj.get_attestation_report()
+        # Parsing the attestation report.
+        attestation_report_data = gpu_info_obj.get_attestation_report()
+        with Tracer.span("parse_attestation_report"):
             attestation_report_obj = AttestationReport(attestation_report_data, settings)
-            settings.mark_attestation_report_parsed()
+        settings.mark_attestation_report_parsed()
 
-            info_log.info("\tValidating GPU certificate chains.")
-            gpu_attestation_cert_chain = gpu_info_obj.get_attestation_cert_chain()
+        info_log.info("\tValidating GPU certificate chains.")
+        gpu_attestation_cert_chain = gpu_info_obj.get_attestation_cert_chain()
 
-            for certificate in gpu_attestation_cert_chain:
-                cert = certificate.to_cryptography()
-                issuer = cert.issuer.public_bytes()
-                subject = cert.subject.public_bytes()
+        for certificate in gpu_attestation_cert_chain:
+            cert = certificate.to_cryptography()
+            issuer = cert.issuer.public_bytes()
+            subject = cert.subject.public_bytes()
 
-                if issuer == subject:
-                    event_log.debug("Root certificate is a available.")
+            if issuer == subject:
+                event_log.debug("Root certificate is a available.")
 
-            if len(gpu_attestation_cert_chain) > 1:
-                common_name = (
-                    gpu_attestation_cert_chain[1]
-                    .to_cryptography()
-                    .subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0]
-                    .value
-                )
-                hwmodel[gpu_info_obj.get_uuid()] = common_name
-                ueid[gpu_info_obj.get_uuid()] = gpu_attestation_cert_chain[0].get_serial_number()
+        if len(gpu_attestation_cert_chain) > 1:
+            common_name = (
+                gpu_attestation_cert_chain[1]
+                .to_cryptography()
+                .subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0]
+                .value
+            )
+            gpu_result["hwmodel"] = common_name
+            gpu_result["ueid"] = gpu_attestation_cert_chain[0].get_serial_number()
 
-            gpu_leaf_cert = gpu_attestation_cert_chain[0]
-            event_log.debug("\t\tverifying attestation certificate chain.")
-            cert_verification_status = CcAdminUtils.verify_gpu_certificate_chain(
-                gpu_attestation_cert_chain,
-                settings,
-                attestation_report_obj.get_response_message().get_opaque_data().get_data("OPAQUE_FIELD_ID_FWID").hex(),
+        gpu_leaf_cert = gpu_attestation_cert_chain[0]
+        attestation_report_fwid = (
+            attestation_report_obj.get_response_message().get_opaque_data().get_data("OPAQUE_FIELD_ID_FWID").hex()
+        )
+        gpu_cert_chain_verdict_key = None
+        if VerdictCache.is_enabled():
+            gpu_cert_chain_verdict_key = VerdictCache.get_key(
+                "gpu_cert_chain",
+                attestation_report_fwid,
+                *[certificate.to_cryptography().public_bytes(Encoding.DER) for certificate in gpu_attestation_cert_chain],
             )
 
+        if gpu_cert_chain_verdict_key is not None and VerdictCache.get(gpu_cert_chain_verdict_key):
+            info_log.info("\t\tReusing the GPU attestation report certificate chain validation of a previous attestation.")
+        else:
+            event_log.debug("\t\tverifying attestation certificate chain.")
+            with Tracer.span("verify_gpu_certificate_chain"):
+                cert_verification_status = CcAdminUtils.verify_gpu_certificate_chain(
+                    gpu_attestation_cert_chain,
+                    settings,
+                    attestation_report_fwid,
+                )
+
             if not cert_verification_status:
                 err_msg = "\t\tGPU attestation report certificate chain validation failed."
                 event_log.error(err_msg)
@@ -505,19 +608,28 @@ def attest(arguments_as_dictionary, nonce, gpu_evidence_list):
             else:
                 info_log.info("\t\tGPU attestation report certificate chain validation successful.")
 
-            cert_chain_revocation_status, gpu_attestation_warning = CcAdminUtils.ocsp_certificate_chain_validation(
-                gpu_attestation_cert_chain, settings, BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION
-            )
+            with Tracer.span("gpu_ocsp_validation"):
+                cert_chain_revocation_status, gpu_attestation_warning = CcAdminUtils.ocsp_certificate_chain_validation(
+                    gpu_attestation_cert_chain, settings, BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION
+                )
 
             if not cert_chain_revocation_status:
                 err_msg = "\t\tGPU attestation report certificate chain revocation validation failed."
                 event_log.error(err_msg)
                 raise CertChainVerificationFailureError(err_msg)
 
-            settings.mark_gpu_attestation_report_cert_chain_validated()
+            if not gpu_attestation_warning:
+                VerdictCache.put(
+                    gpu_cert_chain_verdict_key,
+                    True,
+                    settings.get_ocsp_valid_until(BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION),
+                )
 
-            info_log.info("\tAuthenticating attestation report")
-            attestation_report_obj.print_obj(info_log)
+        settings.mark_gpu_attestation_report_cert_chain_validated()
+
+        info_log.info("\tAuthenticating attestation report")
+        attestation_report_obj.print_obj(info_log)
+        with Tracer.span("verify_attestation_report"):
             attestation_report_verification_status = CcAdminUtils.verify_attestation_report(
                 attestation_report_obj=attestation_report_obj,
                 gpu_leaf_certificate=gpu_leaf_cert,
@@ -527,141 +639,413 @@ def attest(arguments_as_dictionary, nonce, gpu_evidence_list):
                 settings=settings,
             )
 
-            if attestation_report_verification_status:
-                info_log.info("\t\tAttestation report verification successful.")
+        if attestation_report_verification_status:
+            info_log.info("\t\tAttestation report verification successful.")
+        else:
+            err_msg = "\t\tAttestation report verification failed."
+            event_log.error(err_msg)
+            raise AttestationReportVerificationError(err_msg)
+
+        info_log.info("\tAuthenticating the RIMs.")
+
+        # performing the schema validation and signature verification of the driver RIM.
+        info_log.info("\t\tAuthenticating Driver RIM")
+
+        # Use local RIM file if provided, else fetch from RIM service
+        use_local_driver_rim = bool(arguments_as_dictionary.get("driver_rim") or arguments_as_dictionary["test_no_gpu"])
+        driver_rim_content = None
+        driver_rim_verdict_key = None
+        if VerdictCache.is_enabled():
+            if use_local_driver_rim:
+                driver_rim_source = RimMemo.get_key_for_file("driver", settings.DRIVER_RIM_PATH)
             else:
-                err_msg = "\t\tAttestation report verification failed."
-                event_log.error(err_msg)
-                raise AttestationReportVerificationError(err_msg)
-
-            info_log.info("\tAuthenticating the RIMs.")
-
-            # performing the schema validation and signature verification of the driver RIM.
-            info_log.info("\t\tAuthenticating Driver RIM")
-
-            # Use local RIM file if provided, else fetch from RIM service
-            if arguments_as_dictionary.get("driver_rim") or arguments_as_dictionary["test_no_gpu"]:
+                driver_rim_source = CcAdminUtils.get_driver_rim_file_id(driver_version)
+            driver_rim_verdict_key = get_rim_verdict_key("driver", driver_version, driver_rim_source)
+
+        driver_rim = reuse_rim_verdict(driver_rim_verdict_key, driver_version, settings)
+        if driver_rim is not None:
+            driver_rim_verification_status, gpu_driver_attestation_warning = True, ""
+            if not use_local_driver_rim:
+                gpu_result["oemid"] = driver_rim.get_manufacturer_id()
+        else:
+            if use_local_driver_rim:
                 info_log.info("\t\t\tUsing the local driver rim file : " + settings.DRIVER_RIM_PATH)
-                driver_rim = RIM(rim_name="driver", settings=settings, rim_path=settings.DRIVER_RIM_PATH)
+                driver_rim_key = RimMemo.get_key_for_file("driver", settings.DRIVER_RIM_PATH)
+                driver_rim = rim_memo.get_rim(driver_rim_key, "driver", settings, rim_path=settings.DRIVER_RIM_PATH)
             else:
                 info_log.info("\t\t\tFetching the driver RIM from the RIM service.")
                 try:
                     driver_rim_file_id = CcAdminUtils.get_driver_rim_file_id(driver_version)
-                    driver_rim_content = CcAdminUtils.fetch_rim_file(
+                    driver_rim_content = rim_memo.fetch_rim_file(
                         driver_rim_file_id, BaseSettings.RIM_SERVICE_RETRY_COUNT
                     )
-                    driver_rim = RIM(rim_name="driver", settings=settings, content=driver_rim_content)
+                    driver_rim_key = RimMemo.get_key("driver", driver_rim_file_id, driver_rim_content)
+                    driver_rim = rim_memo.get_rim(driver_rim_key, "driver", settings, content=driver_rim_content)
                 except Exception as error:
-                    info_log.error(f"Error occurred while fetching the driver RIM from the RIM service due to {error}")
-                    sys.exit()
-                
+                    raise RIMFetchError(
+                        f"Error occurred while fetching the driver RIM from the RIM service due to {error}"
+                    ) from error
+            
                 try:
-                    driver_rim_manufacturer_id = driver_rim.get_manufacturer_id(driver_rim_content)
+                    driver_rim_manufacturer_id = driver_rim.get_manufacturer_id()
                 except Exception as error:
                     event_log.error(f"Error while fetching manufacturer id from driver RIM : {error}")
                     driver_rim_manufacturer_id = None
-                oemid[gpu_info_obj.get_uuid()] = driver_rim_manufacturer_id
+                gpu_result["oemid"] = driver_rim_manufacturer_id
 
-            driver_rim_verification_status, gpu_driver_attestation_warning = driver_rim.verify(
-                version=driver_version, settings=settings
+            driver_rim_verification_status, gpu_driver_attestation_warning = rim_memo.verify(
+                driver_rim_key, driver_rim, driver_version, settings
             )
-            gpu_driver_attestation_warning_list[gpu_info_obj.get_uuid()] = gpu_driver_attestation_warning
+            if driver_rim_verification_status and not gpu_driver_attestation_warning:
+                VerdictCache.put(
+                    driver_rim_verdict_key,
+                    driver_rim,
+                    settings.get_ocsp_valid_until(BaseSettings.Certificate_Chain_Verification_Mode.DRIVER_RIM_CERT),
+                )
+        gpu_result["driver_warning"] = gpu_driver_attestation_warning
 
-            if driver_rim_verification_status:
-                settings.mark_driver_rim_signature_verified()
-                info_log.info("\t\t\tDriver RIM verification successful")
+        if driver_rim_verification_status:
+            settings.mark_driver_rim_signature_verified()
+            info_log.info("\t\t\tDriver RIM verification successful")
+            if driver_rim_content:
+                RimCache.put(driver_rim_file_id, driver_rim_content)
+        else:
+            event_log.error("\t\t\tDriver RIM verification failed.")
+            raise RIMVerificationFailureError("\t\t\tDriver RIM verification failed.\n\t\t\tQuitting now.")
+
+        # performing the schema validation and signature verification of the vbios RIM.
+        info_log.info("\t\tAuthenticating VBIOS RIM.")
+        vbios_rim_content = None
+        use_local_vbios_rim = bool(arguments_as_dictionary.get("vbios_rim") or arguments_as_dictionary["test_no_gpu"])
+        vbios_rim_verdict_key = None
+        if VerdictCache.is_enabled():
+            if use_local_vbios_rim:
+                vbios_rim_source = RimMemo.get_key_for_file("vbios", settings.VBIOS_RIM_PATH)
+                vbios_rim_verdict_key = get_rim_verdict_key("vbios", vbios_version, vbios_rim_source)
             else:
-                event_log.error("\t\t\tDriver RIM verification failed.")
-                raise RIMVerificationFailureError("\t\t\tDriver RIM verification failed.\n\t\t\tQuitting now.")
+                vbios_rim_file_id, vbios_version = CcAdminUtils.get_vbios_rim_file_id_from_report(attestation_report_obj)
+                vbios_rim_verdict_key = get_rim_verdict_key("vbios", vbios_version, vbios_rim_file_id)
 
-            # performing the schema validation and signature verification of the vbios RIM.
-            info_log.info("\t\tAuthenticating VBIOS RIM.")
-            if arguments_as_dictionary.get("vbios_rim") or arguments_as_dictionary["test_no_gpu"]:
+        vbios_rim = reuse_rim_verdict(vbios_rim_verdict_key, vbios_version, settings)
+        if vbios_rim is not None:
+            vbios_rim_verification_status, gpu_attestation_warning = True, ""
+        else:
+            if use_local_vbios_rim:
                 info_log.info("\t\t\tUsing the local VBIOS rim file : " + settings.VBIOS_RIM_PATH)
-                driver_rim = RIM(rim_name="vbios", settings=settings, rim_path=settings.VBIOS_RIM_PATH)
+                vbios_rim_key = RimMemo.get_key_for_file("vbios", settings.VBIOS_RIM_PATH)
+                vbios_rim = rim_memo.get_rim(vbios_rim_key, "vbios", settings, rim_path=settings.VBIOS_RIM_PATH)
 
             else:
                 info_log.info("\t\t\tFetching the VBIOS RIM from the RIM service.")
-                project = (
-                    attestation_report_obj.get_response_message().get_opaque_data().get_data("OPAQUE_FIELD_ID_PROJECT")
-                )
-                project_sku = (
-                    attestation_report_obj.get_response_message()
-                    .get_opaque_data()
-                    .get_data("OPAQUE_FIELD_ID_PROJECT_SKU")
-                )
-                chip_sku = (
-                    attestation_report_obj.get_response_message()
-                    .get_opaque_data()
-                    .get_data("OPAQUE_FIELD_ID_CHIP_SKU")
-                )
-                vbios_version = format_vbios_version(
-                    attestation_report_obj.get_response_message()
-                    .get_opaque_data()
-                    .get_data("OPAQUE_FIELD_ID_VBIOS_VERSION")
-                )
-                vbios_version_for_id = vbios_version.replace(".", "").upper()
-                vbios_version = vbios_version.lower()
-
-                project = project.decode("ascii").strip().strip("\x00")
-                project = project.upper()
-                project_sku = project_sku.decode("ascii").strip().strip("\x00")
-                project_sku = project_sku.upper()
-                chip_sku = chip_sku.decode("ascii").strip().strip("\x00")
-                chip_sku = chip_sku.upper()
+                vbios_rim_file_id, vbios_version = CcAdminUtils.get_vbios_rim_file_id_from_report(attestation_report_obj)
 
                 try:
-                    vbios_rim_file_id = CcAdminUtils.get_vbios_rim_file_id(
-                        project, project_sku, chip_sku, vbios_version_for_id
-                    )
                     event_log.debug(f"vbios_rim_file_id is {vbios_rim_file_id}")
-                    vbios_rim_content = CcAdminUtils.fetch_rim_file(
+                    vbios_rim_content = rim_memo.fetch_rim_file(
                         vbios_rim_file_id, BaseSettings.RIM_SERVICE_RETRY_COUNT
                     )
-                    vbios_rim = RIM(rim_name="vbios", settings=settings, content=vbios_rim_content)
+                    vbios_rim_key = RimMemo.get_key("vbios", vbios_rim_file_id, vbios_rim_content)
+                    vbios_rim = rim_memo.get_rim(vbios_rim_key, "vbios", settings, content=vbios_rim_content)
                 except Exception as error:
-                    info_log.error(f"Error occurred while fetching the VBIOS RIM from the RIM service due to {error}")
-                    sys.exit()
+                    raise RIMFetchError(
+                        f"Error occurred while fetching the VBIOS RIM from the RIM service due to {error}"
+                    ) from error
 
-            vbios_rim_verification_status, gpu_attestation_warning = vbios_rim.verify(
-                version=vbios_version, settings=settings
+            vbios_rim_verification_status, gpu_attestation_warning = rim_memo.verify(
+                vbios_rim_key, vbios_rim, vbios_version, settings
             )
-            gpu_vbios_attestation_warning_list[gpu_info_obj.get_uuid()] = gpu_attestation_warning
+            if vbios_rim_verification_status and not gpu_attestation_warning:
+                VerdictCache.put(
+                    vbios_rim_verdict_key,
+                    vbios_rim,
+                    settings.get_ocsp_valid_until(BaseSettings.Certificate_Chain_Verification_Mode.VBIOS_RIM_CERT),
+                )
+        gpu_result["vbios_warning"] = gpu_attestation_warning
 
-            if vbios_rim_verification_status:
-                settings.mark_vbios_rim_signature_verified()
-                info_log.info("\t\t\tVBIOS RIM verification successful")
-            else:
-                event_log.error("\t\tVBIOS RIM verification failed.")
-                raise RIMVerificationFailureError("\t\tVBIOS RIM verification failed.\n\tQuitting now.")
+        if vbios_rim_verification_status:
+            settings.mark_vbios_rim_signature_verified()
+            info_log.info("\t\t\tVBIOS RIM verification successful")
+            if vbios_rim_content:
+                RimCache.put(vbios_rim_file_id, vbios_rim_content)
+        else:
+            event_log.error("\t\tVBIOS RIM verification failed.")
+            raise RIMVerificationFailureError("\t\tVBIOS RIM verification failed.\n\tQuitting now.")
 
+        with Tracer.span("verify_measurements"):
             verifier_obj = Verifier(attestation_report_obj, driver_rim, vbios_rim, settings=settings)
             verifier_obj.verify(settings)
 
-            # Checking the attestation status.
-            if settings.check_status():
-                info_log.info(f"\tGPU {i} with UUID {gpu_info_obj.get_uuid()} verified successfully.")
-            else:
-                info_log.info(f"The verification of GPU {i} with UUID {gpu_info_obj.get_uuid()} resulted in failure.")
+        # Checking the attestation status.
+        gpu_result["status"] = settings.check_status()
+        Tracer.set_attribute("status", gpu_result["status"])
+        if gpu_result["status"]:
+            info_log.info(f"\tGPU {i} with UUID {gpu_info_obj.get_uuid()} verified successfully.")
+        else:
+            info_log.info(f"The verification of GPU {i} with UUID {gpu_info_obj.get_uuid()} resulted in failure.")
 
-            if i == 0:
-                overall_status = settings.check_status()
-            else:
-                overall_status = overall_status and settings.check_status()
+    except Exception as error:
+        info_log.error(error)
+        gpu_result["status"] = False
+        if settings is None:
+            settings = HopperSettings()
+
+    # Set current gpu_claims
+    gpu_result["claims"] = ClaimsUtils.get_current_gpu_claims(settings, gpu_result["uuid"])
+    return gpu_result
+
+
+def get_rim_verdict_key(rim_name, version, rim_source):
+    """Method to get the key of the verdict of a RIM in the VerdictCache.
+
+    Args:
+        rim_name (str): the name of the RIM, can be either "driver" or "vbios".
+        version (str): the driver/vbios version of the GPU.
+        rim_source (str or tuple): the RIM file id, or the memo key of the local RIM file.
+
+    Returns:
+        [tuple]: the key of the verdict, or None if the RIM file is unknown.
+    """
+    if rim_source is None:
+        return None
+    if isinstance(rim_source, tuple):
+        return VerdictCache.get_key(f"{rim_name}_rim", version, *rim_source)
+    return VerdictCache.get_key(f"{rim_name}_rim", version, rim_source)
+
+
+def reuse_rim_verdict(key, version, settings):
+    """Method to reuse the verdict of a RIM verified successfully in a previous attestation, marking the
+    settings flags of the GPU like the verification of the RIM does.
+
+    Args:
+        key (tuple): the key of the verdict, or None if the verdict can not be reused.
+        version (str): the driver/vbios version of the GPU.
+        settings (config.HopperSettings): the object containing the various config info.
+
+    Returns:
+        [RIM]: the RIM object, or None if there is no verdict to reuse.
+    """
+    if key is None:
+        return None
+    rim = VerdictCache.get(key)
+    if rim is None:
+        return None
 
-            # Set current gpu_claims
-            current_gpu_uuid = gpu_info_obj.get_uuid()
-            current_gpu_claims = ClaimsUtils.get_current_gpu_claims(settings, current_gpu_uuid)
-            gpu_claims_list.append((i, current_gpu_uuid, current_gpu_claims))
+    info_log.info(f"\t\t\tReusing the {rim.rim_name} RIM verification of a previous attestation.")
+    rim.mark_parsed(settings)
+    rim.mark_verification_status(version, settings)
+    return rim
+
+
+def attest_gpu_with_span(arguments):
+    """Method to perform the attestation of a single GPU in its own span of the attestation trace.
+
+    Args:
+        arguments (tuple): the arguments of attest_gpu.
+
+    Returns:
+        The result of attest_gpu.
+    """
+    with Tracer.span("attest_gpu", gpu_index=arguments[0], gpu_uuid=str(arguments[1].get_uuid())):
+        return attest_gpu(*arguments)
+
+
+def apply_attestation_arguments(arguments_as_dictionary):
+    """Method to apply the Attestation Options to the settings of the verifier.
+
+    Args:
+        arguments_as_dictionary (Dictionary): the dictionary object containing Attestation Options.
+
+    Raises:
+        InvalidClaimsVersionError: it is raised if the claims version is not supported.
+    """
+    # Set claims version and validate
+    BaseSettings.CLAIMS_VERSION = arguments_as_dictionary.get("claims_version") or "2.0"
+
+    if BaseSettings.CLAIMS_VERSION != "2.0" and BaseSettings.CLAIMS_VERSION != "3.0":
+        raise InvalidClaimsVersionError(f'Claims version is not supported: {BaseSettings.CLAIMS_VERSION}')
+
+    # Set log level to DEBUG if verbose flag is set
+    if arguments_as_dictionary["verbose"]:
+        info_log.setLevel(logging.DEBUG)
+
+    # Get Azure VM Region
+    BaseSettings.get_vm_region()
+    info_log.debug(f"VM Region : {BaseSettings.AZURE_VM_REGION}")
+
+    # Set RIM service url
+    if not arguments_as_dictionary["rim_service_url"] is None:
+        BaseSettings.set_rim_service_base_url(arguments_as_dictionary["rim_service_url"])
+    else:
+        BaseSettings.set_thim_rim_service_base_url()
+    info_log.debug(f"RIM service url: {BaseSettings.RIM_SERVICE_BASE_URL}")
+
+    # Set OCSP service url
+    if not arguments_as_dictionary["ocsp_url"] is None:
+        BaseSettings.set_ocsp_url(arguments_as_dictionary["ocsp_url"])
+        BaseSettings.OCSP_NONCE_ENABLED = arguments_as_dictionary.get("ocsp_nonce_enabled", False)
+    else:
+        BaseSettings.set_thim_ocsp_service_url()
+    info_log.debug(
+        f"OCSP service url: {BaseSettings.OCSP_URL}\nOCSP Nonce: {'ENABLED' if BaseSettings.OCSP_NONCE_ENABLED else 'DISABLED'}"
+    )
+
+    # Set OCSP attestation settings
+    if arguments_as_dictionary["ocsp_attestation_settings"] == "strict":
+        BaseSettings.allow_hold_cert = False
+        BaseSettings.OCSP_VALIDITY_EXTENSION_HRS = 0
+        BaseSettings.OCSP_CERT_REVOCATION_DEVICE_EXTENSION_HRS = 0
+        BaseSettings.OCSP_CERT_REVOCATION_DRIVER_RIM_EXTENSION_HRS = 0
+        BaseSettings.OCSP_CERT_REVOCATION_VBIOS_RIM_EXTENSION_HRS = 0
+    elif arguments_as_dictionary["ocsp_attestation_settings"] == "default":
+        BaseSettings.allow_hold_cert = True
+        BaseSettings.OCSP_VALIDITY_EXTENSION_HRS = 14 * 24
+        BaseSettings.OCSP_CERT_REVOCATION_DEVICE_EXTENSION_HRS = 14 * 24
+        BaseSettings.OCSP_CERT_REVOCATION_DRIVER_RIM_EXTENSION_HRS = 14 * 24
+        BaseSettings.OCSP_CERT_REVOCATION_VBIOS_RIM_EXTENSION_HRS = 90 * 24
+
+    # Set allow OCSP cert hold flag
+    if arguments_as_dictionary["allow_hold_cert"] is not None:
+        BaseSettings.allow_hold_cert = BaseSettings.allow_hold_cert or arguments_as_dictionary["allow_hold_cert"]
+
+    # Set OCSP validity extension
+    if arguments_as_dictionary["ocsp_validity_extension"] is not None:
+        BaseSettings.OCSP_VALIDITY_EXTENSION_HRS = max(0, arguments_as_dictionary["ocsp_validity_extension"])
+
+    # Set OCSP cert revoked extension
+    if arguments_as_dictionary["ocsp_cert_revocation_extension_device"] is not None:
+        BaseSettings.OCSP_CERT_REVOCATION_DEVICE_EXTENSION_HRS = max(
+            0, arguments_as_dictionary["ocsp_cert_revocation_extension_device"]
+        )
+    if arguments_as_dictionary["ocsp_cert_revocation_extension_driver_rim"] is not None:
+        BaseSettings.OCSP_CERT_REVOCATION_DRIVER_RIM_EXTENSION_HRS = max(
+            0, arguments_as_dictionary["ocsp_cert_revocation_extension_driver_rim"]
+        )
+    if arguments_as_dictionary["ocsp_cert_revocation_extension_vbios_rim"] is not None:
+        BaseSettings.OCSP_CERT_REVOCATION_VBIOS_RIM_EXTENSION_HRS = max(
+            0, arguments_as_dictionary["ocsp_cert_revocation_extension_vbios_rim"]
+        )
+
+    # Set the RIM cache settings
+    if arguments_as_dictionary.get("rim_cache_dir"):
+        BaseSettings.set_rim_cache_dir(arguments_as_dictionary["rim_cache_dir"])
+    BaseSettings.RIM_CACHE_ENABLED = not arguments_as_dictionary.get("disable_rim_cache", False)
+
+    # Set the RIM bundle settings
+    if arguments_as_dictionary.get("rim_bundle"):
+        BaseSettings.set_rim_bundle_path(arguments_as_dictionary["rim_bundle"])
+    if arguments_as_dictionary.get("rim_bundle_public_key"):
+        BaseSettings.set_rim_bundle_public_key(arguments_as_dictionary["rim_bundle_public_key"])
+
+    # Set the OCSP cache settings
+    if arguments_as_dictionary.get("ocsp_cache_dir"):
+        BaseSettings.set_ocsp_cache_dir(arguments_as_dictionary["ocsp_cache_dir"])
+    BaseSettings.OCSP_CACHE_ENABLED = not arguments_as_dictionary.get("disable_ocsp_cache", False)
+    if arguments_as_dictionary.get("ocsp_bundle"):
+        BaseSettings.set_ocsp_bundle_path(arguments_as_dictionary["ocsp_bundle"])
+    BaseSettings.OCSP_BUNDLE_ALLOW_EXPIRED = arguments_as_dictionary.get("ocsp_bundle_allow_expired", False)
+
+    # Set the incremental attestation, reusing the verdicts of the previous attestations
+    BaseSettings.INCREMENTAL_ATTESTATION_ENABLED = arguments_as_dictionary.get("incremental", False)
+
+    # Set the RIM root certificate path
+    if not arguments_as_dictionary["rim_root_cert"] is None:
+        BaseSettings.set_rim_root_certificate(arguments_as_dictionary["rim_root_cert"])
+
+    # Log the arguments and BaseSettings
+    base_settings_dict = dict(
+        (k, v)
+        for k, v in vars(BaseSettings).items()
+        if not (k.startswith("_") or callable(v) or k in dir(BaseSettings.__class__) or isinstance(v, classmethod))
+    )
+    event_log.debug(f"Arguments: {arguments_as_dictionary}")
+    event_log.debug(f"BaseSettings: {base_settings_dict}")
+
+    # Set the RIM file paths used by the Hopper GPUs
+    HopperSettings.set_driver_rim_path(arguments_as_dictionary["driver_rim"])
+    HopperSettings.set_vbios_rim_path(arguments_as_dictionary["vbios_rim"])
+
+    if arguments_as_dictionary["test_no_gpu"]:
+        HopperSettings.set_driver_rim_path(HopperSettings.TEST_NO_GPU_DRIVER_RIM_PATH)
+        HopperSettings.set_vbios_rim_path(HopperSettings.TEST_NO_GPU_VBIOS_RIM_PATH)
+
+
+def attest(arguments_as_dictionary, nonce, gpu_evidence_list):
+    """Method to perform GPU Attestation and return an Attestation Response.
+
+    Args:
+        arguments_as_dictionary (Dictionary): the dictionary object containing Attestation Options.
+
+    Raises:
+        Different Errors regarding GPU Attestation
+
+    Returns:
+        A tuple containing Attestation result (boolean) and Attestation JWT claims(JWT Object)
+    """
+    overall_status = False
+    gpu_claims_list = []  # (index, gpu_uuid, gpu_claims)
+    hwmodel = {}
+    oemid = {}
+    ueid = {}
+    gpu_driver_attestation_warning_list = {}
+    gpu_vbios_attestation_warning_list = {}
+    rim_memo = RimMemo()
+    prefetcher = None
+    att_report_nonce_hex = CcAdminUtils.validate_and_extract_nonce(nonce)
+
+    try:
+        with Tracer.span("apply_attestation_arguments"):
+            apply_attestation_arguments(arguments_as_dictionary)
+
+        # Fetch the RIM files and OCSP responses in the background while the evidence is being verified,
+        # unless an incremental attestation reuses the verdicts of a previous attestation
+        if (
+            BaseSettings.PREFETCH_ENABLED
+            and not arguments_as_dictionary.get("disable_prefetch")
+            and not VerdictCache.has_valid_verdicts()
+        ):
+            prefetcher = AttestationPrefetcher(rim_memo, arguments_as_dictionary)
+            prefetcher.start(gpu_evidence_list)
+
+        # Run attestation for each GPU, concurrently if a parallelism greater than 1 is requested
+        parallelism = max(1, arguments_as_dictionary.get("parallelism") or 1)
+        gpu_attestation_arguments = [
+            (i, gpu_info_obj, arguments_as_dictionary, att_report_nonce_hex, rim_memo)
+            for i, gpu_info_obj in enumerate(gpu_evidence_list)
+        ]
+
+        if parallelism > 1 and len(gpu_attestation_arguments) > 1:
+            info_log.info(f"Attesting {len(gpu_attestation_arguments)} GPUs with a parallelism of {parallelism}")
+            with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                gpu_results = list(executor.map(Tracer.bind(attest_gpu_with_span), gpu_attestation_arguments))
+        else:
+            gpu_results = [attest_gpu_with_span(arguments) for arguments in gpu_attestation_arguments]
+
+        # Collect the results in the order of the GPUs
+        for gpu_result in gpu_results:
+            gpu_uuid = gpu_result["uuid"]
+            gpu_claims_list.append((gpu_result["index"], gpu_uuid, gpu_result["claims"]))
+            if gpu_result["hwmodel"] is not None:
+                hwmodel[gpu_uuid] = gpu_result["hwmodel"]
+            if gpu_result["ueid"] is not None:
+                ueid[gpu_uuid] = gpu_result["ueid"]
+            if gpu_result["oemid"] is not None:
+                oemid[gpu_uuid] = gpu_result["oemid"]
+            if gpu_result["driver_warning"] is not None:
+                gpu_driver_attestation_warning_list[gpu_uuid] = gpu_result["driver_warning"]
+            if gpu_result["vbios_warning"] is not None:
+                gpu_vbios_attestation_warning_list[gpu_uuid] = gpu_result["vbios_warning"]
+
+        overall_status = len(gpu_results) > 0 and all(gpu_result["status"] for gpu_result in gpu_results)
 
     except Exception as error:
         info_log.error(error)
-        current_gpu_uuid = gpu_info_obj.get_uuid()
-        current_gpu_claims = ClaimsUtils.get_current_gpu_claims(settings, current_gpu_uuid)
-        gpu_claims_list.append((i, current_gpu_uuid, current_gpu_claims))
 
     finally:
+        if prefetcher is not None:
+            prefetcher.close()
+
         # Checking the attestation status.
+        BaseSettings.test_result = overall_status
         if overall_status:
             if not arguments_as_dictionary["user_mode"] and not arguments_as_dictionary["test_no_gpu"]:
                 if not NvmlHandler.get_gpu_ready_state():
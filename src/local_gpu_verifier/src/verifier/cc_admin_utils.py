@@ -33,15 +33,15 @@ import time
 import secrets
 import string
 from datetime import datetime, timezone, timedelta
-from urllib import request
-from urllib.error import HTTPError
+from requests import HTTPError
 import json
 import base64
+import threading
 
 
 from OpenSSL import crypto
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.hashes import SHA384
+from cryptography.hazmat.primitives.hashes import SHA256, SHA384
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.exceptions import InvalidSignature
 from cryptography.x509 import ocsp, OCSPNonce, ExtensionNotFound
@@ -56,7 +56,22 @@ from verifier.config import (
 from verifier.utils import (
     format_vbios_version,
     function_wrapper_with_timeout,
+    get_executor,
+    is_call_cancelled,
+    OCSP_POOL,
+    get_ocsp_single_response,
+    read_der_element,
+    split_der_elements,
+    encode_der_element,
 )
+from verifier.utils.rim_cache import RimCache
+from verifier.utils.rim_bundle import RimBundle
+from verifier.utils.ocsp_cache import OcspCache
+from verifier.utils.ocsp_bundle import OcspBundle
+from verifier.utils.cert_store_cache import CertificateStoreCache
+from verifier.utils.http_client import HttpClient
+from verifier.utils.tracing import Tracer
+from verifier.utils.metrics import MetricsRegistry
 from verifier.exceptions import (
     NoCertificateError,
     IncorrectNumberOfCertificatesError,
@@ -72,6 +87,11 @@ from verifier.exceptions import (
 class CcAdminUtils:
     """ A class to provide the required functionalities for the CC ADMIN to perform the GPU attestation.
     """
+    ocsp_batch_unsupported_urls = set()
+    # The OCSP fetches started ahead of the verification, keyed by the fingerprints of the certificate and its issuer.
+    prefetched_ocsp_responses = dict()
+    prefetched_ocsp_responses_lock = threading.Lock()
+
     @staticmethod
     def extract_fwid(cert):
         """ A static function to extract the FWID data from the given certificate.
@@ -151,24 +171,12 @@ class CcAdminUtils:
             event_log.error("\t\tThe number of certificates fetched from the GPU is unexpected.")
             raise IncorrectNumberOfCertificatesError("\t\tThe number of certificates fetched from the GPU is unexpected.")
 
-        store = crypto.X509Store()
-        index = number_of_certificates - 1
-        while index > -1:
-            if index == number_of_certificates - 1:
-                # The root CA certificate is stored at the end in the cert chain.
-                store.add_cert(cert_chain[index])
-                index = index - 1
-            else:
-                store_context = crypto.X509StoreContext(store, cert_chain[index])
-                try:
-                    store_context.verify_certificate()
-                    store.add_cert(cert_chain[index])
-                    index = index - 1
-                except crypto.X509StoreContextError as e:
-                    event_log.info(f'Cert chain verification is failing at index : {index}')
-                    event_log.error(e)
-                    return False
-        return True
+        # The root CA certificate is stored at the end in the cert chain. The store of the root and the
+        # already verified certificates are reused across the chains.
+        status, index = CertificateStoreCache.verify_certificate_chain(cert_chain)
+        if not status:
+            event_log.info(f'Cert chain verification is failing at index : {index}')
+        return status
 
     @staticmethod
     def convert_cert_from_cryptography_to_pyopenssl(cert):
@@ -242,55 +250,22 @@ class CcAdminUtils:
         for i, cert in enumerate(cert_chain):
             cert_chain[i] = cert.to_cryptography()
 
-        for i in range(start_index, end_index):
-            cert_common_name = cert_chain[i].subject.get_attributes_for_oid(x509.oid.NameOID.COMMON_NAME)[0].value
-
-            # Fetch OCSP Response from provided OCSP Service
-            nonce = (
-                CcAdminUtils.generate_nonce(BaseSettings.SIZE_OF_NONCE_IN_BYTES)
-                if BaseSettings.OCSP_NONCE_ENABLED
-                else None
+        # Fetch the OCSP responses of all the certificates of the chain
+        with Tracer.span("fetch_ocsp_responses", certificates=end_index - start_index):
+            ocsp_fetch_results = CcAdminUtils.fetch_ocsp_responses(
+                [(cert_chain[i], cert_chain[i + 1]) for i in range(start_index, end_index)]
             )
-            ocsp_request = CcAdminUtils.build_ocsp_request(cert_chain[i], cert_chain[i + 1], nonce)
-
-            try:
-                ocsp_response = function_wrapper_with_timeout(
-                    [
-                        CcAdminUtils.fetch_ocsp_response_from_url,
-                        ocsp_request.public_bytes(serialization.Encoding.DER),
-                        BaseSettings.OCSP_URL,
-                        BaseSettings.OCSP_RETRY_COUNT,
-                        "send_ocsp_request",
-                    ],
-                    BaseSettings.MAX_OCSP_REQUEST_TIME_DELAY * BaseSettings.OCSP_RETRY_COUNT,
-                )
-            except Exception as e:
-                event_log.error(f"Exception occurred while fetching OCSP response from provided OCSP service: {str(e)}")
-                ocsp_response = None
 
-            # Fallback to Nvidia OCSP Service if the fetch fails
-            if ocsp_response is None:
-                nonce = CcAdminUtils.generate_nonce(BaseSettings.SIZE_OF_NONCE_IN_BYTES)
-                ocsp_request = CcAdminUtils.build_ocsp_request(cert_chain[i], cert_chain[i + 1], nonce)
-                try:
-                    ocsp_response = function_wrapper_with_timeout(
-                        [
-                            CcAdminUtils.fetch_ocsp_response_from_url,
-                            ocsp_request.public_bytes(serialization.Encoding.DER),
-                            BaseSettings.OCSP_URL_NVIDIA,
-                            BaseSettings.OCSP_RETRY_COUNT,
-                            "send_ocsp_request",
-                        ],
-                        BaseSettings.MAX_OCSP_REQUEST_TIME_DELAY * BaseSettings.OCSP_RETRY_COUNT,
-                    )
-                except Exception as e:
-                    event_log.error(f"Exception occurred while fetching OCSP response from Nvidia OCSP service: {str(e)}")
-                    ocsp_response = None
+        # Validate the OCSP responses in the order of the certificate chain
+        for i in range(start_index, end_index):
+            cert_common_name = cert_chain[i].subject.get_attributes_for_oid(x509.oid.NameOID.COMMON_NAME)[0].value
+            ocsp_request, ocsp_response, nonce, is_cached_ocsp_response = ocsp_fetch_results[i - start_index]
 
             # Raise error if OCSP response is not fetched from both OCSP services
             if ocsp_response is None:
                 error_msg = f"Failed to fetch the ocsp response for certificate {cert_common_name}"
                 info_log.error(f"\t\t\t{error_msg}")
+                MetricsRegistry.increment("verifier_errors_total", error="OCSPFetchError")
                 raise OCSPFetchError(error_msg)
 
             # Verify the OCSP response status
@@ -299,6 +274,15 @@ class CcAdminUtils:
                 info_log.error(f"\t\t{error_msg}")
                 return False, error_msg
 
+            # Find the status of the certificate, as the OCSP response may contain the status of several certificates
+            single_response = get_ocsp_single_response(
+                ocsp_response, ocsp_request.issuer_key_hash, ocsp_request.serial_number
+            )
+            if single_response is None:
+                error_msg = f"The OCSP response does not contain the revocation status of the certificate {cert_common_name}."
+                info_log.error(f"\t\t{error_msg}")
+                return False, error_msg
+
             # Verify the Nonce in the OCSP response
             try:
                 if nonce is not None and nonce != ocsp_response.extensions.get_extension_for_class(OCSPNonce).value.nonce:
@@ -315,8 +299,8 @@ class CcAdminUtils:
 
             # Verify the OCSP response is within the validity period
             timestamp_format = "%Y/%m/%d %H:%M:%S UTC"
-            this_update = ocsp_response.this_update_utc
-            next_update = ocsp_response.next_update_utc
+            this_update = single_response.this_update_utc
+            next_update = single_response.next_update_utc
             next_update_extended = next_update + timedelta(hours=BaseSettings.OCSP_VALIDITY_EXTENSION_HRS)
             utc_now = datetime.now(timezone.utc)
             event_log.debug(f"Current time: {utc_now.strftime(timestamp_format)}")
@@ -368,14 +352,20 @@ class CcAdminUtils:
             elif i == end_index - 1:
                 info_log.debug("\t\tGPU Certificate OCSP Signature is verified")
 
+            if not is_cached_ocsp_response:
+                OcspCache.put(ocsp_request.issuer_key_hash, ocsp_request.serial_number, ocsp_response)
+
+            # The verdict of the certificate chain is valid until the next update of the status or the expiry of the certificate
+            settings.mark_ocsp_valid_until(mode, min(next_update, cert_chain[i].not_valid_after_utc))
+
             # The OCSP response certificate status is unknown
-            if ocsp_response.certificate_status == ocsp.OCSPCertStatus.UNKNOWN:
+            if single_response.certificate_status == ocsp.OCSPCertStatus.UNKNOWN:
                 error_msg = f"The {cert_common_name} certificate revocation status is UNKNOWN"
                 info_log.error(f"\t\t\t{error_msg}")
                 return False, error_msg
 
             # The OCSP response certificate status is revoked
-            if ocsp_response.certificate_status == ocsp.OCSPCertStatus.REVOKED:
+            if single_response.certificate_status == ocsp.OCSPCertStatus.REVOKED:
                 # Get cert revoke timestamp
                 cert_revocation_extension_hrs = 0
                 if mode == BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION:
@@ -385,8 +375,8 @@ class CcAdminUtils:
                 elif mode == BaseSettings.Certificate_Chain_Verification_Mode.VBIOS_RIM_CERT:
                     cert_revocation_extension_hrs = BaseSettings.OCSP_CERT_REVOCATION_VBIOS_RIM_EXTENSION_HRS
 
-                cert_revocation_time = ocsp_response.revocation_time_utc
-                cert_revocation_reason = ocsp_response.revocation_reason
+                cert_revocation_time = single_response.revocation_time_utc
+                cert_revocation_reason = single_response.revocation_reason
                 cert_revocation_time_extended = cert_revocation_time + timedelta(hours=cert_revocation_extension_hrs)
 
                 # Cert is revoked, print warning
@@ -431,6 +421,380 @@ class CcAdminUtils:
         info_log.info(f"\t\t\tThe certificate chain revocation status verification successful.")
         return True, '\n'.join(gpu_attestation_warning_msg_list)
 
+    @staticmethod
+    def build_batched_ocsp_request(cert_pairs, nonce=None):
+        """ A static method to build one ocsp request message asking for the status of several certificates.
+        The OCSPRequestBuilder only supports one certificate, so the Request element of the single
+        certificate ocsp requests are combined in the requestList of one ocsp request.
+
+        Args:
+            cert_pairs (list): the list of (certificate, issuer certificate) tuples.
+            nonce (bytes, optional): the nonce to be added in the ocsp request message. Defaults to None.
+
+        Returns:
+            [tuple]: the list of the single certificate ocsp requests and the raw batched ocsp request message.
+        """
+        ocsp_requests = [CcAdminUtils.build_ocsp_request(cert, issuer) for cert, issuer in cert_pairs]
+
+        request_list = bytes()
+        for ocsp_request in ocsp_requests:
+            _, ocsp_request_content, _ = read_der_element(ocsp_request.public_bytes(serialization.Encoding.DER))
+            _, tbs_request_content, _ = read_der_element(ocsp_request_content)
+            for tag, element in split_der_elements(tbs_request_content):
+                if tag == 0x30:
+                    _, single_requests, _ = read_der_element(element)
+                    request_list += single_requests
+
+        # The first ocsp request carries the version and the nonce extension of the batched request.
+        template_request = ocsp_requests[0]
+        if nonce is not None:
+            template_request = CcAdminUtils.build_ocsp_request(cert_pairs[0][0], cert_pairs[0][1], nonce)
+
+        _, ocsp_request_content, _ = read_der_element(template_request.public_bytes(serialization.Encoding.DER))
+        _, tbs_request_content, _ = read_der_element(ocsp_request_content)
+        tbs_request = bytes()
+        for tag, element in split_der_elements(tbs_request_content):
+            if tag == 0x30:
+                element = encode_der_element(0x30, request_list)
+            tbs_request += element
+
+        return ocsp_requests, encode_der_element(0x30, encode_der_element(0x30, tbs_request))
+
+    @staticmethod
+    def fetch_batched_ocsp_response(cert_pairs):
+        """ A static method to get the ocsp responses of several certificates with one request to the provided
+        ocsp service. The ocsp service is remembered as not supporting batched requests if it answers that the
+        request is malformed, or answers successfully without the status of all the certificates.
+
+        Args:
+            cert_pairs (list): the list of (certificate, issuer certificate) tuples.
+
+        Raises:
+            OCSPFetchError: it is raised if the provided ocsp service could not be reached.
+
+        Returns:
+            [list]: the list of (ocsp request, ocsp response, nonce, is cached) tuples in the order of cert_pairs, or
+                    None if the certificates have to be requested one by one.
+        """
+        nonce = (
+            CcAdminUtils.generate_nonce(BaseSettings.SIZE_OF_NONCE_IN_BYTES)
+            if BaseSettings.OCSP_NONCE_ENABLED
+            else None
+        )
+        ocsp_url = BaseSettings.OCSP_URL
+
+        try:
+            ocsp_requests, ocsp_request_data = CcAdminUtils.build_batched_ocsp_request(cert_pairs, nonce)
+            ocsp_response = function_wrapper_with_timeout(
+                [
+                    CcAdminUtils.fetch_ocsp_response_from_url,
+                    ocsp_request_data,
+                    ocsp_url,
+                    BaseSettings.OCSP_RETRY_COUNT,
+                    "send_batched_ocsp_request",
+                ],
+                BaseSettings.MAX_OCSP_REQUEST_TIME_DELAY * BaseSettings.OCSP_RETRY_COUNT,
+            )
+        except Exception as e:
+            event_log.error(f"Exception occurred while fetching batched OCSP response from provided OCSP service: {str(e)}")
+            ocsp_response = None
+
+        MetricsRegistry.increment(
+            "verifier_ocsp_fetch_total", service="provided_batched", result="failure" if ocsp_response is None else "success"
+        )
+        if ocsp_response is None:
+            raise OCSPFetchError(f"The provided OCSP service {ocsp_url} could not be reached.")
+
+        response_status = ocsp_response.response_status
+        if response_status == ocsp.OCSPResponseStatus.MALFORMED_REQUEST or (
+            response_status == ocsp.OCSPResponseStatus.SUCCESSFUL
+            and any(
+                get_ocsp_single_response(ocsp_response, ocsp_request.issuer_key_hash, ocsp_request.serial_number) is None
+                for ocsp_request in ocsp_requests
+            )
+        ):
+            event_log.warning(f"The OCSP service {ocsp_url} does not support batched requests, using single requests.")
+            CcAdminUtils.ocsp_batch_unsupported_urls.add(ocsp_url)
+            return None
+        if response_status != ocsp.OCSPResponseStatus.SUCCESSFUL:
+            # A transient status such as tryLater or internalError does not tell if batched requests are supported
+            event_log.warning(
+                f"The OCSP service {ocsp_url} answered the batched request with the status {response_status.name}, "
+                "using single requests."
+            )
+            return None
+
+        event_log.debug(f"Fetched the OCSP status of {len(ocsp_requests)} certificates with one request.")
+        return [(ocsp_request, ocsp_response, nonce, False) for ocsp_request in ocsp_requests]
+
+    @staticmethod
+    def get_ocsp_cert_pairs(cert_chain, mode):
+        """ A static method to list the certificates of a certificate chain whose ocsp status is checked by
+        ocsp_certificate_chain_validation, without modifying the certificate chain.
+
+        Args:
+            cert_chain (list): the list of the OpenSSL.crypto.X509 certificates of the certificate chain.
+            mode (<enum 'CERT CHAIN VERIFICATION MODE'>): the certificate chain verification mode.
+
+        Returns:
+            [list]: the list of (certificate, issuer certificate) tuples of cryptography certificates.
+        """
+        start_index = 1 if mode == BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION else 0
+        cert_chain = [cert.to_cryptography() for cert in cert_chain]
+        return [(cert_chain[i], cert_chain[i + 1]) for i in range(start_index, len(cert_chain) - 1)]
+
+    @staticmethod
+    def get_ocsp_prefetch_key(cert, issuer):
+        """ Returns the key of the prefetched ocsp response of a certificate.
+
+        Args:
+            cert (cryptography.x509.Certificate): the certificate.
+            issuer (cryptography.x509.Certificate): the issuer certificate.
+
+        Returns:
+            [tuple]: the sha256 fingerprints of the certificate and of the issuer certificate.
+        """
+        return cert.fingerprint(SHA256()), issuer.fingerprint(SHA256())
+
+    @staticmethod
+    def prefetch_ocsp_responses(cert_pairs, executor):
+        """ A static method to start fetching the ocsp responses of certificates on the given executor. The
+        results are used by the fetch_ocsp_responses calls for the same certificates until they are discarded,
+        and the certificates which are already being prefetched are skipped.
+
+        Args:
+            cert_pairs (list): the list of (certificate, issuer certificate) tuples.
+            executor (concurrent.futures.Executor): the executor running the fetch.
+
+        Returns:
+            [list]: the keys of the prefetched ocsp responses, to be discarded at the end of the attestation.
+        """
+        keys = list()
+        with CcAdminUtils.prefetched_ocsp_responses_lock:
+            pending_pairs = list()
+            for cert, issuer in cert_pairs:
+                key = CcAdminUtils.get_ocsp_prefetch_key(cert, issuer)
+                if key not in CcAdminUtils.prefetched_ocsp_responses and key not in keys:
+                    keys.append(key)
+                    pending_pairs.append((cert, issuer))
+            if not pending_pairs:
+                return keys
+
+            future = executor.submit(Tracer.bind(CcAdminUtils.fetch_ocsp_responses), pending_pairs, False)
+            for index, key in enumerate(keys):
+                CcAdminUtils.prefetched_ocsp_responses[key] = (future, index)
+        return keys
+
+    @staticmethod
+    def get_prefetched_ocsp_response(cert, issuer):
+        """ A static method to get the prefetched ocsp response of a certificate, waiting for its fetch to finish.
+
+        Args:
+            cert (cryptography.x509.Certificate): the certificate.
+            issuer (cryptography.x509.Certificate): the issuer certificate.
+
+        Returns:
+            [tuple]: the (ocsp request, ocsp response, nonce, is cached) tuple as returned by fetch_ocsp_response,
+                    or None if the ocsp response was not prefetched or its prefetch failed.
+        """
+        with CcAdminUtils.prefetched_ocsp_responses_lock:
+            entry = CcAdminUtils.prefetched_ocsp_responses.get(CcAdminUtils.get_ocsp_prefetch_key(cert, issuer))
+        if entry is None:
+            return None
+
+        future, index = entry
+        try:
+            ocsp_fetch_result = future.result()[index]
+        except Exception as error:
+            event_log.debug(f"The prefetch of the ocsp response failed : {error}")
+            return None
+
+        if ocsp_fetch_result[1] is None:
+            event_log.debug(f"The prefetch of the ocsp response of serial number {format(cert.serial_number, 'x')} failed.")
+            return None
+        return ocsp_fetch_result
+
+    @staticmethod
+    def discard_prefetched_ocsp_responses(keys):
+        """ A static method to discard the prefetched ocsp responses at the end of an attestation.
+
+        Args:
+            keys (list): the keys returned by prefetch_ocsp_responses.
+        """
+        with CcAdminUtils.prefetched_ocsp_responses_lock:
+            for key in keys:
+                CcAdminUtils.prefetched_ocsp_responses.pop(key, None)
+
+    @staticmethod
+    def fetch_ocsp_responses(cert_pairs, use_prefetched=True):
+        """ A static method to get the ocsp responses of the certificates of a certificate chain. The prefetched
+        responses are used first, then the responses are taken from the ocsp cache when possible, the remaining
+        certificates are sent to the provided ocsp service in one batched request, and the certificates whose
+        status could not be fetched that way are requested concurrently one by one in the shared ocsp pool. If
+        the provided ocsp service could not be reached with the batched request, the certificates are requested
+        from the Nvidia ocsp service.
+
+        Args:
+            cert_pairs (list): the list of (certificate, issuer certificate) tuples.
+            use_prefetched (bool, optional): whether the prefetched ocsp responses are used. Defaults to True.
+
+        Returns:
+            [list]: the list of (ocsp request, ocsp response, nonce, is cached) tuples in the order of cert_pairs,
+                    as returned by fetch_ocsp_response.
+        """
+        ocsp_fetch_results = [None] * len(cert_pairs)
+        provided_service_failed = False
+
+        if use_prefetched and CcAdminUtils.prefetched_ocsp_responses:
+            for index, (cert, issuer) in enumerate(cert_pairs):
+                ocsp_fetch_results[index] = CcAdminUtils.get_prefetched_ocsp_response(cert, issuer)
+
+        if (
+            BaseSettings.OCSP_BATCH_REQUEST_ENABLED
+            and len(cert_pairs) > 1
+            and BaseSettings.OCSP_URL not in CcAdminUtils.ocsp_batch_unsupported_urls
+        ):
+            if OcspCache.is_enabled() or OcspBundle.is_enabled():
+                for index, (cert, issuer) in enumerate(cert_pairs):
+                    if ocsp_fetch_results[index] is not None:
+                        continue
+                    ocsp_request = CcAdminUtils.build_ocsp_request(cert, issuer)
+                    ocsp_response = CcAdminUtils.get_stored_ocsp_response(ocsp_request)
+                    if ocsp_response is not None:
+                        ocsp_fetch_results[index] = (ocsp_request, ocsp_response, None, True)
+
+            pending_indexes = [index for index, result in enumerate(ocsp_fetch_results) if result is None]
+            if len(pending_indexes) > 1:
+                try:
+                    batched_results = CcAdminUtils.fetch_batched_ocsp_response(
+                        [cert_pairs[index] for index in pending_indexes]
+                    )
+                except OCSPFetchError as error:
+                    event_log.error(str(error))
+                    provided_service_failed = True
+                    batched_results = None
+                if batched_results is not None:
+                    for index, result in zip(pending_indexes, batched_results):
+                        ocsp_fetch_results[index] = result
+
+        pending_indexes = [index for index, result in enumerate(ocsp_fetch_results) if result is None]
+        if len(pending_indexes) > 1:
+            fetch_ocsp_response = Tracer.bind(CcAdminUtils.fetch_ocsp_response)
+            executor = get_executor(OCSP_POOL)
+            futures = [
+                executor.submit(fetch_ocsp_response, *cert_pairs[index], provided_service_failed)
+                for index in pending_indexes
+            ]
+            single_results = [future.result() for future in futures]
+        else:
+            single_results = [
+                CcAdminUtils.fetch_ocsp_response(*cert_pairs[index], provided_service_failed) for index in pending_indexes
+            ]
+
+        for index, result in zip(pending_indexes, single_results):
+            ocsp_fetch_results[index] = result
+
+        return ocsp_fetch_results
+
+    @staticmethod
+    def fetch_ocsp_response(cert, issuer, provided_service_failed=False):
+        """ A static method to get the ocsp response of a certificate, either from the ocsp cache or from
+        the provided ocsp service with a fallback to the Nvidia ocsp service.
+
+        Args:
+            cert (cryptography.x509.Certificate): the certificate whose ocsp status is requested.
+            issuer (cryptography.x509.Certificate): the issuer certificate.
+            provided_service_failed (bool, optional): True to go straight to the Nvidia ocsp service, as the
+                    provided ocsp service could not be reached by the same attestation. Defaults to False.
+
+        Returns:
+            [tuple]: the ocsp request, the ocsp response (None if it could not be fetched), the nonce used in
+                    the ocsp request and whether the ocsp response comes from the ocsp cache.
+        """
+        with Tracer.span("fetch_ocsp_response", serial_number=format(cert.serial_number, "x")):
+            # Fetch OCSP Response from provided OCSP Service
+            nonce = (
+                CcAdminUtils.generate_nonce(BaseSettings.SIZE_OF_NONCE_IN_BYTES)
+                if BaseSettings.OCSP_NONCE_ENABLED
+                else None
+            )
+            ocsp_request = CcAdminUtils.build_ocsp_request(cert, issuer, nonce)
+
+            # Reuse a cached or bundled OCSP response if the OCSP nonce is not required
+            ocsp_response = CcAdminUtils.get_stored_ocsp_response(ocsp_request)
+            is_cached_ocsp_response = ocsp_response is not None
+
+            if not is_cached_ocsp_response:
+                if not provided_service_failed:
+                    try:
+                        ocsp_response = function_wrapper_with_timeout(
+                            [
+                                CcAdminUtils.fetch_ocsp_response_from_url,
+                                ocsp_request.public_bytes(serialization.Encoding.DER),
+                                BaseSettings.OCSP_URL,
+                                BaseSettings.OCSP_RETRY_COUNT,
+                                "send_ocsp_request",
+                            ],
+                            BaseSettings.MAX_OCSP_REQUEST_TIME_DELAY * BaseSettings.OCSP_RETRY_COUNT,
+                        )
+                    except Exception as e:
+                        event_log.error(f"Exception occurred while fetching OCSP response from provided OCSP service: {str(e)}")
+                        ocsp_response = None
+                    MetricsRegistry.increment(
+                        "verifier_ocsp_fetch_total", service="provided", result="failure" if ocsp_response is None else "success"
+                    )
+
+                # Fallback to Nvidia OCSP Service if the fetch fails
+                if ocsp_response is None:
+                    Tracer.increment("ocsp.fallbacks")
+                    nonce = CcAdminUtils.generate_nonce(BaseSettings.SIZE_OF_NONCE_IN_BYTES)
+                    ocsp_request = CcAdminUtils.build_ocsp_request(cert, issuer, nonce)
+                    try:
+                        ocsp_response = function_wrapper_with_timeout(
+                            [
+                                CcAdminUtils.fetch_ocsp_response_from_url,
+                                ocsp_request.public_bytes(serialization.Encoding.DER),
+                                BaseSettings.OCSP_URL_NVIDIA,
+                                BaseSettings.OCSP_RETRY_COUNT,
+                                "send_ocsp_request",
+                            ],
+                            BaseSettings.MAX_OCSP_REQUEST_TIME_DELAY * BaseSettings.OCSP_RETRY_COUNT,
+                        )
+                    except Exception as e:
+                        event_log.error(f"Exception occurred while fetching OCSP response from Nvidia OCSP service: {str(e)}")
+                        ocsp_response = None
+                    MetricsRegistry.increment(
+                        "verifier_ocsp_fetch_total", service="nvidia", result="failure" if ocsp_response is None else "success"
+                    )
+
+                # Use an expired bundled OCSP response if it is allowed and both OCSP services can not be reached,
+                # the validation still applies the OCSP validity extension to it
+                if ocsp_response is None and BaseSettings.OCSP_BUNDLE_ALLOW_EXPIRED:
+                    ocsp_response = OcspBundle.get(
+                        ocsp_request.issuer_key_hash, ocsp_request.serial_number, allow_expired=True
+                    )
+                    if ocsp_response is not None:
+                        event_log.warning(f"Using the bundled OCSP response for serial number {format(cert.serial_number, 'x')}")
+                        nonce = None
+                        is_cached_ocsp_response = True
+
+        return ocsp_request, ocsp_response, nonce, is_cached_ocsp_response
+
+    @staticmethod
+    def get_stored_ocsp_response(ocsp_request):
+        """ A static method to get the ocsp response of a certificate from the ocsp cache, or from the ocsp bundle.
+
+        Args:
+            ocsp_request (cryptography.x509.ocsp.OCSPRequest): the ocsp request of the certificate.
+
+        Returns:
+            [cryptography.x509.ocsp.OCSPResponse]: the ocsp response, or None if there is no fresh stored response.
+        """
+        ocsp_response = OcspCache.get(ocsp_request.issuer_key_hash, ocsp_request.serial_number)
+        if ocsp_response is None:
+            ocsp_response = OcspBundle.get(ocsp_request.issuer_key_hash, ocsp_request.serial_number)
+        return ocsp_response
+
     @staticmethod
     def fetch_ocsp_response_from_url(ocsp_request_data, url, max_retries):
         """ A static method to prepare http request and send it to the ocsp server
@@ -451,19 +815,20 @@ class CcAdminUtils:
 
         # Sending the ocsp request to the given url
         try:
-            ocsp_request = request.Request(url, ocsp_request_data)
-            ocsp_request.add_header("Content-Type", "application/ocsp-request")
-
-            with request.urlopen(ocsp_request) as ocsp_response_data:
-                ocsp_response = ocsp.load_der_ocsp_response(ocsp_response_data.read())
-                event_log.debug(f"Successfully fetched the ocsp response from {url}")
-                return ocsp_response
+            with Tracer.span("ocsp_request", url=url):
+                ocsp_response_data = HttpClient.post(
+                    url, ocsp_request_data, "application/ocsp-request", BaseSettings.MAX_OCSP_REQUEST_TIME_DELAY
+                )
+                ocsp_response = ocsp.load_der_ocsp_response(ocsp_response_data)
+            event_log.debug(f"Successfully fetched the ocsp response from {url}")
+            return ocsp_response
 
         except Exception as e:
             event_log.error(f"Error while fetching the ocsp response from {url}")
             if isinstance(e, HTTPError):
-                event_log.error(f"HTTP Error code : {e.code}")
-            if max_retries > 0:
+                event_log.error(f"HTTP Error code : {e.response.status_code}")
+            if max_retries > 0 and not is_call_cancelled():
+                Tracer.increment("ocsp.retries")
                 time.sleep(BaseSettings.OCSP_RETRY_DELAY)
                 return CcAdminUtils.fetch_ocsp_response_from_url(ocsp_request_data, url, max_retries - 1)
             else:
@@ -516,18 +881,19 @@ class CcAdminUtils:
 
         # Fetching the RIM file from the given url
         try:
-            with request.urlopen(url + rim_id) as https_response:
-                data = https_response.read()
-                json_object = json.loads(data)
-                base64_data = json_object["rim"]
-                decoded_str = base64.b64decode(base64_data).decode("utf-8")
-                event_log.debug(f"Successfully fetched the RIM file from {url + rim_id}")
-                return decoded_str
+            with Tracer.span("rim_service_request", url=url):
+                data = HttpClient.get(url + rim_id, BaseSettings.MAX_RIM_REQUEST_TIME_DELAY)
+            json_object = json.loads(data)
+            base64_data = json_object["rim"]
+            decoded_str = base64.b64decode(base64_data).decode("utf-8")
+            event_log.debug(f"Successfully fetched the RIM file from {url + rim_id}")
+            return decoded_str
         except Exception as e:
             event_log.error(f"Error while fetching the RIM file from {url + rim_id}")
             if isinstance(e, HTTPError):
-                event_log.error(f"HTTP Error code : {e.code}")
-            if max_retries > 0:
+                event_log.error(f"HTTP Error code : {e.response.status_code}")
+            if max_retries > 0 and not is_call_cancelled():
+                Tracer.increment("rim_service.retries")
                 time.sleep(BaseSettings.RIM_SERVICE_RETRY_DELAY)
                 return CcAdminUtils.fetch_rim_file_from_url(rim_id, url, max_retries - 1)
             else:
@@ -536,7 +902,8 @@ class CcAdminUtils:
     @staticmethod
     def fetch_rim_file(rim_id, max_retries=BaseSettings.RIM_SERVICE_RETRY_COUNT):
         """A static method to fetch the RIM file with the given file id from the RIM service.
-            It tries to fetch the RIM file from provided RIM service, and fallback to the Nvidia RIM service if the fetch fails.
+            It first looks up the RIM file in the local RIM cache and in the RIM bundle, then tries to fetch the RIM
+            file from provided RIM service, and fallback to the Nvidia RIM service if the fetch fails.
 
         Args:
             rim_id (str): the RIM file id which need to be fetched from the RIM service.
@@ -547,6 +914,20 @@ class CcAdminUtils:
         Returns:
             [str]: the content of the required RIM file as a string.
         """
+        # Using the RIM file from the local RIM cache if it is available
+        rim_result = RimCache.get(rim_id)
+        if rim_result is not None:
+            event_log.debug(f"Using RIM {rim_id} from the RIM cache")
+            MetricsRegistry.increment("verifier_rim_fetch_total", service="cache", result="success")
+            return rim_result
+
+        # Using the RIM file from the RIM bundle if one is configured
+        rim_result = RimBundle.get(rim_id)
+        if rim_result is not None:
+            event_log.debug(f"Using RIM {rim_id} from the RIM bundle")
+            MetricsRegistry.increment("verifier_rim_fetch_total", service="bundle", result="success")
+            return rim_result
+
         # Fetching the RIM file from the provided RIM service
         try:
             rim_result = function_wrapper_with_timeout(
@@ -565,7 +946,9 @@ class CcAdminUtils:
 
         # RIM is successfully fetched from the provided RIM service
         if rim_result is not None:
+            MetricsRegistry.increment("verifier_rim_fetch_total", service="provided", result="success")
             return rim_result
+        MetricsRegistry.increment("verifier_rim_fetch_total", service="provided", result="failure")
 
         # Log error if RIM file is not fetched from the provided RIM service
         event_log.error(f"Failed to fetch RIM {rim_id} from provided RIM service: {BaseSettings.RIM_SERVICE_BASE_URL}")
@@ -573,6 +956,7 @@ class CcAdminUtils:
         # Fallback to the Nvidia RIM service if the fetch fails
         if BaseSettings.RIM_SERVICE_BASE_URL_NVIDIA != BaseSettings.RIM_SERVICE_BASE_URL:
             event_log.info(f"Falling back to Nvidia RIM service {BaseSettings.RIM_SERVICE_BASE_URL_NVIDIA}")
+            Tracer.increment("rim_service.fallbacks")
             try:
                 rim_result = function_wrapper_with_timeout(
                     [
@@ -590,12 +974,15 @@ class CcAdminUtils:
 
             # RIM is successfully fetched from the Nvidia RIM service
             if rim_result is not None:
+                MetricsRegistry.increment("verifier_rim_fetch_total", service="nvidia", result="success")
                 return rim_result
+            MetricsRegistry.increment("verifier_rim_fetch_total", service="nvidia", result="failure")
 
             # Log error if RIM file is not fetched from the Nvidia RIM service
             event_log.error(f"Failed to fetch RIM {rim_id} from Nvidia RIM service: {BaseSettings.RIM_SERVICE_BASE_URL_NVIDIA}")
 
         # Raise error if RIM file is not fetched from both the RIM services
+        MetricsRegistry.increment("verifier_errors_total", error="RIMFetchError")
         raise RIMFetchError(f"Could not fetch the required RIM file : {rim_id} from the RIM service.")
 
     @staticmethod
@@ -613,6 +1000,30 @@ class CcAdminUtils:
 
         return base_str + project + "_" + project_sku + "_" + chip_sku + "_" + vbios_version
 
+    @staticmethod
+    def get_vbios_rim_file_id_from_report(attestation_report):
+        """ A static method to generate the VBIOS RIM file id from the opaque data of the attestation report.
+
+        Args:
+            attestation_report (AttestationReport): the object representing the attestation report.
+
+        Returns:
+            [tuple]: the VBIOS RIM file id and the VBIOS version in lower case.
+        """
+        opaque_data = attestation_report.get_response_message().get_opaque_data()
+        project = opaque_data.get_data("OPAQUE_FIELD_ID_PROJECT")
+        project_sku = opaque_data.get_data("OPAQUE_FIELD_ID_PROJECT_SKU")
+        chip_sku = opaque_data.get_data("OPAQUE_FIELD_ID_CHIP_SKU")
+        vbios_version = format_vbios_version(opaque_data.get_data("OPAQUE_FIELD_ID_VBIOS_VERSION"))
+        vbios_version_for_id = vbios_version.replace(".", "").upper()
+
+        project = project.decode("ascii").strip().strip("\x00").upper()
+        project_sku = project_sku.decode("ascii").strip().strip("\x00").upper()
+        chip_sku = chip_sku.decode("ascii").strip().strip("\x00").upper()
+
+        vbios_rim_file_id = CcAdminUtils.get_vbios_rim_file_id(project, project_sku, chip_sku, vbios_version_for_id)
+        return vbios_rim_file_id, vbios_version.lower()
+
     @staticmethod
     def get_driver_rim_file_id(driver_version):
         """ A static method to generate the driver RIM file id to be fetched from the RIM service corresponding to
@@ -655,10 +1066,9 @@ class CcAdminUtils:
         chip_sku = chip_sku.lower()
 
         rim_file_name = project + "_" + project_sku + "_" + chip_sku + "_" + vbios_version + "_" + settings.get_sku() + ".swidtag"
-        list_of_files = os.listdir(settings.RIM_DIRECTORY_PATH)
         rim_path = os.path.join(settings.RIM_DIRECTORY_PATH, rim_file_name)
 
-        if rim_file_name in list_of_files:
+        if os.path.isfile(rim_path):
             return rim_path
 
         raise RIMFetchError(f"Could not find the required VBIOS RIM file : {rim_path}")
@@ -57,6 +57,8 @@ event_log.debug("----------STARTING----------")
 
 
 class BaseSettings:
+    # A settings object is created for every GPU attestation, its checks are the bits of the status
+    __slots__ = ("status", "gpu_driver_version", "gpu_vbios_version", "ocsp_valid_until")
     AZURE_VM_REGION = ""
     AZURE_IMDS_URL = "http://169.254.169.254/metadata/instance?api-version=2021-02-01"
     AZURE_THIM_ENDPOINT_DICT = {
@@ -70,6 +72,8 @@ class BaseSettings:
     SIZE_OF_NONCE_IN_HEX_STR = 64
     gpu_availability = False
     attestation_report_availability = False
+    # The overall result of the last attestation, set once all its GPUs are attested
+    test_result = False
     TEST_NO_GPU_NUMBER_OF_GPUS = 1
     NONCE = "4cff7f5380ead8fad8ec2c531c110aca4302a88f603792801a8ca29ee151af2e"
     # The maximum number of times the CC ADMIN will retry the GPU attestation.
@@ -79,6 +83,24 @@ class BaseSettings:
     MAX_NVML_TIME_DELAY = 5
     MAX_OCSP_REQUEST_TIME_DELAY = 10
     MAX_RIM_REQUEST_TIME_DELAY = 10
+    # The maximum number of threads running the network calls and the NVML calls made with a timeout, and the
+    # time in seconds a call may wait for a thread before it is cancelled.
+    MAX_CALL_EXECUTOR_WORKERS = 32
+    MAX_NVML_EXECUTOR_WORKERS = 8
+    MAX_CALL_QUEUE_TIME_DELAY = 60
+    # The maximum number of threads fetching the OCSP responses of the certificates one by one, shared by
+    # all the certificate chains.
+    MAX_OCSP_FETCH_WORKERS = 8
+    # The maximum number of threads prefetching the RIM files and OCSP responses of an attestation.
+    MAX_PREFETCH_WORKERS = 8
+    # The maximum number of GPUs whose evidence is collected concurrently, and the time in seconds the
+    # collection of the evidence of each GPU may take.
+    MAX_EVIDENCE_COLLECTION_WORKERS = 8
+    MAX_GPU_EVIDENCE_TIME_DELAY = 30
+    PREFETCH_ENABLED = True
+    HTTP_CONNECT_TIMEOUT = 5
+    HTTP_POOL_CONNECTIONS = 4
+    HTTP_POOL_MAX_SIZE = 16
     OCSP_URL = ""
     OCSP_URL_NVIDIA = os.getenv("NV_OCSP_URL", "https://ocsp.ndis.nvidia.com/")
     OCSP_NONCE_ENABLED = False
@@ -94,6 +116,20 @@ class BaseSettings:
     RIM_SERVICE_BASE_URL_NVIDIA = os.getenv("NV_RIM_URL", "https://rim.attestation.nvidia.com/v1/rim/")
     RIM_SERVICE_RETRY_COUNT = 3
     RIM_SERVICE_RETRY_DELAY = 0.1
+    RIM_CACHE_ENABLED = True
+    RIM_CACHE_DIR = os.getenv(
+        "NV_RIM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nv-local-gpu-verifier", "rims")
+    )
+    RIM_CACHE_MAX_SIZE_BYTES = 64 * 1024 * 1024
+    RIM_CACHE_MAX_AGE_HRS = 30 * 24
+    RIM_BUNDLE_PATH = os.getenv("NV_RIM_BUNDLE", "")
+    RIM_BUNDLE_PUBLIC_KEY = os.getenv("NV_RIM_BUNDLE_PUBLIC_KEY", "")
+    OCSP_CACHE_ENABLED = True
+    OCSP_BATCH_REQUEST_ENABLED = True
+    OCSP_CACHE_DIR = os.getenv("NV_OCSP_CACHE_DIR", "")
+    OCSP_BUNDLE_PATH = os.getenv("NV_OCSP_BUNDLE", "")
+    OCSP_BUNDLE_ALLOW_EXPIRED = False
+    INCREMENTAL_ATTESTATION_ENABLED = False
     Certificate_Chain_Verification_Mode = Enum(
         "CERT CHAIN VERIFICATION MODE", ["GPU_ATTESTATION", "OCSP_RESPONSE", "DRIVER_RIM_CERT", "VBIOS_RIM_CERT"]
     )
@@ -139,6 +175,63 @@ class BaseSettings:
         "MEASUREMENT_MATCH": 29,
     }
 
+    # The bits of the status of a settings object, one for every check of the attestation of the GPU
+    class Status:
+        MEASUREMENT_COMPARISON = 1 << 0
+        GPU_ARCH_IS_CORRECT = 1 << 1
+        ATTESTATION_REPORT_MEASUREMENTS_AVAILABILITY = 1 << 2
+        GPU_INFO_FETCH = 1 << 3
+        GPU_CERT_CHAIN_VERIFICATION = 1 << 4
+        ROOT_CERT_AVAILABILITY = 1 << 5
+        ATTESTATION_REPORT_VERIFICATION = 1 << 6
+        PARSE_ATTESTATION_REPORT = 1 << 7
+        NONCE_COMPARISON = 1 << 8
+        ATTESTATION_REPORT_DRIVER_VERSION_MATCH = 1 << 9
+        ATTESTATION_REPORT_VBIOS_VERSION_MATCH = 1 << 10
+        RIM_DRIVER_VERSION_MATCH = 1 << 11
+        RIM_VBIOS_VERSION_MATCH = 1 << 12
+        RIM_DRIVER_MEASUREMENTS_AVAILABILITY = 1 << 13
+        RIM_VBIOS_MEASUREMENTS_AVAILABILITY = 1 << 14
+        DRIVER_RIM_SCHEMA_VALIDATION = 1 << 15
+        VBIOS_RIM_SCHEMA_VALIDATION = 1 << 16
+        DRIVER_RIM_SIGNATURE_VERIFICATION = 1 << 17
+        VBIOS_RIM_SIGNATURE_VERIFICATION = 1 << 18
+        DRIVER_RIM_CERTIFICATE_EXTRACTION = 1 << 19
+        VBIOS_RIM_CERTIFICATE_EXTRACTION = 1 << 20
+        FETCH_DRIVER_RIM = 1 << 21
+        FETCH_VBIOS_RIM = 1 << 22
+        NO_DRIVER_VBIOS_MEASUREMENT_INDEX_CONFLICT = 1 << 23
+        GPU_CERTIFICATE_OCSP_NONCE_MATCH = 1 << 24
+        GPU_CERTIFICATE_OCSP_SIGNATURE_VERIFICATION = 1 << 25
+        GPU_CERTIFICATE_OCSP_CERT_CHAIN_VERIFICATION = 1 << 26
+        GPU_CERT_CHECK_COMPLETE = 1 << 27
+        GPU_ATTESTATION_REPORT_CERT_CHAIN_VALIDATED = 1 << 28
+        DRIVER_RIM_CERTIFICATE_VALIDATED = 1 << 29
+        VBIOS_RIM_CERTIFICATE_VALIDATED = 1 << 30
+        ATTESTATION_REPORT_SIGNATURE_VERIFICATION = 1 << 31
+
+    # The checks which all must pass for the attestation of a GPU to succeed
+    REQUIRED_STATUS = (
+        Status.GPU_ARCH_IS_CORRECT
+        | Status.GPU_ATTESTATION_REPORT_CERT_CHAIN_VALIDATED
+        | Status.PARSE_ATTESTATION_REPORT
+        | Status.NONCE_COMPARISON
+        | Status.ATTESTATION_REPORT_DRIVER_VERSION_MATCH
+        | Status.ATTESTATION_REPORT_VBIOS_VERSION_MATCH
+        | Status.ATTESTATION_REPORT_SIGNATURE_VERIFICATION
+        | Status.FETCH_DRIVER_RIM
+        | Status.DRIVER_RIM_SCHEMA_VALIDATION
+        | Status.DRIVER_RIM_CERTIFICATE_VALIDATED
+        | Status.DRIVER_RIM_SIGNATURE_VERIFICATION
+        | Status.RIM_DRIVER_MEASUREMENTS_AVAILABILITY
+        | Status.FETCH_VBIOS_RIM
+        | Status.VBIOS_RIM_SCHEMA_VALIDATION
+        | Status.VBIOS_RIM_SIGNATURE_VERIFICATION
+        | Status.RIM_VBIOS_MEASUREMENTS_AVAILABILITY
+        | Status.NO_DRIVER_VBIOS_MEASUREMENT_INDEX_CONFLICT
+        | Status.MEASUREMENT_COMPARISON
+    )
+
     @classmethod
     def set_rim_service_base_url(cls, url):
         if not isinstance(url, str):
@@ -159,6 +252,54 @@ class BaseSettings:
             url += '/'
         cls.OCSP_URL = url
 
+    @classmethod
+    def set_rim_root_certificate(cls, path):
+        if not isinstance(path, str):
+            raise ValueError("Incorrect data type for the RIM root certificate path.")
+        if not os.path.isfile(path):
+            raise ValueError(f"RIM root certificate {path} does not exist")
+        cls.RIM_ROOT_CERT = os.path.abspath(path)
+
+    @classmethod
+    def set_rim_cache_dir(cls, path):
+        if not isinstance(path, str):
+            raise ValueError("Incorrect data type for the RIM cache directory.")
+        if not path:
+            raise ValueError("RIM cache directory is empty")
+        cls.RIM_CACHE_DIR = path
+
+    @classmethod
+    def set_rim_bundle_path(cls, path):
+        if not isinstance(path, str):
+            raise ValueError("Incorrect data type for the RIM bundle path.")
+        if not os.path.isfile(path):
+            raise ValueError(f"RIM bundle {path} does not exist")
+        cls.RIM_BUNDLE_PATH = os.path.abspath(path)
+
+    @classmethod
+    def set_rim_bundle_public_key(cls, path):
+        if not isinstance(path, str):
+            raise ValueError("Incorrect data type for the RIM bundle public key path.")
+        if not os.path.isfile(path):
+            raise ValueError(f"RIM bundle public key {path} does not exist")
+        cls.RIM_BUNDLE_PUBLIC_KEY = os.path.abspath(path)
+
+    @classmethod
+    def set_ocsp_cache_dir(cls, path):
+        if not isinstance(path, str):
+            raise ValueError("Incorrect data type for the OCSP cache directory.")
+        if not path:
+            raise ValueError("OCSP cache directory is empty")
+        cls.OCSP_CACHE_DIR = path
+
+    @classmethod
+    def set_ocsp_bundle_path(cls, path):
+        if not isinstance(path, str):
+            raise ValueError("Incorrect data type for the OCSP bundle path.")
+        if not os.path.isfile(path):
+            raise ValueError(f"OCSP bundle {path} does not exist")
+        cls.OCSP_BUNDLE_PATH = os.path.abspath(path)
+
     @classmethod
     def get_sku(cls):
         return cls.SKU
@@ -223,40 +364,13 @@ class BaseSettings:
             cls.OCSP_NONCE_ENABLED = True
 
     def __init__(self):
-        self.measurement_comparison = False
-        self.gpu_arch_is_correct = False
-        self.attestation_report_measurements_availability = False
-        self.gpu_info_fetch = False
-        self.gpu_cert_chain_verification = False
-        self.root_cert_availability = False
-        self.attestation_report_verification = False
-        self.parse_attestation_report = False
-        self.nonce_comparison = False
-        self.attestation_report_driver_version_match = False
-        self.attestation_report_vbios_version_match = False
-        self.rim_driver_version_match = False
-        self.rim_vbios_version_match = False
-        self.rim_driver_measurements_availability = False
-        self.rim_vbios_measurements_availability = False
-        self.driver_rim_schema_validation = False
-        self.vbios_rim_schema_validation = False
-        self.driver_rim_signature_verification = False
-        self.vbios_rim_signature_verification = False
-        self.driver_rim_certificate_extraction = False
-        self.vbios_rim_certificate_extraction = False
-        self.fetch_driver_rim = False
-        self.fetch_vbios_rim = False
-        self.no_driver_vbios_measurement_index_conflict = False
-        self.gpu_certificate_ocsp_nonce_match = False
-        self.gpu_certificate_ocsp_signature_verification = False
-        self.gpu_certificate_ocsp_cert_chain_verification = False
-        self.gpu_cert_check_complete = False
-        self.gpu_attestation_report_cert_chain_validated = False
-        self.driver_rim_certificate_validated = False
-        self.vbios_rim_certificate_validated = False
-        self.attestation_report_signature_verification = False
+        self.status = 0
         self.gpu_driver_version = ""
         self.gpu_vbios_version = ""
+        self.ocsp_valid_until = None
+
+    def is_marked(self, status):
+        return self.status & status == status
 
     @classmethod
     def mark_attestation_report_as_available(cls):
@@ -264,64 +378,67 @@ class BaseSettings:
         cls.attestation_report_availability = True
 
     def check_if_gpu_attestation_report_cert_chain_validated(self):
-        event_log.debug(
-            f"check_if_gpu_attestation_report_cert_chain_validated: {self.gpu_attestation_report_cert_chain_validated}"
-        )
-        return self.gpu_attestation_report_cert_chain_validated
+        is_marked = self.is_marked(BaseSettings.Status.GPU_ATTESTATION_REPORT_CERT_CHAIN_VALIDATED)
+        event_log.debug(f"check_if_gpu_attestation_report_cert_chain_validated: {is_marked}")
+        return is_marked
 
     def mark_gpu_attestation_report_cert_chain_validated(self):
         event_log.debug("mark_gpu_attestation_report_cert_chain_validated called")
-        self.gpu_attestation_report_cert_chain_validated = True
+        self.status |= BaseSettings.Status.GPU_ATTESTATION_REPORT_CERT_CHAIN_VALIDATED
 
     def check_if_attestation_report_signature_verified(self):
-        event_log.debug(
-            f"check_if_attestation_report_signature_verified: {self.attestation_report_signature_verification}"
-        )
-        return self.attestation_report_signature_verification
+        is_marked = self.is_marked(BaseSettings.Status.ATTESTATION_REPORT_SIGNATURE_VERIFICATION)
+        event_log.debug(f"check_if_attestation_report_signature_verified: {is_marked}")
+        return is_marked
 
     def mark_attestation_report_signature_verified(self):
         event_log.debug("mark_attestation_report_signature_verified called")
-        self.attestation_report_signature_verification = True
+        self.status |= BaseSettings.Status.ATTESTATION_REPORT_SIGNATURE_VERIFICATION
 
     def check_if_driver_rim_fetched(self):
-        event_log.debug(f"check_if_driver_rim_fetched: {self.fetch_driver_rim}")
-        return self.fetch_driver_rim
+        is_marked = self.is_marked(BaseSettings.Status.FETCH_DRIVER_RIM)
+        event_log.debug(f"check_if_driver_rim_fetched: {is_marked}")
+        return is_marked
 
     def mark_driver_rim_fetched(self):
         event_log.debug("mark_driver_rim_fetched called")
-        self.fetch_driver_rim = True
+        self.status |= BaseSettings.Status.FETCH_DRIVER_RIM
 
     def check_if_vbios_rim_fetched(self):
-        event_log.debug(f"check_if_vbios_rim_fetched: {self.fetch_vbios_rim}")
-        return self.fetch_vbios_rim
+        is_marked = self.is_marked(BaseSettings.Status.FETCH_VBIOS_RIM)
+        event_log.debug(f"check_if_vbios_rim_fetched: {is_marked}")
+        return is_marked
 
     def mark_vbios_rim_fetched(self):
         event_log.debug("mark_vbios_rim_fetched called.")
-        self.fetch_vbios_rim = True
+        self.status |= BaseSettings.Status.FETCH_VBIOS_RIM
 
     def check_if_driver_rim_signature_verified(self):
-        event_log.debug(f"check_if_driver_rim_signature_verified: {self.driver_rim_signature_verification}")
-        return self.driver_rim_signature_verification
+        is_marked = self.is_marked(BaseSettings.Status.DRIVER_RIM_SIGNATURE_VERIFICATION)
+        event_log.debug(f"check_if_driver_rim_signature_verified: {is_marked}")
+        return is_marked
 
     def mark_driver_rim_signature_verified(self):
         event_log.debug("mark_driver_rim_signature_verified called.")
-        self.driver_rim_signature_verification = True
+        self.status |= BaseSettings.Status.DRIVER_RIM_SIGNATURE_VERIFICATION
 
     def check_if_vbios_rim_signature_verified(self):
-        event_log.debug(f"check_if_vbios_rim_signature_verified: {self.vbios_rim_signature_verification}")
-        return self.vbios_rim_signature_verification
+        is_marked = self.is_marked(BaseSettings.Status.VBIOS_RIM_SIGNATURE_VERIFICATION)
+        event_log.debug(f"check_if_vbios_rim_signature_verified: {is_marked}")
+        return is_marked
 
     def mark_vbios_rim_signature_verified(self):
         event_log.debug("mark_vbios_rim_signature_verified called.")
-        self.vbios_rim_signature_verification = True
+        self.status |= BaseSettings.Status.VBIOS_RIM_SIGNATURE_VERIFICATION
 
     def check_if_driver_rim_schema_validated(self):
-        event_log.debug(f"check_if_driver_rim_schema_validated: {self.driver_rim_schema_validation}")
-        return self.driver_rim_schema_validation
+        is_marked = self.is_marked(BaseSettings.Status.DRIVER_RIM_SCHEMA_VALIDATION)
+        event_log.debug(f"check_if_driver_rim_schema_validated: {is_marked}")
+        return is_marked
 
     def mark_driver_rim_schema_validated(self):
         event_log.debug("mark_driver_rim_schema_validated called.")
-        self.driver_rim_schema_validation = True
+        self.status |= BaseSettings.Status.DRIVER_RIM_SCHEMA_VALIDATION
 
     def check_gpu_driver_version(self):
         event_log.debug(f"check_gpu_driver_version called.{self.gpu_driver_version}")
@@ -341,159 +458,161 @@ class BaseSettings:
             self.gpu_vbios_version = vbios_version.upper()
 
     def check_if_vbios_rim_schema_validated(self):
-        event_log.debug(f"check_if_vbios_rim_schema_validated: {self.vbios_rim_schema_validation}")
-        return self.vbios_rim_schema_validation
+        is_marked = self.is_marked(BaseSettings.Status.VBIOS_RIM_SCHEMA_VALIDATION)
+        event_log.debug(f"check_if_vbios_rim_schema_validated: {is_marked}")
+        return is_marked
 
     def mark_vbios_rim_schema_validated(self):
         event_log.debug("mark_vbios_rim_schema_validated called.")
-        self.vbios_rim_schema_validation = True
+        self.status |= BaseSettings.Status.VBIOS_RIM_SCHEMA_VALIDATION
 
     def check_rim_driver_measurements_availability(self):
-        event_log.debug(f"check_rim_driver_measurements_availability: {self.rim_driver_measurements_availability}")
-        return self.rim_driver_measurements_availability
+        is_marked = self.is_marked(BaseSettings.Status.RIM_DRIVER_MEASUREMENTS_AVAILABILITY)
+        event_log.debug(f"check_rim_driver_measurements_availability: {is_marked}")
+        return is_marked
 
     def mark_rim_driver_measurements_as_available(self):
         event_log.debug("mark_rim_driver_measurements_as_available called.")
-        self.rim_driver_measurements_availability = True
+        self.status |= BaseSettings.Status.RIM_DRIVER_MEASUREMENTS_AVAILABILITY
 
     def check_rim_vbios_measurements_availability(self):
-        event_log.debug(f"check_rim_vbios_measurements_availability: {self.rim_vbios_measurements_availability}")
-        return self.rim_vbios_measurements_availability
+        is_marked = self.is_marked(BaseSettings.Status.RIM_VBIOS_MEASUREMENTS_AVAILABILITY)
+        event_log.debug(f"check_rim_vbios_measurements_availability: {is_marked}")
+        return is_marked
 
     def mark_rim_vbios_measurements_as_available(self):
         event_log.debug("mark_rim_vbios_measurements_as_available called.")
-        self.rim_vbios_measurements_availability = True
+        self.status |= BaseSettings.Status.RIM_VBIOS_MEASUREMENTS_AVAILABILITY
 
     def check_if_measurements_are_matching(self):
-        if self.measurement_comparison:
+        if self.is_marked(BaseSettings.Status.MEASUREMENT_COMPARISON):
             return "success"
         else:
             return "fail"
 
     def mark_measurements_as_matching(self):
         event_log.debug("mark_measurements_as_matching called.")
-        self.measurement_comparison = True
+        self.status |= BaseSettings.Status.MEASUREMENT_COMPARISON
 
     def check_if_rim_driver_version_matches(self):
-        event_log.debug(f"check_if_rim_driver_version_matches: {self.rim_driver_version_match}")
-        return self.rim_driver_version_match
+        is_marked = self.is_marked(BaseSettings.Status.RIM_DRIVER_VERSION_MATCH)
+        event_log.debug(f"check_if_rim_driver_version_matches: {is_marked}")
+        return is_marked
 
     def mark_rim_driver_version_as_matching(self):
         event_log.debug("mark_rim_driver_version_as_matching called.")
-        self.rim_driver_version_match = True
+        self.status |= BaseSettings.Status.RIM_DRIVER_VERSION_MATCH
 
     def check_if_rim_vbios_version_matches(self):
-        event_log.debug(f"check_if_rim_vbios_version_matches: {self.rim_vbios_version_match}")
-        return self.rim_vbios_version_match
+        is_marked = self.is_marked(BaseSettings.Status.RIM_VBIOS_VERSION_MATCH)
+        event_log.debug(f"check_if_rim_vbios_version_matches: {is_marked}")
+        return is_marked
 
     def mark_rim_vbios_version_as_matching(self):
         event_log.debug("mark_rim_vbios_version_as_matching called.")
-        self.rim_vbios_version_match = True
+        self.status |= BaseSettings.Status.RIM_VBIOS_VERSION_MATCH
     
     def check_if_driver_rim_cert_validated(self):
-        event_log.debug(f"check_if_driver_rim_cert_validated: {self.driver_rim_certificate_validated}")
-        return self.driver_rim_certificate_validated
+        is_marked = self.is_marked(BaseSettings.Status.DRIVER_RIM_CERTIFICATE_VALIDATED)
+        event_log.debug(f"check_if_driver_rim_cert_validated: {is_marked}")
+        return is_marked
 
     def mark_driver_rim_cert_validated_successfully(self):
         event_log.debug("mark_driver_rim_cert_validatedd_successfully called.")
-        self.driver_rim_certificate_validated = True
+        self.status |= BaseSettings.Status.DRIVER_RIM_CERTIFICATE_VALIDATED
 
     def check_if_vbios_rim_cert_extracted(self):
-        event_log.debug(f"check_if_vbios_rim_cert_extracted: {self.vbios_rim_certificate_extraction}")
-        return self.vbios_rim_certificate_extraction
+        is_marked = self.is_marked(BaseSettings.Status.VBIOS_RIM_CERTIFICATE_EXTRACTION)
+        event_log.debug(f"check_if_vbios_rim_cert_extracted: {is_marked}")
+        return is_marked
 
     def mark_vbios_rim_cert_extracted_successfully(self):
         event_log.debug("mark_vbios_rim_cert_extracted_successfully called.")
-        self.vbios_rim_certificate_extraction = True
+        self.status |= BaseSettings.Status.VBIOS_RIM_CERTIFICATE_EXTRACTION
 
     def check_if_vbios_rim_cert_validated(self):
-        event_log.debug(f"check_if_vbios_rim_cert_extracted: {self.vbios_rim_certificate_validated}")
-        return self.vbios_rim_certificate_validated
+        is_marked = self.is_marked(BaseSettings.Status.VBIOS_RIM_CERTIFICATE_VALIDATED)
+        event_log.debug(f"check_if_vbios_rim_cert_extracted: {is_marked}")
+        return is_marked
 
     def mark_vbios_rim_cert_validated_successfully(self):
         event_log.debug("mark_vbios_rim_cert_validated_successfully called.")
-        self.vbios_rim_certificate_validated = True
+        self.status |= BaseSettings.Status.VBIOS_RIM_CERTIFICATE_VALIDATED
+
+    def mark_ocsp_valid_until(self, mode, valid_until):
+        event_log.debug(f"mark_ocsp_valid_until called for {str(mode)}.")
+        if self.ocsp_valid_until is None:
+            self.ocsp_valid_until = dict()
+        if mode not in self.ocsp_valid_until or valid_until < self.ocsp_valid_until[mode]:
+            self.ocsp_valid_until[mode] = valid_until
+
+    def get_ocsp_valid_until(self, mode):
+        if self.ocsp_valid_until is None:
+            return None
+        return self.ocsp_valid_until.get(mode)
 
     def check_if_gpu_arch_is_correct(self):
-        event_log.debug(f"check_if_gpu_arch_is_correct: {self.gpu_arch_is_correct}")
-        return self.gpu_arch_is_correct
+        is_marked = self.is_marked(BaseSettings.Status.GPU_ARCH_IS_CORRECT)
+        event_log.debug(f"check_if_gpu_arch_is_correct: {is_marked}")
+        return is_marked
 
     def mark_gpu_arch_is_correct(self):
         event_log.debug("mark_gpu_arch_is_correct called.")
-        self.gpu_arch_is_correct = True
+        self.status |= BaseSettings.Status.GPU_ARCH_IS_CORRECT
 
     def check_if_nonce_are_matching(self):
-        event_log.debug(f"check_if_nonce_are_matching: {self.nonce_comparison}")
-        return self.nonce_comparison
+        is_marked = self.is_marked(BaseSettings.Status.NONCE_COMPARISON)
+        event_log.debug(f"check_if_nonce_are_matching: {is_marked}")
+        return is_marked
 
     def mark_nonce_as_matching(self):
         event_log.debug("mark_nonce_as_matching called.")
-        self.nonce_comparison = True
+        self.status |= BaseSettings.Status.NONCE_COMPARISON
 
     def check_if_attestation_report_parsed_successfully(self):
-        event_log.debug(f"check_if_attestation_report_parsed_successfully: {self.parse_attestation_report}")
-        return self.parse_attestation_report
+        is_marked = self.is_marked(BaseSettings.Status.PARSE_ATTESTATION_REPORT)
+        event_log.debug(f"check_if_attestation_report_parsed_successfully: {is_marked}")
+        return is_marked
 
     def mark_attestation_report_parsed(self):
         event_log.debug("mark_attestation_report_parsed called.")
-        self.parse_attestation_report = True
+        self.status |= BaseSettings.Status.PARSE_ATTESTATION_REPORT
 
     def check_if_attestation_report_driver_version_matches(self):
-        event_log.debug(
-            f"check_if_attestation_report_vbios_version_matches: {self.attestation_report_vbios_version_match}"
-        )
-        return self.attestation_report_driver_version_match
+        is_marked = self.is_marked(BaseSettings.Status.ATTESTATION_REPORT_DRIVER_VERSION_MATCH)
+        event_log.debug(f"check_if_attestation_report_driver_version_matches: {is_marked}")
+        return is_marked
 
     def mark_attestation_report_driver_version_as_matching(self):
         event_log.debug("mark_attestation_report_driver_version_as_matching called.")
-        self.attestation_report_driver_version_match = True
+        self.status |= BaseSettings.Status.ATTESTATION_REPORT_DRIVER_VERSION_MATCH
 
     def check_if_attestation_report_vbios_version_matches(self):
-        return self.attestation_report_vbios_version_match
+        return self.is_marked(BaseSettings.Status.ATTESTATION_REPORT_VBIOS_VERSION_MATCH)
 
     def mark_attestation_report_vbios_version_as_matching(self):
         event_log.debug("mark_attestation_report_vbios_version_as_matching called.")
-        self.attestation_report_vbios_version_match = True
+        self.status |= BaseSettings.Status.ATTESTATION_REPORT_VBIOS_VERSION_MATCH
 
     def check_if_no_driver_vbios_measurement_index_conflict(self):
-        event_log.debug(
-            f"check_if_no_driver_vbios_measurement_index_conflict: {self.no_driver_vbios_measurement_index_conflict}"
-        )
-        return self.no_driver_vbios_measurement_index_conflict
+        is_marked = self.is_marked(BaseSettings.Status.NO_DRIVER_VBIOS_MEASUREMENT_INDEX_CONFLICT)
+        event_log.debug(f"check_if_no_driver_vbios_measurement_index_conflict: {is_marked}")
+        return is_marked
 
     def mark_no_driver_vbios_measurement_index_conflict(self):
         event_log.debug("mark_no_driver_vbios_measurement_conflict called.")
-        self.no_driver_vbios_measurement_index_conflict = True
+        self.status |= BaseSettings.Status.NO_DRIVER_VBIOS_MEASUREMENT_INDEX_CONFLICT
 
     def check_status(self):
-        if (
-            self.check_if_gpu_arch_is_correct()
-            and self.check_if_gpu_attestation_report_cert_chain_validated()
-            and self.check_if_attestation_report_parsed_successfully()
-            and self.check_if_nonce_are_matching()
-            and self.check_if_attestation_report_driver_version_matches()
-            and self.check_if_attestation_report_vbios_version_matches()
-            and self.check_if_attestation_report_signature_verified()
-            and self.check_if_driver_rim_fetched()
-            and self.check_if_driver_rim_schema_validated()
-            and self.check_if_driver_rim_cert_validated()
-            and self.check_if_driver_rim_signature_verified()
-            and self.check_rim_driver_measurements_availability()
-            and self.check_if_vbios_rim_fetched()
-            and self.check_if_vbios_rim_schema_validated()
-            and self.check_if_vbios_rim_signature_verified()
-            and self.check_rim_vbios_measurements_availability()
-            and self.check_if_no_driver_vbios_measurement_index_conflict()
-            and self.check_if_measurements_are_matching() == "success"
-        ):
-            BaseSettings.test_result = True
+        if self.is_marked(BaseSettings.REQUIRED_STATUS):
             return True
         else:
-            BaseSettings.test_result = False
+            event_log.debug(f"check_status: failed checks {BaseSettings.REQUIRED_STATUS & ~self.status:#x}")
             return False
 
 
 class HopperSettings(BaseSettings):
+    __slots__ = ()
     signature_length = 96
     HashFunction = sha384
     MAX_CERT_CHAIN_LENGTH = 5
@@ -259,6 +259,13 @@ class InvalidRIMNameError(RIMError):
     pass
 
 
+class RIMBundleError(RIMError):
+    """ It is raised in case the RIM bundle can not be read, is malformed or
+    fails the signature verification.
+    """
+    pass
+
+
 class VerifierError(Error):
     """ It is the base class for the exceptions related to the verifier.
     """
@@ -54,6 +54,8 @@ from pynvml import (
 from verifier.utils import (
     get_gpu_architecture_value,
     function_wrapper_with_timeout,
+    NVML_POOL,
+    buffer_to_bytes,
 )
 from verifier.config import (
     BaseSettings,
@@ -77,6 +79,7 @@ class NvmlHandler:
     """ Class to handle all the pynvml api calls and fetching the GPU information.
     """
     Handles = None
+    Initialized = False
 
     @classmethod
     def get_number_of_gpus(cls):
@@ -88,27 +91,32 @@ class NvmlHandler:
         """
         number_of_gpus = function_wrapper_with_timeout([nvmlDeviceGetCount,
                                                         "nvmlDeviceGetCount"],
-                                                       BaseSettings.MAX_NVML_TIME_DELAY)
+                                                       BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
         cls.Handles = list()
 
         for i in range(number_of_gpus):
             cls.Handles.append(function_wrapper_with_timeout([nvmlDeviceGetHandleByIndex,
                                                               i,
                                                               "nvmlDeviceGetHandleByIndex"],
-                                                             BaseSettings.MAX_NVML_TIME_DELAY))
+                                                             BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL))
         return number_of_gpus
 
-    @staticmethod
-    def close_nvml():
-        """ Static method to close the pynvml library.
+    @classmethod
+    def close_nvml(cls):
+        """ Class method to close the pynvml library.
         """
-        function_wrapper_with_timeout([nvmlShutdown, "nvmlShutdown"], BaseSettings.MAX_NVML_TIME_DELAY)
+        function_wrapper_with_timeout([nvmlShutdown, "nvmlShutdown"], BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
+        cls.Initialized = False
 
-    @staticmethod
-    def init_nvml():
-        """ Static method to initialize the pynvml library.
+    @classmethod
+    def init_nvml(cls):
+        """ Class method to initialize the pynvml library. The library is only initialized once
+        until close_nvml is called, so that a long running process can reuse it across attestations.
         """
-        function_wrapper_with_timeout([nvmlInit, "nvmlInit"], BaseSettings.MAX_NVML_TIME_DELAY)
+        if cls.Initialized:
+            return
+        function_wrapper_with_timeout([nvmlInit, "nvmlInit"], BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
+        cls.Initialized = True
 
     @staticmethod
     def set_gpu_ready_state(state):
@@ -124,7 +132,7 @@ class NvmlHandler:
         function_wrapper_with_timeout([nvmlSystemSetConfComputeGpusReadyState,
                                        ready_state,
                                        "nvmlSystemSetConfComputeGpusReadyState"],
-                                      BaseSettings.MAX_NVML_TIME_DELAY)
+                                      BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
 
     @staticmethod
     def is_cc_enabled():
@@ -135,7 +143,7 @@ class NvmlHandler:
                     returns False.
         """
         state = function_wrapper_with_timeout([nvmlSystemGetConfComputeState,
-                                               "nvmlSystemGetConfComputeState"], BaseSettings.MAX_NVML_TIME_DELAY)
+                                               "nvmlSystemGetConfComputeState"], BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
         return state.ccFeature != 0
 
     @staticmethod
@@ -148,7 +156,7 @@ class NvmlHandler:
         """
         settings = NvmlSystemConfComputeSettings()
         state = function_wrapper_with_timeout([nvmlSystemGetConfComputeSettings, ctypes.byref(settings),
-                                               "nvmlSystemGetConfComputeSettings"], BaseSettings.MAX_NVML_TIME_DELAY)
+                                               "nvmlSystemGetConfComputeSettings"], BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
         return settings.multiGpuMode != 0
 
     @staticmethod
@@ -160,7 +168,7 @@ class NvmlHandler:
                     returns False.
         """
         state = function_wrapper_with_timeout([nvmlSystemGetConfComputeState,
-                                               "nvmlSystemGetConfComputeState"], BaseSettings.MAX_NVML_TIME_DELAY)
+                                               "nvmlSystemGetConfComputeState"], BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
         return state.devToolsMode != 0
 
     @staticmethod
@@ -172,7 +180,7 @@ class NvmlHandler:
         """
         state = function_wrapper_with_timeout([nvmlSystemGetConfComputeGpusReadyState,
                                                "nvmlSystemGetConfComputeGpusReadyState"],
-                                              BaseSettings.MAX_NVML_TIME_DELAY)
+                                              BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
         return state
 
     def fetch_attestation_report(self, index, nonce):
@@ -195,15 +203,9 @@ class NvmlHandler:
                                                                        self.Handles[index],
                                                                        nonce,
                                                                        "nvmlDeviceGetConfComputeGpuAttestationReport"],
-                                                                      BaseSettings.MAX_NVML_TIME_DELAY)
-            length_of_attestation_report = attestation_report_struct.attestationReportSize
-            attestation_report = attestation_report_struct.attestationReport
-            attestation_report_data = list()
-
-            for i in range(length_of_attestation_report):
-                attestation_report_data.append(attestation_report[i])
-
-            bin_attestation_report_data = bytes(attestation_report_data)
+                                                                      BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
+            bin_attestation_report_data = buffer_to_bytes(attestation_report_struct.attestationReport,
+                                                          attestation_report_struct.attestationReportSize)
 
             BaseSettings.mark_attestation_report_as_available()
             return bin_attestation_report_data
@@ -272,7 +274,7 @@ class NvmlHandler:
         self.Handles[self.Index] = function_wrapper_with_timeout([nvmlDeviceGetHandleByIndex,
                                                                   self.Index,
                                                                   "nvmlDeviceGetHandleByIndex"],
-                                                                 BaseSettings.MAX_NVML_TIME_DELAY)
+                                                                 BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
 
     def init_driver_version(self):
         """ Fetches and assigns the Driver Version from the driver via pynvml
@@ -280,7 +282,7 @@ class NvmlHandler:
         """
         self.DriverVersion = function_wrapper_with_timeout([nvmlSystemGetDriverVersion,
                                                             "nvmlSystemGetDriverVersion"],
-                                                           BaseSettings.MAX_NVML_TIME_DELAY)
+                                                           BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
 
     def init_board_id(self):
         """ Fetches and assigns the BoardId from the driver via pynvml api.
@@ -288,7 +290,7 @@ class NvmlHandler:
         self.BoardId = function_wrapper_with_timeout([nvmlDeviceGetBoardId,
                                                       self.Handles[self.Index],
                                                       "nvmlDeviceGetBoardId"],
-                                                     BaseSettings.MAX_NVML_TIME_DELAY)
+                                                     BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
 
     def init_uuid(self):
         """ Fetches and assigns the UUID of the GPU to the UUID field.
@@ -296,7 +298,7 @@ class NvmlHandler:
         self.UUID = function_wrapper_with_timeout([nvmlDeviceGetUUID,
                                                    self.Handles[self.Index],
                                                    "nvmlDeviceGetUUID"],
-                                                  BaseSettings.MAX_NVML_TIME_DELAY)
+                                                  BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
 
     def init_gpu_architecture(self):
         """ Fetches and assigns the GPU device architecture field.
@@ -304,7 +306,7 @@ class NvmlHandler:
         self.GPUArchitecture = function_wrapper_with_timeout([nvmlDeviceGetArchitecture,
                                                               self.Handles[self.Index],
                                                               "nvmlDeviceGetArchitecture"],
-                                                             BaseSettings.MAX_NVML_TIME_DELAY)
+                                                             BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
 
     def init_vbios_version(self):
         """ Fetches and assigns the VbiosVersion field via pynvml api.
@@ -312,7 +314,7 @@ class NvmlHandler:
         self.VbiosVersion = function_wrapper_with_timeout([nvmlDeviceGetVbiosVersion,
                                                            self.Handles[self.Index],
                                                            "nvmlDeviceGetVbiosVersion"],
-                                                          BaseSettings.MAX_NVML_TIME_DELAY)
+                                                          BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
 
     def __init__(self, index, nonce, settings):
         """ Constructor method for the NvmlHandler class that initializes the
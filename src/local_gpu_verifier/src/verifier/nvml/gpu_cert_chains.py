@@ -43,7 +43,12 @@ from verifier.exceptions import (
     TimeoutError,
 )
 from .test_handle import TestHandle
-from verifier.utils import function_wrapper_with_timeout
+from verifier.utils import (
+    function_wrapper_with_timeout,
+    NVML_POOL,
+    buffer_to_bytes,
+)
+from verifier.utils.cert_store_cache import CertificateStoreCache
 from verifier.cc_admin_utils import CcAdminUtils
 
 class GpuCertificateChains:
@@ -67,16 +72,10 @@ class GpuCertificateChains:
             cert_struct = function_wrapper_with_timeout([nvmlDeviceGetConfComputeGpuCertificate,
                                                         handle,
                                                         "nvmlDeviceGetConfComputeGpuCertificate"],
-                                                        BaseSettings.MAX_NVML_TIME_DELAY)
+                                                        BaseSettings.MAX_NVML_TIME_DELAY, NVML_POOL)
             # fetching the attestation cert chain.
-            length_of_attestation_cert_chain = cert_struct.attestationCertChainSize
-            attestation_cert_chain = cert_struct.attestationCertChain
-            attestation_cert_data = list()
-
-            for i in range(length_of_attestation_cert_chain):
-                attestation_cert_data.append(attestation_cert_chain[i])
-
-            bin_attestation_cert_data = bytes(attestation_cert_data)
+            bin_attestation_cert_data = buffer_to_bytes(cert_struct.attestationCertChain,
+                                                        cert_struct.attestationCertChainSize)
 
             return bin_attestation_cert_data
         except TimeoutError as err:
@@ -158,6 +157,4 @@ class GpuCertificateChains:
         else:
             self.GpuAttestationCertificateChain = self.extract_cert_chain(self.get_gpu_certificate_chains(handle))[:-1]
         
-        with open(BaseSettings.DEVICE_ROOT_CERT, 'r') as f:
-            data = f.read()
-            self.GpuAttestationCertificateChain.append(crypto.load_certificate(type= crypto.FILETYPE_PEM, buffer= data))
+        self.GpuAttestationCertificateChain.append(CertificateStoreCache.load_root_certificate(BaseSettings.DEVICE_ROOT_CERT))
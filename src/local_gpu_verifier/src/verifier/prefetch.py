@@ -0,0 +1,174 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from verifier.attestation import AttestationReport
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+    event_log,
+)
+from verifier.rim.rim_memo import RimMemo
+from verifier.utils.cert_store_cache import CertificateStoreCache
+from verifier.utils.tracing import Tracer
+
+
+class AttestationPrefetcher:
+    """ A class to fetch the RIM files and the OCSP responses needed by an attestation in the background,
+    so that the network requests overlap with the certificate chain and attestation report checks.
+
+    The RIM file ids of every GPU are computed from the driver version and the opaque data of the
+    attestation report. The RIM files are fetched and parsed through the RimMemo of the attestation and
+    the OCSP responses of the GPU and RIM certificate chains are fetched ahead of
+    CcAdminUtils.ocsp_certificate_chain_validation, which still performs all the checks. A failed
+    prefetch only means that the attestation fetches the data itself.
+    """
+
+    def __init__(self, rim_memo, arguments_as_dictionary):
+        """ The constructor of the AttestationPrefetcher class.
+
+        Args:
+            rim_memo (RimMemo): the memo sharing the RIM files across the GPUs of the attestation.
+            arguments_as_dictionary (Dictionary): the dictionary object containing Attestation Options.
+        """
+        self.rim_memo = rim_memo
+        self.arguments_as_dictionary = arguments_as_dictionary
+        self.executor = None
+        self.lock = threading.Lock()
+        self.closed = False
+        self.ocsp_keys = list()
+
+    def start(self, gpu_evidence_list):
+        """ Starts prefetching the RIM files and OCSP responses of the GPUs.
+
+        Args:
+            gpu_evidence_list (list): the objects containing the evidence of the GPUs.
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=BaseSettings.MAX_PREFETCH_WORKERS, thread_name_prefix="verifier-prefetch"
+        )
+        # The ocsp responses of the GPU certificate chains are registered before the attestation needs them
+        for i, gpu_info_obj in enumerate(gpu_evidence_list):
+            try:
+                if gpu_info_obj.get_gpu_architecture() == "HOPPER":
+                    self.prefetch_ocsp_responses(
+                        gpu_info_obj.get_attestation_cert_chain(),
+                        BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION,
+                    )
+            except Exception as error:
+                event_log.debug(f"The ocsp prefetch for the GPU {i} stopped : {error}")
+        for i, gpu_info_obj in enumerate(gpu_evidence_list):
+            self.executor.submit(Tracer.bind(self.prefetch_gpu), i, gpu_info_obj)
+
+    def close(self):
+        """ Stops the prefetches which have not started and discards the prefetched OCSP responses. """
+        with self.lock:
+            self.closed = True
+            CcAdminUtils.discard_prefetched_ocsp_responses(self.ocsp_keys)
+            self.ocsp_keys = list()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def prefetch_ocsp_responses(self, cert_chain, mode):
+        """ Starts fetching the OCSP responses of a certificate chain.
+
+        Args:
+            cert_chain (list): the OpenSSL.crypto.X509 certificates of the certificate chain.
+            mode (<enum 'CERT CHAIN VERIFICATION MODE'>): the certificate chain verification mode.
+        """
+        cert_pairs = CcAdminUtils.get_ocsp_cert_pairs(cert_chain, mode)
+        with self.lock:
+            if not self.closed:
+                self.ocsp_keys.extend(CcAdminUtils.prefetch_ocsp_responses(cert_pairs, self.executor))
+
+    def prefetch_rim(self, rim_name, rim_id, rim_path):
+        """ Fetches and parses a RIM file through the RimMemo and starts fetching the OCSP responses of
+        its certificate chain.
+
+        Args:
+            rim_name (str): the name of the RIM, can be either "driver" or "vbios".
+            rim_id (str): the RIM file id, or None if the local RIM file is used.
+            rim_path (str): the path to the local RIM file.
+        """
+        settings = HopperSettings()
+        if rim_id is None:
+            key = RimMemo.get_key_for_file(rim_name, rim_path)
+            if key is None:
+                return
+            rim = self.rim_memo.get_rim(key, rim_name, settings, rim_path=rim_path)
+        else:
+            content = self.rim_memo.fetch_rim_file(rim_id, BaseSettings.RIM_SERVICE_RETRY_COUNT)
+            key = RimMemo.get_key(rim_name, rim_id, content)
+            rim = self.rim_memo.get_rim(key, rim_name, settings, content=content)
+
+        # The verification of the RIM holds the lock of its key, the certificates are read once it is released.
+        with self.rim_memo.get_key_lock(key):
+            if key in self.rim_memo.verification_results:
+                return
+            rim_cert_chain = rim.extract_certificates()
+        rim_cert_chain.append(
+            CertificateStoreCache.load_root_certificate(os.path.join(settings.ROOT_CERT_DIR, settings.RIM_ROOT_CERT))
+        )
+        if rim_name == "driver":
+            mode = BaseSettings.Certificate_Chain_Verification_Mode.DRIVER_RIM_CERT
+        else:
+            mode = BaseSettings.Certificate_Chain_Verification_Mode.VBIOS_RIM_CERT
+        self.prefetch_ocsp_responses(rim_cert_chain, mode)
+
+    def prefetch_gpu(self, i, gpu_info_obj):
+        """ Prefetches the RIM files of a GPU and the OCSP responses of their certificate chains.
+
+        Args:
+            i (int): the index of the GPU.
+            gpu_info_obj (NvmlHandler): the object containing the evidence of the GPU.
+        """
+        with Tracer.span("prefetch_gpu", gpu_index=i):
+            try:
+                if gpu_info_obj.get_gpu_architecture() != "HOPPER":
+                    return
+
+                if self.arguments_as_dictionary.get("driver_rim") or self.arguments_as_dictionary["test_no_gpu"]:
+                    self.prefetch_rim("driver", None, HopperSettings.DRIVER_RIM_PATH)
+                else:
+                    driver_rim_file_id = CcAdminUtils.get_driver_rim_file_id(gpu_info_obj.get_driver_version())
+                    self.prefetch_rim("driver", driver_rim_file_id, None)
+
+                if self.arguments_as_dictionary.get("vbios_rim") or self.arguments_as_dictionary["test_no_gpu"]:
+                    self.prefetch_rim("vbios", None, HopperSettings.VBIOS_RIM_PATH)
+                else:
+                    attestation_report_obj = AttestationReport(gpu_info_obj.get_attestation_report(), HopperSettings())
+                    vbios_rim_file_id, _ = CcAdminUtils.get_vbios_rim_file_id_from_report(attestation_report_obj)
+                    self.prefetch_rim("vbios", vbios_rim_file_id, None)
+            except Exception as error:
+                event_log.debug(f"The prefetch for the GPU {i} stopped : {error}")
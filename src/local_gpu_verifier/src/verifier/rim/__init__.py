@@ -30,6 +30,8 @@
 
 import os
 import io
+import logging
+import warnings
 
 from signxml import XMLVerifier
 from signxml.exceptions import InvalidSignature
@@ -37,6 +39,7 @@ from lxml import etree
 from OpenSSL import crypto
 
 from .golden_measurement import GoldenMeasurement
+from .schema_cache import SchemaCache
 from verifier.config import (
     BaseSettings,
     event_log,
@@ -46,6 +49,8 @@ from verifier.config import (
     __version__,
 )
 from verifier.cc_admin_utils import CcAdminUtils
+from verifier.utils.cert_store_cache import CertificateStoreCache
+from verifier.utils.tracing import Tracer
 from verifier.exceptions import (
     ElementNotFoundError,
     EmptyElementError,
@@ -66,6 +71,16 @@ class RIM:
     Verifier is used to perform the authentication and access of the golden
     measurements.
     """
+    SWID_NAMESPACE = "{http://standards.iso.org/iso/19770/-2/2015/schema.xsd}"
+    XMLDSIG_NAMESPACE = "{http://www.w3.org/2000/09/xmldsig#}"
+    RIM_NAMESPACE = "{https://trustedcomputinggroup.org/resource/tcg-reference-integrity-manifest-rim-information-model/}"
+    META_TAG = SWID_NAMESPACE + "Meta"
+    PAYLOAD_TAG = SWID_NAMESPACE + "Payload"
+    RESOURCE_TAG = SWID_NAMESPACE + "Resource"
+    SIGNATURE_TAG = XMLDSIG_NAMESPACE + "Signature"
+    KEY_INFO_TAG = XMLDSIG_NAMESPACE + "KeyInfo"
+    X509_DATA_TAG = XMLDSIG_NAMESPACE + "X509Data"
+    X509_CERTIFICATE_TAG = XMLDSIG_NAMESPACE + "X509Certificate"
 
     @staticmethod
     def get_element(parent_element, name_of_element):
@@ -124,7 +139,8 @@ class RIM:
             file_stream = io.BytesIO(read_data)
 
         elif base_RIM_path is None and content is not None:
-            file_stream = io.StringIO(content)
+            # Parsing the encoded content is faster than parsing the string
+            file_stream = io.BytesIO(content.encode("utf-8") if isinstance(content, str) else content)
 
         else:
             raise RIMFetchError("Invalid parameters!!")
@@ -134,6 +150,20 @@ class RIM:
         new_root = new_swidtag_tree.getroot()
         return new_root
 
+    def find_elements(self):
+        """ Finds the Meta, Payload and X509Certificate elements of the base RIM in the tree read once by
+        RIM.read(), matching the namespace of every element exactly. The same tree is then used by the
+        measurement parsing, the certificate extraction, the schema validation and the signature verification.
+        """
+        self.meta = self.root.find(RIM.META_TAG)
+        self.payload = self.root.find(RIM.PAYLOAD_TAG)
+        self.x509_data = None
+        signature = self.root.find(RIM.SIGNATURE_TAG)
+        if signature is not None:
+            key_info = signature.find(RIM.KEY_INFO_TAG)
+            if key_info is not None:
+                self.x509_data = key_info.find(RIM.X509_DATA_TAG)
+
     def validate_schema(self, schema_path):
         """ Performs the schema validation of the base RIM against a given schema.
 
@@ -144,12 +174,8 @@ class RIM:
             [bool]: Ture if the schema validation is successful otherwise, returns False.
         """
         try:
-            parser = etree.XMLParser(resolve_entities=False)
-            xml_schema_document = etree.parse(schema_path, parser)
-
-            xml_schema = etree.XMLSchema(xml_schema_document)
-
-            result = xml_schema.validate(self.root)
+            with Tracer.span("rim_schema_validation", rim_name=self.rim_name):
+                result = SchemaCache.validate(schema_path, self.root)
         except Exception:
             err_msg = "\t\tRIM Schema validation failed."
             event_log.error(err_msg)
@@ -169,13 +195,12 @@ class RIM:
         Returns:
             [str]: The colloquialVersion attribute of Meta element.
         """
-        Meta = RIM.get_element(self.root, "Meta")
-        if Meta is None:
+        if self.meta is None:
             err_msg = "\t\tNo Meta element found in the RIM."
             info_log.error(err_msg)
             raise ElementNotFoundError(err_msg)
 
-        version = Meta.attrib['colloquialVersion']
+        version = self.meta.get('colloquialVersion')
 
         if version is None or version == '':
             err_msg = "Driver version not found in the RIM."
@@ -198,26 +223,12 @@ class RIM:
             [bytes]: the X509 PEM certificate data.
         """
         try:
-            Signature = RIM.get_element(self.root, "Signature")
-
-            if Signature is None:
-                err_msg = "No Signature found in the RIM."
-                info_log.error(err_msg)
-                raise ElementNotFoundError(err_msg)
-
-            KeyInfo = RIM.get_element(Signature, "KeyInfo")
-            if KeyInfo is None:
-                err_msg = "No KeyInfor found in the RIM."
-                info_log.error(err_msg)
-                raise ElementNotFoundError(err_msg)
-
-            X509Data = RIM.get_element(KeyInfo, "X509Data")
-            if X509Data is None:
+            if self.x509_data is None:
                 err_msg = "X509Data not found in the RIM."
                 info_log.error(err_msg)
                 raise ElementNotFoundError(err_msg)
 
-            X509Certificates = RIM.get_all_elements(X509Data, "X509Certificate")
+            X509Certificates = self.x509_data.findall(RIM.X509_CERTIFICATE_TAG)
 
             if len(X509Certificates) == 0:
                 err_msg = "X509Certificates not found in the RIM."
@@ -263,7 +274,8 @@ class RIM:
         try:
             # performs the signature verification of the RIM. We will get the root of the RIM
             # if the signature verification is successful otherwise, it raises InvalidSignature exception.
-            verified_root = XMLVerifier().verify(self.root, ca_pem_file = settings.RIM_ROOT_CERT, ca_path = settings.ROOT_CERT_DIR).signed_xml
+            with Tracer.span("rim_signature_verification", rim_name=self.rim_name):
+                verified_root = XMLVerifier().verify(self.root, ca_pem_file = settings.RIM_ROOT_CERT, ca_path = settings.ROOT_CERT_DIR).signed_xml
 
             if verified_root is None:
                 err_msg = "\t\t\tRIM signature verification failed."
@@ -309,32 +321,33 @@ class RIM:
             NoRIMMeasurementsError: it is raised in case there are no golden measurements in the RIM file.
         """       
         self.measurements_obj = dict()
-        Payload = RIM.get_element(self.root, "Payload")
 
-        if Payload is None:
+        if self.payload is None:
             err_msg = "Payload not found in the RIM."
             info_log.error(err_msg)
             raise ElementNotFoundError(err_msg)
 
-        for child in Payload:
+        for child in self.payload.iterchildren(RIM.RESOURCE_TAG):
+            # Every access to child.attrib creates a new proxy object, so it is created once per resource
+            attributes = child.attrib
 
-            if child.attrib['active'] == 'False':
+            if attributes['active'] == 'False':
                 active = False
             else:
                 active =True
 
-            index = int(child.attrib['index'])
-            alternatives = int(child.attrib['alternatives'])
+            index = int(attributes['index'])
+            alternatives = int(attributes['alternatives'])
             measurements_values = list()
 
             for i in range(alternatives):
-                measurements_values.append(child.attrib[settings.HashFunctionNamespace + 'Hash' + str(i)])
+                measurements_values.append(attributes[settings.HashFunctionNamespace + 'Hash' + str(i)])
 
             golden_measurement = GoldenMeasurement(component = self.rim_name,
                                                    values = measurements_values,
-                                                   name = child.attrib['name'],
+                                                   name = attributes['name'],
                                                    index = index,
-                                                   size = int(child.attrib['size']),
+                                                   size = int(attributes['size']),
                                                    alternatives = alternatives,
                                                    active = active)
             if index in self.measurements_obj:
@@ -345,6 +358,16 @@ class RIM:
         if len(self.measurements_obj) == 0:
             raise NoRIMMeasurementsError(f"\tNo golden measurements found in {self.rim_name} rim.\n\tQuitting now.")
 
+        if event_log.isEnabledFor(logging.DEBUG):
+            self.log_measurements()
+
+        if self.rim_name == 'driver':
+            settings.mark_rim_driver_measurements_as_available()
+        else:
+            settings.mark_rim_vbios_measurements_as_available()
+
+    def log_measurements(self):
+        """ Logs the golden measurements of the RIM in the event log. """
         event_log.debug(f"{self.rim_name} golden measurements are : \n\t\t\t\t\t\t\t")
 
         for idx in self.measurements_obj:
@@ -353,31 +376,27 @@ class RIM:
             for i in range(self.measurements_obj[idx].get_number_of_alternatives()):
                 event_log.debug(f"\t\t\t\t\t\t\t\t value {i + 1} : {self.measurements_obj[idx].get_value_at_index(i)}")
 
-        if self.rim_name == 'driver':
-            settings.mark_rim_driver_measurements_as_available()
-        else:
-            settings.mark_rim_vbios_measurements_as_available()
+    def get_manufacturer_id(self, driver_rim_content=None):
+        """Returns the manufacturer id of the RIM, read from the Meta element of the already parsed RIM.
+
+        Args:
+            driver_rim_content (str, optional): deprecated and ignored, the RIM content is no longer parsed
+                    again. It is kept for the callers passing the RIM content and will be removed.
 
-    def get_manufacturer_id(self, driver_rim_content):
-        """Returns the manufacturer id of the RIM.
         Returns:
             [str]: the manufacturer id of the RIM.
         """
-        root = etree.fromstring(driver_rim_content)
-
-        ns = {
-            "ns0": "http://standards.iso.org/iso/19770/-2/2015/schema.xsd",
-            "ns1": "https://trustedcomputinggroup.org/resource/tcg-reference-integrity-manifest-rim-information-model/",
-        }
-        meta = root.find(".//ns0:Meta", ns)
-        if meta is None:
+        if driver_rim_content is not None:
+            warnings.warn(
+                "The driver_rim_content argument of RIM.get_manufacturer_id is deprecated and ignored.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        if self.meta is None:
             event_log.error("Meta element not found in the RIM.")
             return ""
 
-        firmware_manufacturer_id = meta.attrib.get(
-            "{https://trustedcomputinggroup.org/resource/tcg-reference-integrity-manifest-rim-information-model/}FirmwareManufacturerId",
-            "",
-        )
+        firmware_manufacturer_id = self.meta.get(RIM.RIM_NAMESPACE + "FirmwareManufacturerId", "")
         if not firmware_manufacturer_id:
             event_log.error("FirmwareManufacturerId attribute not found in Meta element.")
         return firmware_manufacturer_id
@@ -425,33 +444,75 @@ class RIM:
 
             rim_cert_chain = self.extract_certificates()
             # Reading the RIM root certificate.
-            with open(os.path.join(settings.ROOT_CERT_DIR, settings.RIM_ROOT_CERT), 'r') as root_cert_file:
-                root_cert_data = root_cert_file.read()
+            root_cert = CertificateStoreCache.load_root_certificate(os.path.join(settings.ROOT_CERT_DIR, settings.RIM_ROOT_CERT))
 
             if self.rim_name == 'driver':
                 mode = BaseSettings.Certificate_Chain_Verification_Mode.DRIVER_RIM_CERT
             else:
                 mode = BaseSettings.Certificate_Chain_Verification_Mode.VBIOS_RIM_CERT
 
-            rim_cert_chain.append(crypto.load_certificate(type = crypto.FILETYPE_PEM, buffer = root_cert_data))
-            rim_cert_chain_verification_status = CcAdminUtils.verify_certificate_chain(rim_cert_chain,
-                                                                                       settings,
-                                                                                       mode)
+            rim_cert_chain.append(root_cert)
+            with Tracer.span("rim_cert_chain_verification", rim_name=self.rim_name):
+                rim_cert_chain_verification_status = CcAdminUtils.verify_certificate_chain(rim_cert_chain,
+                                                                                           settings,
+                                                                                           mode)
             if not rim_cert_chain_verification_status:
                 raise RIMCertChainVerificationError(f"\t\t\t{self.rim_name} RIM cert chain verification failed")
 
             info_log.info(f"\t\t\t{self.rim_name} RIM certificate chain verification successful.")
 
-            rim_cert_chain_ocsp_revocation_status, gpu_attestation_warning = CcAdminUtils.ocsp_certificate_chain_validation(rim_cert_chain, settings, mode)
+            with Tracer.span("rim_ocsp_validation", rim_name=self.rim_name):
+                rim_cert_chain_ocsp_revocation_status, gpu_attestation_warning = CcAdminUtils.ocsp_certificate_chain_validation(rim_cert_chain, settings, mode)
 
             if not rim_cert_chain_ocsp_revocation_status:
                 raise RIMCertChainOCSPVerificationError(f"\t\t\t{self.rim_name} RIM cert chain ocsp status verification failed.")
 
             return self.verify_signature(settings), gpu_attestation_warning
 
-        else:            
+        else:
             raise RIMSchemaValidationError(f"\t\t\tSchema validation of {self.rim_name} RIM failed.")
 
+    def mark_parsed(self, settings):
+        """ Marks the settings flags of a GPU for a RIM that has already been fetched and parsed
+        for another GPU in the same attestation.
+
+        Arguments:
+            settings (config.HopperSettings): the object containing the various config info.
+        """
+        if self.rim_name == 'driver':
+            settings.mark_driver_rim_fetched()
+            settings.mark_rim_driver_measurements_as_available()
+        else:
+            settings.mark_vbios_rim_fetched()
+            settings.mark_rim_vbios_measurements_as_available()
+
+    def mark_verification_status(self, version, settings):
+        """ Marks the settings flags of a GPU for a RIM that has already been verified successfully
+        for another GPU in the same attestation.
+
+        Arguments:
+            version (str) : the driver/vbios version of the GPU.
+            settings (config.HopperSettings): the object containing the various config info.
+        """
+        assert type(version) is str
+
+        if self.rim_name == 'driver':
+            settings.mark_driver_rim_schema_validated()
+        else:
+            settings.mark_vbios_rim_schema_validated()
+
+        if version != self.colloquialVersion.lower():
+            info_log.warning(f"\t\t\tThe {self.rim_name} version in the RIM file is not matching with the installed {self.rim_name} version.")
+        elif self.rim_name == 'driver':
+            settings.mark_rim_driver_version_as_matching()
+        else:
+            settings.mark_rim_vbios_version_as_matching()
+
+        if self.rim_name == 'driver':
+            settings.mark_driver_rim_cert_validated_successfully()
+        else:
+            settings.mark_vbios_rim_cert_validated_successfully()
+
     def __init__(self, rim_name, settings, rim_path = '', content = ''):
         """ The constructor method for the RIM class handling all the RIM file processing.
 
@@ -474,6 +535,7 @@ class RIM:
             self.root = RIM.read(base_RIM_path = rim_path)
         else:
             self.root = RIM.read(content = content)
+        self.find_elements()
 
         if rim_name == 'driver':
             settings.mark_driver_rim_fetched()
@@ -32,6 +32,7 @@ from verifier.config import info_log
 class GoldenMeasurement:
     """ A class to represent the individual golden measurement values from the RIM files.
     """
+    __slots__ = ("component", "values", "name", "index", "size", "alternatives", "active")
 
     def __init__(self, component, values, name, index, size, alternatives, active):
         """ Constructor method to create the object for the individual golden measurement.
@@ -195,9 +196,9 @@ class GoldenMeasurement:
         """
         logger.info('-----------------------------------')
         logger.info(f"\tcomponent : {self.component}")
-        logger.info(f"\tvalue     : {self.value}")
+        logger.info(f"\tvalues    : {self.values}")
         logger.info(f"\tname      : {self.name}")
         logger.info(f"\tindex     : {self.index}")
         logger.info(f"\tsize      : {self.size}")
-        logger.info(f"\tnullable  : {self.nullable}")
+        logger.info(f"\talternatives : {self.alternatives}")
         logger.info(f"\tactive    : {self.active}")
@@ -0,0 +1,192 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import hashlib
+import threading
+
+from verifier.config import (
+    BaseSettings,
+    event_log,
+)
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.utils.tracing import Tracer
+from . import RIM
+
+
+class RimMemo:
+    """ A class to share the RIM files fetched, parsed and verified during one attestation across
+    all the GPUs being attested, so that GPUs with the same driver/VBIOS version do not repeat
+    the RIM fetch and the RIM verification.
+
+    The entries are keyed by the RIM name, the RIM file id (or local path) and the sha384 digest
+    of the RIM content. Only successful verifications are shared, and the settings flags of every
+    GPU are still marked.
+    """
+
+    def __init__(self):
+        """ The constructor method for the RimMemo class. """
+        self.lock = threading.Lock()
+        self.key_locks = dict()
+        self.contents = dict()
+        self.fetch_errors = dict()
+        self.rims = dict()
+        self.verification_results = dict()
+
+    @staticmethod
+    def get_key(rim_name, rim_id, content):
+        """ Returns the memo key of a RIM file.
+
+        Args:
+            rim_name (str): the name of the RIM, can be either "driver" or "vbios".
+            rim_id (str): the RIM file id or the path to the local RIM file.
+            content (str or bytes): the content of the RIM file.
+
+        Returns:
+            [tuple]: the memo key.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return (rim_name, rim_id, hashlib.sha384(content).hexdigest())
+
+    @staticmethod
+    def get_key_for_file(rim_name, rim_path):
+        """ Returns the memo key of a local RIM file.
+
+        Args:
+            rim_name (str): the name of the RIM, can be either "driver" or "vbios".
+            rim_path (str): the path to the local RIM file.
+
+        Returns:
+            [tuple]: the memo key, or None if the RIM file can not be read.
+        """
+        try:
+            with open(rim_path, "rb") as f:
+                return RimMemo.get_key(rim_name, rim_path, f.read())
+        except (OSError, TypeError):
+            return None
+
+    def get_key_lock(self, key):
+        """ Returns the lock serializing the work done for the given memo key.
+
+        Args:
+            key (tuple): the memo key.
+
+        Returns:
+            [threading.Lock]: the lock of the memo key.
+        """
+        with self.lock:
+            return self.key_locks.setdefault(key, threading.Lock())
+
+    def fetch_rim_file(self, rim_id, max_retries=BaseSettings.RIM_SERVICE_RETRY_COUNT):
+        """ Fetches the RIM file with the given id once per attestation. A failed fetch is not retried within
+        the attestation.
+
+        Args:
+            rim_id (str): the RIM file id.
+            max_retries (int, optional): the maximum number of retries. Defaults to BaseSettings.RIM_SERVICE_RETRY_COUNT.
+
+        Returns:
+            [str]: the content of the RIM file as a string.
+        """
+        with Tracer.span("fetch_rim_file", rim_id=rim_id), self.get_key_lock(("content", rim_id)):
+            content = self.contents.get(rim_id)
+            if rim_id in self.fetch_errors:
+                raise self.fetch_errors[rim_id]
+            if content is None:
+                Tracer.increment("rim_memo.miss")
+                try:
+                    content = CcAdminUtils.fetch_rim_file(rim_id, max_retries)
+                except Exception as error:
+                    self.fetch_errors[rim_id] = error
+                    raise
+                self.contents[rim_id] = content
+            else:
+                Tracer.increment("rim_memo.hit")
+                event_log.debug(f"Reusing the RIM {rim_id} fetched for another GPU.")
+        return content
+
+    def get_rim(self, key, rim_name, settings, rim_path='', content=''):
+        """ Returns the parsed RIM object of the given memo key, parsing the RIM file on first use.
+
+        Args:
+            key (tuple): the memo key of the RIM file, or None to disable the memo for this RIM file.
+            rim_name (str): the name of the RIM, can be either "driver" or "vbios".
+            settings (config.HopperSettings): the object containing the various config info.
+            rim_path (str): the path to the RIM file.
+            content (str): the content of the RIM file as a string.
+
+        Returns:
+            [RIM]: the RIM object.
+        """
+        with Tracer.span("parse_rim", rim_name=rim_name):
+            if key is None:
+                return RIM(rim_name=rim_name, settings=settings, rim_path=rim_path, content=content)
+
+            with self.get_key_lock(key):
+                rim = self.rims.get(key)
+                if rim is None:
+                    Tracer.increment("rim_memo.miss")
+                    rim = RIM(rim_name=rim_name, settings=settings, rim_path=rim_path, content=content)
+                    self.rims[key] = rim
+                else:
+                    Tracer.increment("rim_memo.hit")
+                    event_log.debug(f"Reusing the {rim_name} RIM parsed for another GPU.")
+                    rim.mark_parsed(settings)
+            return rim
+
+    def verify(self, key, rim, version, settings):
+        """ Verifies the RIM, reusing the result of a successful verification of the same RIM file
+        for another GPU.
+
+        Args:
+            key (tuple): the memo key of the RIM file, or None to disable the memo for this RIM file.
+            rim (RIM): the RIM object.
+            version (str): the driver/vbios version of the GPU.
+            settings (config.HopperSettings): the object containing the various config info.
+
+        Returns:
+            [tuple]: the verification status and the attestation warning, as returned by RIM.verify().
+        """
+        with Tracer.span("verify_rim", rim_name=rim.rim_name):
+            if key is None:
+                return rim.verify(version=version, settings=settings)
+
+            with self.get_key_lock(key):
+                result = self.verification_results.get(key)
+                if result is None:
+                    Tracer.increment("rim_memo.miss")
+                    result = rim.verify(version=version, settings=settings)
+                    if result[0]:
+                        self.verification_results[key] = result
+                else:
+                    Tracer.increment("rim_memo.hit")
+                    event_log.debug(f"Reusing the {rim.rim_name} RIM verification result of another GPU.")
+                    rim.mark_verification_status(version, settings)
+            return result
@@ -0,0 +1,99 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import threading
+
+from lxml import etree
+
+from verifier.config import event_log
+from verifier.utils.tracing import Tracer
+
+
+class SchemaCache:
+    """ A class to keep the compiled XML schemas used for the RIM schema validation for the lifetime
+    of the process, so that the swidtag schema and the schemas it imports are only parsed and compiled once.
+
+    The entries are keyed by the absolute path of the schema and its modification time, so an updated
+    schema file is compiled again. lxml schema objects keep their error log on the object itself, so
+    every validation holds the lock of its entry.
+    """
+    lock = threading.Lock()
+    schemas = dict()
+
+    @classmethod
+    def get_schema(cls, schema_path):
+        """ Returns the compiled schema of the given xsd file, compiling it on the first use.
+
+        Args:
+            schema_path (str): the path to the schema xsd file.
+
+        Returns:
+            [tuple]: the compiled lxml.etree.XMLSchema object and the lock guarding its use.
+        """
+        schema_path = os.path.abspath(schema_path)
+        key = (schema_path, os.stat(schema_path).st_mtime_ns)
+
+        with cls.lock:
+            entry = cls.schemas.get(key)
+            if entry is None:
+                Tracer.increment("schema_cache.miss")
+                event_log.debug(f"Compiling the XML schema {schema_path}")
+                parser = etree.XMLParser(resolve_entities=False)
+                xml_schema_document = etree.parse(schema_path, parser)
+                entry = (etree.XMLSchema(xml_schema_document), threading.Lock())
+
+                for stale_key in [k for k in cls.schemas if k[0] == schema_path]:
+                    del cls.schemas[stale_key]
+                cls.schemas[key] = entry
+            else:
+                Tracer.increment("schema_cache.hit")
+        return entry
+
+    @classmethod
+    def validate(cls, schema_path, root):
+        """ Validates an XML element tree against the given schema.
+
+        Args:
+            schema_path (str): the path to the schema xsd file.
+            root (lxml.etree._Element): the root element of the XML document.
+
+        Returns:
+            [bool]: True if the document is valid, otherwise False.
+        """
+        xml_schema, schema_lock = cls.get_schema(schema_path)
+        with schema_lock:
+            return xml_schema.validate(root)
+
+    @classmethod
+    def clear(cls):
+        """ Removes all the compiled schemas. """
+        with cls.lock:
+            cls.schemas.clear()
@@ -0,0 +1,455 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import io
+import os
+import sys
+import json
+import uuid
+import time
+import logging
+import threading
+import socketserver
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from verifier import cc_admin
+from verifier.config import (
+    BaseSettings,
+    info_log,
+    event_log,
+)
+from verifier.exceptions import InvalidNonceError
+from verifier.utils.tracing import Tracer
+from verifier.utils.metrics import MetricsRegistry
+
+
+class AttestationService:
+    """ A class to run the GPU attestations of a long running attestation service.
+
+    The NVML library, the RIM and OCSP caches and the pooled HTTP session are kept in the process
+    across the requests. The attestations use the process wide settings of the verifier, so they are
+    executed one at a time and the other requests wait in a bounded queue.
+    """
+    SUCCESS_MESSAGE = "GPU Attestation is Successful"
+    REQUEST_ID_HEADERS = ["x-request-id", "x-ms-request-id", "request-id", "requestid"]
+    # The requests only carry an optional nonce, the larger bodies are rejected without being read
+    MAX_REQUEST_BODY_SIZE = 4096
+    # The time in seconds a client connection may stay idle or take to send a request
+    REQUEST_TIMEOUT = 30
+
+    def __init__(self, arguments_as_dictionary, max_queue_size):
+        """ The constructor of the AttestationService class.
+
+        Args:
+            arguments_as_dictionary (dict): the Attestation Options used for every request.
+            max_queue_size (int): the maximum number of requests waiting for an attestation to finish.
+        """
+        self.arguments_as_dictionary = arguments_as_dictionary
+        self.max_queue_size = max_queue_size
+        self.attestation_lock = threading.Lock()
+        self.queue_lock = threading.Lock()
+        self.queued_requests = 0
+
+    def start(self):
+        """ Initializes the NVML library once for the lifetime of the service and resolves the VM region
+        used to label the metrics. """
+        BaseSettings.get_vm_region()
+        if not self.arguments_as_dictionary["test_no_gpu"]:
+            cc_admin.init_nvml(standalone_mode=True)
+
+    def enter_queue(self):
+        """ Reserves a place in the attestation queue.
+
+        Returns:
+            [bool]: True if the request was queued, False if the queue is full.
+        """
+        with self.queue_lock:
+            if self.queued_requests > self.max_queue_size:
+                return False
+            self.queued_requests += 1
+            return True
+
+    def leave_queue(self):
+        """ Releases the place of a request in the attestation queue. """
+        with self.queue_lock:
+            self.queued_requests -= 1
+
+    def attest(self, nonce):
+        """ Collects the GPU evidence with the given nonce and attests it.
+
+        Args:
+            nonce (str): the nonce provided with the request as a hex string, or None to generate a random nonce.
+
+        Returns:
+            [tuple]: the attestation status, the attestation output, the Entity Attestation Token and the
+                     trace of the attestation (None if the tracing is disabled).
+        """
+        arguments_as_dictionary = dict(self.arguments_as_dictionary, nonce=nonce)
+        output = io.StringIO()
+        output_handler = logging.StreamHandler(output)
+
+        with self.attestation_lock:
+            info_log.addHandler(output_handler)
+            try:
+                nonce = cc_admin.get_user_nonce(arguments_as_dictionary)
+                if cc_admin.is_trace_enabled(arguments_as_dictionary):
+                    with Tracer.start_trace("gpu_attestation") as trace:
+                        status, jwt_token = self.collect_and_attest(arguments_as_dictionary, nonce)
+                    cc_admin.export_trace(trace, arguments_as_dictionary)
+                else:
+                    trace = None
+                    status, jwt_token = self.collect_and_attest(arguments_as_dictionary, nonce)
+                info_log.info("\nEntity Attestation Token:")
+                info_log.info(json.dumps(jwt_token, indent=2))
+            finally:
+                info_log.removeHandler(output_handler)
+
+        return status, output.getvalue(), jwt_token, trace
+
+    @staticmethod
+    def collect_and_attest(arguments_as_dictionary, nonce):
+        """ Collects the GPU evidence with the given nonce and attests it.
+
+        Args:
+            arguments_as_dictionary (dict): the Attestation Options of the request.
+            nonce (str): the nonce as a hex string.
+
+        Returns:
+            [tuple]: the attestation status and the Entity Attestation Token.
+        """
+        evidence_list = cc_admin.collect_gpu_evidence(nonce, arguments_as_dictionary["test_no_gpu"])
+        return cc_admin.attest(arguments_as_dictionary, nonce, evidence_list)
+
+    @staticmethod
+    def validate_nonce(nonce):
+        """ Validates the nonce provided with a request.
+
+        Args:
+            nonce (str): the nonce as a hex string.
+
+        Raises:
+            InvalidNonceError: it is raised if the nonce is not a 32 bytes hex string.
+        """
+        try:
+            nonce_bytes = bytes.fromhex(nonce)
+        except ValueError:
+            raise InvalidNonceError("Invalid args: nonce must be a 32-byte hex string")
+        if len(nonce) != 2 * BaseSettings.SIZE_OF_NONCE_IN_BYTES or len(nonce_bytes) != BaseSettings.SIZE_OF_NONCE_IN_BYTES:
+            raise InvalidNonceError("Invalid args: nonce must be a 32-byte hex string")
+
+
+class AttestationRequestHandler(BaseHTTPRequestHandler):
+    """ A class to handle the HTTP requests of the attestation service on both the TCP port and the unix socket.
+    """
+    protocol_version = "HTTP/1.1"
+    timeout = AttestationService.REQUEST_TIMEOUT
+    service = None
+
+    def address_string(self):
+        """ Returns the address of the client, the unix socket clients do not have one. """
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix-socket"
+
+    def log_message(self, format, *args):
+        """ Logs the requests in the event log instead of stderr. """
+        event_log.debug(f"{self.address_string()} - {format % args}")
+
+    def get_request_id(self):
+        """ Returns the request id provided in the headers of the request or a new one.
+
+        Returns:
+            [str]: the request id.
+        """
+        for header in AttestationService.REQUEST_ID_HEADERS:
+            request_id = self.headers.get(header)
+            if request_id:
+                return request_id
+        return str(uuid.uuid4())
+
+    def send_body(self, status_code, body, content_type, request_id=None):
+        """ Sends a response with the given status code and body.
+
+        Args:
+            status_code (int): the HTTP status code.
+            body (bytes): the body of the response.
+            content_type (str): the content type of the body.
+            request_id (str): the request id returned in the x-ms-request-id header.
+        """
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if request_id is not None:
+            self.send_header("x-ms-request-id", request_id)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_text(self, status_code, message, request_id=None):
+        """ Sends a plain text error response. """
+        self.send_body(status_code, (message + "\n").encode("utf-8"), "text/plain; charset=utf-8", request_id)
+
+    def send_attestation_result(self, status_code, attestation_output, jwt_token, request_id, trace=None):
+        """ Sends the result of an attestation in the format of the local GPU verifier HTTP service. """
+        response = {
+            "attestation_output": attestation_output,
+            "entity_attestation_token": jwt_token,
+        }
+        if trace is not None and self.service.arguments_as_dictionary.get("trace"):
+            response["attestation_trace"] = trace.to_dict()
+        self.send_body(status_code, json.dumps(response, indent=2).encode("utf-8"), "application/json", request_id)
+
+    def do_GET(self):
+        """ Handles the GET requests. """
+        path = urlparse(self.path).path
+        if path == "/heartbeat":
+            self.send_body(200, b"OK", "text/plain; charset=utf-8")
+        elif path == "/metrics":
+            self.send_body(200, MetricsRegistry.render().encode("utf-8"), MetricsRegistry.CONTENT_TYPE)
+        elif path == "/gpu_attest":
+            self.handle_gpu_attest()
+        else:
+            self.send_error_text(404, "Not Found")
+
+    def do_POST(self):
+        """ Handles the POST requests. """
+        if urlparse(self.path).path == "/gpu_attest":
+            self.handle_gpu_attest()
+        else:
+            self.close_connection = True
+            self.send_error_text(404, "Not Found")
+
+    def get_content_length(self):
+        """ Returns the length of the body of the request.
+
+        Returns:
+            [int]: the value of the Content-Length header, 0 if it is not provided.
+
+        Raises:
+            ValueError: it is raised if the Content-Length header is not a non negative integer.
+        """
+        content_length = self.headers.get("Content-Length")
+        if content_length is None:
+            return 0
+        content_length = content_length.strip()
+        if not content_length.isdigit():
+            raise ValueError(f"Invalid Content-Length {content_length!r}")
+        return int(content_length)
+
+    def read_nonce(self, content_length):
+        """ Reads the optional nonce of a request, from the query of a GET request or the JSON body of a POST request.
+
+        Args:
+            content_length (int): the length of the body of the request.
+
+        Returns:
+            [str]: the nonce, or None if it is not provided.
+        """
+        if self.command == "GET":
+            return parse_qs(urlparse(self.path).query).get("nonce", [None])[0] or None
+
+        body = self.rfile.read(content_length) if content_length > 0 else b""
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return None
+        if isinstance(request, dict) and isinstance(request.get("nonce"), str):
+            return request["nonce"] or None
+        return None
+
+    def handle_gpu_attest(self):
+        """ Handles a /gpu_attest request. """
+        start_time = time.monotonic()
+        service = self.service
+        request_id = self.get_request_id()
+
+        try:
+            content_length = self.get_content_length()
+        except ValueError as error:
+            event_log.error(f"[{request_id}] {error}")
+            # The end of the body is unknown, the connection can not be reused
+            self.close_connection = True
+            self.send_error_text(400, "Invalid Content-Length", request_id)
+            return
+        if content_length > service.MAX_REQUEST_BODY_SIZE:
+            event_log.error(f"[{request_id}] The request body of {content_length} bytes is too large.")
+            self.close_connection = True
+            self.send_error_text(413, "Request body too large", request_id)
+            return
+
+        try:
+            nonce = self.read_nonce(content_length)
+            if nonce is not None:
+                service.validate_nonce(nonce)
+        except InvalidNonceError as error:
+            event_log.error(f"[{request_id}] {error}")
+            self.send_error_text(400, str(error), request_id)
+            return
+        except Exception as error:
+            event_log.error(f"[{request_id}] Failed to read the request : {error}")
+            self.close_connection = True
+            self.send_error_text(400, "Failed to read request body", request_id)
+            return
+
+        if not service.enter_queue():
+            event_log.error(f"[{request_id}] The attestation queue is full.")
+            MetricsRegistry.increment("verifier_attestations_total", result="rejected")
+            self.send_error_text(503, "Too many pending attestation requests", request_id)
+            return
+
+        trace = None
+        attestation_start_time = time.monotonic()
+        try:
+            status, attestation_output, jwt_token, trace = service.attest(nonce)
+            status_code = 200 if status else 400
+        except Exception as error:
+            event_log.error(f"[{request_id}] Error while running the GPU attestation : {error}")
+            status_code, attestation_output, jwt_token = 500, f"Error while running the GPU attestation: {error}\n", None
+        finally:
+            service.leave_queue()
+
+        MetricsRegistry.increment(
+            "verifier_attestations_total", result={200: "success", 400: "failure"}.get(status_code, "error")
+        )
+        MetricsRegistry.observe("verifier_attestation_duration_seconds", time.monotonic() - attestation_start_time)
+
+        self.send_attestation_result(status_code, attestation_output, jwt_token, request_id, trace)
+        event_log.info(
+            f"[{request_id}] Completed /gpu_attest with HTTP {status_code} in {time.monotonic() - start_time:.3f} s"
+        )
+
+
+class UnixSocketHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """ A class to serve the HTTP requests over a unix domain socket.
+    """
+    daemon_threads = True
+
+    def server_bind(self):
+        """ Binds the unix socket, replacing a stale socket file and making it accessible to all the users. """
+        socket_dir = os.path.dirname(self.server_address)
+        if socket_dir:
+            os.makedirs(socket_dir, mode=0o755, exist_ok=True)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+        try:
+            os.chmod(self.server_address, 0o666)
+        except OSError as error:
+            event_log.error(f"Failed to set the permissions of the unix socket {self.server_address} : {error}")
+
+    def server_close(self):
+        """ Closes the server and removes the socket file. """
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+
+def build_argument_parser():
+    """Method to build the command line argument parser of the attestation service.
+
+    Returns:
+        An argparse.ArgumentParser object with the Attestation Options and the service options.
+    """
+    parser = cc_admin.build_argument_parser()
+    parser.description = "Runs the local GPU verifier as a long running attestation service."
+    parser.add_argument(
+        "--port",
+        help="The TCP port of the HTTP server, 0 disables it.",
+        type=int,
+        default=8123,
+    )
+    parser.add_argument(
+        "--host",
+        help="The address the HTTP server listens on.",
+        default="",
+    )
+    parser.add_argument(
+        "--socket",
+        help="The path of the unix socket of the HTTP server, an empty path disables it.",
+        default="/var/run/gpu-attestation/gpu-attestation.sock",
+    )
+    parser.add_argument(
+        "--max_queue_size",
+        help="The maximum number of attestation requests waiting for the running attestation to finish.",
+        type=int,
+        default=16,
+    )
+    return parser
+
+
+def serve(arguments_as_dictionary):
+    """Method to run the attestation service until it is interrupted.
+
+    Args:
+        arguments_as_dictionary (Dictionary): the dictionary object containing the Attestation and service Options.
+    """
+    MetricsRegistry.enable()
+    service = AttestationService(arguments_as_dictionary, max(0, arguments_as_dictionary["max_queue_size"]))
+    service.start()
+    handler = type("ServiceRequestHandler", (AttestationRequestHandler,), {"service": service})
+
+    servers = []
+    if arguments_as_dictionary["port"]:
+        http_server = ThreadingHTTPServer((arguments_as_dictionary["host"], arguments_as_dictionary["port"]), handler)
+        servers.append(http_server)
+        info_log.info(f"Attestation service listening on port {http_server.server_address[1]}")
+    if arguments_as_dictionary["socket"]:
+        servers.append(UnixSocketHTTPServer(arguments_as_dictionary["socket"], handler))
+        info_log.info(f"Attestation service listening on unix socket {arguments_as_dictionary['socket']}")
+    if not servers:
+        info_log.error("Either a port or a unix socket is required to run the attestation service.")
+        sys.exit(1)
+
+    threads = [threading.Thread(target=server.serve_forever, daemon=True) for server in servers]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        info_log.info("Stopping the attestation service.")
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def main():
+    """The main function of the attestation service."""
+    args = build_argument_parser().parse_args()
+    serve(vars(args))
+
+
+if __name__ == "__main__":
+    main()
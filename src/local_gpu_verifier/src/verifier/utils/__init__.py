@@ -28,12 +28,14 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
-import queue
-from queue import Empty
+import threading
+import contextvars
 from threading import (
-    Thread,
     Event,
+    Lock,
 )
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 from cryptography import x509
 from cryptography.hazmat.primitives import serialization
@@ -51,6 +53,19 @@ from verifier.exceptions import (
     UnknownGpuArchitectureError,
     TimeoutError,
 )
+from verifier.utils.metrics import MetricsRegistry
+
+# The calls made through function_wrapper_with_timeout run in one executor per pool, so that hung NVML calls
+# can not hold the workers of the network calls and the other way around. The single OCSP fetches wait on
+# network calls, so they run in a pool of their own instead of taking the workers of the network pool.
+NETWORK_POOL = "network"
+NVML_POOL = "nvml"
+OCSP_POOL = "ocsp"
+EXECUTOR_STATES = ("submitted", "completed", "failed", "cancelled", "timed_out", "abandoned_running", "abandoned_finished")
+executors = dict()
+executor_lock = Lock()
+executor_stats = {pool: dict.fromkeys(EXECUTOR_STATES, 0) for pool in (NETWORK_POOL, NVML_POOL)}
+call_context = threading.local()
 
 def get_gpu_architecture_value(nvml_arch_value):
     """ A function to map the NVML architecture integer value to the
@@ -123,6 +138,25 @@ def convert_string_to_blob(inp):
     out = bytes.fromhex(out)
     return out
 
+def buffer_to_bytes(buffer, length):
+    """ Copies the first length bytes of a buffer, such as the ctypes arrays filled in by the NVML
+    calls, with a single copy through the buffer protocol instead of reading it one byte at a time.
+
+    Args:
+        buffer (ctypes.Array): the buffer, or any object supporting the buffer protocol.
+        length (int): the number of bytes to be copied.
+
+    Raises:
+        ValueError: it is raised if the length is larger than the buffer.
+
+    Returns:
+        [bytes]: the copied data.
+    """
+    with memoryview(buffer) as view, view.cast("B") as data:
+        if length > data.nbytes:
+            raise ValueError(f"The length {length} is larger than the buffer of {data.nbytes} bytes.")
+        return data[:length].tobytes()
+
 def extract_public_key(certificate):
     """ Reads the leaf certificate of GPU and then extract the public key.
 
@@ -181,61 +215,260 @@ def format_vbios_version(version):
     return result
 
 
+def read_der_element(data, offset=0):
+    """ Reads the DER encoded element starting at the given offset.
+
+    Args:
+        data (bytes): the DER encoded data.
+        offset (int, optional): the offset of the element. Defaults to 0.
+
+    Raises:
+        ValueError: it is raised if the data is not a valid DER encoding.
+
+    Returns:
+        [tuple]: the tag of the element, its content and the offset of the next element.
+    """
+    if offset + 2 > len(data):
+        raise ValueError("Truncated DER element.")
+
+    tag = data[offset]
+    length = data[offset + 1]
+    offset += 2
+
+    if length & 0x80:
+        number_of_length_bytes = length & 0x7F
+        if number_of_length_bytes == 0 or offset + number_of_length_bytes > len(data):
+            raise ValueError("Invalid DER length.")
+        length = int.from_bytes(data[offset : offset + number_of_length_bytes], "big")
+        offset += number_of_length_bytes
+
+    if offset + length > len(data):
+        raise ValueError("Truncated DER element.")
+
+    return tag, data[offset : offset + length], offset + length
+
+def split_der_elements(data):
+    """ Splits the content of a DER encoded constructed element into its DER encoded child elements.
+
+    Args:
+        data (bytes): the content of the constructed element.
+
+    Returns:
+        [list]: the list of (tag, encoded element) tuples.
+    """
+    elements = list()
+    offset = 0
+
+    while offset < len(data):
+        tag, _, next_offset = read_der_element(data, offset)
+        elements.append((tag, data[offset : next_offset]))
+        offset = next_offset
+
+    return elements
+
+def encode_der_element(tag, content):
+    """ Encodes an element in DER.
+
+    Args:
+        tag (int): the tag of the element.
+        content (bytes): the content of the element.
+
+    Returns:
+        [bytes]: the DER encoded element.
+    """
+    length = len(content)
+
+    if length < 0x80:
+        encoded_length = bytes([length])
+    else:
+        length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+        encoded_length = bytes([0x80 | len(length_bytes)]) + length_bytes
+
+    return bytes([tag]) + encoded_length + content
+
+def get_ocsp_single_response(ocsp_response, issuer_key_hash, serial_number):
+    """ Finds the status of a certificate in an OCSP response, which can contain the status of several
+    certificates.
+
+    Args:
+        ocsp_response (cryptography.x509.ocsp.OCSPResponse): the ocsp response message object.
+        issuer_key_hash (bytes): the hash of the public key of the issuer certificate.
+        serial_number (int): the serial number of the certificate.
+
+    Returns:
+        [cryptography.x509.ocsp.OCSPSingleResponse]: the status of the certificate, or None if it is not present.
+    """
+    try:
+        for single_response in ocsp_response.responses:
+            if single_response.serial_number == serial_number and single_response.issuer_key_hash == issuer_key_hash:
+                return single_response
+    except ValueError:
+        pass
+
+    return None
+
+
+def get_executor(pool=NETWORK_POOL):
+    """ Returns the executor shared by the calls of a pool, creating it on first use. The number of worker
+    threads is bounded by BaseSettings.MAX_CALL_EXECUTOR_WORKERS for the network calls, by
+    BaseSettings.MAX_NVML_EXECUTOR_WORKERS for the NVML calls and by BaseSettings.MAX_OCSP_FETCH_WORKERS
+    for the single OCSP fetches.
+
+    Args:
+        pool (str, optional): NETWORK_POOL, NVML_POOL or OCSP_POOL. Defaults to NETWORK_POOL.
+
+    Returns:
+        [concurrent.futures.ThreadPoolExecutor]: the shared executor of the pool.
+    """
+    with executor_lock:
+        if pool not in executors:
+            max_workers = {
+                NVML_POOL: BaseSettings.MAX_NVML_EXECUTOR_WORKERS,
+                OCSP_POOL: BaseSettings.MAX_OCSP_FETCH_WORKERS,
+            }.get(pool, BaseSettings.MAX_CALL_EXECUTOR_WORKERS)
+            executors[pool] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"verifier-{pool}")
+        return executors[pool]
+
+def update_executor_stats(pool, **increments):
+    """ Updates the counters of the calls of a pool made through function_wrapper_with_timeout.
+
+    Args:
+        pool (str): NETWORK_POOL or NVML_POOL.
+        increments (dict): the value to be added to each counter.
+    """
+    with executor_lock:
+        for name, value in increments.items():
+            executor_stats[pool][name] += value
+
+def get_executor_stats():
+    """ Returns the counters of the calls made through function_wrapper_with_timeout, by pool. The abandoned
+    counters track the calls which timed out while running: they keep their worker thread until
+    they return.
+
+    Returns:
+        [dict]: a copy of the counters of every pool.
+    """
+    with executor_lock:
+        return {pool: dict(stats) for pool, stats in executor_stats.items()}
+
+def is_call_cancelled():
+    """ Checks if the call running in the current thread has been abandoned by function_wrapper_with_timeout,
+    so that long running work such as retry loops can stop early.
+
+    Returns:
+        [bool]: True if the current call timed out, otherwise False.
+    """
+    event = getattr(call_context, "cancel_event", None)
+    return event is not None and event.is_set()
+
 def function_caller(inp):
-    """ This function is run in a separate thread by 
-    function_wrapper_with_timeout function so that if the execution of the
-    function passed as an argument takes more than the max threshold time limit then
-    the thread is killed.
+    """ This function is run by the shared executor for function_wrapper_with_timeout. The
+    cancel event of the call is made available to the function through is_call_cancelled.
 
     Args:
-        inp (tuple): the tuple containing the function to be executed and its
-                     arguments. 
+        inp (list): the list containing the function to be executed, its arguments,
+                    the name of the function, the cancel event and the start event of the call.
+
+    Returns:
+        [any]: the return of the function.
     """
     assert type(inp) is list
 
-    event = inp[-1]
-    q = inp[-2]
+    started = inp[-1]
+    event = inp[-2]
     function_name = inp[-3]
     function = inp[0]
     arguments = inp[1:-3]
-    
-    result = function(*arguments)
-    
-    if event.is_set():
-        event_log.info(f"{function_name} execution timed out, stopping.")
-        return
 
-    q.put(result)
-    
-
-def function_wrapper_with_timeout(args, max_time_delay):
-    """ This function spawns a separate thread for the given function in the
-    arguments to be executed in that separate thread.
+    started.set()
+    call_context.cancel_event = event
+    try:
+        return function(*arguments)
+    finally:
+        call_context.cancel_event = None
+        if event.is_set():
+            event_log.info(f"{function_name} execution timed out, stopping.")
+
+def function_wrapper_with_timeout(args, max_time_delay, pool=NETWORK_POOL):
+    """ This function runs the given function on the shared executor of the pool and waits for its
+    result for at most max_time_delay seconds from the start of the call. A call still waiting for a worker
+    after BaseSettings.MAX_CALL_QUEUE_TIME_DELAY seconds is cancelled. The function runs in a copy of the
+    context of the caller, so that it records its trace spans and counters under the caller's span.
 
     Args:
-        args (list): the list containing the function and its arguments.
+        args (list): the list containing the function, its arguments and the name of the function.
+        max_time_delay (float): the maximum time to wait for the result in seconds once the function runs.
+        pool (str, optional): NVML_POOL for the NVML calls, NETWORK_POOL for the other calls.
+                              Defaults to NETWORK_POOL.
 
     Raises:
-        TimeoutError: it is raised if the thread spawned takes more time than
-                      the threshold time limit.
+        TimeoutError: it is raised if the function takes more time than
+                      the threshold time limit, or does not start in time.
 
     Returns:
-        [any]: the return of the function being executed in the thread.
+        [any]: the return of the function being executed.
     """
     assert type(args) is list
+    function_name = args[-1]
+    event = Event()
+    started = Event()
+    event_log.info(f"{function_name} called.")
+
+    future = get_executor(pool).submit(contextvars.copy_context().run, function_caller, args + [event, started])
+    update_executor_stats(pool, submitted=1)
+
+    if not started.wait(BaseSettings.MAX_CALL_QUEUE_TIME_DELAY) and future.cancel():
+        update_executor_stats(pool, cancelled=1)
+        event_log.error(f"The {function_name} call did not start in time.")
+        MetricsRegistry.increment("verifier_call_timeouts_total", function=function_name)
+        raise TimeoutError(f"The {function_name} call did not start in time.")
+
     try:
-        function_name = args[-1]
-        q = queue.Queue()
-        args.append(q)
-        event = Event()
-        args.append(event)
-        args = ((args),)
-        event_log.info(f"{function_name} called.")
-        thread = Thread(target = function_caller, args = args)
-        thread.start()
-        return_value = q.get(block=True, timeout= max_time_delay)
+        return_value = future.result(timeout=max_time_delay)
+    except FutureTimeoutError:
         event.set()
-        return return_value
-    except Empty:
+        update_executor_stats(pool, timed_out=1, abandoned_running=1)
+        future.add_done_callback(
+            lambda future: update_executor_stats(pool, abandoned_running=-1, abandoned_finished=1)
+        )
         event_log.error(f"The {function_name} call timed out.")
+        MetricsRegistry.increment("verifier_call_timeouts_total", function=function_name)
         raise TimeoutError(f"The {function_name} call timed out.")
+    except Exception:
+        update_executor_stats(pool, failed=1)
+        raise
+
+    update_executor_stats(pool, completed=1)
+    return return_value
+
+
+def collect_executor_metrics():
+    """ Reports the counters of the calls made through function_wrapper_with_timeout to the MetricsRegistry. The
+    abandoned calls still running go up and down, the other counters only increase.
+
+    Returns:
+        [list]: the counter and the gauge of the executor.
+    """
+    executor_stats = get_executor_stats()
+    return [
+        (
+            "verifier_executor_calls_total",
+            "counter",
+            "The calls made through function_wrapper_with_timeout, by pool and state.",
+            [
+                ({"pool": pool, "state": state}, value)
+                for pool, stats in executor_stats.items()
+                for state, value in stats.items()
+                if state != "abandoned_running"
+            ],
+        ),
+        (
+            "verifier_executor_abandoned_running_calls",
+            "gauge",
+            "The calls made through function_wrapper_with_timeout which timed out and are still running, by pool.",
+            [({"pool": pool}, stats["abandoned_running"]) for pool, stats in executor_stats.items()],
+        ),
+    ]
+
+
+MetricsRegistry.register_collector(collect_executor_metrics)
@@ -0,0 +1,202 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from OpenSSL import crypto
+
+from verifier.config import event_log
+from verifier.utils.tracing import Tracer
+
+
+class CertificateStoreCache:
+    """ A class to reuse the trusted certificates and the certificate chain verification results
+    across the certificate chains verified by the process.
+
+    The root certificates are loaded from disk once per path and modification time and every root has a
+    persistent X509Store. A certificate is verified against the store of the root of its chain with only
+    the certificates above it in the same chain as untrusted intermediates, so a chain can not borrow
+    intermediates from other chains. A successful verification is memoized by the sha256 fingerprints of
+    the certificate and of the certificates above it, until the earliest expiry time of those certificates,
+    with the least recently used verifications evicted beyond MAX_VERIFIED_CERTIFICATES.
+    """
+    MAX_VERIFIED_CERTIFICATES = 256
+    lock = threading.Lock()
+    root_certificates = dict()
+    stores = dict()
+    verified_certificates = OrderedDict()
+
+    @classmethod
+    def load_root_certificate(cls, path):
+        """ Loads a PEM root certificate, reusing the already loaded certificate if the file is unchanged.
+
+        Args:
+            path (str): the path to the root certificate.
+
+        Returns:
+            [OpenSSL.crypto.X509]: the root certificate.
+        """
+        path = os.path.abspath(path)
+        key = (path, os.stat(path).st_mtime_ns)
+
+        with cls.lock:
+            root_certificate = cls.root_certificates.get(key)
+        if root_certificate is not None:
+            return root_certificate
+
+        with open(path, "r") as f:
+            root_certificate = crypto.load_certificate(type=crypto.FILETYPE_PEM, buffer=f.read())
+
+        with cls.lock:
+            for stale_key in [k for k in cls.root_certificates if k[0] == path]:
+                del cls.root_certificates[stale_key]
+            cls.root_certificates[key] = root_certificate
+        event_log.debug(f"Loaded the root certificate {path}")
+        return root_certificate
+
+    @staticmethod
+    def get_fingerprint(cert):
+        """ Returns the sha256 fingerprint of a certificate.
+
+        Args:
+            cert (OpenSSL.crypto.X509): the certificate.
+
+        Returns:
+            [bytes]: the fingerprint.
+        """
+        return cert.digest("sha256")
+
+    @staticmethod
+    def get_expiry_time(cert_chain):
+        """ Returns the earliest expiry time of the certificates in a chain.
+
+        Args:
+            cert_chain (list): list of OpenSSL.crypto.X509 certificates.
+
+        Returns:
+            [datetime]: the earliest notAfter time in UTC.
+        """
+        return min(cert.to_cryptography().not_valid_after_utc for cert in cert_chain)
+
+    @classmethod
+    def get_store(cls, root_cert):
+        """ Returns the persistent store of a root certificate, creating it on the first use.
+
+        Args:
+            root_cert (OpenSSL.crypto.X509): the root certificate.
+
+        Returns:
+            [OpenSSL.crypto.X509Store]: the store trusting only the root certificate.
+        """
+        root_fingerprint = cls.get_fingerprint(root_cert)
+        with cls.lock:
+            store = cls.stores.get(root_fingerprint)
+            if store is None:
+                store = crypto.X509Store()
+                store.add_cert(root_cert)
+                cls.stores[root_fingerprint] = store
+        return store
+
+    @classmethod
+    def is_verified(cls, chain_key):
+        """ Checks if the certificate identified by the chain key has already been verified and has not expired.
+
+        Args:
+            chain_key (tuple): the fingerprints of the certificate and of the certificates above it.
+
+        Returns:
+            [bool]: True if a successful verification is memoized, otherwise False.
+        """
+        with cls.lock:
+            expiry_time = cls.verified_certificates.get(chain_key)
+            if expiry_time is None:
+                return False
+            if datetime.now(timezone.utc) > expiry_time:
+                del cls.verified_certificates[chain_key]
+                return False
+            cls.verified_certificates.move_to_end(chain_key)
+        return True
+
+    @classmethod
+    def mark_verified(cls, chain_key, cert_chain):
+        """ Memoizes a successful verification.
+
+        Args:
+            chain_key (tuple): the fingerprints of the certificate and of the certificates above it.
+            cert_chain (list): the certificate and the certificates above it.
+        """
+        expiry_time = cls.get_expiry_time(cert_chain)
+        with cls.lock:
+            cls.verified_certificates[chain_key] = expiry_time
+            cls.verified_certificates.move_to_end(chain_key)
+            if len(cls.verified_certificates) > cls.MAX_VERIFIED_CERTIFICATES:
+                cls.verified_certificates.popitem(last=False)
+
+    @classmethod
+    def verify_certificate_chain(cls, cert_chain):
+        """ Verifies a certificate chain against its root certificate, reusing the persistent store of the
+        root and the memoized verification results.
+
+        Args:
+            cert_chain (list): the certificate chain as a list of OpenSSL.crypto.X509 with the root cert at the end.
+
+        Returns:
+            [tuple]: True if the verification is successful, otherwise False, and the index of the failing
+                     certificate or None.
+        """
+        fingerprints = [cls.get_fingerprint(cert) for cert in cert_chain]
+        store = cls.get_store(cert_chain[-1])
+
+        for index in range(len(cert_chain) - 2, -1, -1):
+            chain_key = tuple(fingerprints[index:])
+            if cls.is_verified(chain_key):
+                Tracer.increment("cert_chain_cache.hit")
+                continue
+
+            Tracer.increment("cert_chain_cache.miss")
+            store_context = crypto.X509StoreContext(store, cert_chain[index], chain=cert_chain[index + 1:-1])
+            try:
+                store_context.verify_certificate()
+            except crypto.X509StoreContextError as e:
+                event_log.error(e)
+                return False, index
+            cls.mark_verified(chain_key, cert_chain[index:])
+        return True, None
+
+    @classmethod
+    def clear(cls):
+        """ Removes all the cached certificates, stores and verification results. """
+        with cls.lock:
+            cls.root_certificates.clear()
+            cls.stores.clear()
+            cls.verified_certificates.clear()
@@ -0,0 +1,132 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from verifier.config import (
+    BaseSettings,
+    event_log,
+)
+
+
+class HttpClient:
+    """ A class to share one pooled HTTP session between the RIM and OCSP clients, so that the
+    requests sent during an attestation reuse the keep-alive connections to each host instead of
+    doing a new TCP and TLS handshake per request.
+
+    The retries are done by the callers, so the session itself does not retry.
+    """
+    session = None
+    lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls):
+        """ Returns the shared HTTP session, creating it on first use.
+
+        Returns:
+            [requests.Session]: the shared HTTP session.
+        """
+        with cls.lock:
+            if cls.session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=BaseSettings.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=BaseSettings.HTTP_POOL_MAX_SIZE,
+                    max_retries=0,
+                    pool_block=True,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls.session = session
+                event_log.debug("Created the pooled HTTP session.")
+            return cls.session
+
+    @staticmethod
+    def get_timeout(read_timeout):
+        """ Returns the (connect, read) timeout tuple of a request.
+
+        Args:
+            read_timeout (float): the read timeout in seconds.
+
+        Returns:
+            [tuple]: the connect and read timeouts in seconds.
+        """
+        return (BaseSettings.HTTP_CONNECT_TIMEOUT, read_timeout)
+
+    @classmethod
+    def get(cls, url, read_timeout):
+        """ Sends a GET request with the shared HTTP session.
+
+        Args:
+            url (str): the url of the request.
+            read_timeout (float): the read timeout in seconds.
+
+        Raises:
+            requests.RequestException: it is raised if the request fails or the response has an error status.
+
+        Returns:
+            [bytes]: the body of the response.
+        """
+        response = cls.get_session().get(url, timeout=cls.get_timeout(read_timeout))
+        response.raise_for_status()
+        return response.content
+
+    @classmethod
+    def post(cls, url, data, content_type, read_timeout):
+        """ Sends a POST request with the shared HTTP session.
+
+        Args:
+            url (str): the url of the request.
+            data (bytes): the body of the request.
+            content_type (str): the content type of the body.
+            read_timeout (float): the read timeout in seconds.
+
+        Raises:
+            requests.RequestException: it is raised if the request fails or the response has an error status.
+
+        Returns:
+            [bytes]: the body of the response.
+        """
+        response = cls.get_session().post(
+            url, data=data, headers={"Content-Type": content_type}, timeout=cls.get_timeout(read_timeout)
+        )
+        response.raise_for_status()
+        return response.content
+
+    @classmethod
+    def close(cls):
+        """ Closes the shared HTTP session and its pooled connections. """
+        with cls.lock:
+            if cls.session is not None:
+                cls.session.close()
+                cls.session = None
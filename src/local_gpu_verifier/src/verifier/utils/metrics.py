@@ -0,0 +1,235 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import bisect
+import threading
+
+from verifier.config import (
+    BaseSettings,
+    event_log,
+)
+
+
+class MetricsRegistry:
+    """ A class to record the counters and the latency histograms of the verifier and to expose them
+    in the Prometheus text format from a long running process.
+
+    Every sample is labelled with the Azure VM region of the process. The registry only records
+    samples once it is enabled, so the one-shot command line tools do not pay for it.
+    """
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+    DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    enabled = False
+    lock = threading.Lock()
+    # name -> (type, help)
+    descriptions = dict()
+    # name -> {labels: value}
+    counters = dict()
+    # name -> {labels: [bucket counts, sum, count]}
+    histograms = dict()
+    collectors = list()
+
+    @classmethod
+    def enable(cls):
+        """ Starts recording the metrics. """
+        cls.enabled = True
+
+    @classmethod
+    def describe(cls, name, metric_type, description):
+        """ Sets the type and the help text of a metric.
+
+        Args:
+            name (str): the name of the metric.
+            metric_type (str): the Prometheus type of the metric, counter, gauge or histogram.
+            description (str): the help text of the metric.
+        """
+        with cls.lock:
+            cls.descriptions[name] = (metric_type, description)
+
+    @classmethod
+    def register_collector(cls, collector):
+        """ Registers a function called on every scrape to report metrics computed on demand.
+
+        Args:
+            collector (callable): a function returning a list of (name, type, help, [(labels, value)]) tuples.
+        """
+        with cls.lock:
+            cls.collectors.append(collector)
+
+    @staticmethod
+    def get_labels(labels):
+        """ Returns the labels of a sample with the region label added, in a hashable form. """
+        labels = dict(labels)
+        labels.setdefault("region", BaseSettings.AZURE_VM_REGION or "unknown")
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @classmethod
+    def increment(cls, name, value=1, **labels):
+        """ Increments a counter.
+
+        Args:
+            name (str): the name of the counter.
+            value (int, optional): the value to be added. Defaults to 1.
+            labels (dict): the labels of the sample.
+        """
+        if not cls.enabled:
+            return
+        key = cls.get_labels(labels)
+        with cls.lock:
+            samples = cls.counters.setdefault(name, dict())
+            samples[key] = samples.get(key, 0) + value
+
+    @classmethod
+    def observe(cls, name, value, **labels):
+        """ Adds an observation to a histogram using the DURATION_BUCKETS.
+
+        Args:
+            name (str): the name of the histogram.
+            value (float): the observed value.
+            labels (dict): the labels of the sample.
+        """
+        if not cls.enabled:
+            return
+        key = cls.get_labels(labels)
+        bucket_index = bisect.bisect_left(cls.DURATION_BUCKETS, value)
+        with cls.lock:
+            samples = cls.histograms.setdefault(name, dict())
+            sample = samples.get(key)
+            if sample is None:
+                sample = samples[key] = [[0] * (len(cls.DURATION_BUCKETS) + 1), 0.0, 0]
+            sample[0][bucket_index] += 1
+            sample[1] += value
+            sample[2] += 1
+
+    @staticmethod
+    def format_labels(labels):
+        """ Formats the labels of a sample in the Prometheus text format. """
+        if not labels:
+            return ""
+        escaped = (
+            (key, value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")) for key, value in labels
+        )
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+    @staticmethod
+    def format_value(value):
+        """ Formats the value of a sample in the Prometheus text format. """
+        if isinstance(value, float):
+            return repr(value)
+        return str(value)
+
+    @classmethod
+    def render(cls):
+        """ Returns all the metrics in the Prometheus text exposition format.
+
+        Returns:
+            [str]: the metrics.
+        """
+        lines = list()
+
+        def add_header(name, default_type):
+            default_description = "The number of " + name[len("verifier_"):-len("_total")].replace("_", " ") + " events."
+            metric_type, description = cls.descriptions.get(name, (default_type, default_description))
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        with cls.lock:
+            for name in sorted(cls.counters):
+                add_header(name, "counter")
+                for labels, value in sorted(cls.counters[name].items()):
+                    lines.append(f"{name}{cls.format_labels(labels)} {cls.format_value(value)}")
+
+            for name in sorted(cls.histograms):
+                add_header(name, "histogram")
+                for labels, (bucket_counts, total, count) in sorted(cls.histograms[name].items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(cls.DURATION_BUCKETS + ("+Inf",), bucket_counts):
+                        cumulative += bucket_count
+                        bucket_labels = labels + (("le", str(bound)),)
+                        lines.append(f"{name}_bucket{cls.format_labels(bucket_labels)} {cumulative}")
+                    lines.append(f"{name}_sum{cls.format_labels(labels)} {cls.format_value(total)}")
+                    lines.append(f"{name}_count{cls.format_labels(labels)} {count}")
+            collectors = list(cls.collectors)
+
+        for collector in collectors:
+            try:
+                metrics = collector()
+            except Exception as error:
+                event_log.error(f"Failed to collect the metrics of {collector.__name__} : {error}")
+                continue
+            for name, metric_type, description, samples in metrics:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{cls.format_labels(cls.get_labels(labels))} {cls.format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def clear(cls):
+        """ Removes all the recorded samples. """
+        with cls.lock:
+            cls.counters.clear()
+            cls.histograms.clear()
+
+
+MetricsRegistry.describe(
+    "verifier_phase_duration_seconds", "histogram", "The duration of the phases of the GPU attestation."
+)
+MetricsRegistry.describe(
+    "verifier_phase_errors_total", "counter", "The number of phases of the GPU attestation which raised an error."
+)
+MetricsRegistry.describe(
+    "verifier_rim_fetch_total", "counter", "The number of RIM fetches by the RIM service used and result."
+)
+MetricsRegistry.describe(
+    "verifier_ocsp_fetch_total", "counter", "The number of OCSP response fetches by the OCSP service used and result."
+)
+MetricsRegistry.describe(
+    "verifier_call_timeouts_total", "counter", "The number of calls timed out in function_wrapper_with_timeout."
+)
+MetricsRegistry.describe(
+    "verifier_errors_total", "counter", "The number of RIMFetchError and OCSPFetchError errors raised."
+)
+MetricsRegistry.describe(
+    "verifier_attestations_total", "counter", "The number of GPU attestations by result."
+)
+MetricsRegistry.describe(
+    "verifier_cache_lookups_total", "counter", "The number of lookups in the caches of the verifier by cache and result."
+)
+MetricsRegistry.describe(
+    "verifier_retries_total", "counter", "The number of retried RIM and OCSP requests by service."
+)
+MetricsRegistry.describe(
+    "verifier_fallbacks_total", "counter", "The number of fallbacks to the Nvidia RIM and OCSP services by service."
+)
+MetricsRegistry.describe(
+    "verifier_attestation_duration_seconds", "histogram", "The duration of the GPU attestations."
+)
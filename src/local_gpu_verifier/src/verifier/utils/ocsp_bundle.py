@@ -0,0 +1,221 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import json
+import base64
+import threading
+from datetime import datetime, timezone
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509 import ocsp
+
+from verifier.config import (
+    BaseSettings,
+    event_log,
+)
+from verifier.utils import get_ocsp_single_response
+from verifier.utils.tracing import Tracer
+
+
+class OcspBundle:
+    """ A class to read and write the OCSP bundles stapling the OCSP responses of the known certificates
+    of the GPU and RIM certificate chains.
+
+    An OCSP bundle is a JSON file with the DER encoded OCSP responses, an index mapping the issuer key hash
+    and the serial number of every certificate to its response, and the time after which the bundle is no
+    longer fresh, the earliest nextUpdate time of its responses. A fresh bundled response is used instead of
+    the OCSP service. An expired one is only used when the OCSP services can not be reached, so that the OCSP
+    validity extension still applies. A bundled response goes through the same validation as a freshly
+    fetched one, which verifies its signature, and the bundle is bypassed when the OCSP nonce is enabled.
+    """
+    lock = threading.Lock()
+    file_id = None
+    responses = list()
+    index = dict()
+    not_after = None
+    load_error = None
+
+    @staticmethod
+    def is_enabled():
+        """ Checks if the OCSP bundle can be used.
+
+        Returns:
+            [bool]: True if an OCSP bundle is configured and the OCSP nonce is disabled, otherwise False.
+        """
+        return bool(BaseSettings.OCSP_BUNDLE_PATH) and not BaseSettings.OCSP_NONCE_ENABLED
+
+    @staticmethod
+    def get_key(issuer_key_hash, serial_number):
+        """ Returns the index key of a certificate.
+
+        Args:
+            issuer_key_hash (bytes): the hash of the public key of the issuer certificate.
+            serial_number (int): the serial number of the certificate.
+
+        Returns:
+            [str]: the index key.
+        """
+        return f"{issuer_key_hash.hex()}_{serial_number:x}"
+
+    @classmethod
+    def load(cls, path):
+        """ Reads the OCSP bundle, the caller holds the lock.
+
+        Args:
+            path (str): the path to the OCSP bundle.
+
+        Raises:
+            ValueError: it is raised if the OCSP bundle is malformed.
+            OSError: it is raised if the OCSP bundle can not be read.
+        """
+        cls.responses = list()
+        cls.index = dict()
+        cls.not_after = None
+        with open(path, "r") as f:
+            bundle = json.load(f)
+        responses = [ocsp.load_der_ocsp_response(base64.b64decode(data)) for data in bundle["responses"]]
+        index = bundle["index"]
+        if any(not 0 <= position < len(responses) for position in index.values()):
+            raise ValueError("the index refers to a missing response")
+        cls.responses = responses
+        cls.index = index
+        cls.not_after = datetime.fromisoformat(bundle["not_after"])
+        event_log.debug(f"Loaded the OCSP bundle {path} with {len(index)} certificates, fresh until {cls.not_after}.")
+
+    @classmethod
+    def refresh(cls):
+        """ Reads the configured OCSP bundle if it is not read yet or its file has been replaced, the caller
+        holds the lock.
+
+        Returns:
+            [bool]: True if the OCSP bundle is loaded, otherwise False.
+        """
+        path = BaseSettings.OCSP_BUNDLE_PATH
+        try:
+            stat = os.stat(path)
+            file_id = (path, stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_id = (path,)
+
+        if file_id != cls.file_id:
+            cls.load_error = None
+            try:
+                cls.load(path)
+            except Exception as error:
+                cls.load_error = error
+            cls.file_id = file_id
+        if cls.load_error is not None:
+            event_log.error(f"The OCSP bundle {path} can not be used : {cls.load_error}")
+            return False
+        return True
+
+    @classmethod
+    def get(cls, issuer_key_hash, serial_number, allow_expired=False):
+        """ Fetches the bundled OCSP response of a certificate.
+
+        Args:
+            issuer_key_hash (bytes): the hash of the public key of the issuer certificate.
+            serial_number (int): the serial number of the certificate.
+            allow_expired (bool, optional): whether a response past its nextUpdate time, or from a bundle
+                    which is no longer fresh, can be returned. Defaults to False.
+
+        Returns:
+            [cryptography.x509.ocsp.OCSPResponse]: the OCSP response, or None if there is no usable bundled response.
+        """
+        if not cls.is_enabled():
+            return None
+
+        with cls.lock:
+            if not cls.refresh():
+                return None
+            position = cls.index.get(cls.get_key(issuer_key_hash, serial_number))
+            ocsp_response = cls.responses[position] if position is not None else None
+            not_after = cls.not_after
+
+        single_response = None
+        if ocsp_response is not None:
+            single_response = get_ocsp_single_response(ocsp_response, issuer_key_hash, serial_number)
+        if single_response is None:
+            event_log.debug(f"OCSP bundle miss for serial number {serial_number}")
+            Tracer.increment("ocsp_bundle.miss")
+            return None
+
+        utc_now = datetime.now(timezone.utc)
+        next_update = single_response.next_update_utc
+        if not allow_expired and (utc_now > not_after or next_update is None or utc_now >= next_update):
+            event_log.debug(f"The bundled OCSP response for serial number {serial_number} is expired")
+            Tracer.increment("ocsp_bundle.miss")
+            return None
+
+        event_log.debug(f"OCSP bundle hit for serial number {serial_number}")
+        Tracer.increment("ocsp_bundle.hit")
+        return ocsp_response
+
+    @classmethod
+    def write(cls, path, ocsp_fetch_results):
+        """ Writes an OCSP bundle atomically.
+
+        Args:
+            path (str): the path of the OCSP bundle.
+            ocsp_fetch_results (list): the (ocsp request, ocsp response) tuples of the certificates.
+
+        Returns:
+            [datetime]: the time after which the OCSP bundle is no longer fresh.
+        """
+        responses = list()
+        positions = dict()
+        index = dict()
+        not_after = None
+        for ocsp_request, ocsp_response in ocsp_fetch_results:
+            data = ocsp_response.public_bytes(serialization.Encoding.DER)
+            if data not in positions:
+                positions[data] = len(responses)
+                responses.append(base64.b64encode(data).decode("ascii"))
+            index[cls.get_key(ocsp_request.issuer_key_hash, ocsp_request.serial_number)] = positions[data]
+
+            single_response = get_ocsp_single_response(
+                ocsp_response, ocsp_request.issuer_key_hash, ocsp_request.serial_number
+            )
+            if not_after is None or single_response.next_update_utc < not_after:
+                not_after = single_response.next_update_utc
+
+        bundle = {
+            "version": 1,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "not_after": not_after.isoformat(),
+            "responses": responses,
+            "index": index,
+        }
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(bundle, f, indent=1)
+        os.replace(temp_path, path)
+        return not_after
@@ -0,0 +1,251 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509 import ocsp
+
+from verifier.config import (
+    BaseSettings,
+    event_log,
+)
+from verifier.utils import get_ocsp_single_response
+from verifier.utils.tracing import Tracer
+
+
+class OcspCache:
+    """ A class to manage the cache of the OCSP responses of the certificates in the GPU and RIM
+    certificate chains.
+
+    The responses are keyed by the issuer key hash and the serial number of the certificate and
+    are reused until their nextUpdate time. The MAX_ENTRIES most recently used ones are kept in memory
+    and all of them are optionally persisted as DER files in BaseSettings.OCSP_CACHE_DIR. A cached response goes
+    through the same validation as a freshly fetched one; the cache is bypassed when the OCSP nonce
+    is enabled, as the nonce requires a fresh response.
+    """
+    FILE_SUFFIX = ".der"
+    MAX_ENTRIES = 256
+    entries = OrderedDict()
+    lock = threading.Lock()
+
+    @staticmethod
+    def is_enabled():
+        """ Checks if the OCSP cache can be used.
+
+        Returns:
+            [bool]: True if the OCSP cache is enabled and the OCSP nonce is disabled, otherwise False.
+        """
+        return BaseSettings.OCSP_CACHE_ENABLED and not BaseSettings.OCSP_NONCE_ENABLED
+
+    @staticmethod
+    def get_key(issuer_key_hash, serial_number):
+        """ Returns the cache key of a certificate.
+
+        Args:
+            issuer_key_hash (bytes): the hash of the public key of the issuer certificate.
+            serial_number (int): the serial number of the certificate.
+
+        Returns:
+            [tuple]: the cache key.
+        """
+        return (issuer_key_hash.hex(), serial_number)
+
+    @classmethod
+    def get_path(cls, key):
+        """ Returns the path of the cached OCSP response on the disk.
+
+        Args:
+            key (tuple): the cache key.
+
+        Returns:
+            [str]: the path to the cached OCSP response, or None if the disk cache is not configured.
+        """
+        if not BaseSettings.OCSP_CACHE_DIR:
+            return None
+        return os.path.join(BaseSettings.OCSP_CACHE_DIR, f"{key[0]}_{key[1]:x}{cls.FILE_SUFFIX}")
+
+    @staticmethod
+    def is_fresh(single_response):
+        """ Checks if the status of a certificate in an OCSP response can still be reused.
+
+        Args:
+            single_response (cryptography.x509.ocsp.OCSPSingleResponse): the status of the certificate.
+
+        Returns:
+            [bool]: True if the current time is before the nextUpdate time of the status, otherwise False.
+        """
+        next_update = single_response.next_update_utc
+        return next_update is not None and datetime.now(timezone.utc) < next_update
+
+    @classmethod
+    def load_from_disk(cls, key):
+        """ Loads a cached OCSP response from the disk.
+
+        Args:
+            key (tuple): the cache key.
+
+        Returns:
+            [bytes]: the DER encoded OCSP response, or None if it is not on the disk.
+        """
+        path = cls.get_path(key)
+        if path is None:
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as error:
+            event_log.error(f"Unable to read the cached OCSP response {path} : {error}")
+            return None
+
+    @classmethod
+    def keep_in_memory(cls, key, data):
+        """ Keeps an OCSP response in memory as the most recently used one, evicting the least recently used
+        one beyond MAX_ENTRIES. The caller must hold the lock.
+
+        Args:
+            key (tuple): the cache key.
+            data (bytes): the DER encoded OCSP response.
+        """
+        cls.entries[key] = data
+        cls.entries.move_to_end(key)
+        if len(cls.entries) > cls.MAX_ENTRIES:
+            cls.entries.popitem(last=False)
+
+    @classmethod
+    def remove(cls, key):
+        """ Removes the OCSP response of the given key from the cache. The caller must hold the lock.
+
+        Args:
+            key (tuple): the cache key.
+        """
+        cls.entries.pop(key, None)
+        path = cls.get_path(key)
+        if path is None:
+            return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as error:
+            event_log.error(f"Unable to remove {path} from the OCSP cache : {error}")
+
+    @classmethod
+    def get(cls, issuer_key_hash, serial_number):
+        """ Fetches the cached OCSP response of a certificate.
+
+        Args:
+            issuer_key_hash (bytes): the hash of the public key of the issuer certificate.
+            serial_number (int): the serial number of the certificate.
+
+        Returns:
+            [cryptography.x509.ocsp.OCSPResponse]: the OCSP response, or None if there is no fresh cached response.
+        """
+        if not cls.is_enabled():
+            return None
+
+        key = cls.get_key(issuer_key_hash, serial_number)
+        with cls.lock:
+            data = cls.entries.get(key)
+            if data is None:
+                data = cls.load_from_disk(key)
+            if data is None:
+                event_log.debug(f"OCSP cache miss for serial number {serial_number}")
+                Tracer.increment("ocsp_cache.miss")
+                return None
+
+            try:
+                ocsp_response = ocsp.load_der_ocsp_response(data)
+                single_response = get_ocsp_single_response(ocsp_response, issuer_key_hash, serial_number)
+                if single_response is None:
+                    raise ValueError("the response does not match the certificate")
+            except Exception as error:
+                event_log.error(f"Invalid cached OCSP response for serial number {serial_number} : {error}")
+                cls.remove(key)
+                Tracer.increment("ocsp_cache.miss")
+                return None
+
+            if not cls.is_fresh(single_response):
+                event_log.debug(f"The cached OCSP response for serial number {serial_number} is expired")
+                cls.remove(key)
+                Tracer.increment("ocsp_cache.miss")
+                return None
+
+            cls.keep_in_memory(key, data)
+
+        event_log.debug(f"OCSP cache hit for serial number {serial_number}")
+        Tracer.increment("ocsp_cache.hit")
+        return ocsp_response
+
+    @classmethod
+    def put(cls, issuer_key_hash, serial_number, ocsp_response):
+        """ Stores a validated OCSP response in the cache.
+
+        Args:
+            issuer_key_hash (bytes): the hash of the public key of the issuer certificate.
+            serial_number (int): the serial number of the certificate.
+            ocsp_response (cryptography.x509.ocsp.OCSPResponse): the OCSP response.
+        """
+        if not BaseSettings.OCSP_CACHE_ENABLED:
+            return
+
+        single_response = get_ocsp_single_response(ocsp_response, issuer_key_hash, serial_number)
+        if single_response is None or not cls.is_fresh(single_response):
+            return
+
+        key = cls.get_key(issuer_key_hash, serial_number)
+        data = ocsp_response.public_bytes(serialization.Encoding.DER)
+
+        with cls.lock:
+            cls.keep_in_memory(key, data)
+            path = cls.get_path(key)
+            if path is None:
+                return
+
+            try:
+                os.makedirs(BaseSettings.OCSP_CACHE_DIR, mode=0o700, exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except OSError as error:
+                event_log.error(f"Unable to store the OCSP response in the OCSP cache : {error}")
+
+    @classmethod
+    def clear(cls):
+        """ Removes all the OCSP responses kept in memory. """
+        with cls.lock:
+            cls.entries.clear()
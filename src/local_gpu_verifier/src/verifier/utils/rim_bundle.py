@@ -0,0 +1,296 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+import threading
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.hashes import SHA384
+
+from verifier.config import (
+    BaseSettings,
+    event_log,
+)
+from verifier.exceptions import RIMBundleError
+from verifier.utils.tracing import Tracer
+
+
+class RimBundle:
+    """ A class to read and write the RIM bundles used where the RIM service can not be reached.
+
+    A RIM bundle is a single file with many RIM files and an index by RIM file id:
+
+        magic (8 bytes) | index length (4 bytes) | signature length (4 bytes) | index | signature | RIM contents
+
+    The index is a JSON object mapping every RIM file id to the offset and length of its content,
+    relative to the start of the RIM contents, and to the sha384 digest of its content. The signature
+    is an ECDSA signature of the index with SHA384, so it covers the content of every RIM file through
+    its digest. The bundle is memory mapped once, and mapped again only when the file is replaced, and
+    a RIM file is read by slicing the mapping at the offset given by the index, without extracting the bundle.
+    """
+    MAGIC = b"NVRIMBD1"
+    HEADER = struct.Struct(">8sII")
+    lock = threading.Lock()
+    file_id = None
+    file = None
+    mapping = None
+    entries = dict()
+    data_offset = 0
+    load_error = None
+
+    @staticmethod
+    def is_enabled():
+        """ Checks if a RIM bundle is configured.
+
+        Returns:
+            [bool]: True if the RIM bundle can be used, otherwise False.
+        """
+        return bool(BaseSettings.RIM_BUNDLE_PATH)
+
+    @staticmethod
+    def compute_digest(content):
+        """ Computes the sha384 digest of a RIM content.
+
+        Args:
+            content (bytes): the content of the RIM file.
+
+        Returns:
+            [str]: the hex encoded digest.
+        """
+        return hashlib.sha384(content).hexdigest()
+
+    @staticmethod
+    def load_public_key(path):
+        """ Loads the public key verifying the signature of the RIM bundle.
+
+        Args:
+            path (str): the path to the PEM encoded EC public key.
+
+        Raises:
+            RIMBundleError: it is raised if the public key can not be read or is not an EC key.
+
+        Returns:
+            [cryptography.hazmat.primitives.asymmetric.ec.EllipticCurvePublicKey]: the public key.
+        """
+        try:
+            with open(path, "rb") as f:
+                public_key = serialization.load_pem_public_key(f.read())
+        except Exception as error:
+            raise RIMBundleError(f"Unable to read the RIM bundle public key {path} : {error}")
+        if not isinstance(public_key, ec.EllipticCurvePublicKey):
+            raise RIMBundleError(f"The RIM bundle public key {path} is not an EC public key.")
+        return public_key
+
+    @classmethod
+    def close(cls):
+        """ Unmaps the loaded RIM bundle. """
+        with cls.lock:
+            cls.unload()
+
+    @classmethod
+    def unload(cls):
+        """ Unmaps the loaded RIM bundle, the caller holds the lock. """
+        if cls.mapping is not None:
+            cls.mapping.close()
+        if cls.file is not None:
+            cls.file.close()
+        cls.file_id = None
+        cls.file = None
+        cls.mapping = None
+        cls.entries = dict()
+        cls.data_offset = 0
+        cls.load_error = None
+
+    @classmethod
+    def load(cls, path):
+        """ Memory maps the RIM bundle and reads its index, the caller holds the lock.
+
+        Args:
+            path (str): the path to the RIM bundle.
+
+        Raises:
+            RIMBundleError: it is raised if the RIM bundle is malformed or fails the signature verification.
+        """
+        cls.unload()
+        try:
+            cls.file = open(path, "rb")
+            cls.mapping = mmap.mmap(cls.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            raise RIMBundleError(f"Unable to map the RIM bundle {path} : {error}")
+
+        if len(cls.mapping) < cls.HEADER.size:
+            raise RIMBundleError(f"The RIM bundle {path} is truncated.")
+        magic, index_length, signature_length = cls.HEADER.unpack_from(cls.mapping, 0)
+        if magic != cls.MAGIC:
+            raise RIMBundleError(f"{path} is not a RIM bundle.")
+        data_offset = cls.HEADER.size + index_length + signature_length
+        if data_offset > len(cls.mapping):
+            raise RIMBundleError(f"The RIM bundle {path} is truncated.")
+        index = cls.mapping[cls.HEADER.size:cls.HEADER.size + index_length]
+        signature = cls.mapping[cls.HEADER.size + index_length:data_offset]
+
+        if BaseSettings.RIM_BUNDLE_PUBLIC_KEY:
+            if not signature:
+                raise RIMBundleError(f"The RIM bundle {path} is not signed.")
+            public_key = cls.load_public_key(BaseSettings.RIM_BUNDLE_PUBLIC_KEY)
+            try:
+                public_key.verify(signature, index, ec.ECDSA(SHA384()))
+            except InvalidSignature:
+                raise RIMBundleError(f"The signature verification of the RIM bundle {path} failed.")
+            event_log.debug(f"The signature of the RIM bundle {path} is verified.")
+
+        try:
+            entries = json.loads(index)["rims"]
+            for rim_id, (offset, length, digest) in entries.items():
+                if offset < 0 or length < 0 or data_offset + offset + length > len(cls.mapping):
+                    raise ValueError(f"the content of {rim_id} is out of the bundle")
+                if not isinstance(digest, str):
+                    raise ValueError(f"the digest of {rim_id} is not a string")
+        except Exception as error:
+            raise RIMBundleError(f"The index of the RIM bundle {path} is malformed : {error}")
+
+        cls.entries = entries
+        cls.data_offset = data_offset
+        event_log.debug(f"Loaded the RIM bundle {path} with {len(entries)} RIM files.")
+
+    @classmethod
+    def refresh(cls):
+        """ Loads the configured RIM bundle if it is not loaded yet or its file has been replaced, the caller
+        holds the lock.
+
+        Raises:
+            RIMBundleError: it is raised if the RIM bundle can not be loaded.
+        """
+        path = BaseSettings.RIM_BUNDLE_PATH
+        try:
+            stat = os.stat(path)
+            file_id = (path, stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_id = (path,)
+
+        if file_id != cls.file_id:
+            try:
+                cls.load(path)
+            except RIMBundleError as error:
+                cls.load_error = error
+            cls.file_id = file_id
+        if cls.load_error is not None:
+            raise cls.load_error
+
+    @classmethod
+    def get(cls, rim_id):
+        """ Fetches the content of the RIM file with the given id from the RIM bundle.
+
+        Args:
+            rim_id (str): the RIM file id.
+
+        Returns:
+            [str]: the content of the RIM file, or None if there is no RIM bundle, the RIM file is not
+                    in the RIM bundle or fails the integrity check.
+        """
+        if not cls.is_enabled():
+            return None
+
+        with cls.lock:
+            try:
+                cls.refresh()
+            except RIMBundleError as error:
+                event_log.error(f"The RIM bundle can not be used : {error}")
+                return None
+
+            entry = cls.entries.get(rim_id)
+            if entry is None:
+                event_log.debug(f"RIM {rim_id} is not in the RIM bundle")
+                Tracer.increment("rim_bundle.miss")
+                return None
+
+            offset, length, digest = entry
+            start = cls.data_offset + offset
+            content = cls.mapping[start:start + length]
+
+        if cls.compute_digest(content) != digest:
+            event_log.error(f"RIM {rim_id} of the RIM bundle failed the integrity check.")
+            Tracer.increment("rim_bundle.miss")
+            return None
+
+        event_log.debug(f"RIM bundle hit for {rim_id}")
+        Tracer.increment("rim_bundle.hit")
+        return content.decode("utf-8")
+
+    @classmethod
+    def write(cls, path, rims, signing_key=None):
+        """ Writes a RIM bundle atomically.
+
+        Args:
+            path (str): the path of the RIM bundle.
+            rims (dict): the content of the RIM files as strings, keyed by RIM file id.
+            signing_key (cryptography.hazmat.primitives.asymmetric.ec.EllipticCurvePrivateKey, optional):
+                    the key signing the index of the RIM bundle. Defaults to None, which writes an unsigned bundle.
+        """
+        entries = dict()
+        contents = list()
+        offset = 0
+        for rim_id in sorted(rims):
+            content = rims[rim_id].encode("utf-8")
+            entries[rim_id] = [offset, len(content), cls.compute_digest(content)]
+            contents.append(content)
+            offset += len(content)
+
+        index = json.dumps({"version": 1, "rims": entries}, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        signature = signing_key.sign(index, ec.ECDSA(SHA384())) if signing_key is not None else b""
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(index), len(signature)))
+            f.write(index)
+            f.write(signature)
+            for content in contents:
+                f.write(content)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def list_rim_ids(cls):
+        """ Lists the RIM file ids of the configured RIM bundle.
+
+        Raises:
+            RIMBundleError: it is raised if the RIM bundle can not be loaded.
+
+        Returns:
+            [list]: the sorted RIM file ids.
+        """
+        with cls.lock:
+            cls.refresh()
+            return sorted(cls.entries)
@@ -0,0 +1,328 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import Counter
+
+from verifier.config import (
+    BaseSettings,
+    event_log,
+)
+from verifier.utils.tracing import Tracer
+
+
+class RimCache:
+    """ A class to manage the on-disk cache of the RIM files fetched from the RIM service.
+
+    The RIM content is stored content-addressed as <sha384>.swidtag and every RIM file id
+    has a small <rim_id>.json index entry pointing to the digest of its content. Only the RIM
+    files whose verification has succeeded are stored, and the digest of the content is
+    checked again on every read.
+    """
+    RIM_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]+$")
+    INDEX_SUFFIX = ".json"
+    CONTENT_SUFFIX = ".swidtag"
+    lock = threading.Lock()
+
+    @staticmethod
+    def is_enabled():
+        """ Checks if the RIM cache is enabled and has a cache directory configured.
+
+        Returns:
+            [bool]: True if the RIM cache can be used, otherwise False.
+        """
+        return BaseSettings.RIM_CACHE_ENABLED and bool(BaseSettings.RIM_CACHE_DIR)
+
+    @classmethod
+    def get_index_path(cls, rim_id):
+        """ Returns the path of the index entry of the given RIM file id.
+
+        Args:
+            rim_id (str): the RIM file id.
+
+        Returns:
+            [str]: the path to the index entry, or None if the RIM file id can not be used as a file name.
+        """
+        if not cls.RIM_ID_PATTERN.match(rim_id):
+            return None
+        return os.path.join(BaseSettings.RIM_CACHE_DIR, rim_id + cls.INDEX_SUFFIX)
+
+    @classmethod
+    def get_content_path(cls, digest):
+        """ Returns the path of the cached RIM content with the given digest.
+
+        Args:
+            digest (str): the hex encoded sha384 digest of the RIM content.
+
+        Returns:
+            [str]: the path to the cached RIM content.
+        """
+        return os.path.join(BaseSettings.RIM_CACHE_DIR, digest + cls.CONTENT_SUFFIX)
+
+    @staticmethod
+    def compute_digest(content):
+        """ Computes the sha384 digest of the RIM content.
+
+        Args:
+            content (str): the content of the RIM file as a string.
+
+        Returns:
+            [str]: the hex encoded digest.
+        """
+        return hashlib.sha384(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def write_file(path, data):
+        """ Writes the data to the given path atomically.
+
+        Args:
+            path (str): the destination path.
+            data (bytes): the data to be written.
+        """
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def is_expired(stored_at):
+        """ Checks if a cache entry stored at the given time is older than the maximum age.
+
+        Args:
+            stored_at (float): the time at which the entry was stored, in seconds since the epoch.
+
+        Returns:
+            [bool]: True if the entry is expired, otherwise False.
+        """
+        return time.time() - stored_at > BaseSettings.RIM_CACHE_MAX_AGE_HRS * 3600
+
+    @classmethod
+    def read_index(cls, index_path):
+        """ Reads an index entry of the RIM cache.
+
+        Args:
+            index_path (str): the path to the index entry.
+
+        Returns:
+            [dict]: the index entry, or None if it is missing or malformed.
+        """
+        try:
+            with open(index_path, "r") as f:
+                entry = json.load(f)
+            if not isinstance(entry.get("sha384"), str) or not isinstance(entry.get("stored_at"), (int, float)):
+                raise ValueError("missing fields")
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            event_log.error(f"Invalid RIM cache index entry {index_path} : {error}")
+            cls.remove_file(index_path)
+            return None
+
+    @staticmethod
+    def remove_file(path):
+        """ Removes the given file, ignoring the case where it does not exist.
+
+        Args:
+            path (str): the path to the file.
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as error:
+            event_log.error(f"Unable to remove {path} from the RIM cache : {error}")
+
+    @classmethod
+    def get(cls, rim_id):
+        """ Fetches the content of the RIM file with the given id from the RIM cache.
+
+        Args:
+            rim_id (str): the RIM file id.
+
+        Returns:
+            [str]: the content of the RIM file, or None if it is not cached, expired or fails the integrity check.
+        """
+        if not cls.is_enabled():
+            return None
+
+        index_path = cls.get_index_path(rim_id)
+        if index_path is None:
+            return None
+
+        with cls.lock:
+            entry = cls.read_index(index_path)
+            if entry is None:
+                event_log.debug(f"RIM cache miss for {rim_id}")
+                Tracer.increment("rim_cache.miss")
+                return None
+
+            if cls.is_expired(entry["stored_at"]):
+                event_log.debug(f"RIM cache entry for {rim_id} is expired")
+                cls.evict(rim_id)
+                Tracer.increment("rim_cache.miss")
+                return None
+
+            try:
+                with open(cls.get_content_path(entry["sha384"]), "rb") as f:
+                    content = f.read().decode("utf-8")
+            except Exception as error:
+                event_log.error(f"Unable to read the cached RIM {rim_id} : {error}")
+                cls.evict(rim_id)
+                Tracer.increment("rim_cache.miss")
+                return None
+
+            if cls.compute_digest(content) != entry["sha384"]:
+                event_log.error(f"The cached RIM {rim_id} failed the integrity check, removing it from the RIM cache.")
+                cls.evict(rim_id)
+                Tracer.increment("rim_cache.miss")
+                return None
+
+        event_log.debug(f"RIM cache hit for {rim_id}")
+        Tracer.increment("rim_cache.hit")
+        return content
+
+    @classmethod
+    def put(cls, rim_id, content):
+        """ Stores the content of a verified RIM file in the RIM cache and then enforces the size and age limits.
+
+        Args:
+            rim_id (str): the RIM file id.
+            content (str): the content of the RIM file as a string.
+        """
+        if not cls.is_enabled():
+            return
+
+        index_path = cls.get_index_path(rim_id)
+        if index_path is None:
+            event_log.debug(f"The RIM file id {rim_id} can not be cached.")
+            return
+
+        digest = cls.compute_digest(content)
+
+        with cls.lock:
+            entry = cls.read_index(index_path)
+            if entry is not None and entry["sha384"] == digest and os.path.isfile(cls.get_content_path(digest)):
+                return
+
+            try:
+                os.makedirs(BaseSettings.RIM_CACHE_DIR, mode=0o700, exist_ok=True)
+                cls.write_file(cls.get_content_path(digest), content.encode("utf-8"))
+                entry = {
+                    "rim_id": rim_id,
+                    "sha384": digest,
+                    "size": len(content.encode("utf-8")),
+                    "stored_at": time.time(),
+                }
+                cls.write_file(index_path, json.dumps(entry).encode("utf-8"))
+                event_log.debug(f"Stored RIM {rim_id} in the RIM cache.")
+            except OSError as error:
+                event_log.error(f"Unable to store RIM {rim_id} in the RIM cache : {error}")
+                return
+
+            cls.enforce_limits()
+
+    @classmethod
+    def evict(cls, rim_id, references=None):
+        """ Removes the RIM file with the given id from the RIM cache, and its content once no other index entry
+        refers to it. The caller must hold the lock.
+
+        Args:
+            rim_id (str): the RIM file id.
+            references (collections.Counter, optional): the number of index entries referring to every content
+                    digest, counted by the caller from one listing of the RIM cache and updated by the eviction.
+                    Defaults to None, in which case the RIM cache is listed.
+        """
+        index_path = cls.get_index_path(rim_id)
+        if index_path is None:
+            return
+
+        entry = cls.read_index(index_path)
+        cls.remove_file(index_path)
+        if entry is None:
+            return
+
+        digest = entry["sha384"]
+        if references is None:
+            references = Counter(other_entry["sha384"] for _, other_entry in cls.list_entries())
+        else:
+            references[digest] -= 1
+        if references[digest] <= 0:
+            cls.remove_file(cls.get_content_path(digest))
+
+    @classmethod
+    def list_entries(cls):
+        """ Lists all the index entries of the RIM cache.
+
+        Returns:
+            [list]: list of (rim_id, entry) tuples.
+        """
+        entries = list()
+        try:
+            file_names = os.listdir(BaseSettings.RIM_CACHE_DIR)
+        except OSError:
+            return entries
+
+        for file_name in file_names:
+            if not file_name.endswith(cls.INDEX_SUFFIX):
+                continue
+            entry = cls.read_index(os.path.join(BaseSettings.RIM_CACHE_DIR, file_name))
+            if entry is not None:
+                entries.append((file_name[: -len(cls.INDEX_SUFFIX)], entry))
+        return entries
+
+    @classmethod
+    def enforce_limits(cls):
+        """ Evicts the expired entries and then the oldest entries until the total size of the RIM cache is
+        within the configured limit. The RIM cache is listed once. The caller must hold the lock.
+        """
+        entries = sorted(cls.list_entries(), key=lambda item: item[1]["stored_at"])
+        references = Counter(entry["sha384"] for _, entry in entries)
+
+        valid_entries = list()
+        for rim_id, entry in entries:
+            if cls.is_expired(entry["stored_at"]):
+                event_log.debug(f"Evicting expired RIM {rim_id} from the RIM cache.")
+                cls.evict(rim_id, references)
+            else:
+                valid_entries.append((rim_id, entry))
+
+        total_size = sum(entry.get("size", 0) for _, entry in valid_entries)
+        for rim_id, entry in valid_entries:
+            if total_size <= BaseSettings.RIM_CACHE_MAX_SIZE_BYTES:
+                break
+            event_log.debug(f"Evicting RIM {rim_id} from the RIM cache to stay within the size limit.")
+            cls.evict(rim_id, references)
+            total_size -= entry.get("size", 0)
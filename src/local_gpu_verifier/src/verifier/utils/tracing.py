@@ -0,0 +1,390 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import json
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from verifier.config import (
+    event_log,
+    __version__,
+)
+from verifier.utils.metrics import MetricsRegistry
+
+
+class Span:
+    """ A class to record the timing, the attributes and the counters of one phase of an attestation.
+    """
+
+    def __init__(self, trace, name, parent, attributes):
+        """ The constructor of the Span class.
+
+        Args:
+            trace (Trace): the trace the span belongs to.
+            name (str): the name of the phase.
+            parent (Span): the enclosing span, or None for the root span of the trace.
+            attributes (dict): the attributes of the span.
+        """
+        self.trace = trace
+        self.name = name
+        self.parent = parent
+        self.span_id = secrets.token_hex(8)
+        self.attributes = dict(attributes)
+        self.counters = dict()
+        self.error = None
+        self.start_time_ns = time.time_ns()
+        self.start_counter_ns = time.perf_counter_ns()
+        self.end_time_ns = None
+        self.duration_ns = None
+        self.lock = threading.Lock()
+
+    def set_attribute(self, key, value):
+        """ Sets an attribute of the span.
+
+        Args:
+            key (str): the name of the attribute.
+            value (str, int, float or bool): the value of the attribute.
+        """
+        with self.lock:
+            self.attributes[key] = value
+
+    def increment(self, counter, value=1):
+        """ Increments a counter of the span, such as the number of retries or cache hits.
+
+        Args:
+            counter (str): the name of the counter.
+            value (int, optional): the value to be added. Defaults to 1.
+        """
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def end(self, error=None):
+        """ Ends the span and adds it to its trace.
+
+        Args:
+            error (BaseException, optional): the exception raised in the phase. Defaults to None.
+        """
+        self.duration_ns = time.perf_counter_ns() - self.start_counter_ns
+        self.end_time_ns = self.start_time_ns + self.duration_ns
+        if error is not None:
+            self.error = str(error) or type(error).__name__
+        self.trace.add_span(self)
+
+    def get_duration_ms(self):
+        """ Returns the duration of the span in milliseconds, or the elapsed time if it is not ended. """
+        duration_ns = self.duration_ns
+        if duration_ns is None:
+            duration_ns = time.perf_counter_ns() - self.start_counter_ns
+        return round(duration_ns / 1e6, 3)
+
+    @staticmethod
+    def to_otlp_value(value):
+        """ Converts an attribute value to an OTLP AnyValue. """
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def to_otlp(self):
+        """ Returns the span in the OTLP JSON format.
+
+        Returns:
+            [dict]: the OTLP span.
+        """
+        attributes = dict(self.attributes)
+        attributes.update((f"counter.{name}", value) for name, value in self.counters.items())
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or time.time_ns()),
+            "attributes": [{"key": key, "value": self.to_otlp_value(value)} for key, value in attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error is not None else {"code": 1},
+        }
+        if self.parent is not None:
+            span["parentSpanId"] = self.parent.span_id
+        return span
+
+
+class Trace:
+    """ A class to collect the spans of one attestation.
+    """
+
+    def __init__(self, name, attributes):
+        """ The constructor of the Trace class.
+
+        Args:
+            name (str): the name of the root span.
+            attributes (dict): the attributes of the root span.
+        """
+        self.trace_id = secrets.token_hex(16)
+        self.lock = threading.Lock()
+        self.spans = list()
+        self.root = Span(self, name, None, attributes)
+
+    def add_span(self, span):
+        """ Adds an ended span to the trace.
+
+        Args:
+            span (Span): the span.
+        """
+        with self.lock:
+            self.spans.append(span)
+
+    def get_spans(self):
+        """ Returns the ended spans in the order of their start time. """
+        with self.lock:
+            return sorted(self.spans, key=lambda span: span.start_counter_ns)
+
+    def get_counters(self):
+        """ Returns the sum of the counters of all the spans of the trace.
+
+        Returns:
+            [dict]: the total of every counter.
+        """
+        counters = dict()
+        for span in self.get_spans():
+            for name, value in span.counters.items():
+                counters[name] = counters.get(name, 0) + value
+        return counters
+
+    def to_dict(self):
+        """ Returns the trace as a tree of spans, to be included in the JSON output of the verifier.
+
+        Returns:
+            [dict]: the trace id, the total counters and the root span with its children.
+        """
+        spans = self.get_spans()
+        children = dict()
+        for span in spans:
+            children.setdefault(span.parent, []).append(span)
+
+        def to_node(span):
+            node = {
+                "name": span.name,
+                "duration_ms": span.get_duration_ms(),
+            }
+            if span.attributes:
+                node["attributes"] = dict(span.attributes)
+            if span.counters:
+                node["counters"] = dict(span.counters)
+            if span.error is not None:
+                node["error"] = span.error
+            if span in children:
+                node["children"] = [to_node(child) for child in children[span]]
+            return node
+
+        return {
+            "trace_id": self.trace_id,
+            "counters": self.get_counters(),
+            "root": to_node(self.root),
+        }
+
+    def to_otlp(self):
+        """ Returns the trace in the OTLP JSON format (an ExportTraceServiceRequest).
+
+        Returns:
+            [dict]: the OTLP trace.
+        """
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": "nv-local-gpu-verifier"}},
+                        {"key": "service.version", "value": {"stringValue": __version__}},
+                    ]
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "verifier", "version": __version__},
+                    "spans": [span.to_otlp() for span in self.get_spans()],
+                }],
+            }]
+        }
+
+
+class Tracer:
+    """ A class to record the phases of the attestations as traces of nested spans.
+
+    The current trace and span are kept in context variables, so that the spans opened in the
+    helper threads are attached to the span that submitted the work. Nothing is recorded when no
+    trace is active, so the spans can be left in the code paths at no cost. The durations of the
+    spans and the counters are also recorded in the MetricsRegistry when it is enabled.
+    """
+    current_trace = ContextVar("verifier_trace", default=None)
+    current_span = ContextVar("verifier_span", default=None)
+    export_lock = threading.Lock()
+
+    @classmethod
+    @contextmanager
+    def start_trace(cls, name, **attributes):
+        """ Starts a trace whose root span covers the enclosed code.
+
+        Args:
+            name (str): the name of the root span.
+            attributes (dict): the attributes of the root span.
+
+        Yields:
+            [Trace]: the trace.
+        """
+        trace = Trace(name, attributes)
+        trace_token = cls.current_trace.set(trace)
+        span_token = cls.current_span.set(trace.root)
+        error = None
+        try:
+            yield trace
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            cls.current_span.reset(span_token)
+            cls.current_trace.reset(trace_token)
+            trace.root.end(error)
+
+    @classmethod
+    @contextmanager
+    def span(cls, name, **attributes):
+        """ Records the enclosed code as a span of the current trace.
+
+        Args:
+            name (str): the name of the phase.
+            attributes (dict): the attributes of the span.
+
+        Yields:
+            [Span]: the span, or None if no trace is active.
+        """
+        trace = cls.current_trace.get()
+        if trace is None and not MetricsRegistry.enabled:
+            yield None
+            return
+
+        span = Span(trace, name, cls.current_span.get(), attributes) if trace is not None else None
+        token = cls.current_span.set(span) if span is not None else None
+        start_time = time.perf_counter()
+        error = None
+        try:
+            yield span
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            if span is not None:
+                cls.current_span.reset(token)
+                span.end(error)
+            MetricsRegistry.observe("verifier_phase_duration_seconds", time.perf_counter() - start_time, phase=name)
+            if error is not None:
+                MetricsRegistry.increment("verifier_phase_errors_total", phase=name, error=type(error).__name__)
+
+    @classmethod
+    def increment(cls, counter, value=1):
+        """ Increments a counter of the current span. The counter is also added to the metrics registry, the
+        "<cache>.hit" and "<cache>.miss" counters as verifier_cache_lookups_total{cache,result} and the other
+        "<service>.<event>" counters, such as "ocsp.retries", as verifier_<event>_total{service}.
+
+        Args:
+            counter (str): the name of the counter.
+            value (int, optional): the value to be added. Defaults to 1.
+        """
+        component, _, event = counter.rpartition(".")
+        if event in ("hit", "miss"):
+            MetricsRegistry.increment("verifier_cache_lookups_total", value, cache=component, result=event)
+        else:
+            MetricsRegistry.increment(f"verifier_{event}_total", value, service=component)
+        span = cls.current_span.get()
+        if span is not None:
+            span.increment(counter, value)
+
+    @classmethod
+    def set_attribute(cls, key, value):
+        """ Sets an attribute of the current span.
+
+        Args:
+            key (str): the name of the attribute.
+            value (str, int, float or bool): the value of the attribute.
+        """
+        span = cls.current_span.get()
+        if span is not None:
+            span.set_attribute(key, value)
+
+    @classmethod
+    def bind(cls, function):
+        """ Binds a function to the current trace and span, so that the spans it opens when it is run
+        by a thread pool are attached to the current span.
+
+        Args:
+            function (callable): the function.
+
+        Returns:
+            [callable]: the bound function.
+        """
+        trace = cls.current_trace.get()
+        if trace is None:
+            return function
+        span = cls.current_span.get()
+
+        def bound_function(*args, **kwargs):
+            trace_token = cls.current_trace.set(trace)
+            span_token = cls.current_span.set(span)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                cls.current_span.reset(span_token)
+                cls.current_trace.reset(trace_token)
+
+        return bound_function
+
+    @classmethod
+    def export(cls, trace, path):
+        """ Appends a trace to a file in the OTLP JSON format, one trace per line, as written by the
+        OpenTelemetry collector file exporter. Every line is appended with a single write, so several
+        processes can share the trace file.
+
+        Args:
+            trace (Trace): the trace.
+            path (str): the path to the trace file.
+        """
+        line = (json.dumps(trace.to_otlp(), separators=(",", ":")) + "\n").encode("utf-8")
+        try:
+            with cls.export_lock:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
+        except OSError as error:
+            event_log.error(f"Failed to write the attestation trace to {path} : {error}")
@@ -0,0 +1,146 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+from verifier.config import (
+    BaseSettings,
+    event_log,
+)
+from verifier.utils.tracing import Tracer
+
+
+class VerdictCache:
+    """ A class to keep the verdicts of the certificate chain and RIM verifications of the GPUs across
+    the attestations of the incremental mode.
+
+    In a periodic attestation, the GPU certificate chain, the driver and VBIOS versions and the RIM files
+    do not change between the attestations, only the attestation report bound to the nonce does. The
+    verdicts are keyed by a fingerprint of what was verified and are only kept when the verification
+    succeeded without any warning. They are reused until the earliest nextUpdate time of the OCSP responses
+    and expiry time of the certificates checked by the verification. The cache is bypassed when the OCSP
+    nonce is enabled, as the nonce requires a fresh OCSP response for every attestation.
+    """
+    entries = dict()
+    lock = threading.Lock()
+
+    @staticmethod
+    def is_enabled():
+        """ Checks if the verdicts can be reused.
+
+        Returns:
+            [bool]: True if the incremental attestation is enabled and the OCSP nonce is disabled, otherwise False.
+        """
+        return BaseSettings.INCREMENTAL_ATTESTATION_ENABLED and not BaseSettings.OCSP_NONCE_ENABLED
+
+    @staticmethod
+    def get_key(name, *parts):
+        """ Returns the cache key of a verdict.
+
+        Args:
+            name (str): the name of the verification.
+            parts (list): the str or bytes values fingerprinting what was verified.
+
+        Returns:
+            [tuple]: the cache key.
+        """
+        fingerprint = hashlib.sha384()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode("utf-8")
+            fingerprint.update(len(part).to_bytes(8, "big"))
+            fingerprint.update(part)
+        return (name, fingerprint.hexdigest())
+
+    @classmethod
+    def get(cls, key):
+        """ Fetches a verdict that is still valid.
+
+        Args:
+            key (tuple): the cache key.
+
+        Returns:
+            [any]: the verdict, or None if there is no valid verdict.
+        """
+        if not cls.is_enabled():
+            return None
+
+        with cls.lock:
+            entry = cls.entries.get(key)
+            if entry is not None and datetime.now(timezone.utc) >= entry[1]:
+                event_log.debug(f"The {key[0]} verdict is expired")
+                del cls.entries[key]
+                entry = None
+
+        if entry is None:
+            Tracer.increment("verdict_cache.miss")
+            return None
+
+        event_log.debug(f"Reusing the {key[0]} verdict of a previous attestation")
+        Tracer.increment("verdict_cache.hit")
+        return entry[0]
+
+    @classmethod
+    def put(cls, key, verdict, valid_until):
+        """ Stores the verdict of a successful verification.
+
+        Args:
+            key (tuple): the cache key.
+            verdict (any): the verdict.
+            valid_until (datetime.datetime): the time until which the verdict can be reused, or None if
+                                             it is unknown, in which case the verdict is not stored.
+        """
+        if not cls.is_enabled() or valid_until is None or datetime.now(timezone.utc) >= valid_until:
+            return
+
+        with cls.lock:
+            cls.entries[key] = (verdict, valid_until)
+
+    @classmethod
+    def has_valid_verdicts(cls):
+        """ Checks if the cache holds verdicts that can still be reused.
+
+        Returns:
+            [bool]: True if the cache is enabled and holds at least one valid verdict, otherwise False.
+        """
+        if not cls.is_enabled():
+            return False
+
+        utc_now = datetime.now(timezone.utc)
+        with cls.lock:
+            return any(utc_now < valid_until for _, valid_until in cls.entries.values())
+
+    @classmethod
+    def clear(cls):
+        """ Removes all the verdicts. """
+        with cls.lock:
+            cls.entries.clear()
@@ -28,6 +28,9 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import threading
+import weakref
+
 from verifier.config import (
     BaseSettings,
     info_log,
@@ -37,6 +40,104 @@ from verifier.config import (
 )
 from verifier.utils import is_zeros
 from verifier.exceptions import InvalidMeasurementIndexError
+from verifier.utils.tracing import Tracer
+
+
+class MeasurementPolicy:
+    """ A class to represent the golden measurements of a pair of driver and VBIOS RIMs compiled for the
+    comparison with the runtime measurements. Every active measurement index is mapped to the frozenset of
+    its alternative values as raw bytes, keeping only the values of the expected size, so that the runtime
+    measurement of an index is matched with a single set lookup.
+
+    The policy of a pair of RIM objects is compiled once and shared by the GPUs of an attestation, and by the
+    following attestations while the RIM objects are reused by the incremental attestation.
+    """
+    MSR_35_INDEX = 35
+    policies = dict()
+    lock = threading.Lock()
+
+    def __init__(self, golden_measurements):
+        """ The constructor method for the MeasurementPolicy class.
+
+        Args:
+            golden_measurements (dict): the active golden measurements of the driver and VBIOS RIMs by index.
+        """
+        self.golden_measurements = golden_measurements
+        self.values = dict()
+
+        for index, golden_measurement in golden_measurements.items():
+            size = golden_measurement.get_size()
+            values = set()
+
+            for j in range(golden_measurement.get_number_of_alternatives()):
+                value = golden_measurement.get_value_at_index(j)
+                try:
+                    raw_value = bytes.fromhex(value)
+                except (TypeError, ValueError):
+                    continue
+
+                # The runtime measurements are lower case hex strings, a value can only match one of them
+                # if it is written the same way and has the size of the measurement.
+                if raw_value.hex() == value and len(raw_value) == size:
+                    values.add(raw_value)
+
+            self.values[index] = frozenset(values)
+
+    @classmethod
+    def get(cls, driver_rim_obj, vbios_rim_obj):
+        """ Returns the policy of a pair of driver and VBIOS RIMs, compiling it on first use.
+
+        Args:
+            driver_rim_obj (rim.RIM): the driver RIM object.
+            vbios_rim_obj (rim.RIM): the vbios RIM object.
+
+        Raises:
+            InvalidMeasurementIndexError: it is raised in case both the driver and vbios RIM file have
+                                          active measurement at the same index.
+
+        Returns:
+            [MeasurementPolicy]: the policy.
+        """
+        key = (id(driver_rim_obj), id(vbios_rim_obj))
+        with cls.lock:
+            entry = cls.policies.get(key)
+            if entry is not None and entry[0]() is driver_rim_obj and entry[1]() is vbios_rim_obj:
+                Tracer.increment("measurement_policy.hit")
+                return entry[2]
+
+        Tracer.increment("measurement_policy.miss")
+        policy = cls(Verifier.merge_golden_measurements(driver_rim_obj.get_measurements(),
+                                                        vbios_rim_obj.get_measurements()))
+
+        with cls.lock:
+            # The policies of the RIM objects which no longer exist are dropped
+            for dead_key in [k for k, e in cls.policies.items() if e[0]() is None or e[1]() is None]:
+                del cls.policies[dead_key]
+            cls.policies[key] = (weakref.ref(driver_rim_obj), weakref.ref(vbios_rim_obj), policy)
+        return policy
+
+    def match(self, runtime_measurements, is_msr_35_valid):
+        """ Matches the runtime measurements against the policy.
+
+        Args:
+            runtime_measurements (list): the runtime measurements as hex strings.
+            is_msr_35_valid (bool): False if the measurement at index 35 must not be compared, as the
+                                    NVDEC0 is disabled.
+
+        Returns:
+            [int]: the bitmap of the mismatched measurement indexes, 0 if all the measurements are matching.
+        """
+        mismatches = 0
+
+        for index, values in self.values.items():
+            if index == MeasurementPolicy.MSR_35_INDEX and not is_msr_35_valid:
+                continue
+
+            runtime_measurement = runtime_measurements[index]
+            if runtime_measurement is None or bytes.fromhex(runtime_measurement) not in values:
+                mismatches |= 1 << index
+
+        return mismatches
 
 
 class Verifier:
@@ -68,33 +169,16 @@ class Verifier:
             return False
             
         
-        list_of_mismatched_indexes = list()
-
-        for i in self.golden_measurements:
-            
-            if i == 35 and not self.is_msr_35_valid:
-                continue
-
-            is_matching = False
-
-            for j in range(self.golden_measurements[i].get_number_of_alternatives()):
-                
-                if self.golden_measurements[i].get_value_at_index(j) == self.runtime_measurements[i] and \
-                   self.golden_measurements[i].get_size() == len(self.runtime_measurements[i]) // 2:
-
-                    is_matching = True
-
-            if not is_matching:
-                # Measurements are not matching.
-                list_of_mismatched_indexes.append(i)
+        self.mismatched_measurements = self.policy.match(self.runtime_measurements, self.is_msr_35_valid)
+        list_of_mismatched_indexes = [
+            index for index in range(self.mismatched_measurements.bit_length()) if self.mismatched_measurements >> index & 1
+        ]
 
         if len(list_of_mismatched_indexes) > 0:
             
             info_log.info("""\t\t\tThe runtime measurements are not matching with the
                         golden measurements at the following indexes(starting from 0) :\n\t\t\t[""")
             
-            list_of_mismatched_indexes.sort()
-            
             for i, index in enumerate(list_of_mismatched_indexes):
                 if i != len(list_of_mismatched_indexes) - 1:
                     info_log.info(f'\t\t\t{index}, ')
@@ -108,36 +192,58 @@ class Verifier:
             settings.mark_measurements_as_matching()
             return True
     
-    def generate_golden_measurement_list(self, driver_golden_measurements, vbios_golden_measurements, settings):
+    @staticmethod
+    def merge_golden_measurements(driver_golden_measurements, vbios_golden_measurements):
         """ This method takes the driver and vbios golden measurements and
-        combines them into a single dictionary with the measurement index as
-        the key and the golden measurement object as the value.
+        combines their active measurements into a single dictionary with the
+        measurement index as the key and the golden measurement object as the value.
 
         Args:
             driver_golden_measurements (dict): the dictionary containing the driver golden measurements.
             vbios_golden_measurements (dict): the dictionary containing the vbios golden measurements.
-            settings (config.HopperSettings): the object containing the various config info.
 
         Raises:
             InvalidMeasurementIndexError: it is raised in case both the driver and vbios RIM file have 
                                           active measurement at the same index.
+
+        Returns:
+            [dict]: the active golden measurements by index.
         """
-        self.golden_measurements = dict()
+        golden_measurements = dict()
         
         for gld_msr_idx in driver_golden_measurements:
             
             if driver_golden_measurements[gld_msr_idx].is_active():
-                self.golden_measurements[gld_msr_idx] = driver_golden_measurements[gld_msr_idx]
+                golden_measurements[gld_msr_idx] = driver_golden_measurements[gld_msr_idx]
 
         for gld_msr_idx in vbios_golden_measurements:
 
             if vbios_golden_measurements[gld_msr_idx].is_active() and \
-               gld_msr_idx in self.golden_measurements:
+               gld_msr_idx in golden_measurements:
                raise InvalidMeasurementIndexError(f"The driver and vbios RIM have measurement at the same index : {gld_msr_idx}")
             
             elif vbios_golden_measurements[gld_msr_idx].is_active():
-                self.golden_measurements[gld_msr_idx] = vbios_golden_measurements[gld_msr_idx]
-        
+                golden_measurements[gld_msr_idx] = vbios_golden_measurements[gld_msr_idx]
+
+        return golden_measurements
+
+    def generate_golden_measurement_list(self, driver_golden_measurements, vbios_golden_measurements, settings):
+        """ This method takes the driver and vbios golden measurements and
+        combines them into a single dictionary with the measurement index as
+        the key and the golden measurement object as the value.
+
+        Args:
+            driver_golden_measurements (dict): the dictionary containing the driver golden measurements.
+            vbios_golden_measurements (dict): the dictionary containing the vbios golden measurements.
+            settings (config.HopperSettings): the object containing the various config info.
+
+        Raises:
+            InvalidMeasurementIndexError: it is raised in case both the driver and vbios RIM file have 
+                                          active measurement at the same index.
+        """
+        self.golden_measurements = Verifier.merge_golden_measurements(driver_golden_measurements,
+                                                                      vbios_golden_measurements)
+        self.policy = MeasurementPolicy(self.golden_measurements)
         settings.mark_no_driver_vbios_measurement_index_conflict()
 
     def __init__(self, attestation_report_obj, driver_rim_obj, vbios_rim_obj, settings):
@@ -151,8 +257,13 @@ class Verifier:
         """
         self.is_msr_35_valid = True
 
-        if attestation_report_obj.get_response_message().get_opaque_data().get_data("OPAQUE_FIELD_ID_NVDEC0_STATUS") == BaseSettings.NVDEC_STATUS.DISABLED:
+        # The opaque data field holds the raw status byte, not the NVDEC_STATUS member
+        nvdec0_status = attestation_report_obj.get_response_message().get_opaque_data().get_data("OPAQUE_FIELD_ID_NVDEC0_STATUS")
+        if nvdec0_status == bytes([BaseSettings.NVDEC_STATUS.DISABLED.value]):
             self.is_msr_35_valid = False
 
-        self.generate_golden_measurement_list(driver_rim_obj.get_measurements(), vbios_rim_obj.get_measurements(), settings)
+        # The golden measurements of the RIMs are compiled once per pair of RIM objects
+        self.policy = MeasurementPolicy.get(driver_rim_obj, vbios_rim_obj)
+        self.golden_measurements = self.policy.golden_measurements
+        settings.mark_no_driver_vbios_measurement_index_conflict()
         self.runtime_measurements = attestation_report_obj.get_measurements()
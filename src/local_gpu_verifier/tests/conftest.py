@@ -0,0 +1,125 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+
+import pytest
+from OpenSSL import crypto
+
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+)
+from verifier.nvml import NvmlHandlerTest
+from verifier.rim import RIM
+from verifier.utils.http_client import HttpClient
+
+from nvml_stub import StubNvml
+from ocsp_stub import StubOcspResponder
+
+STUB_OCSP_URL = "https://ocsp.stub.test/"
+STUB_OCSP_URL_NVIDIA = "https://ocsp.nvidia.stub.test/"
+
+
+@pytest.fixture
+def cert_pairs():
+    """ The (certificate, issuer certificate) pairs of the sample GPU certificate chain whose OCSP status is
+    checked. """
+    cert_chain = NvmlHandlerTest(settings=BaseSettings).get_attestation_cert_chain()
+    return CcAdminUtils.get_ocsp_cert_pairs(cert_chain, BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION)
+
+
+@pytest.fixture
+def ocsp_responder(monkeypatch, cert_pairs):
+    """ A stub OCSP responder answering for the sample GPU certificate chain in place of the provided OCSP
+    service, with the OCSP cache and bundle disabled. """
+    responder = StubOcspResponder(STUB_OCSP_URL)
+    responder.add_certificates(cert_pairs)
+
+    monkeypatch.setattr(HttpClient, "post", responder.post)
+    monkeypatch.setattr(BaseSettings, "OCSP_URL", STUB_OCSP_URL)
+    monkeypatch.setattr(BaseSettings, "OCSP_URL_NVIDIA", STUB_OCSP_URL_NVIDIA)
+    monkeypatch.setattr(BaseSettings, "OCSP_NONCE_ENABLED", False)
+    monkeypatch.setattr(BaseSettings, "OCSP_CACHE_ENABLED", False)
+    monkeypatch.setattr(BaseSettings, "OCSP_BUNDLE_PATH", "")
+    monkeypatch.setattr(BaseSettings, "OCSP_BATCH_REQUEST_ENABLED", True)
+    monkeypatch.setattr(BaseSettings, "OCSP_RETRY_DELAY", 0)
+    monkeypatch.setattr(CcAdminUtils, "ocsp_batch_unsupported_urls", set())
+    monkeypatch.setattr(CcAdminUtils, "prefetched_ocsp_responses", dict())
+    return responder
+
+
+@pytest.fixture
+def offline_attestation(monkeypatch, ocsp_responder):
+    """ Lets the sample GPU evidence be attested against the sample RIMs without the network. The stub OCSP
+    responder also answers for the RIM certificate chains, and the verification of the certificate chains
+    accepts its responder certificate, which is not issued by the Nvidia CAs. """
+    monkeypatch.setattr(HopperSettings, "DRIVER_RIM_PATH", HopperSettings.TEST_NO_GPU_DRIVER_RIM_PATH)
+    monkeypatch.setattr(HopperSettings, "VBIOS_RIM_PATH", HopperSettings.TEST_NO_GPU_VBIOS_RIM_PATH)
+    monkeypatch.setattr(BaseSettings, "get_vm_region", classmethod(lambda cls: None))
+    monkeypatch.setattr(CcAdminUtils, "verify_certificate_chain", staticmethod(lambda cert_chain, settings, mode: True))
+
+    # The signing certificates of the sample RIMs are expired, so their signature is not verified
+    def verify_signature(rim, settings):
+        if rim.rim_name == "driver":
+            settings.mark_driver_rim_cert_validated_successfully()
+        else:
+            settings.mark_vbios_rim_cert_validated_successfully()
+        return True
+
+    monkeypatch.setattr(RIM, "verify_signature", verify_signature)
+
+    settings = HopperSettings()
+    with open(os.path.join(settings.ROOT_CERT_DIR, settings.RIM_ROOT_CERT), "rb") as root_cert_file:
+        rim_root_cert = crypto.load_certificate(crypto.FILETYPE_PEM, root_cert_file.read())
+    for rim_name, rim_path in (("driver", settings.DRIVER_RIM_PATH), ("vbios", settings.VBIOS_RIM_PATH)):
+        rim_cert_chain = RIM(rim_name, settings, rim_path=rim_path).extract_certificates() + [rim_root_cert]
+        ocsp_responder.add_certificates(
+            CcAdminUtils.get_ocsp_cert_pairs(rim_cert_chain, BaseSettings.Certificate_Chain_Verification_Mode.DRIVER_RIM_CERT)
+        )
+    return ocsp_responder
+
+
+@pytest.fixture
+def stub_nvml(monkeypatch):
+    """ Returns a function installing a StubNvml of the given number of GPUs in place of NVML. The hung GPUs are
+    released afterwards. """
+    stubs = list()
+
+    def install(number_of_gpus, **latencies):
+        stub = StubNvml(number_of_gpus, **latencies)
+        stub.install(monkeypatch.setattr)
+        stubs.append(stub)
+        return stub
+
+    yield install
+    for stub in stubs:
+        stub.release()
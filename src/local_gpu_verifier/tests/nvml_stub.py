@@ -0,0 +1,121 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import threading
+import time
+import types
+
+import verifier.nvml
+import verifier.nvml.gpu_cert_chains
+from verifier.config import BaseSettings
+from verifier.nvml.nvmlHandlerTest import NvmlHandlerTest
+
+
+class StubNvml:
+    """ A stub of the NVML calls made by NvmlHandler to fetch the evidence of the GPUs, with a latency per call.
+
+    The attestation report of a GPU ends with the index of the GPU, so that the evidence can be matched to the GPU
+    it was fetched from.
+
+    Args:
+        number_of_gpus (int): the number of GPUs.
+        call_latency (float, optional): the time in seconds every NVML call takes. Defaults to 0.
+        certificate_latency (float, optional): the time in seconds the certificate chain fetch takes. Defaults to 0.
+        report_latency (callable, optional): a function returning the time in seconds the attestation report fetch
+                                             of the GPU of the given index takes. Defaults to no latency.
+    """
+
+    ATTESTATION_REPORT = b"\x11" * 0x500
+
+    def __init__(self, number_of_gpus, call_latency=0, certificate_latency=0, report_latency=None):
+        self.number_of_gpus = number_of_gpus
+        self.call_latency = call_latency
+        self.certificate_latency = certificate_latency
+        self.report_latency = report_latency or (lambda index: 0)
+        # The GPUs whose attestation report fetch hangs until release is called
+        self.hung_gpus = set()
+        self.released = threading.Event()
+        self.cert_chain = NvmlHandlerTest(settings=BaseSettings).get_test_attestation_cert_chain()
+
+    def call(self, latency, value):
+        """ Returns an NVML function taking the given time and returning the value, or calling it with the
+        arguments of the NVML call. """
+        def nvml_function(*arguments):
+            time.sleep(latency)
+            return value(*arguments) if callable(value) else value
+        return nvml_function
+
+    def get_attestation_report(self, handle, nonce):
+        index = handle[1]
+        if index in self.hung_gpus:
+            self.released.wait()
+        time.sleep(self.report_latency(index))
+        attestation_report = self.ATTESTATION_REPORT + bytes([index])
+        return types.SimpleNamespace(
+            attestationReportSize=len(attestation_report), attestationReport=attestation_report
+        )
+
+    def release(self):
+        """ Lets the hung attestation report fetches return. """
+        self.released.set()
+
+    def install(self, setattr_function=setattr):
+        """ Replaces the NVML functions used by NvmlHandler with the stub.
+
+        Args:
+            setattr_function (callable, optional): the function setting an attribute, such as
+                                                   pytest's monkeypatch.setattr to restore them. Defaults to setattr.
+        """
+        nvml = verifier.nvml
+        calls = {
+            "nvmlInit": None,
+            "nvmlSystemGetConfComputeState": types.SimpleNamespace(ccFeature=1, devToolsMode=0),
+            "nvmlSystemGetConfComputeSettings": None,
+            "nvmlDeviceGetCount": self.number_of_gpus,
+            "nvmlDeviceGetHandleByIndex": lambda index: ("handle", index),
+            "nvmlSystemGetDriverVersion": "550.90.07",
+            "nvmlDeviceGetBoardId": 1,
+            "nvmlDeviceGetUUID": lambda handle: f"GPU-{handle[1]}",
+            "nvmlDeviceGetArchitecture": 9,
+            "nvmlDeviceGetVbiosVersion": "96.00.9f.00.01",
+        }
+        for name, value in calls.items():
+            setattr_function(nvml, name, self.call(self.call_latency, value))
+        setattr_function(nvml, "nvmlDeviceGetConfComputeGpuAttestationReport", self.get_attestation_report)
+        setattr_function(
+            verifier.nvml.gpu_cert_chains,
+            "nvmlDeviceGetConfComputeGpuCertificate",
+            self.call(
+                self.certificate_latency,
+                types.SimpleNamespace(attestationCertChainSize=len(self.cert_chain), attestationCertChain=self.cert_chain),
+            ),
+        )
+        setattr_function(nvml.NvmlHandler, "is_ppcie_mode_enabled", staticmethod(lambda: False))
+        setattr_function(nvml.NvmlHandler, "Initialized", False)
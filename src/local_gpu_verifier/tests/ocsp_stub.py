@@ -0,0 +1,315 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+""" A stub OCSP responder answering the OCSP requests of the verifier in process, used by the tests and the
+benchmarks instead of the OCSP services.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.hashes import SHA384
+from cryptography.x509 import ocsp
+from cryptography.x509.oid import NameOID
+
+from verifier.utils import encode_der_element, read_der_element, split_der_elements
+
+
+def parse_ocsp_request(ocsp_request_data):
+    """ Parses an OCSP request which can ask for the status of several certificates. The cryptography
+    package only loads the OCSP requests with a single certificate, so every Request element of the
+    requestList is loaded as a single certificate OCSP request carrying the extensions of the request.
+
+    Args:
+        ocsp_request_data (bytes): the raw OCSP request message.
+
+    Returns:
+        [tuple]: the list of the single certificate ocsp requests and the nonce of the request, or None.
+    """
+    _, ocsp_request_content, _ = read_der_element(ocsp_request_data)
+    tbs_request_element = split_der_elements(ocsp_request_content)[0][1]
+    _, tbs_request_content, _ = read_der_element(tbs_request_element)
+
+    request_list, request_extensions = bytes(), bytes()
+    for tag, element in split_der_elements(tbs_request_content):
+        if tag == 0x30:
+            _, request_list, _ = read_der_element(element)
+        elif tag == 0xA2:
+            request_extensions = element
+
+    ocsp_requests = list()
+    for _, request in split_der_elements(request_list):
+        tbs_request = encode_der_element(0x30, encode_der_element(0x30, request) + request_extensions)
+        ocsp_requests.append(ocsp.load_der_ocsp_request(encode_der_element(0x30, tbs_request)))
+
+    nonce = None
+    if ocsp_requests:
+        try:
+            nonce = ocsp_requests[0].extensions.get_extension_for_class(x509.OCSPNonce).value.nonce
+        except x509.ExtensionNotFound:
+            pass
+
+    return ocsp_requests, nonce
+
+
+def get_basic_ocsp_response(ocsp_response_data):
+    """ Extracts the BasicOCSPResponse element of a successful OCSP response message.
+
+    Args:
+        ocsp_response_data (bytes): the raw OCSP response message.
+
+    Returns:
+        [tuple]: the responseStatus element, the responseType element and the BasicOCSPResponse element.
+    """
+    _, ocsp_response_content, _ = read_der_element(ocsp_response_data)
+    (_, response_status), (_, response_bytes) = split_der_elements(ocsp_response_content)
+    _, response_bytes, _ = read_der_element(response_bytes)
+    _, response_bytes_content, _ = read_der_element(response_bytes)
+    (_, response_type), (_, response) = split_der_elements(response_bytes_content)
+    _, basic_ocsp_response, _ = read_der_element(response)
+    return response_status, response_type, basic_ocsp_response
+
+
+class StubOcspResponder:
+    """ A stub OCSP responder signing the status GOOD for the certificates registered with it.
+
+    Args:
+        url (str): the url the responder answers on.
+        latency (float, optional): the time in seconds every request takes. Defaults to 0.
+        supports_batch (bool, optional): False to only answer the first certificate of a request, as the OCSP
+                                         services not supporting batched requests do. Defaults to True.
+    """
+
+    # The time from the signing of a response to its nextUpdate time, negative for expired responses
+    validity = timedelta(days=1)
+
+    def __init__(self, url, latency=0, supports_batch=True):
+        self.url = url
+        self.latency = latency
+        self.supports_batch = supports_batch
+        self.omitted_serial_numbers = set()
+        # The serial numbers whose requests fail as if the responder could not be reached, and the extra time in
+        # seconds the requests of a serial number take
+        self.refused_serial_numbers = set()
+        self.delays = dict()
+        # The validity of the responses of a serial number instead of the validity of the responder, and the
+        # (revocation time, revocation reason) of the revoked serial numbers
+        self.validities = dict()
+        self.revocations = dict()
+        # The status answered instead of the OCSP responses, such as tryLater, or None to answer them
+        self.response_status = None
+        self.refused_urls = list()
+        self.certificates = dict()
+        self.requests = list()
+        self.lock = threading.Lock()
+
+        now = datetime.now(timezone.utc)
+        self.responder_key = ec.generate_private_key(ec.SECP384R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Stub OCSP Responder")])
+        self.responder_cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(self.responder_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(days=1))
+            .not_valid_after(now + timedelta(days=30))
+            .sign(self.responder_key, SHA384())
+        )
+
+    def add_certificates(self, cert_pairs):
+        """ Registers the certificates whose status the responder can sign.
+
+        Args:
+            cert_pairs (list): the list of (certificate, issuer certificate) tuples of cryptography certificates.
+        """
+        for cert, issuer in cert_pairs:
+            key_hash = ocsp.OCSPRequestBuilder().add_certificate(cert, issuer, SHA384()).build().issuer_key_hash
+            self.certificates[(key_hash, cert.serial_number)] = (cert, issuer)
+
+    def get_request_count(self):
+        """ Returns the number of requests received by the responder. """
+        with self.lock:
+            return len(self.requests)
+
+    def build_single_response(self, cert, issuer, nonce):
+        """ Builds and signs the OCSP response of one certificate. """
+        now = datetime.now(timezone.utc)
+        validity = self.validities.get(cert.serial_number, self.validity)
+        revocation_time, revocation_reason = self.revocations.get(cert.serial_number, (None, None))
+        builder = (
+            ocsp.OCSPResponseBuilder()
+            .add_response(
+                cert=cert,
+                issuer=issuer,
+                algorithm=SHA384(),
+                cert_status=ocsp.OCSPCertStatus.GOOD if revocation_time is None else ocsp.OCSPCertStatus.REVOKED,
+                this_update=min(now, now + validity - timedelta(days=1)),
+                next_update=now + validity,
+                revocation_time=revocation_time,
+                revocation_reason=revocation_reason,
+            )
+            .responder_id(ocsp.OCSPResponderEncoding.HASH, self.responder_cert)
+            .certificates([self.responder_cert])
+        )
+        if nonce is not None:
+            builder = builder.add_extension(x509.OCSPNonce(nonce), critical=False)
+        return builder.sign(self.responder_key, SHA384()).public_bytes(serialization.Encoding.DER)
+
+    def build_response(self, ocsp_requests, nonce):
+        """ Builds one OCSP response with the status of all the known certificates of the request. The
+        single certificate responses of the OCSPResponseBuilder are merged into the responses of the first one,
+        which is then signed again.
+
+        Args:
+            ocsp_requests (list): the single certificate ocsp requests.
+            nonce (bytes): the nonce of the request, or None.
+
+        Returns:
+            [bytes]: the raw OCSP response message.
+        """
+        if self.response_status is not None:
+            return ocsp.OCSPResponseBuilder.build_unsuccessful(self.response_status).public_bytes(
+                serialization.Encoding.DER
+            )
+        if not self.supports_batch:
+            ocsp_requests = ocsp_requests[:1]
+
+        single_responses = [
+            self.build_single_response(*self.certificates[(request.issuer_key_hash, request.serial_number)], nonce)
+            for request in ocsp_requests
+            if (request.issuer_key_hash, request.serial_number) in self.certificates
+            and request.serial_number not in self.omitted_serial_numbers
+        ]
+        if not single_responses:
+            return ocsp.OCSPResponseBuilder.build_unsuccessful(ocsp.OCSPResponseStatus.UNAUTHORIZED).public_bytes(
+                serialization.Encoding.DER
+            )
+        if len(single_responses) == 1:
+            return single_responses[0]
+
+        responses = bytes()
+        for single_response in single_responses:
+            basic_ocsp_response = get_basic_ocsp_response(single_response)[2]
+            _, basic_ocsp_response_content, _ = read_der_element(basic_ocsp_response)
+            _, tbs_response_data, _ = read_der_element(split_der_elements(basic_ocsp_response_content)[0][1])
+            for tag, element in split_der_elements(tbs_response_data):
+                if tag == 0x30:
+                    responses += read_der_element(element)[1]
+
+        response_status, response_type, basic_ocsp_response = get_basic_ocsp_response(single_responses[0])
+        _, basic_ocsp_response_content, _ = read_der_element(basic_ocsp_response)
+        tbs_response_element, signature_algorithm, _, certs = [
+            element for _, element in split_der_elements(basic_ocsp_response_content)
+        ]
+        _, tbs_response_data, _ = read_der_element(tbs_response_element)
+        tbs_response_data = encode_der_element(
+            0x30,
+            b"".join(
+                encode_der_element(0x30, responses) if tag == 0x30 else element
+                for tag, element in split_der_elements(tbs_response_data)
+            ),
+        )
+        signature = self.responder_key.sign(tbs_response_data, ec.ECDSA(SHA384()))
+        basic_ocsp_response = encode_der_element(
+            0x30, tbs_response_data + signature_algorithm + encode_der_element(0x03, b"\x00" + signature) + certs
+        )
+        response_bytes = encode_der_element(0x30, response_type + encode_der_element(0x04, basic_ocsp_response))
+        return encode_der_element(0x30, response_status + encode_der_element(0xA0, response_bytes))
+
+    def post(self, url, data, content_type, read_timeout):
+        """ Answers a POST request in place of verifier.utils.http_client.HttpClient.post. """
+        if url != self.url or content_type != "application/ocsp-request":
+            with self.lock:
+                self.refused_urls.append(url)
+            raise requests.ConnectionError(f"The stub OCSP responder does not answer on {url}")
+
+        ocsp_requests, nonce = parse_ocsp_request(data)
+        serial_numbers = [request.serial_number for request in ocsp_requests]
+        if self.refused_serial_numbers.intersection(serial_numbers):
+            raise requests.ConnectionError(f"The stub OCSP responder refuses the request on {url}")
+        with self.lock:
+            self.requests.append(len(ocsp_requests))
+        delay = self.latency + max(self.delays.get(serial_number, 0) for serial_number in serial_numbers)
+        if delay:
+            time.sleep(delay)
+        return self.build_response(ocsp_requests, nonce)
+
+
+class StubOcspRequestHandler(BaseHTTPRequestHandler):
+    """ Answers the OCSP requests sent over HTTP with the StubOcspResponder of the server, keeping the
+    connections alive. """
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.client_ports.append(self.client_address[1])
+        try:
+            response = self.server.responder.post(
+                self.server.responder.url, data, self.headers.get("Content-Type"), None
+            )
+        except requests.ConnectionError:
+            self.send_error(415 if self.headers.get("Content-Type") != "application/ocsp-request" else 503)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/ocsp-response")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def do_GET(self):
+        self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOcspServer(ThreadingHTTPServer):
+    """ A local HTTP server in front of a StubOcspResponder, used to test the HTTP client itself. The client
+    port of every request is recorded to tell the connections apart.
+
+    Args:
+        responder (StubOcspResponder): the responder answering the requests.
+    """
+    daemon_threads = True
+
+    def __init__(self, responder):
+        super().__init__(("127.0.0.1", 0), StubOcspRequestHandler)
+        self.responder = responder
+        self.client_ports = list()
+        self.lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self.server_port}/"
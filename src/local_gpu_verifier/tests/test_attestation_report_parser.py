@@ -0,0 +1,153 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import os
+from collections import OrderedDict
+
+import pytest
+from cryptography.hazmat.primitives import hashes
+
+from verifier.attestation import AttestationReport
+from verifier.attestation.spdm_msrt_resp_msg import OpaqueData, SpdmMeasurementResponseMessage
+from verifier.config import HopperSettings
+from verifier.exceptions import ParsingError
+from verifier.utils import convert_string_to_blob
+
+# The values returned by the getters for samples/hopperAttestationReport.txt, recorded with the parser preceding
+# the memoryview based one
+EXPECTED_GETTER_VALUES_PATH = os.path.join(os.path.dirname(__file__), "data", "hopper_attestation_report_getters.json")
+
+
+def to_json_value(value):
+    """ Converts a getter value to JSON, keeping the bytes distinct from the strings. """
+    if value is None or type(value) in (bool, int, str):
+        return value
+    if type(value) is bytes:
+        return {"bytes": value.hex()}
+    if type(value) is list:
+        return [to_json_value(item) for item in value]
+    if type(value) is dict:
+        return {str(key): to_json_value(item) for key, item in value.items()}
+    raise TypeError(f"Unexpected getter value type {type(value).__name__}")
+
+
+def get_response_getter_values(response_message):
+    measurement_record = response_message.get_measurement_record()
+    opaque_data = response_message.get_opaque_data()
+    return to_json_value({
+        "spdm_version": response_message.get_spdm_version(),
+        "request_response_code": response_message.get_request_response_code(),
+        "param1": response_message.get_param1(),
+        "param2": response_message.get_param2(),
+        "number_of_blocks": response_message.get_number_of_blocks(),
+        "measurement_record_length": response_message.get_measurement_record_length(),
+        "measurements": measurement_record.get_measurements(),
+        "measurement_blocks": {
+            index: [
+                block.get_measurement_value_type(),
+                block.get_measurement_value_size(),
+                block.get_measurement_value(),
+            ]
+            for index, block in sorted(measurement_record.MeasurementBlocks.items())
+        },
+        "nonce": response_message.get_nonce(),
+        "opaque_data_length": response_message.get_opaque_data_length(),
+        "opaque_data": {name: opaque_data.get_data(name) for name in OpaqueData.OPAQUE_DATA_TYPES.values()},
+        "signature": response_message.get_signature(),
+    })
+
+
+def get_report_getter_values(attestation_report):
+    request_message = attestation_report.get_request_message()
+    return {
+        "request": to_json_value({
+            "spdm_version": request_message.get_spdm_version(),
+            "request_response_code": request_message.get_request_response_code(),
+            "param1": request_message.get_param1(),
+            "param2": request_message.get_param2(),
+            "nonce": request_message.get_nonce(),
+            "slot_id_param": request_message.get_slot_id_param(),
+        }),
+        "measurements": to_json_value(attestation_report.get_measurements()),
+        "response": get_response_getter_values(attestation_report.get_response_message()),
+    }
+
+
+@pytest.fixture(scope="module")
+def attestation_report_data():
+    with open(HopperSettings.ATTESTATION_REPORT_PATH, "r") as f:
+        return convert_string_to_blob(f.read())
+
+
+def test_getters_match_the_recorded_values(attestation_report_data):
+    with open(EXPECTED_GETTER_VALUES_PATH, "r") as f:
+        expected_getter_values = json.load(f)
+
+    attestation_report = AttestationReport(attestation_report_data, HopperSettings())
+
+    assert get_report_getter_values(attestation_report) == expected_getter_values
+
+
+def test_every_truncated_response_raises(attestation_report_data):
+    response = attestation_report_data[AttestationReport.LENGTH_OF_SPDM_GET_MEASUREMENT_REQUEST_MESSAGE:]
+    SpdmMeasurementResponseMessage(response, HopperSettings())
+
+    accepted_lengths = list()
+    for length in range(len(response)):
+        try:
+            SpdmMeasurementResponseMessage(response[:length], HopperSettings())
+        except ParsingError:
+            continue
+        accepted_lengths.append(length)
+
+    assert accepted_lengths == []
+
+
+@pytest.mark.parametrize("length", [4, 7, 200, 3500])
+def test_truncated_attestation_report_raises(attestation_report_data, length):
+    truncated_data = attestation_report_data[:AttestationReport.LENGTH_OF_SPDM_GET_MEASUREMENT_REQUEST_MESSAGE + length]
+
+    with pytest.raises(ParsingError):
+        AttestationReport(truncated_data, HopperSettings())
+
+
+def test_public_keys_evicts_the_least_recently_used(monkeypatch, cert_pairs):
+    monkeypatch.setattr(AttestationReport, "MAX_PUBLIC_KEYS", 2)
+    monkeypatch.setattr(AttestationReport, "public_keys", OrderedDict())
+    first, second, third = (certificate for certificate, _ in cert_pairs)
+
+    first_public_key = AttestationReport.get_public_key(first)
+    AttestationReport.get_public_key(second)
+    assert AttestationReport.get_public_key(first) is first_public_key
+    AttestationReport.get_public_key(third)
+
+    assert list(AttestationReport.public_keys) == [first.fingerprint(hashes.SHA256()), third.fingerprint(hashes.SHA256())]
+    assert AttestationReport.get_public_key(first) is first_public_key
@@ -0,0 +1,117 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import pytest
+
+from verifier.attestation import AttestationReport
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+)
+from verifier.nvml import NvmlHandlerTest
+from verifier.utils import convert_string_to_blob
+
+
+def flip_bit(data, index, bit=0):
+    data = bytearray(data)
+    data[index] ^= 1 << bit
+    return bytes(data)
+
+
+@pytest.fixture(scope="module")
+def settings():
+    return HopperSettings()
+
+
+@pytest.fixture(scope="module")
+def attestation_report_data():
+    with open(HopperSettings.ATTESTATION_REPORT_PATH, "r") as f:
+        return convert_string_to_blob(f.read())
+
+
+@pytest.fixture(scope="module")
+def leaf_certificate():
+    return NvmlHandlerTest(settings=BaseSettings).get_attestation_cert_chain()[0].to_cryptography()
+
+
+@pytest.fixture(scope="module")
+def signed_data(attestation_report_data, settings):
+    """ The sample attestation report, the data it signs and its signature. """
+    attestation_report = AttestationReport(attestation_report_data, settings)
+    data = AttestationReport.concatenate(
+        attestation_report.request_data, attestation_report.response_data, settings.signature_length
+    )
+    return attestation_report, data, attestation_report.get_response_message().get_signature()
+
+
+def test_valid_signature(signed_data, leaf_certificate, settings):
+    attestation_report, data, signature = signed_data
+
+    assert AttestationReport.verify_signature_with_cryptography(
+        AttestationReport.get_public_key(leaf_certificate), signature, data, settings.HashFunction
+    ) is True
+    assert attestation_report.verify_signature(leaf_certificate, settings.signature_length, settings.HashFunction) is True
+
+
+@pytest.mark.parametrize(
+    "signature_bit, data_bit, expected",
+    [
+        (None, None, True),
+        # The lowest bits of r and s, and the highest bit of r
+        ((47, 0), None, False),
+        ((95, 0), None, False),
+        ((0, 7), None, False),
+        # A bit of the nonce of the request and of the measurements of the response
+        (None, (10, 3), False),
+        (None, (200, 0), False),
+    ],
+)
+def test_cryptography_and_ecdsa_agree(signed_data, leaf_certificate, settings, signature_bit, data_bit, expected):
+    attestation_report, data, signature = signed_data
+    if signature_bit is not None:
+        signature = flip_bit(signature, *signature_bit)
+    if data_bit is not None:
+        data = flip_bit(data, *data_bit)
+
+    cryptography_result = AttestationReport.verify_signature_with_cryptography(
+        AttestationReport.get_public_key(leaf_certificate), signature, data, settings.HashFunction
+    )
+    ecdsa_result = attestation_report.verify_signature_with_ecdsa(leaf_certificate, signature, data, settings.HashFunction)
+
+    assert cryptography_result is ecdsa_result is expected
+
+
+@pytest.mark.parametrize("offset_from_end", [1, 150])
+def test_report_with_a_flipped_bit_is_rejected(attestation_report_data, leaf_certificate, settings, offset_from_end):
+    # The last byte of the signature, and a byte of the opaque data preceding it
+    data = flip_bit(attestation_report_data, len(attestation_report_data) - offset_from_end)
+    attestation_report = AttestationReport(data, settings)
+
+    assert attestation_report.verify_signature(leaf_certificate, settings.signature_length, settings.HashFunction) is False
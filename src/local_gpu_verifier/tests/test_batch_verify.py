@@ -0,0 +1,120 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import sys
+
+import pytest
+
+from verifier import (
+    batch_verify,
+    cc_admin,
+)
+from verifier.config import BaseSettings
+
+from conftest import STUB_OCSP_URL
+
+
+@pytest.fixture(scope="module")
+def sample_record():
+    return cc_admin.collect_gpu_evidence_remote(BaseSettings.NONCE, no_gpu_mode=True)[0]
+
+
+@pytest.fixture
+def run_batch_verify(offline_attestation, monkeypatch, tmp_path):
+    """ Returns a function running the batch verifier over the given records and returning its exit code and
+    results. The worker processes are forked, so they inherit the stubs of the offline attestation. """
+
+    def run(records, workers):
+        input_path = tmp_path / "evidence.jsonl"
+        output_path = tmp_path / "results.jsonl"
+        input_path.write_text("".join(record + "\n" for record in records))
+        monkeypatch.setattr(sys, "argv", [
+            "batch_verify", str(input_path),
+            "--test_no_gpu",
+            "--workers", str(workers),
+            "--output", str(output_path),
+            "--ocsp_url", STUB_OCSP_URL,
+            "--rim_service_url", "https://rim.stub.test/",
+        ])
+
+        exit_code = 0
+        try:
+            batch_verify.main()
+        except SystemExit as error:
+            exit_code = error.code
+
+        with open(output_path, "r") as output_file:
+            return exit_code, [json.loads(line) for line in output_file]
+
+    return run
+
+
+def get_record(sample_record, uuid, **fields):
+    return json.dumps(dict(sample_record, uuid=uuid, **fields))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_records_are_verified_in_order(run_batch_verify, sample_record, workers):
+    records = [get_record(sample_record, f"GPU-{index}", nonce=BaseSettings.NONCE) for index in range(6)]
+
+    exit_code, results = run_batch_verify(records, workers)
+
+    assert exit_code == 0
+    assert [result["record"] for result in results] == list(range(6))
+    assert [result["uuid"] for result in results] == [f"GPU-{index}" for index in range(6)]
+    for result in results:
+        assert result["status"] is True
+        assert result["nonce_verified"] is True
+        assert result["claims"]["x-nvidia-gpu-attestation-report-nonce-match"] is True
+        assert "error" not in result
+
+
+def test_corrupt_records_do_not_stop_the_run(run_batch_verify, sample_record):
+    truncated_evidence = dict(sample_record, evidence=sample_record["evidence"][:100])
+    records = [
+        get_record(sample_record, "GPU-0", nonce=BaseSettings.NONCE),
+        "{not json",
+        get_record(truncated_evidence, "GPU-2", nonce=BaseSettings.NONCE),
+        get_record(sample_record, "GPU-3"),
+        get_record(sample_record, "GPU-4", nonce=BaseSettings.NONCE),
+    ]
+
+    exit_code, results = run_batch_verify(records, 2)
+
+    assert exit_code == 1
+    assert [result["record"] for result in results] == list(range(5))
+    assert [result["status"] for result in results] == [True, False, False, True, True]
+    assert results[1]["error"]
+    assert results[2]["error"]
+    assert all("error" not in results[index] for index in (0, 3, 4))
+    # Without a nonce the attestation report nonce is not verified
+    assert results[3]["nonce_verified"] is False
+    assert results[3]["claims"]["x-nvidia-gpu-attestation-report-nonce-match"] is False
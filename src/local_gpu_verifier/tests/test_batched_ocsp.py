@@ -0,0 +1,184 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+from cryptography import x509
+from cryptography.x509 import ocsp
+
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import BaseSettings
+from verifier.utils import get_ocsp_single_response
+
+from conftest import STUB_OCSP_URL
+from ocsp_stub import parse_ocsp_request
+
+STUB_OCSP_URL_UNREACHABLE = "https://ocsp.unreachable.stub.test/"
+
+
+def get_cert_id(ocsp_request):
+    return (
+        ocsp_request.hash_algorithm.name,
+        ocsp_request.issuer_name_hash,
+        ocsp_request.issuer_key_hash,
+        ocsp_request.serial_number,
+    )
+
+
+def assert_statuses_match(results, cert_pairs):
+    assert len(results) == len(cert_pairs)
+    for (ocsp_request, ocsp_response, _, _), (cert, _) in zip(results, cert_pairs):
+        assert ocsp_request.serial_number == cert.serial_number
+        single_response = get_ocsp_single_response(
+            ocsp_response, ocsp_request.issuer_key_hash, ocsp_request.serial_number
+        )
+        assert single_response is not None
+        assert single_response.certificate_status == ocsp.OCSPCertStatus.GOOD
+
+
+def test_batched_request_parses_back_to_every_cert_id_and_the_nonce(cert_pairs):
+    nonce = CcAdminUtils.generate_nonce(BaseSettings.SIZE_OF_NONCE_IN_BYTES)
+    ocsp_requests, ocsp_request_data = CcAdminUtils.build_batched_ocsp_request(cert_pairs, nonce)
+
+    parsed_requests, parsed_nonce = parse_ocsp_request(ocsp_request_data)
+
+    assert len(parsed_requests) == len(cert_pairs) == 3
+    assert [get_cert_id(request) for request in parsed_requests] == [
+        get_cert_id(CcAdminUtils.build_ocsp_request(cert, issuer)) for cert, issuer in cert_pairs
+    ]
+    assert [get_cert_id(request) for request in ocsp_requests] == [
+        get_cert_id(request) for request in parsed_requests
+    ]
+    assert parsed_nonce == nonce
+
+
+def test_batched_request_without_nonce(cert_pairs):
+    _, ocsp_request_data = CcAdminUtils.build_batched_ocsp_request(cert_pairs)
+
+    parsed_requests, parsed_nonce = parse_ocsp_request(ocsp_request_data)
+
+    assert [request.serial_number for request in parsed_requests] == [cert.serial_number for cert, _ in cert_pairs]
+    assert parsed_nonce is None
+
+
+def test_batched_response_matches_every_certificate(ocsp_responder, cert_pairs, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "OCSP_NONCE_ENABLED", True)
+
+    results = CcAdminUtils.fetch_batched_ocsp_response(cert_pairs)
+
+    assert ocsp_responder.requests == [3]
+    assert_statuses_match(results, cert_pairs)
+    for _, ocsp_response, nonce, is_cached in results:
+        assert not is_cached
+        assert CcAdminUtils.verify_ocsp_signature(ocsp_response)
+        assert ocsp_response.extensions.get_extension_for_class(x509.OCSPNonce).value.nonce == nonce
+
+
+def test_batched_response_missing_a_single_response_is_rejected(ocsp_responder, cert_pairs):
+    ocsp_responder.omitted_serial_numbers.add(cert_pairs[1][0].serial_number)
+
+    assert CcAdminUtils.fetch_batched_ocsp_response(cert_pairs) is None
+    assert STUB_OCSP_URL in CcAdminUtils.ocsp_batch_unsupported_urls
+
+
+def test_fetch_ocsp_responses_uses_one_batched_request(ocsp_responder, cert_pairs):
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    assert ocsp_responder.requests == [3]
+    assert_statuses_match(results, cert_pairs)
+
+
+def test_unsupported_responder_falls_back_to_single_requests(ocsp_responder, cert_pairs):
+    ocsp_responder.supports_batch = False
+
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    assert ocsp_responder.requests == [3, 1, 1, 1]
+    assert STUB_OCSP_URL in CcAdminUtils.ocsp_batch_unsupported_urls
+    assert_statuses_match(results, cert_pairs)
+
+    # The responder is not asked for a batched request again
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    assert ocsp_responder.requests == [3, 1, 1, 1, 1, 1, 1]
+    assert_statuses_match(results, cert_pairs)
+
+
+def test_transient_status_does_not_disable_batched_requests(ocsp_responder, cert_pairs):
+    ocsp_responder.response_status = ocsp.OCSPResponseStatus.TRY_LATER
+
+    assert CcAdminUtils.fetch_batched_ocsp_response(cert_pairs) is None
+    assert STUB_OCSP_URL not in CcAdminUtils.ocsp_batch_unsupported_urls
+
+    ocsp_responder.response_status = None
+    assert_statuses_match(CcAdminUtils.fetch_batched_ocsp_response(cert_pairs), cert_pairs)
+    assert ocsp_responder.requests == [3, 3]
+
+
+def test_malformed_request_status_disables_batched_requests(ocsp_responder, cert_pairs):
+    ocsp_responder.response_status = ocsp.OCSPResponseStatus.MALFORMED_REQUEST
+
+    assert CcAdminUtils.fetch_batched_ocsp_response(cert_pairs) is None
+    assert STUB_OCSP_URL in CcAdminUtils.ocsp_batch_unsupported_urls
+
+
+def test_unreachable_service_falls_back_to_the_nvidia_service(ocsp_responder, cert_pairs, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "OCSP_URL", STUB_OCSP_URL_UNREACHABLE)
+    monkeypatch.setattr(BaseSettings, "OCSP_URL_NVIDIA", STUB_OCSP_URL)
+
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    # Only the batched request is sent to the unreachable service, with its retries
+    assert ocsp_responder.refused_urls == [STUB_OCSP_URL_UNREACHABLE] * (BaseSettings.OCSP_RETRY_COUNT + 1)
+    assert ocsp_responder.requests == [1, 1, 1]
+    assert STUB_OCSP_URL_UNREACHABLE not in CcAdminUtils.ocsp_batch_unsupported_urls
+    assert_statuses_match(results, cert_pairs)
+
+
+def test_single_responses_are_in_chain_order(ocsp_responder, cert_pairs, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "OCSP_BATCH_REQUEST_ENABLED", False)
+    # The first certificate is answered last
+    ocsp_responder.delays[cert_pairs[0][0].serial_number] = 0.2
+
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    assert ocsp_responder.requests == [1, 1, 1]
+    assert_statuses_match(results, cert_pairs)
+
+
+def test_single_failure_is_reported_at_its_index(ocsp_responder, cert_pairs, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "OCSP_BATCH_REQUEST_ENABLED", False)
+    ocsp_responder.refused_serial_numbers.add(cert_pairs[1][0].serial_number)
+
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    assert [ocsp_request.serial_number for ocsp_request, _, _, _ in results] == [
+        cert.serial_number for cert, _ in cert_pairs
+    ]
+    assert results[1][1] is None
+    assert_statuses_match(results[:1] + results[2:], cert_pairs[:1] + cert_pairs[2:])
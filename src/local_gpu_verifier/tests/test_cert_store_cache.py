@@ -0,0 +1,122 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.hashes import SHA384
+from cryptography.x509.oid import NameOID
+from OpenSSL import crypto
+
+from verifier.utils.cert_store_cache import CertificateStoreCache
+from verifier.utils.tracing import Tracer
+
+
+def build_certificate(subject, issuer, public_key, signing_key, is_ca, serial_number=None):
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)]))
+        .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer)]))
+        .public_key(public_key)
+        .serial_number(serial_number or x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=365))
+        .add_extension(x509.BasicConstraints(ca=is_ca, path_length=None), critical=True)
+        .sign(signing_key, SHA384())
+    )
+    return crypto.X509.from_cryptography(certificate)
+
+
+@pytest.fixture(scope="module")
+def certificates():
+    """ A root, two intermediate certificates with the same name and key, and a leaf certificate valid under both. """
+    root_key = ec.generate_private_key(ec.SECP384R1())
+    intermediate_key = ec.generate_private_key(ec.SECP384R1())
+    leaf_key = ec.generate_private_key(ec.SECP384R1())
+    root = build_certificate("Stub Root", "Stub Root", root_key.public_key(), root_key, True)
+    intermediates = [
+        build_certificate("Stub Intermediate", "Stub Root", intermediate_key.public_key(), root_key, True)
+        for _ in range(2)
+    ]
+    leaf = build_certificate("Stub Leaf", "Stub Intermediate", leaf_key.public_key(), intermediate_key, False)
+    return root, intermediates, leaf
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    CertificateStoreCache.clear()
+    yield
+    CertificateStoreCache.clear()
+
+
+def verify_with_counters(cert_chain):
+    with Tracer.start_trace("verify") as trace:
+        result = CertificateStoreCache.verify_certificate_chain(cert_chain)
+    counters = trace.get_counters()
+    return result, counters.get("cert_chain_cache.hit", 0), counters.get("cert_chain_cache.miss", 0)
+
+
+def test_memoized_chain_is_not_verified_again(certificates):
+    root, intermediates, leaf = certificates
+    cert_chain = [leaf, intermediates[0], root]
+
+    assert verify_with_counters(cert_chain) == ((True, None), 0, 2)
+    assert verify_with_counters(cert_chain) == ((True, None), 2, 0)
+
+
+def test_chain_with_another_intermediate_is_verified_again(certificates):
+    root, intermediates, leaf = certificates
+    verify_with_counters([leaf, intermediates[0], root])
+
+    assert verify_with_counters([leaf, intermediates[1], root]) == ((True, None), 0, 2)
+
+
+def test_chain_failing_the_verification_is_not_memoized(certificates):
+    root, intermediates, leaf = certificates
+    other_key = ec.generate_private_key(ec.SECP384R1())
+    other_root = build_certificate("Stub Root", "Stub Root", other_key.public_key(), other_key, True)
+
+    assert verify_with_counters([leaf, intermediates[0], other_root]) == ((False, 1), 0, 1)
+    assert verify_with_counters([leaf, intermediates[0], other_root]) == ((False, 1), 0, 1)
+
+
+def test_least_recently_used_verifications_are_evicted(certificates, monkeypatch):
+    monkeypatch.setattr(CertificateStoreCache, "MAX_VERIFIED_CERTIFICATES", 3)
+    root, intermediates, leaf = certificates
+    verify_with_counters([leaf, intermediates[0], root])
+    verify_with_counters([leaf, intermediates[1], root])
+
+    assert len(CertificateStoreCache.verified_certificates) == 3
+    # The verifications of the first chain were used least recently, so they were evicted
+    assert verify_with_counters([leaf, intermediates[0], root]) == ((True, None), 0, 2)
+    assert len(CertificateStoreCache.verified_certificates) == 3
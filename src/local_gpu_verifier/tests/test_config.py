@@ -0,0 +1,98 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import inspect
+
+import pytest
+
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+)
+
+REQUIRED_BITS = [1 << shift for shift in range(BaseSettings.REQUIRED_STATUS.bit_length()) if BaseSettings.REQUIRED_STATUS >> shift & 1]
+STATUS_NAMES = {value: name for name, value in vars(BaseSettings.Status).items() if not name.startswith("_")}
+
+
+def get_mark_methods():
+    """ Returns the names of the mark_* methods of the settings objects which take no argument. """
+    names = list()
+    for name in dir(HopperSettings):
+        if not name.startswith("mark_") or isinstance(inspect.getattr_static(HopperSettings, name), classmethod):
+            continue
+        if not inspect.signature(getattr(HopperSettings(), name)).parameters:
+            names.append(name)
+    return names
+
+
+def test_required_status_passes():
+    settings = HopperSettings()
+    settings.status = BaseSettings.REQUIRED_STATUS
+
+    assert settings.check_status()
+
+
+@pytest.mark.parametrize("missing_bit", REQUIRED_BITS, ids=lambda bit: STATUS_NAMES[bit])
+def test_every_required_bit_is_checked(missing_bit):
+    settings = HopperSettings()
+    settings.status = BaseSettings.REQUIRED_STATUS & ~missing_bit
+
+    assert not settings.check_status()
+
+    # The optional checks do not make up for a missing required one
+    settings.status |= sum(STATUS_NAMES) & ~BaseSettings.REQUIRED_STATUS
+    assert not settings.check_status()
+
+
+@pytest.mark.parametrize("name", get_mark_methods())
+def test_mark_sets_only_its_own_bit(name):
+    settings = HopperSettings()
+    getattr(settings, name)()
+
+    assert settings.status in STATUS_NAMES
+    # Marking a check again does not set any other bit
+    getattr(settings, name)()
+    assert settings.status in STATUS_NAMES
+
+
+def test_mark_methods_cover_the_required_status():
+    bits = dict()
+    for name in get_mark_methods():
+        settings = HopperSettings()
+        getattr(settings, name)()
+        bits[name] = settings.status
+
+    assert len(set(bits.values())) == len(bits), "Two mark methods set the same bit."
+    assert BaseSettings.REQUIRED_STATUS & ~sum(bits.values()) == 0
+
+    settings = HopperSettings()
+    for name in get_mark_methods():
+        getattr(settings, name)()
+    assert settings.check_status()
@@ -0,0 +1,159 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import threading
+import time
+
+import pytest
+
+import verifier.utils
+from verifier.config import BaseSettings
+from verifier.exceptions import TimeoutError
+from verifier.utils import (
+    EXECUTOR_STATES,
+    NETWORK_POOL,
+    NVML_POOL,
+    function_wrapper_with_timeout,
+    get_executor_stats,
+    is_call_cancelled,
+)
+
+
+@pytest.fixture(autouse=True)
+def executors(monkeypatch):
+    """ Gives every test its own single worker executors and counters, and releases the blocked calls. """
+    monkeypatch.setattr(BaseSettings, "MAX_CALL_EXECUTOR_WORKERS", 1)
+    monkeypatch.setattr(BaseSettings, "MAX_NVML_EXECUTOR_WORKERS", 1)
+    monkeypatch.setattr(verifier.utils, "executors", dict())
+    monkeypatch.setattr(
+        verifier.utils, "executor_stats", {pool: dict.fromkeys(EXECUTOR_STATES, 0) for pool in (NETWORK_POOL, NVML_POOL)}
+    )
+    released = threading.Event()
+    yield released
+    released.set()
+    for executor in verifier.utils.executors.values():
+        executor.shutdown(wait=True)
+
+
+def block_worker(released, pool=NETWORK_POOL):
+    """ Makes a call holding the only worker of the pool until released is set, from another thread. """
+    started = threading.Event()
+
+    def blocking_call():
+        started.set()
+        released.wait()
+
+    thread = threading.Thread(
+        target=lambda: pytest.raises(TimeoutError, function_wrapper_with_timeout, [blocking_call, "blocking_call"], 0.05, pool)
+    )
+    thread.start()
+    assert started.wait(1)
+    return thread
+
+
+def wait_for_stats(pool, **expected_stats):
+    deadline = time.monotonic() + 1
+    while any(get_executor_stats()[pool][state] != value for state, value in expected_stats.items()):
+        assert time.monotonic() < deadline, get_executor_stats()[pool]
+        time.sleep(0.01)
+
+
+def test_call_returns_its_result():
+    assert function_wrapper_with_timeout([lambda a, b: a + b, 1, 2, "add"], 1) == 3
+
+    assert get_executor_stats()[NETWORK_POOL] == dict(dict.fromkeys(EXECUTOR_STATES, 0), submitted=1, completed=1)
+
+
+def test_call_raising_is_counted_as_failed():
+    def failing_call():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        function_wrapper_with_timeout([failing_call, "failing_call"], 1)
+
+    assert get_executor_stats()[NETWORK_POOL]["failed"] == 1
+
+
+def test_running_call_times_out_and_is_abandoned(executors):
+    cancelled = threading.Event()
+
+    def slow_call():
+        executors.wait()
+        if is_call_cancelled():
+            cancelled.set()
+
+    with pytest.raises(TimeoutError, match="slow_call call timed out"):
+        function_wrapper_with_timeout([slow_call, "slow_call"], 0.1)
+    wait_for_stats(NETWORK_POOL, submitted=1, timed_out=1, abandoned_running=1, abandoned_finished=0)
+
+    executors.set()
+
+    assert cancelled.wait(1)
+    wait_for_stats(NETWORK_POOL, timed_out=1, abandoned_running=0, abandoned_finished=1)
+
+
+def test_timeout_starts_when_the_call_runs(executors):
+    blocking_thread = block_worker(executors)
+    start_time = time.monotonic()
+    threading.Timer(0.3, executors.set).start()
+
+    # The call waits 0.3 s for the worker, more than its 0.2 s timeout, and then runs in time
+    assert function_wrapper_with_timeout([lambda: "done", "queued_call"], 0.2) == "done"
+
+    assert time.monotonic() - start_time >= 0.3
+    blocking_thread.join()
+
+
+def test_call_waiting_too_long_for_a_worker_is_cancelled(executors, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "MAX_CALL_QUEUE_TIME_DELAY", 0.1)
+    blocking_thread = block_worker(executors)
+    ran = threading.Event()
+
+    with pytest.raises(TimeoutError, match="did not start in time"):
+        function_wrapper_with_timeout([ran.set, "queued_call"], 10)
+
+    executors.set()
+    blocking_thread.join()
+    assert not ran.is_set()
+    assert get_executor_stats()[NETWORK_POOL]["cancelled"] == 1
+
+
+def test_hung_nvml_calls_do_not_hold_the_network_calls(executors, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "MAX_CALL_QUEUE_TIME_DELAY", 0.1)
+    blocking_thread = block_worker(executors, NVML_POOL)
+
+    assert function_wrapper_with_timeout([lambda: "done", "network_call"], 1) == "done"
+    with pytest.raises(TimeoutError, match="did not start in time"):
+        function_wrapper_with_timeout([lambda: "done", "nvml_call"], 1, NVML_POOL)
+
+    executors.set()
+    blocking_thread.join()
+    assert get_executor_stats()[NETWORK_POOL]["completed"] == 1
+    assert get_executor_stats()[NVML_POOL]["cancelled"] == 1
@@ -0,0 +1,102 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import time
+
+import pytest
+
+from verifier import cc_admin
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import BaseSettings
+from verifier.exceptions import TimeoutError
+from verifier.nvml import NvmlHandler
+
+from nvml_stub import StubNvml
+
+NUMBER_OF_GPUS = 8
+
+
+def assert_evidence_of_gpus(evidence_list, gpu_indexes):
+    assert [gpu_info_obj.get_uuid() for gpu_info_obj in evidence_list] == [f"GPU-{i}" for i in gpu_indexes]
+    assert [gpu_info_obj.get_attestation_report() for gpu_info_obj in evidence_list] == [
+        StubNvml.ATTESTATION_REPORT + bytes([i]) for i in gpu_indexes
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, NUMBER_OF_GPUS])
+def test_evidence_is_collected_in_the_order_of_the_gpus(stub_nvml, monkeypatch, workers):
+    monkeypatch.setattr(BaseSettings, "MAX_EVIDENCE_COLLECTION_WORKERS", workers)
+    # The last GPUs answer first
+    stub_nvml(NUMBER_OF_GPUS, report_latency=lambda index: 0.01 * (NUMBER_OF_GPUS - index))
+
+    evidence_list = cc_admin.collect_gpu_evidence(BaseSettings.NONCE)
+
+    assert_evidence_of_gpus(evidence_list, range(NUMBER_OF_GPUS))
+
+
+def test_evidence_of_the_gpus_is_fetched_concurrently(stub_nvml, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "MAX_EVIDENCE_COLLECTION_WORKERS", NUMBER_OF_GPUS)
+    stub_nvml(NUMBER_OF_GPUS, report_latency=lambda index: 0.1)
+
+    start_time = time.monotonic()
+    evidence_list = cc_admin.collect_gpu_evidence(BaseSettings.NONCE)
+    duration = time.monotonic() - start_time
+
+    assert len(evidence_list) == NUMBER_OF_GPUS
+    assert duration < 0.1 * NUMBER_OF_GPUS / 2
+
+
+def test_hung_gpu_stops_the_collection_at_the_deadline(stub_nvml, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "MAX_EVIDENCE_COLLECTION_WORKERS", NUMBER_OF_GPUS)
+    monkeypatch.setattr(BaseSettings, "MAX_GPU_EVIDENCE_TIME_DELAY", 0.5)
+    stub_nvml(NUMBER_OF_GPUS).hung_gpus.add(3)
+
+    start_time = time.monotonic()
+    evidence_list = cc_admin.collect_gpu_evidence(BaseSettings.NONCE)
+    duration = time.monotonic() - start_time
+
+    assert_evidence_of_gpus(evidence_list, range(3))
+    assert 0.5 <= duration < 1.5
+
+
+def test_fetch_all_gpu_evidence_raises_after_the_gpus_fetched_in_time(stub_nvml, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "MAX_EVIDENCE_COLLECTION_WORKERS", 4)
+    monkeypatch.setattr(BaseSettings, "MAX_GPU_EVIDENCE_TIME_DELAY", 0.2)
+    stub_nvml(NUMBER_OF_GPUS).hung_gpus.add(5)
+    NvmlHandler.init_nvml()
+    NvmlHandler.get_number_of_gpus()
+    evidence_nonce = CcAdminUtils.validate_and_extract_nonce(BaseSettings.NONCE)
+
+    evidence_list = list()
+    with pytest.raises(TimeoutError, match="GPU 5"):
+        for gpu_info_obj in cc_admin.fetch_all_gpu_evidence(NUMBER_OF_GPUS, evidence_nonce, False):
+            evidence_list.append(gpu_info_obj)
+
+    assert_evidence_of_gpus(evidence_list, range(5))
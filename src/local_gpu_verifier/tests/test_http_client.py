@@ -0,0 +1,121 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import threading
+
+import pytest
+import requests
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509 import ocsp
+from requests.adapters import HTTPAdapter
+
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import BaseSettings
+from verifier.utils.http_client import HttpClient
+
+from conftest import STUB_OCSP_URL
+from ocsp_stub import (
+    StubOcspResponder,
+    StubOcspServer,
+)
+
+
+@pytest.fixture
+def server(cert_pairs):
+    """ Runs a stub OCSP responder for the sample GPU certificate chain on a free local port, with a new HTTP
+    session. """
+    responder = StubOcspResponder(STUB_OCSP_URL)
+    responder.add_certificates(cert_pairs)
+    ocsp_server = StubOcspServer(responder)
+    thread = threading.Thread(target=ocsp_server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    HttpClient.close()
+    yield ocsp_server
+    HttpClient.close()
+    ocsp_server.shutdown()
+    ocsp_server.server_close()
+    thread.join()
+
+
+def get_ocsp_request_data(cert_pairs, index=0):
+    return CcAdminUtils.build_ocsp_request(*cert_pairs[index]).public_bytes(serialization.Encoding.DER)
+
+
+def test_requests_reuse_one_connection(server, cert_pairs):
+    for index in range(len(cert_pairs)):
+        data = HttpClient.post(server.url, get_ocsp_request_data(cert_pairs, index), "application/ocsp-request", 5)
+        ocsp_response = ocsp.load_der_ocsp_response(data)
+        assert ocsp_response.response_status == ocsp.OCSPResponseStatus.SUCCESSFUL
+        assert ocsp_response.serial_number == cert_pairs[index][0].serial_number
+
+    assert len(server.client_ports) == len(cert_pairs) > 1
+    assert len(set(server.client_ports)) == 1
+
+    # A new session opens a new connection
+    HttpClient.close()
+    HttpClient.post(server.url, get_ocsp_request_data(cert_pairs), "application/ocsp-request", 5)
+    assert len(set(server.client_ports)) == 2
+
+
+def test_connect_and_read_timeouts_are_passed(monkeypatch, server, cert_pairs):
+    timeouts = list()
+    send = HTTPAdapter.send
+
+    def record_timeout(adapter, request, **kwargs):
+        timeouts.append(kwargs.get("timeout"))
+        return send(adapter, request, **kwargs)
+
+    monkeypatch.setattr(HTTPAdapter, "send", record_timeout)
+    monkeypatch.setattr(BaseSettings, "HTTP_CONNECT_TIMEOUT", 1.5)
+    HttpClient.post(server.url, get_ocsp_request_data(cert_pairs), "application/ocsp-request", 7)
+    with pytest.raises(requests.HTTPError):
+        HttpClient.get(server.url + "ids", 3)
+
+    assert timeouts == [(1.5, 7), (1.5, 3)]
+
+    # The read timeout bounds the wait for the response
+    server.responder.latency = 1
+    with pytest.raises(requests.Timeout):
+        HttpClient.post(server.url, get_ocsp_request_data(cert_pairs), "application/ocsp-request", 0.2)
+
+
+def test_error_status_raises(server, cert_pairs):
+    with pytest.raises(requests.HTTPError) as error:
+        HttpClient.get(server.url + "NV_GPU_DRIVER_GH100_545.00", 5)
+    assert error.value.response.status_code == 404
+
+    with pytest.raises(requests.HTTPError) as error:
+        HttpClient.post(server.url, get_ocsp_request_data(cert_pairs), "application/json", 5)
+    assert error.value.response.status_code == 415
+
+    server.responder.refused_serial_numbers.add(cert_pairs[0][0].serial_number)
+    with pytest.raises(requests.HTTPError) as error:
+        HttpClient.post(server.url, get_ocsp_request_data(cert_pairs), "application/ocsp-request", 5)
+    assert error.value.response.status_code == 503
@@ -0,0 +1,156 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import gc
+
+import pytest
+
+from verifier.attestation import AttestationReport
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+)
+from verifier.rim import RIM
+from verifier.utils import convert_string_to_blob
+from verifier.utils.tracing import Tracer
+from verifier.verifier import (
+    MeasurementPolicy,
+    Verifier,
+)
+
+MSR_35_INDEX = MeasurementPolicy.MSR_35_INDEX
+
+
+def load_rims(settings):
+    return (
+        RIM("driver", settings, rim_path=HopperSettings.TEST_NO_GPU_DRIVER_RIM_PATH),
+        RIM("vbios", settings, rim_path=HopperSettings.TEST_NO_GPU_VBIOS_RIM_PATH),
+    )
+
+
+def change_measurement(runtime_measurements, index):
+    runtime_measurements = list(runtime_measurements)
+    measurement = runtime_measurements[index]
+    runtime_measurements[index] = ("0" if measurement[0] != "0" else "1") + measurement[1:]
+    return runtime_measurements
+
+
+@pytest.fixture(autouse=True)
+def policies(monkeypatch):
+    monkeypatch.setattr(MeasurementPolicy, "policies", dict())
+
+
+@pytest.fixture
+def settings():
+    return HopperSettings()
+
+
+@pytest.fixture
+def attestation_report(settings):
+    with open(HopperSettings.ATTESTATION_REPORT_PATH, "r") as f:
+        return AttestationReport(convert_string_to_blob(f.read()), settings)
+
+
+@pytest.fixture
+def policy(settings):
+    driver_rim, vbios_rim = load_rims(settings)
+    return MeasurementPolicy.get(driver_rim, vbios_rim)
+
+
+def test_sample_rims_match_the_sample_report(settings, attestation_report):
+    driver_rim, vbios_rim = load_rims(settings)
+    policy = MeasurementPolicy.get(driver_rim, vbios_rim)
+
+    assert MSR_35_INDEX in policy.values
+    assert policy.match(attestation_report.get_measurements(), True) == 0
+    assert Verifier(attestation_report, driver_rim, vbios_rim, settings).verify(settings) is True
+    assert settings.check_if_measurements_are_matching()
+
+
+@pytest.mark.parametrize("index", [0, 12, 21, 40])
+def test_changed_measurement_sets_only_its_own_bit(policy, attestation_report, index):
+    runtime_measurements = change_measurement(attestation_report.get_measurements(), index)
+
+    assert policy.match(runtime_measurements, True) == 1 << index
+
+
+def test_missing_measurement_is_a_mismatch(policy, attestation_report):
+    runtime_measurements = list(attestation_report.get_measurements())
+    runtime_measurements[3] = None
+
+    assert policy.match(runtime_measurements, True) == 1 << 3
+
+
+def test_msr_35_is_skipped_when_nvdec0_is_disabled(settings, attestation_report, monkeypatch):
+    driver_rim, vbios_rim = load_rims(settings)
+    runtime_measurements = change_measurement(attestation_report.get_measurements(), MSR_35_INDEX)
+    monkeypatch.setattr(attestation_report, "get_measurements", lambda: runtime_measurements)
+    opaque_data = attestation_report.get_response_message().get_opaque_data()
+    get_data = opaque_data.get_data
+
+    for status, is_skipped in [(BaseSettings.NVDEC_STATUS.DISABLED, True), (BaseSettings.NVDEC_STATUS.ENABLED, False)]:
+        monkeypatch.setattr(
+            opaque_data,
+            "get_data",
+            lambda name, status=status: bytes([status.value]) if name == "OPAQUE_FIELD_ID_NVDEC0_STATUS" else get_data(name),
+        )
+        verifier = Verifier(attestation_report, driver_rim, vbios_rim, settings)
+
+        assert verifier.is_msr_35_valid is not is_skipped
+        assert verifier.verify(settings) is is_skipped
+        assert verifier.mismatched_measurements == (0 if is_skipped else 1 << MSR_35_INDEX)
+
+
+def test_policy_is_shared_while_the_rims_are_alive(settings):
+    driver_rim, vbios_rim = load_rims(settings)
+
+    with Tracer.start_trace("test") as trace:
+        policy = MeasurementPolicy.get(driver_rim, vbios_rim)
+        assert MeasurementPolicy.get(driver_rim, vbios_rim) is policy
+        other_driver_rim, other_vbios_rim = load_rims(settings)
+        assert MeasurementPolicy.get(other_driver_rim, other_vbios_rim) is not policy
+
+    assert trace.get_counters() == {"measurement_policy.miss": 2, "measurement_policy.hit": 1}
+
+
+def test_policy_is_rebuilt_after_the_rims_are_gone(settings):
+    driver_rim, vbios_rim = load_rims(settings)
+    policy = MeasurementPolicy.get(driver_rim, vbios_rim)
+    del driver_rim, vbios_rim
+    gc.collect()
+
+    # New RIM objects may reuse the ids of the ones which are gone
+    driver_rim, vbios_rim = load_rims(settings)
+    with Tracer.start_trace("test") as trace:
+        rebuilt_policy = MeasurementPolicy.get(driver_rim, vbios_rim)
+
+    assert rebuilt_policy is not policy
+    assert trace.get_counters() == {"measurement_policy.miss": 1}
+    assert len(MeasurementPolicy.policies) == 1
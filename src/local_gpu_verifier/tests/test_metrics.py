@@ -0,0 +1,124 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import pytest
+
+from verifier.config import BaseSettings
+from verifier.utils.metrics import MetricsRegistry
+from verifier.utils.tracing import Tracer
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """ Enables an empty metrics registry in the eastus region. """
+    monkeypatch.setattr(MetricsRegistry, "enabled", True)
+    monkeypatch.setattr(BaseSettings, "AZURE_VM_REGION", "eastus")
+    MetricsRegistry.clear()
+    yield MetricsRegistry
+    MetricsRegistry.clear()
+
+
+def get_metric_lines(metrics, name):
+    """ Returns the rendered lines of the metric with the given name, without the lines of the other metrics. """
+    return [
+        line for line in metrics.render().splitlines()
+        if line.split("{")[0].split(" ")[0] in (name, f"{name}_bucket", f"{name}_sum", f"{name}_count")
+        or line.startswith((f"# HELP {name} ", f"# TYPE {name} "))
+    ]
+
+
+def test_cache_counters_are_one_metric_per_cache(metrics):
+    Tracer.increment("rim_cache.hit")
+    Tracer.increment("rim_cache.hit")
+    Tracer.increment("rim_cache.miss")
+    Tracer.increment("ocsp_cache.miss")
+    Tracer.increment("ocsp.retries", 2)
+
+    assert get_metric_lines(metrics, "verifier_cache_lookups_total") == [
+        "# HELP verifier_cache_lookups_total The number of lookups in the caches of the verifier by cache and result.",
+        "# TYPE verifier_cache_lookups_total counter",
+        'verifier_cache_lookups_total{cache="ocsp_cache",region="eastus",result="miss"} 1',
+        'verifier_cache_lookups_total{cache="rim_cache",region="eastus",result="hit"} 2',
+        'verifier_cache_lookups_total{cache="rim_cache",region="eastus",result="miss"} 1',
+    ]
+    assert get_metric_lines(metrics, "verifier_retries_total")[1:] == [
+        "# TYPE verifier_retries_total counter",
+        'verifier_retries_total{region="eastus",service="ocsp"} 2',
+    ]
+    assert "verifier_rim_cache_hit_total" not in metrics.render()
+
+
+def test_histogram_buckets_are_cumulative(metrics):
+    for value in (0.001, 0.005, 0.02, 0.02, 7.5, 100.0):
+        metrics.observe("verifier_phase_duration_seconds", value, phase="fetch_rim_file")
+
+    lines = get_metric_lines(metrics, "verifier_phase_duration_seconds")
+    assert lines[:2] == [
+        "# HELP verifier_phase_duration_seconds The duration of the phases of the GPU attestation.",
+        "# TYPE verifier_phase_duration_seconds histogram",
+    ]
+    buckets = [line.rsplit(" ", 1) for line in lines[2:-2]]
+    assert [labels.split('le="')[1].split('"')[0] for labels, _ in buckets] == [
+        str(bound) for bound in MetricsRegistry.DURATION_BUCKETS
+    ] + ["+Inf"]
+    assert [int(count) for _, count in buckets] == [2, 2, 4, 4, 4, 4, 4, 4, 4, 4, 5, 5, 5, 6]
+    assert buckets[0][0] == 'verifier_phase_duration_seconds_bucket{phase="fetch_rim_file",region="eastus",le="0.005"}'
+    assert lines[-2] == 'verifier_phase_duration_seconds_sum{phase="fetch_rim_file",region="eastus"} 107.546'
+    assert lines[-1] == 'verifier_phase_duration_seconds_count{phase="fetch_rim_file",region="eastus"} 6'
+
+
+def test_label_values_are_escaped(metrics):
+    metrics.increment("verifier_errors_total", error='Invalid "nonce"\\\n')
+
+    assert get_metric_lines(metrics, "verifier_errors_total")[-1] == (
+        'verifier_errors_total{error="Invalid \\"nonce\\"\\\\\\n",region="eastus"} 1'
+    )
+
+
+def test_region_label(monkeypatch, metrics):
+    metrics.increment("verifier_attestations_total", result="success")
+    monkeypatch.setattr(BaseSettings, "AZURE_VM_REGION", None)
+    metrics.increment("verifier_attestations_total", result="success")
+    metrics.increment("verifier_attestations_total", result="success", region="westus")
+
+    assert get_metric_lines(metrics, "verifier_attestations_total")[2:] == [
+        'verifier_attestations_total{region="eastus",result="success"} 1',
+        'verifier_attestations_total{region="unknown",result="success"} 1',
+        'verifier_attestations_total{region="westus",result="success"} 1',
+    ]
+
+
+def test_disabled_registry_records_nothing(monkeypatch, metrics):
+    monkeypatch.setattr(MetricsRegistry, "enabled", False)
+    Tracer.increment("rim_cache.hit")
+    metrics.observe("verifier_phase_duration_seconds", 0.1, phase="fetch_rim_file")
+
+    assert metrics.counters == {}
+    assert metrics.histograms == {}
@@ -0,0 +1,115 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+from datetime import timedelta
+
+import pytest
+from cryptography.x509 import ocsp
+
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import BaseSettings
+from verifier.utils.ocsp_bundle import OcspBundle
+
+from ocsp_stub import StubOcspResponder
+
+UNREACHABLE_OCSP_URL = "https://ocsp.unreachable.stub.test/"
+
+
+@pytest.fixture
+def write_bundle(ocsp_responder, cert_pairs, tmp_path):
+    """ Writes an OCSP bundle of the sample GPU certificate chain signed by the stub OCSP responder, with
+    responses valid for the given time after their signing, and configures it. """
+    def write(validity):
+        ocsp_responder.validity = validity
+        ocsp_fetch_results = [
+            (
+                CcAdminUtils.build_ocsp_request(cert, issuer),
+                ocsp.load_der_ocsp_response(ocsp_responder.build_single_response(cert, issuer, None)),
+            )
+            for cert, issuer in cert_pairs
+        ]
+        ocsp_responder.validity = StubOcspResponder.validity
+        path = str(tmp_path / "ocsp_bundle.json")
+        OcspBundle.write(path, ocsp_fetch_results)
+        BaseSettings.OCSP_BUNDLE_PATH = path
+    return write
+
+
+@pytest.fixture
+def unreachable_ocsp_services(monkeypatch):
+    monkeypatch.setattr(BaseSettings, "OCSP_URL", UNREACHABLE_OCSP_URL)
+    monkeypatch.setattr(BaseSettings, "OCSP_URL_NVIDIA", UNREACHABLE_OCSP_URL)
+
+
+@pytest.fixture(params=[True, False], ids=["batched", "single"])
+def batch_request_enabled(request, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "OCSP_BATCH_REQUEST_ENABLED", request.param)
+    return request.param
+
+
+def test_fresh_bundle_is_used_before_the_ocsp_service(ocsp_responder, cert_pairs, write_bundle, batch_request_enabled):
+    write_bundle(timedelta(days=1))
+
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    assert ocsp_responder.requests == []
+    assert all(ocsp_response is not None and is_cached for _, ocsp_response, _, is_cached in results)
+
+
+def test_stale_bundle_is_not_used_before_the_ocsp_service(ocsp_responder, cert_pairs, write_bundle, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "OCSP_BUNDLE_ALLOW_EXPIRED", True)
+    write_bundle(timedelta(hours=-1))
+
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    assert ocsp_responder.requests == [3]
+    assert all(ocsp_response is not None and not is_cached for _, ocsp_response, _, is_cached in results)
+
+
+def test_stale_bundle_is_not_used_by_default(cert_pairs, write_bundle, unreachable_ocsp_services,
+                                             batch_request_enabled):
+    write_bundle(timedelta(hours=-1))
+
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    assert [ocsp_response for _, ocsp_response, _, _ in results] == [None] * len(cert_pairs)
+
+
+def test_stale_bundle_is_used_when_allowed_and_the_ocsp_services_fail(cert_pairs, write_bundle,
+                                                                      unreachable_ocsp_services, monkeypatch,
+                                                                      batch_request_enabled):
+    monkeypatch.setattr(BaseSettings, "OCSP_BUNDLE_ALLOW_EXPIRED", True)
+    write_bundle(timedelta(hours=-1))
+
+    results = CcAdminUtils.fetch_ocsp_responses(cert_pairs)
+
+    for (ocsp_request, ocsp_response, nonce, is_cached), (cert, _) in zip(results, cert_pairs):
+        assert ocsp_response is not None and is_cached and nonce is None
+        assert ocsp_response.serial_number == cert.serial_number
@@ -0,0 +1,159 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+from datetime import timedelta
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509 import ocsp
+
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import BaseSettings
+from verifier.utils.ocsp_cache import OcspCache
+from verifier.utils.tracing import Tracer
+
+from conftest import STUB_OCSP_URL
+from ocsp_stub import StubOcspResponder
+
+
+@pytest.fixture
+def cache_dir(monkeypatch, tmp_path):
+    """ Enables the OCSP cache with a disk copy in tmp_path and an empty memory copy. """
+    monkeypatch.setattr(BaseSettings, "OCSP_CACHE_ENABLED", True)
+    monkeypatch.setattr(BaseSettings, "OCSP_NONCE_ENABLED", False)
+    monkeypatch.setattr(BaseSettings, "OCSP_CACHE_DIR", str(tmp_path / "ocsp"))
+    OcspCache.clear()
+    yield BaseSettings.OCSP_CACHE_DIR
+    OcspCache.clear()
+
+
+@pytest.fixture(scope="module")
+def responder():
+    return StubOcspResponder(STUB_OCSP_URL)
+
+
+def get_response(responder, cert, issuer, validity=StubOcspResponder.validity):
+    """ Returns the OCSP request of the certificate and a response of the stub responder valid for the given time. """
+    responder.validity = validity
+    try:
+        ocsp_response = ocsp.load_der_ocsp_response(responder.build_single_response(cert, issuer, None))
+    finally:
+        responder.validity = StubOcspResponder.validity
+    return CcAdminUtils.build_ocsp_request(cert, issuer), ocsp_response
+
+
+def get_cached(ocsp_request):
+    with Tracer.start_trace("get") as trace:
+        ocsp_response = OcspCache.get(ocsp_request.issuer_key_hash, ocsp_request.serial_number)
+    counters = trace.get_counters()
+    return ocsp_response, "hit" if counters.get("ocsp_cache.hit") else "miss"
+
+
+def get_path(ocsp_request):
+    return OcspCache.get_path(OcspCache.get_key(ocsp_request.issuer_key_hash, ocsp_request.serial_number))
+
+
+def test_response_is_reused_before_its_next_update(cache_dir, responder, cert_pairs):
+    ocsp_request, ocsp_response = get_response(responder, *cert_pairs[0])
+    OcspCache.put(ocsp_request.issuer_key_hash, ocsp_request.serial_number, ocsp_response)
+
+    cached_response, result = get_cached(ocsp_request)
+
+    assert result == "hit"
+    assert cached_response.public_bytes(serialization.Encoding.DER) == ocsp_response.public_bytes(
+        serialization.Encoding.DER
+    )
+    OcspCache.clear()
+    assert get_cached(ocsp_request)[1] == "hit"
+
+
+def test_expired_response_is_not_stored(cache_dir, responder, cert_pairs):
+    ocsp_request, ocsp_response = get_response(responder, *cert_pairs[0], validity=timedelta(hours=-1))
+    OcspCache.put(ocsp_request.issuer_key_hash, ocsp_request.serial_number, ocsp_response)
+
+    assert get_cached(ocsp_request) == (None, "miss")
+    assert not os.path.exists(get_path(ocsp_request))
+
+
+def test_response_past_its_next_update_is_removed(cache_dir, responder, cert_pairs):
+    ocsp_request, ocsp_response = get_response(responder, *cert_pairs[0], validity=timedelta(hours=-1))
+    os.makedirs(cache_dir)
+    with open(get_path(ocsp_request), "wb") as f:
+        f.write(ocsp_response.public_bytes(serialization.Encoding.DER))
+
+    assert get_cached(ocsp_request) == (None, "miss")
+    assert not os.path.exists(get_path(ocsp_request))
+
+
+def test_cache_is_bypassed_with_the_ocsp_nonce(cache_dir, responder, cert_pairs, monkeypatch):
+    ocsp_request, ocsp_response = get_response(responder, *cert_pairs[0])
+    OcspCache.put(ocsp_request.issuer_key_hash, ocsp_request.serial_number, ocsp_response)
+    monkeypatch.setattr(BaseSettings, "OCSP_NONCE_ENABLED", True)
+
+    assert get_cached(ocsp_request) == (None, "miss")
+    assert os.path.exists(get_path(ocsp_request))
+
+
+def test_corrupt_file_is_removed(cache_dir, responder, cert_pairs):
+    ocsp_request, _ = get_response(responder, *cert_pairs[0])
+    os.makedirs(cache_dir)
+    with open(get_path(ocsp_request), "wb") as f:
+        f.write(b"\x30\x03corrupt")
+
+    assert get_cached(ocsp_request) == (None, "miss")
+    assert not os.path.exists(get_path(ocsp_request))
+
+
+def test_response_of_another_certificate_is_removed(cache_dir, responder, cert_pairs):
+    ocsp_request, _ = get_response(responder, *cert_pairs[0])
+    _, other_ocsp_response = get_response(responder, *cert_pairs[1])
+    os.makedirs(cache_dir)
+    with open(get_path(ocsp_request), "wb") as f:
+        f.write(other_ocsp_response.public_bytes(serialization.Encoding.DER))
+
+    assert get_cached(ocsp_request) == (None, "miss")
+    assert not os.path.exists(get_path(ocsp_request))
+
+
+def test_least_recently_used_responses_are_evicted_from_memory(cache_dir, responder, cert_pairs, monkeypatch):
+    monkeypatch.setattr(OcspCache, "MAX_ENTRIES", 2)
+    ocsp_requests = list()
+    for cert, issuer in cert_pairs:
+        ocsp_request, ocsp_response = get_response(responder, cert, issuer)
+        OcspCache.put(ocsp_request.issuer_key_hash, ocsp_request.serial_number, ocsp_response)
+        ocsp_requests.append(ocsp_request)
+
+    assert list(OcspCache.entries) == [
+        OcspCache.get_key(ocsp_request.issuer_key_hash, ocsp_request.serial_number) for ocsp_request in ocsp_requests[1:]
+    ]
+    # The evicted response is still read from the disk
+    assert get_cached(ocsp_requests[0])[1] == "hit"
+    assert len(OcspCache.entries) == 2
@@ -0,0 +1,121 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import time
+from concurrent.futures import wait
+
+from OpenSSL import crypto
+
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+)
+from verifier.nvml import NvmlHandlerTest
+from verifier.prefetch import AttestationPrefetcher
+from verifier.rim import RIM
+from verifier.rim.rim_memo import RimMemo
+
+Mode = BaseSettings.Certificate_Chain_Verification_Mode
+
+
+def get_cert_chains():
+    """ Returns the sample GPU certificate chain and the certificate chains of the sample RIMs, with their
+    verification modes. The chains are read again on every call as their validation modifies them. """
+    settings = HopperSettings()
+    with open(os.path.join(settings.ROOT_CERT_DIR, settings.RIM_ROOT_CERT), "rb") as root_cert_file:
+        rim_root_cert = crypto.load_certificate(crypto.FILETYPE_PEM, root_cert_file.read())
+    return [
+        (NvmlHandlerTest(settings=BaseSettings).get_attestation_cert_chain(), Mode.GPU_ATTESTATION),
+        (RIM("driver", settings, rim_path=settings.DRIVER_RIM_PATH).extract_certificates() + [rim_root_cert],
+         Mode.DRIVER_RIM_CERT),
+        (RIM("vbios", settings, rim_path=settings.VBIOS_RIM_PATH).extract_certificates() + [rim_root_cert],
+         Mode.VBIOS_RIM_CERT),
+    ]
+
+
+def get_prefetch_keys(cert_chain, mode):
+    return {CcAdminUtils.get_ocsp_prefetch_key(*pair) for pair in CcAdminUtils.get_ocsp_cert_pairs(cert_chain, mode)}
+
+
+def wait_for_prefetches(keys, timeout=10):
+    """ Waits for the OCSP responses of the given keys to be prefetched. """
+    deadline = time.monotonic() + timeout
+    while not keys.issubset(CcAdminUtils.prefetched_ocsp_responses):
+        assert time.monotonic() < deadline, "The OCSP responses were not prefetched in time."
+        time.sleep(0.01)
+    wait([CcAdminUtils.prefetched_ocsp_responses[key][0] for key in keys], timeout=timeout)
+
+
+def validate_cert_chains():
+    """ Checks the OCSP status of the sample certificate chains as the attestation does. """
+    for cert_chain, mode in get_cert_chains():
+        status, _ = CcAdminUtils.ocsp_certificate_chain_validation(cert_chain, HopperSettings(), mode)
+        assert status
+
+
+def test_prefetched_responses_are_used_then_discarded(offline_attestation):
+    keys = set().union(*(get_prefetch_keys(cert_chain, mode) for cert_chain, mode in get_cert_chains()))
+    prefetcher = AttestationPrefetcher(RimMemo(), {"test_no_gpu": True})
+    try:
+        prefetcher.start([NvmlHandlerTest(settings=BaseSettings)])
+        wait_for_prefetches(keys)
+        prefetch_requests = offline_attestation.get_request_count()
+        assert prefetch_requests > 0
+
+        validate_cert_chains()
+        assert offline_attestation.get_request_count() == prefetch_requests
+    finally:
+        prefetcher.close()
+
+    assert CcAdminUtils.prefetched_ocsp_responses == {}
+    validate_cert_chains()
+    assert offline_attestation.get_request_count() > prefetch_requests
+
+
+def test_failed_prefetch_falls_back_to_the_fetch(offline_attestation):
+    gpu_cert_chain, mode = get_cert_chains()[0]
+    gpu_keys = get_prefetch_keys(gpu_cert_chain, mode)
+    offline_attestation.refused_serial_numbers = {cert.get_serial_number() for cert in gpu_cert_chain}
+    prefetcher = AttestationPrefetcher(RimMemo(), {"test_no_gpu": True})
+    try:
+        prefetcher.start([NvmlHandlerTest(settings=BaseSettings)])
+        wait_for_prefetches(gpu_keys)
+        for key in gpu_keys:
+            future, index = CcAdminUtils.prefetched_ocsp_responses[key]
+            assert future.result()[index][1] is None
+
+        offline_attestation.refused_serial_numbers = set()
+        prefetch_requests = offline_attestation.get_request_count()
+        validate_cert_chains()
+        assert offline_attestation.get_request_count() > prefetch_requests
+    finally:
+        prefetcher.close()
@@ -0,0 +1,198 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import sys
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.hashes import SHA384
+
+from verifier import build_rim_bundle
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import BaseSettings, HopperSettings
+from verifier.exceptions import RIMBundleError
+from verifier.utils.rim_bundle import RimBundle
+
+DRIVER_RIM_ID = "NV_GPU_DRIVER_GH100_535.86.09"
+VBIOS_RIM_ID = "NV_GPU_VBIOS_1010_0200_882_96005E0001"
+
+
+def write_key_pair(directory, name):
+    """ Writes a new EC key pair as PEM files and returns the private key and the path of the public key. """
+    private_key = ec.generate_private_key(ec.SECP384R1())
+    private_key_path = directory / f"{name}.pem"
+    public_key_path = directory / f"{name}.pub.pem"
+    private_key_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    public_key_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ))
+    return private_key, str(public_key_path)
+
+
+def write_raw_bundle(path, entries, contents, signing_key):
+    """ Writes a RIM bundle with the given index entries, bypassing the consistency of RimBundle.write. """
+    index = json.dumps({"version": 1, "rims": entries}).encode("utf-8")
+    signature = signing_key.sign(index, ec.ECDSA(SHA384()))
+    with open(path, "wb") as f:
+        f.write(RimBundle.HEADER.pack(RimBundle.MAGIC, len(index), len(signature)))
+        f.write(index)
+        f.write(signature)
+        f.write(contents)
+
+
+@pytest.fixture
+def rims():
+    with open(HopperSettings.TEST_NO_GPU_DRIVER_RIM_PATH, "r") as f:
+        driver_rim = f.read()
+    with open(HopperSettings.TEST_NO_GPU_VBIOS_RIM_PATH, "r") as f:
+        vbios_rim = f.read()
+    return {DRIVER_RIM_ID: driver_rim, VBIOS_RIM_ID: vbios_rim}
+
+
+@pytest.fixture
+def key_pair(tmp_path):
+    return write_key_pair(tmp_path, "bundle")
+
+
+@pytest.fixture
+def bundle_settings(monkeypatch, tmp_path):
+    """ Configures the RIM bundle path in tmp_path without a public key, and unmaps the RIM bundle afterwards. """
+    path = str(tmp_path / "rims.nvrb")
+    monkeypatch.setattr(BaseSettings, "RIM_BUNDLE_PATH", path)
+    monkeypatch.setattr(BaseSettings, "RIM_BUNDLE_PUBLIC_KEY", "")
+    RimBundle.close()
+    yield path
+    RimBundle.close()
+
+
+def test_get_returns_the_written_rims(bundle_settings, rims, key_pair):
+    signing_key, public_key_path = key_pair
+    BaseSettings.RIM_BUNDLE_PUBLIC_KEY = public_key_path
+    RimBundle.write(bundle_settings, rims, signing_key)
+
+    assert RimBundle.list_rim_ids() == sorted(rims)
+    for rim_id, content in rims.items():
+        assert RimBundle.get(rim_id) == content
+    assert RimBundle.get("NV_GPU_VBIOS_NOT_IN_THE_BUNDLE") is None
+
+
+def test_get_returns_the_rims_of_an_unsigned_bundle_without_a_public_key(bundle_settings, rims):
+    RimBundle.write(bundle_settings, rims)
+
+    assert RimBundle.get(DRIVER_RIM_ID) == rims[DRIVER_RIM_ID]
+
+
+def test_replaced_bundle_is_loaded_again(bundle_settings, rims):
+    RimBundle.write(bundle_settings, rims)
+    assert RimBundle.get(VBIOS_RIM_ID) == rims[VBIOS_RIM_ID]
+
+    RimBundle.write(bundle_settings, {VBIOS_RIM_ID: "replaced"})
+
+    assert RimBundle.get(VBIOS_RIM_ID) == "replaced"
+    assert RimBundle.get(DRIVER_RIM_ID) is None
+
+
+def test_build_rim_bundle_writes_the_fetched_rims(monkeypatch, bundle_settings, rims, key_pair, tmp_path):
+    signing_key_path = str(tmp_path / "bundle.pem")
+    BaseSettings.RIM_BUNDLE_PUBLIC_KEY = key_pair[1]
+    monkeypatch.setattr(
+        CcAdminUtils, "fetch_rim_file_from_url", staticmethod(lambda rim_id, url, retries: rims.get(rim_id))
+    )
+    monkeypatch.setattr(sys, "argv", [
+        "build_rim_bundle", bundle_settings,
+        "--rim_id", DRIVER_RIM_ID, "--rim_id", VBIOS_RIM_ID,
+        "--rim_service_url", "https://rim.stub.test/",
+        "--signing_key", signing_key_path,
+    ])
+
+    build_rim_bundle.main()
+
+    assert {rim_id: RimBundle.get(rim_id) for rim_id in RimBundle.list_rim_ids()} == rims
+
+
+def test_build_rim_bundle_fails_on_a_missing_rim(monkeypatch, bundle_settings, rims):
+    monkeypatch.setattr(
+        CcAdminUtils, "fetch_rim_file_from_url", staticmethod(lambda rim_id, url, retries: rims.get(rim_id))
+    )
+    monkeypatch.setattr(sys, "argv", [
+        "build_rim_bundle", bundle_settings, "--rim_id", DRIVER_RIM_ID, "--rim_id", "NV_GPU_VBIOS_MISSING",
+    ])
+
+    with pytest.raises(SystemExit):
+        build_rim_bundle.main()
+
+
+def test_bundle_signed_with_another_key_is_rejected(bundle_settings, rims, key_pair, tmp_path):
+    other_signing_key, _ = write_key_pair(tmp_path, "other")
+    BaseSettings.RIM_BUNDLE_PUBLIC_KEY = key_pair[1]
+    RimBundle.write(bundle_settings, rims, other_signing_key)
+
+    with pytest.raises(RIMBundleError, match="signature verification"):
+        RimBundle.list_rim_ids()
+    assert RimBundle.get(DRIVER_RIM_ID) is None
+
+
+def test_unsigned_bundle_is_rejected_with_a_public_key(bundle_settings, rims, key_pair):
+    BaseSettings.RIM_BUNDLE_PUBLIC_KEY = key_pair[1]
+    RimBundle.write(bundle_settings, rims)
+
+    with pytest.raises(RIMBundleError, match="not signed"):
+        RimBundle.list_rim_ids()
+    assert RimBundle.get(DRIVER_RIM_ID) is None
+
+
+@pytest.mark.parametrize("offset, length", [(0, 100), (90, 20), (-1, 10), (0, -1)])
+def test_entry_out_of_the_bundle_is_rejected(bundle_settings, key_pair, offset, length):
+    signing_key, public_key_path = key_pair
+    BaseSettings.RIM_BUNDLE_PUBLIC_KEY = public_key_path
+    content = b"x" * 99
+    write_raw_bundle(bundle_settings, {DRIVER_RIM_ID: [offset, length, RimBundle.compute_digest(content)]}, content,
+                     signing_key)
+
+    with pytest.raises(RIMBundleError, match="out of the bundle"):
+        RimBundle.list_rim_ids()
+    assert RimBundle.get(DRIVER_RIM_ID) is None
+
+
+def test_content_not_matching_its_digest_is_rejected(bundle_settings, key_pair):
+    signing_key, public_key_path = key_pair
+    BaseSettings.RIM_BUNDLE_PUBLIC_KEY = public_key_path
+    entries = {
+        DRIVER_RIM_ID: [0, 6, RimBundle.compute_digest(b"driver")],
+        VBIOS_RIM_ID: [6, 5, RimBundle.compute_digest(b"vbios")],
+    }
+    write_raw_bundle(bundle_settings, entries, b"driverVBIOS", signing_key)
+
+    assert RimBundle.get(DRIVER_RIM_ID) == "driver"
+    assert RimBundle.get(VBIOS_RIM_ID) is None
@@ -0,0 +1,157 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import os
+
+import pytest
+
+from verifier.config import BaseSettings
+from verifier.utils.rim_cache import RimCache
+from verifier.utils.tracing import Tracer
+
+RIM_CONTENT = "<SoftwareIdentity name=\"{}\"/>"
+
+
+@pytest.fixture
+def cache_dir(monkeypatch, tmp_path):
+    """ Enables the RIM cache in tmp_path. """
+    monkeypatch.setattr(BaseSettings, "RIM_CACHE_ENABLED", True)
+    monkeypatch.setattr(BaseSettings, "RIM_CACHE_DIR", str(tmp_path / "rims"))
+    monkeypatch.setattr(BaseSettings, "RIM_CACHE_MAX_AGE_HRS", 24)
+    monkeypatch.setattr(BaseSettings, "RIM_CACHE_MAX_SIZE_BYTES", 1024 * 1024)
+    return BaseSettings.RIM_CACHE_DIR
+
+
+def set_stored_at(rim_id, hours_ago):
+    """ Moves the time at which the entry of the RIM file id was stored to the given number of hours ago. """
+    index_path = RimCache.get_index_path(rim_id)
+    with open(index_path) as index_file:
+        entry = json.load(index_file)
+    entry["stored_at"] -= hours_ago * 3600
+    with open(index_path, "w") as index_file:
+        json.dump(entry, index_file)
+
+
+def test_round_trip(cache_dir):
+    content = RIM_CONTENT.format("driver")
+    RimCache.put("NV_GPU_DRIVER_GH100_545.00", content)
+
+    with Tracer.start_trace("test") as trace:
+        assert RimCache.get("NV_GPU_DRIVER_GH100_545.00") == content
+        assert RimCache.get("NV_GPU_DRIVER_GH100_550.00") is None
+
+    assert trace.get_counters() == {"rim_cache.hit": 1, "rim_cache.miss": 1}
+    assert os.path.isfile(RimCache.get_content_path(RimCache.compute_digest(content)))
+
+
+def test_digest_mismatch_evicts_the_entry(cache_dir):
+    content = RIM_CONTENT.format("driver")
+    RimCache.put("NV_GPU_DRIVER_GH100_545.00", content)
+    content_path = RimCache.get_content_path(RimCache.compute_digest(content))
+    with open(content_path, "w") as content_file:
+        content_file.write(RIM_CONTENT.format("tampered"))
+
+    assert RimCache.get("NV_GPU_DRIVER_GH100_545.00") is None
+    assert not os.path.exists(RimCache.get_index_path("NV_GPU_DRIVER_GH100_545.00"))
+    assert not os.path.exists(content_path)
+
+
+def test_expired_entries_are_evicted(cache_dir):
+    RimCache.put("NV_GPU_DRIVER_GH100_545.00", RIM_CONTENT.format("driver"))
+    RimCache.put("NV_GPU_VBIOS_1010_0200_882_96005E0001", RIM_CONTENT.format("vbios"))
+    set_stored_at("NV_GPU_DRIVER_GH100_545.00", 25)
+    set_stored_at("NV_GPU_VBIOS_1010_0200_882_96005E0001", 25)
+
+    assert RimCache.get("NV_GPU_DRIVER_GH100_545.00") is None
+    assert not os.path.exists(RimCache.get_index_path("NV_GPU_DRIVER_GH100_545.00"))
+
+    # The expired entries are also evicted when another RIM is stored
+    RimCache.put("NV_GPU_DRIVER_GH100_550.00", RIM_CONTENT.format("driver 550"))
+    assert [rim_id for rim_id, _ in RimCache.list_entries()] == ["NV_GPU_DRIVER_GH100_550.00"]
+    assert sorted(os.listdir(cache_dir)) == sorted([
+        "NV_GPU_DRIVER_GH100_550.00.json",
+        RimCache.compute_digest(RIM_CONTENT.format("driver 550")) + RimCache.CONTENT_SUFFIX,
+    ])
+
+
+def test_size_limit_evicts_the_oldest_entries(monkeypatch, cache_dir):
+    contents = [RIM_CONTENT.format(f"driver {index}") for index in range(4)]
+    monkeypatch.setattr(BaseSettings, "RIM_CACHE_MAX_SIZE_BYTES", 2 * len(contents[0]) + 1)
+
+    for index, content in enumerate(contents):
+        RimCache.put(f"NV_GPU_DRIVER_GH100_{index}", content)
+        set_stored_at(f"NV_GPU_DRIVER_GH100_{index}", len(contents) - index)
+
+    assert sorted(rim_id for rim_id, _ in RimCache.list_entries()) == ["NV_GPU_DRIVER_GH100_2", "NV_GPU_DRIVER_GH100_3"]
+    assert RimCache.get("NV_GPU_DRIVER_GH100_0") is None
+    assert not os.path.exists(RimCache.get_content_path(RimCache.compute_digest(contents[0])))
+    assert RimCache.get("NV_GPU_DRIVER_GH100_3") == contents[3]
+
+
+def test_shared_content_is_kept_while_referenced(cache_dir):
+    content = RIM_CONTENT.format("driver")
+    RimCache.put("NV_GPU_DRIVER_GH100_545.00", content)
+    RimCache.put("NV_GPU_DRIVER_GH100_545.01", content)
+    set_stored_at("NV_GPU_DRIVER_GH100_545.00", 25)
+
+    RimCache.put("NV_GPU_DRIVER_GH100_550.00", RIM_CONTENT.format("driver 550"))
+
+    assert not os.path.exists(RimCache.get_index_path("NV_GPU_DRIVER_GH100_545.00"))
+    assert RimCache.get("NV_GPU_DRIVER_GH100_545.01") == content
+
+
+def test_enforce_limits_lists_the_entries_once(monkeypatch, cache_dir):
+    for index in range(5):
+        RimCache.put(f"NV_GPU_DRIVER_GH100_{index}", RIM_CONTENT.format(f"driver {index}"))
+        set_stored_at(f"NV_GPU_DRIVER_GH100_{index}", 25)
+
+    list_entries = RimCache.list_entries
+    listings = list()
+
+    def count_listings():
+        listings.append(1)
+        return list_entries()
+
+    monkeypatch.setattr(RimCache, "list_entries", count_listings)
+    with RimCache.lock:
+        RimCache.enforce_limits()
+
+    assert len(listings) == 1
+    assert list_entries() == []
+    assert os.listdir(cache_dir) == []
+
+
+@pytest.mark.parametrize("rim_id", ["../NV_GPU_DRIVER_GH100_545.00", "rims/NV_GPU_DRIVER_GH100_545.00", ""])
+def test_unsafe_rim_id_is_rejected(cache_dir, rim_id):
+    RimCache.put(rim_id, RIM_CONTENT.format("driver"))
+
+    assert RimCache.get(rim_id) is None
+    assert not os.path.exists(cache_dir)
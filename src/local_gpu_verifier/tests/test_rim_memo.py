@@ -0,0 +1,117 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import threading
+import time
+
+import pytest
+from cryptography.x509 import ocsp
+
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import HopperSettings
+from verifier.exceptions import RIMCertChainOCSPVerificationError
+from verifier.rim import RIM
+from verifier.rim.rim_memo import RimMemo
+
+DRIVER_RIM_FILE_ID = "NV_GPU_DRIVER_GH100_545.00"
+DRIVER_VERSION = "545.00"
+
+
+@pytest.fixture
+def rim_service(monkeypatch, offline_attestation):
+    """ Serves the sample driver RIM in place of the RIM service and counts the RIM fetches and verifications. """
+    with open(HopperSettings.TEST_NO_GPU_DRIVER_RIM_PATH) as rim_file:
+        content = rim_file.read()
+    calls = {"fetch": 0, "verify": 0}
+
+    def fetch_rim_file(rim_id, max_retries):
+        calls["fetch"] += 1
+        time.sleep(0.05)
+        return content
+
+    verify = RIM.verify
+
+    def count_verifications(rim, version, settings):
+        calls["verify"] += 1
+        return verify(rim, version=version, settings=settings)
+
+    monkeypatch.setattr(CcAdminUtils, "fetch_rim_file", staticmethod(fetch_rim_file))
+    monkeypatch.setattr(RIM, "verify", count_verifications)
+    return calls
+
+
+def attest_driver_rim(rim_memo, settings):
+    """ Fetches, parses and verifies the driver RIM of one GPU as cc_admin.attest_gpu does. """
+    content = rim_memo.fetch_rim_file(DRIVER_RIM_FILE_ID)
+    key = RimMemo.get_key("driver", DRIVER_RIM_FILE_ID, content)
+    rim = rim_memo.get_rim(key, "driver", settings, content=content)
+    return rim_memo.verify(key, rim, DRIVER_VERSION, settings)
+
+
+def test_gpus_with_the_same_driver_share_the_rim(rim_service):
+    rim_memo = RimMemo()
+    number_of_gpus = 4
+    barrier = threading.Barrier(number_of_gpus)
+    settings = [HopperSettings() for _ in range(number_of_gpus)]
+    results = [None] * number_of_gpus
+
+    def attest(index):
+        barrier.wait()
+        results[index] = attest_driver_rim(rim_memo, settings[index])
+
+    threads = [threading.Thread(target=attest, args=(index,)) for index in range(number_of_gpus)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert rim_service == {"fetch": 1, "verify": 1}
+    assert [status for status, _ in results] == [True] * number_of_gpus
+    for gpu_settings in settings:
+        assert gpu_settings.check_if_driver_rim_schema_validated()
+        assert gpu_settings.check_if_rim_driver_version_matches()
+        assert gpu_settings.check_if_driver_rim_cert_validated()
+
+
+def test_failed_verification_is_not_reused(rim_service, offline_attestation):
+    rim_memo = RimMemo()
+    offline_attestation.response_status = ocsp.OCSPResponseStatus.TRY_LATER
+
+    with pytest.raises(RIMCertChainOCSPVerificationError):
+        attest_driver_rim(rim_memo, HopperSettings())
+    assert rim_memo.verification_results == {}
+
+    offline_attestation.response_status = None
+    settings = HopperSettings()
+    status, _ = attest_driver_rim(rim_memo, settings)
+
+    assert status
+    assert rim_service == {"fetch": 1, "verify": 2}
+    assert settings.check_if_driver_rim_cert_validated()
@@ -0,0 +1,89 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import shutil
+
+import pytest
+from lxml import etree
+
+import verifier.rim
+from verifier.config import HopperSettings
+from verifier.rim import RIM
+from verifier.rim.schema_cache import SchemaCache
+
+SCHEMA_DIR = os.path.dirname(os.path.abspath(verifier.rim.__file__))
+SCHEMA_FILES = ("swidSchema2015.xsd", "signSchema.xsd")
+
+
+@pytest.fixture(autouse=True)
+def clear_schema_cache():
+    SchemaCache.clear()
+    yield
+    SchemaCache.clear()
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    """ A copy of the swidtag schema and the schemas it imports, whose modification time can be changed. """
+    for schema_file in SCHEMA_FILES:
+        shutil.copy(os.path.join(SCHEMA_DIR, schema_file), tmp_path / schema_file)
+    return str(tmp_path / SCHEMA_FILES[0])
+
+
+def test_schema_is_compiled_once(schema_path):
+    xml_schema, schema_lock = SchemaCache.get_schema(schema_path)
+
+    assert SchemaCache.get_schema(schema_path) == (xml_schema, schema_lock)
+    assert len(SchemaCache.schemas) == 1
+
+
+def test_changed_modification_time_recompiles_the_schema(schema_path):
+    xml_schema, _ = SchemaCache.get_schema(schema_path)
+    modification_time = os.stat(schema_path).st_mtime_ns
+    os.utime(schema_path, ns=(modification_time + 1_000_000_000, modification_time + 1_000_000_000))
+
+    recompiled_xml_schema, _ = SchemaCache.get_schema(schema_path)
+
+    assert recompiled_xml_schema is not xml_schema
+    assert list(SchemaCache.schemas) == [(os.path.abspath(schema_path), modification_time + 1_000_000_000)]
+    assert SchemaCache.get_schema(schema_path)[0] is recompiled_xml_schema
+
+
+def test_validate_matches_an_uncached_schema():
+    schema_path = os.path.join(SCHEMA_DIR, SCHEMA_FILES[0])
+    root = RIM.read(base_RIM_path=HopperSettings.TEST_NO_GPU_DRIVER_RIM_PATH)
+    xml_schema = etree.XMLSchema(etree.parse(schema_path, etree.XMLParser(resolve_entities=False)))
+
+    assert SchemaCache.validate(schema_path, root) is xml_schema.validate(root) is True
+
+    # The name attribute of the SoftwareIdentity element is required
+    del root.attrib["name"]
+    assert SchemaCache.validate(schema_path, root) is xml_schema.validate(root) is False
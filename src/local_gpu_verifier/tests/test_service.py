@@ -0,0 +1,240 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import http.client
+import json
+import socket
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from verifier import service
+from verifier.config import (
+    BaseSettings,
+    info_log,
+)
+from verifier.utils.metrics import MetricsRegistry
+
+NONCE = "0f" * BaseSettings.SIZE_OF_NONCE_IN_BYTES
+TOKEN = [["JWT", "token"], {"GPU-0": "token"}]
+
+
+class StubAttestation:
+    """ Stands in for the evidence collection and the attestation of AttestationService.collect_and_attest. """
+
+    def __init__(self):
+        self.status = True
+        self.error = None
+        self.nonces = list()
+        self.started = threading.Event()
+        self.released = threading.Event()
+        self.released.set()
+
+    def __call__(self, arguments_as_dictionary, nonce):
+        self.nonces.append(nonce)
+        self.started.set()
+        self.released.wait(10)
+        if self.error is not None:
+            raise self.error
+        info_log.info(service.AttestationService.SUCCESS_MESSAGE if self.status else "GPU Attestation failed")
+        return self.status, TOKEN
+
+
+@pytest.fixture
+def attestation(monkeypatch):
+    stub = StubAttestation()
+    monkeypatch.setattr(service.AttestationService, "collect_and_attest", staticmethod(stub))
+    yield stub
+    stub.released.set()
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.setattr(MetricsRegistry, "enabled", True)
+    MetricsRegistry.clear()
+    yield MetricsRegistry
+    MetricsRegistry.clear()
+
+
+@pytest.fixture
+def server(attestation, metrics):
+    """ Runs the attestation service on a free local port, with no attestation waiting in the queue. """
+    arguments_as_dictionary = vars(service.build_argument_parser().parse_args(["--port", "0", "--socket", ""]))
+    attestation_service = service.AttestationService(arguments_as_dictionary, max_queue_size=0)
+    handler = type("ServiceRequestHandler", (service.AttestationRequestHandler,), {"service": attestation_service})
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=http_server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+    thread.join()
+
+
+def request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request(method, path, body=body, headers=headers or dict())
+        response = connection.getresponse()
+        return response.status, response.read(), response.getheader("x-ms-request-id")
+    finally:
+        connection.close()
+
+
+def get_counter(name, **labels):
+    return MetricsRegistry.counters.get(name, dict()).get(MetricsRegistry.get_labels(labels), 0)
+
+
+def test_heartbeat(server):
+    assert request(server, "GET", "/heartbeat")[:2] == (200, b"OK")
+
+
+def test_unknown_path(server):
+    assert request(server, "GET", "/attest")[0] == 404
+    assert request(server, "POST", "/attest", body=b"{}")[0] == 404
+
+
+def test_gpu_attest_get(server, attestation):
+    status, body, request_id = request(server, "GET", f"/gpu_attest?nonce={NONCE}", headers={"x-request-id": "abc"})
+
+    assert status == 200
+    assert request_id == "abc"
+    response = json.loads(body)
+    assert service.AttestationService.SUCCESS_MESSAGE in response["attestation_output"]
+    assert response["entity_attestation_token"] == TOKEN
+    assert attestation.nonces == [NONCE]
+    assert get_counter("verifier_attestations_total", result="success") == 1
+
+
+def test_gpu_attest_post(server, attestation):
+    status, body, request_id = request(server, "POST", "/gpu_attest", body=json.dumps({"nonce": NONCE}))
+
+    assert status == 200
+    assert request_id
+    assert attestation.nonces == [NONCE]
+
+
+def test_failed_attestation_is_400(server, attestation):
+    attestation.status = False
+
+    status, body, _ = request(server, "GET", "/gpu_attest")
+
+    assert status == 400
+    assert json.loads(body)["entity_attestation_token"] == TOKEN
+    assert get_counter("verifier_attestations_total", result="failure") == 1
+
+
+def test_attestation_error_is_500(server, attestation):
+    attestation.error = RuntimeError("NVML is gone")
+
+    status, body, _ = request(server, "GET", "/gpu_attest")
+
+    assert status == 500
+    response = json.loads(body)
+    assert "NVML is gone" in response["attestation_output"]
+    assert response["entity_attestation_token"] is None
+    assert get_counter("verifier_attestations_total", result="error") == 1
+    assert server.RequestHandlerClass.service.queued_requests == 0
+
+
+@pytest.mark.parametrize("path", ["/gpu_attest?nonce=zz", "/gpu_attest?nonce=0f0f"])
+def test_invalid_nonce_is_400(server, attestation, path):
+    status, body, _ = request(server, "GET", path)
+
+    assert status == 400
+    assert b"nonce must be a 32-byte hex string" in body
+    assert attestation.nonces == []
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1", "1.5"])
+def test_malformed_content_length_is_400(server, attestation, content_length):
+    with socket.create_connection(server.server_address, timeout=10) as client:
+        client.sendall(
+            f"POST /gpu_attest HTTP/1.1\r\nHost: localhost\r\nContent-Length: {content_length}\r\n\r\n".encode()
+        )
+        response = http.client.HTTPResponse(client)
+        response.begin()
+
+        assert response.status == 400
+        assert response.read() == b"Invalid Content-Length\n"
+        assert response.getheader("Connection") == "close"
+    assert attestation.nonces == []
+
+
+def test_large_body_is_413(server, attestation):
+    body = json.dumps({"nonce": NONCE, "padding": "x" * service.AttestationService.MAX_REQUEST_BODY_SIZE})
+
+    assert request(server, "POST", "/gpu_attest", body=body)[0] == 413
+    assert attestation.nonces == []
+
+
+def test_full_queue_is_rejected(server, attestation):
+    attestation.released.clear()
+    results = list()
+    thread = threading.Thread(target=lambda: results.append(request(server, "GET", "/gpu_attest")[0]))
+    thread.start()
+    assert attestation.started.wait(10)
+
+    # The running attestation takes the only place of the queue
+    status, body, _ = request(server, "GET", "/gpu_attest")
+    attestation.released.set()
+    thread.join()
+
+    assert status == 503
+    assert body == b"Too many pending attestation requests\n"
+    assert results == [200]
+    assert get_counter("verifier_attestations_total", result="rejected") == 1
+    assert get_counter("verifier_attestations_total", result="success") == 1
+
+
+def test_metrics(server, attestation):
+    request(server, "GET", "/gpu_attest")
+
+    status, body, _ = request(server, "GET", "/metrics")
+
+    assert status == 200
+    metrics = body.decode()
+    assert "# TYPE verifier_attestations_total counter" in metrics
+    assert 'verifier_attestations_total{region="' in metrics
+    assert 'result="success"} 1' in metrics
+    assert "verifier_attestation_duration_seconds_count{" in metrics
+
+
+def test_idle_connection_is_closed(server, monkeypatch):
+    monkeypatch.setattr(server.RequestHandlerClass, "timeout", 0.2)
+
+    with socket.create_connection(server.server_address, timeout=10) as client:
+        client.sendall(b"POST /gpu_attest HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n\r\n{")
+        response = http.client.HTTPResponse(client)
+        response.begin()
+
+        assert response.status == 400
+        assert response.read() == b"Failed to read request body\n"
@@ -0,0 +1,146 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from verifier.utils import function_wrapper_with_timeout
+from verifier.utils.tracing import Tracer
+
+
+def traced_call(name):
+    """ Records a span with a cache hit, as the helpers run by the executors do. """
+    with Tracer.span("traced_call", call=name):
+        Tracer.increment("test_cache.hit")
+    return name
+
+
+def get_span(trace, name, **attributes):
+    """ Returns the only ended span of the trace with the given name and attributes. """
+    spans = [
+        span for span in trace.get_spans()
+        if span.name == name and all(span.attributes.get(key) == value for key, value in attributes.items())
+    ]
+    assert len(spans) == 1
+    return spans[0]
+
+
+def test_spans_nest_across_threads():
+    with Tracer.start_trace("attest", nonce="00") as trace:
+        with Tracer.span("outer") as outer:
+            assert function_wrapper_with_timeout([traced_call, "wrapped", "traced_call"], 5) == "wrapped"
+            with ThreadPoolExecutor(2) as executor:
+                bound = list(executor.map(Tracer.bind(traced_call), ["bound 1", "bound 2"]))
+                unbound = executor.submit(traced_call, "unbound").result()
+
+    assert bound == ["bound 1", "bound 2"] and unbound == "unbound"
+    assert Tracer.current_trace.get() is None and Tracer.current_span.get() is None
+    assert outer.parent is trace.root
+    for call in ("wrapped", "bound 1", "bound 2"):
+        assert get_span(trace, "traced_call", call=call).parent is outer
+    # A function run by a thread pool without Tracer.bind is not part of the trace
+    assert [span.attributes.get("call") for span in trace.get_spans()].count("unbound") == 0
+    assert trace.get_counters() == {"test_cache.hit": 3}
+
+    root = trace.to_dict()["root"]
+    assert root["name"] == "attest" and root["attributes"] == {"nonce": "00"}
+    assert [child["name"] for child in root["children"]] == ["outer"]
+    assert len(root["children"][0]["children"]) == 3
+
+
+def test_bind_without_trace_returns_the_function():
+    assert Tracer.bind(traced_call) is traced_call
+    with Tracer.span("untraced") as span:
+        assert span is None
+
+
+def test_exception_sets_the_error_status():
+    with pytest.raises(ValueError):
+        with Tracer.start_trace("attest") as trace:
+            with Tracer.span("succeeding"):
+                pass
+            with Tracer.span("failing"):
+                raise ValueError("The nonce is invalid")
+
+    failing = get_span(trace, "failing")
+    assert failing.error == "The nonce is invalid"
+    assert failing.to_otlp()["status"] == {"code": 2, "message": "The nonce is invalid"}
+    assert get_span(trace, "succeeding").to_otlp()["status"] == {"code": 1}
+    assert trace.root.error == "The nonce is invalid"
+    assert trace.to_dict()["root"]["children"][1]["error"] == "The nonce is invalid"
+
+    with pytest.raises(KeyError):
+        with Tracer.start_trace("attest") as trace:
+            raise KeyError()
+    assert trace.root.to_otlp()["status"] == {"code": 2, "message": "KeyError"}
+
+
+def test_export_writes_one_otlp_line_per_trace(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    traces = list()
+    for index in range(2):
+        with Tracer.start_trace("attest", gpu_count=index + 1) as trace:
+            traced_call(f"call {index}")
+        Tracer.export(trace, path)
+        traces.append(trace)
+
+    with open(path) as trace_file:
+        lines = trace_file.read().splitlines()
+    assert len(lines) == 2
+
+    for line, trace in zip(lines, traces):
+        resource_spans = json.loads(line)["resourceSpans"]
+        assert len(resource_spans) == 1
+        resource_attributes = {item["key"]: item["value"] for item in resource_spans[0]["resource"]["attributes"]}
+        assert resource_attributes["service.name"] == {"stringValue": "nv-local-gpu-verifier"}
+
+        spans = resource_spans[0]["scopeSpans"][0]["spans"]
+        assert [span["name"] for span in spans] == ["attest", "traced_call"]
+        root, child = spans
+        assert all(span["traceId"] == trace.trace_id for span in spans)
+        assert re.fullmatch("[0-9a-f]{32}", trace.trace_id)
+        assert all(re.fullmatch("[0-9a-f]{16}", span["spanId"]) for span in spans)
+        assert "parentSpanId" not in root and child["parentSpanId"] == root["spanId"]
+        for span in spans:
+            assert int(span["startTimeUnixNano"]) <= int(span["endTimeUnixNano"])
+            assert span["status"] == {"code": 1}
+        assert root["attributes"] == [{"key": "gpu_count", "value": {"intValue": str(traces.index(trace) + 1)}}]
+        assert {"key": "counter.test_cache.hit", "value": {"intValue": "1"}} in child["attributes"]
+
+
+def test_export_failure_does_not_raise(tmp_path):
+    with Tracer.start_trace("attest") as trace:
+        pass
+    Tracer.export(trace, str(tmp_path / "missing" / "traces.jsonl"))
+
+    assert not (tmp_path / "missing").exists()
@@ -0,0 +1,211 @@
+#
+# SPDX-FileCopyrightText: Copyright (c) 2021-2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.hashes import SHA384
+from cryptography.x509.oid import NameOID
+from OpenSSL import crypto
+
+from verifier import cc_admin
+from verifier.cc_admin_utils import CcAdminUtils
+from verifier.config import (
+    BaseSettings,
+    HopperSettings,
+)
+from verifier.nvml import NvmlHandlerTest
+from verifier.rim.rim_memo import RimMemo
+from verifier.utils.tracing import Tracer
+from verifier.utils.verdict_cache import VerdictCache
+
+GPU_ATTESTATION = BaseSettings.Certificate_Chain_Verification_Mode.GPU_ATTESTATION
+DRIVER_RIM_CERT = BaseSettings.Certificate_Chain_Verification_Mode.DRIVER_RIM_CERT
+
+
+@pytest.fixture(autouse=True)
+def incremental(monkeypatch):
+    monkeypatch.setattr(BaseSettings, "INCREMENTAL_ATTESTATION_ENABLED", True)
+    monkeypatch.setattr(BaseSettings, "OCSP_NONCE_ENABLED", False)
+    monkeypatch.setattr(VerdictCache, "entries", dict())
+
+
+@pytest.fixture
+def attest_gpu(offline_attestation):
+    """ Returns a function attesting the sample GPU evidence against the sample RIMs. It returns the result of
+    the GPU and the counters of its trace. """
+
+    def run():
+        gpu_info_obj = NvmlHandlerTest(settings=BaseSettings)
+        gpu_info_obj.DriverVersion = "545.00"
+        gpu_info_obj.VbiosVersion = "96.00.5e.00.01"
+        nonce = CcAdminUtils.validate_and_extract_nonce(BaseSettings.NONCE)
+        with Tracer.start_trace("test") as trace:
+            gpu_result = cc_admin.attest_gpu(0, gpu_info_obj, {"test_no_gpu": True}, nonce, RimMemo())
+        return gpu_result, trace.get_counters()
+
+    return run
+
+
+def get_verdict_names():
+    return sorted(name for name, _ in VerdictCache.entries)
+
+
+def build_certificate(subject, issuer, public_key, signing_key, not_valid_after):
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)]))
+        .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer)]))
+        .public_key(public_key)
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(not_valid_after)
+        .add_extension(x509.BasicConstraints(ca=subject != "Stub Leaf", path_length=None), critical=True)
+        .sign(signing_key, SHA384())
+    )
+    return crypto.X509.from_cryptography(certificate)
+
+
+def test_verdict_is_reused_for_the_same_fingerprint_only():
+    valid_until = datetime.now(timezone.utc) + timedelta(hours=1)
+    VerdictCache.put(VerdictCache.get_key("gpu_cert_chain", "fwid", b"leaf", b"root"), True, valid_until)
+
+    assert VerdictCache.get(VerdictCache.get_key("gpu_cert_chain", "fwid", b"leaf", b"root")) is True
+    assert VerdictCache.get(VerdictCache.get_key("gpu_cert_chain", "fwid", b"other leaf", b"root")) is None
+    assert VerdictCache.get(VerdictCache.get_key("gpu_cert_chain", "other fwid", b"leaf", b"root")) is None
+    # The parts are delimited, so moving bytes from one part to the next changes the fingerprint
+    assert VerdictCache.get(VerdictCache.get_key("gpu_cert_chain", "fwid", b"lea", b"froot")) is None
+    assert VerdictCache.get(VerdictCache.get_key("driver_rim", "fwid", b"leaf", b"root")) is None
+
+
+def test_verdict_expires_at_its_valid_until_time():
+    key = VerdictCache.get_key("gpu_cert_chain", b"chain")
+    VerdictCache.put(key, True, datetime.now(timezone.utc) + timedelta(milliseconds=100))
+    assert VerdictCache.get(key) is True
+
+    time.sleep(0.2)
+
+    assert VerdictCache.get(key) is None
+    assert not VerdictCache.entries
+    VerdictCache.put(key, True, None)
+    VerdictCache.put(key, True, datetime.now(timezone.utc) - timedelta(seconds=1))
+    assert not VerdictCache.entries
+
+
+def test_verdicts_are_not_reused_with_the_ocsp_nonce(monkeypatch):
+    key = VerdictCache.get_key("gpu_cert_chain", b"chain")
+    valid_until = datetime.now(timezone.utc) + timedelta(hours=1)
+    VerdictCache.put(key, True, valid_until)
+
+    monkeypatch.setattr(BaseSettings, "OCSP_NONCE_ENABLED", True)
+    assert VerdictCache.get(key) is None
+    assert not VerdictCache.has_valid_verdicts()
+    VerdictCache.put(VerdictCache.get_key("driver_rim", b"rim"), True, valid_until)
+    assert get_verdict_names() == ["gpu_cert_chain"]
+
+
+def test_valid_until_is_the_earliest_ocsp_next_update(offline_attestation, cert_pairs):
+    offline_attestation.validities[cert_pairs[1][0].serial_number] = timedelta(hours=2)
+    settings = HopperSettings()
+
+    cert_chain = NvmlHandlerTest(settings=BaseSettings).get_attestation_cert_chain()
+    start_time = datetime.now(timezone.utc)
+    status, warning = CcAdminUtils.ocsp_certificate_chain_validation(list(cert_chain), settings, GPU_ATTESTATION)
+
+    assert (status, warning) == (True, "")
+    valid_until = settings.get_ocsp_valid_until(GPU_ATTESTATION)
+    assert start_time + timedelta(hours=2) - timedelta(seconds=1) <= valid_until
+    assert valid_until <= datetime.now(timezone.utc) + timedelta(hours=2)
+
+
+def test_valid_until_is_the_earliest_certificate_expiry(offline_attestation):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    root_key, intermediate_key, leaf_key = (ec.generate_private_key(ec.SECP384R1()) for _ in range(3))
+    root = build_certificate("Stub Root", "Stub Root", root_key.public_key(), root_key, now + timedelta(days=30))
+    intermediate = build_certificate(
+        "Stub Intermediate", "Stub Root", intermediate_key.public_key(), root_key, now + timedelta(days=30)
+    )
+    leaf = build_certificate("Stub Leaf", "Stub Intermediate", leaf_key.public_key(), intermediate_key, now + timedelta(hours=1))
+    cert_chain = [leaf, intermediate, root]
+    offline_attestation.add_certificates(CcAdminUtils.get_ocsp_cert_pairs(cert_chain, DRIVER_RIM_CERT))
+    settings = HopperSettings()
+
+    status, warning = CcAdminUtils.ocsp_certificate_chain_validation(list(cert_chain), settings, DRIVER_RIM_CERT)
+
+    assert (status, warning) == (True, "")
+    assert settings.get_ocsp_valid_until(DRIVER_RIM_CERT) == now + timedelta(hours=1)
+
+
+def test_reused_verdict_gives_the_claims_of_a_full_attestation(attest_gpu, offline_attestation):
+    full_result, full_counters = attest_gpu()
+    ocsp_requests = len(offline_attestation.requests)
+    reused_result, reused_counters = attest_gpu()
+
+    assert full_result["status"] is True
+    assert "verdict_cache.hit" not in full_counters
+    assert "gpu_cert_chain" in get_verdict_names()
+    assert reused_counters["verdict_cache.hit"] >= 1
+    # The OCSP status of the GPU certificate chain is not fetched again
+    assert len(offline_attestation.requests) - ocsp_requests < ocsp_requests
+    assert reused_result["claims"] == full_result["claims"]
+    assert reused_result["status"] is True
+
+
+def test_verdict_with_a_warning_is_not_stored(attest_gpu, offline_attestation, cert_pairs):
+    # A revoked certificate is still accepted during the grace period, with a warning
+    offline_attestation.revocations[cert_pairs[0][0].serial_number] = (
+        datetime.now(timezone.utc) - timedelta(hours=1),
+        x509.ReasonFlags.key_compromise,
+    )
+
+    first_result, _ = attest_gpu()
+    second_result, second_counters = attest_gpu()
+
+    assert first_result["status"] is True
+    assert "gpu_cert_chain" not in get_verdict_names()
+    assert "verdict_cache.hit" not in second_counters
+    assert second_result["claims"] == first_result["claims"]
+
+
+def test_verdicts_are_not_stored_with_the_ocsp_nonce(attest_gpu, offline_attestation, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "OCSP_NONCE_ENABLED", True)
+
+    first_result, _ = attest_gpu()
+    ocsp_requests = len(offline_attestation.requests)
+    second_result, second_counters = attest_gpu()
+
+    assert first_result["status"] is second_result["status"] is True
+    assert not VerdictCache.entries
+    assert "verdict_cache.hit" not in second_counters
+    assert len(offline_attestation.requests) == 2 * ocsp_requests